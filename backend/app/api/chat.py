@@ -1,15 +1,25 @@
 """User Query API: LLM Orchestrator 연동."""
 
 import asyncio
-from typing import Optional
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.clients import ClientRegistry, get_clients
 from app.core.debug_chat import debug_api_response, debug_request
-from app.database import get_db
-from app.schemas import ChatRequest, ChatResponse
-from app.services.llm_orchestrator import orchestrate
+from app.config import get_settings
+from app.database import async_session, get_db
+from app.schemas import ChatDebugInfo, ChatRequest, ChatResponse
+from app.services.answer_cache import CacheLookup, CachedAnswer, answer_cache
+from app.services.llm_orchestrator import orchestrate, orchestrate_stream
+
+settings = get_settings()
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -18,6 +28,7 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 async def chat_query(
     body: ChatRequest,
     db: AsyncSession = Depends(get_db),
+    clients: ClientRegistry = Depends(get_clients),
 ) -> ChatResponse:
     """
     사용자 질문 → Intent Routing → Context Retrieval → Prompt Synthesis → vLLM.
@@ -25,15 +36,110 @@ async def chat_query(
     """
     debug_request(body.query, body.session_id)
 
-    answer, intent, tools_used = await asyncio.wait_for(
-        orchestrate(db, body.query),
-        timeout=60,
+    t0 = time.perf_counter()
+    lookup = await _cache_lookup(db, body.query)
+    if lookup.answer:
+        cached = lookup.answer
+        debug_api_response(cached.answer, cached.intent, list(cached.tools_used) or None)
+        return ChatResponse(
+            answer=cached.answer,
+            intent=cached.intent,
+            intent_source=cached.intent_source,
+            tools_used=list(cached.tools_used) or None,
+            debug=ChatDebugInfo(stage_timings_ms=_elapsed_ms(t0), cache=lookup.kind),
+        )
+
+    # orchestrate가 chat_deadline_seconds 안에서 단계를 정리하므로 여기서는 여유를 둔 안전장치
+    result = await asyncio.wait_for(
+        orchestrate(db, clients, body.query),
+        timeout=settings.chat_deadline_seconds + 5,
     )
+    if lookup.ticket:
+        answer_cache.store(
+            lookup.ticket,
+            CachedAnswer(result.answer, result.intent, result.intent_source, tuple(result.tools_used)),
+            result.degraded_stages,
+            result.context_rows,
+        )
 
-    debug_api_response(answer, intent, tools_used or None)
+    debug_api_response(result.answer, result.intent, result.tools_used or None)
 
     return ChatResponse(
-        answer=answer,
-        intent=intent,
-        tools_used=tools_used or None,
+        answer=result.answer,
+        intent=result.intent,
+        intent_source=result.intent_source,
+        tools_used=result.tools_used or None,
+        debug=ChatDebugInfo(
+            stage_timings_ms=result.stage_timings_ms,
+            degraded_stages=result.degraded_stages,
+            cache=lookup.kind,
+        ),
+    )
+
+
+async def _cache_lookup(session: AsyncSession, query: str) -> CacheLookup:
+    if not settings.answer_cache_enabled:
+        return CacheLookup(None, "bypass")
+    return await answer_cache.lookup(session, query)
+
+
+def _elapsed_ms(t0: float) -> dict[str, float]:
+    elapsed = round((time.perf_counter() - t0) * 1000, 1)
+    return {"cache": elapsed, "total": elapsed}
+
+
+def _sse(event: str, data: Any) -> str:
+    payload = json.dumps(jsonable_encoder(data), ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream(
+    body: ChatRequest,
+    clients: ClientRegistry = Depends(get_clients),
+) -> StreamingResponse:
+    """
+    /chat/query의 스트리밍 버전 (Server-Sent Events).
+    이벤트: intent, token(delta), tool_call, tool_result, error, done(최종 답변·intent·tools_used·debug).
+    첫 토큰이 생성되는 즉시 전달되어 전체 생성 완료를 기다리지 않음.
+    """
+    debug_request(body.query, body.session_id)
+
+    async def events() -> AsyncIterator[str]:
+        # 응답 본문 전송 중에도 세션이 유지되도록 Depends(get_db) 대신 스트림 안에서 직접 관리
+        async with async_session() as session:
+            t0 = time.perf_counter()
+            lookup = await _cache_lookup(session, body.query)
+            if lookup.answer:
+                cached = lookup.answer
+                debug_api_response(cached.answer, cached.intent, list(cached.tools_used) or None)
+                yield _sse("intent", {"intent": cached.intent, "source": cached.intent_source})
+                yield _sse("token", {"delta": cached.answer})
+                yield _sse("done", {
+                    "answer": cached.answer,
+                    "intent": cached.intent,
+                    "intent_source": cached.intent_source,
+                    "tools_used": list(cached.tools_used) or None,
+                    "debug": {"stage_timings_ms": _elapsed_ms(t0), "degraded_stages": [], "cache": lookup.kind},
+                })
+                return
+
+            async for event, data in orchestrate_stream(session, clients, body.query):
+                if event == "done":
+                    debug_api_response(data["answer"], data["intent"], data["tools_used"])
+                    data["debug"]["cache"] = lookup.kind
+                    if lookup.ticket:
+                        answer_cache.store(
+                            lookup.ticket,
+                            CachedAnswer(data["answer"], data["intent"], data["intent_source"], tuple(data["tools_used"] or ())),
+                            data["debug"]["degraded_stages"],
+                            data["debug"]["context_rows"],
+                        )
+                yield _sse(event, data)
+            await session.commit()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
@@ -1,57 +1,204 @@
 """빗물받이 데이터 조회 API (프론트엔드/맵 연동용)."""
 
-from typing import Optional
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models import DrainageData
-from app.schemas import DrainageDataOut
+from app.models import DrainageLatest
+from app.schemas import DrainageDataOut, DrainageSearchHit, DrainageTileOut, DrainageTrendPoint, RegionRiskOut
+from app.services.drainage_latest import get_latest
+from app.services.http_cache import Payload, cached_response
+from app.services.regions import get_region_summaries
+from app.services.scan_history import get_trend, local_today
+from app.services.search import MAX_SEARCH_LIMIT, search_drainage
+from app.services.spatial import MAX_NEARBY_LIMIT, MAX_RADIUS_M, BBox, bbox_clause, check_point, find_nearby
+from app.services.tiles import MAX_ZOOM, get_tile
 
 router = APIRouter(prefix="/drainage", tags=["drainage"])
 
+# 다음 페이지 커서는 본문(목록) 형식을 바꾸지 않도록 응답 헤더로 전달
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# 목록·단건 응답 본문 필드 (캐시 응답은 Pydantic 검증 없이 행 → dict 직렬화, 형식은 DrainageDataOut과 동일)
+_OUT_FIELDS = [name for name in DrainageDataOut.model_fields if name != "distance_m"]
+
+
+def _encode_cursor(row: DrainageLatest) -> str:
+    raw = json.dumps([row.location_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _parse_near(value: str) -> tuple[float, float]:
+    try:
+        lat, lng = (float(p) for p in value.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="near는 lat,lng 형식이어야 합니다.")
+    try:
+        check_point(lat, lng)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return lat, lng
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        (location_id,) = json.loads(raw)
+        return str(location_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+
+
+def _out(row: DrainageLatest, distance_m: Optional[float] = None) -> dict:
+    out = {name: getattr(row, name) for name in _OUT_FIELDS}
+    out["distance_m"] = distance_m
+    return out
+
+
+def _last_modified(rows: list[DrainageLatest]) -> Optional[datetime]:
+    """응답 행들의 최종 변경 시각 (스캔 수신·ML/강우 재계산 시각 중 최대)."""
+    stamps = [t for r in rows for t in (r.created_at, r.ml_updated_at) if t is not None]
+    return max(stamps) if stamps else None
+
 
 @router.get("", response_model=list[DrainageDataOut])
 async def list_drainage(
-    limit: int = Query(50, le=200),
+    request: Request,
+    limit: int = Query(50, ge=1, le=MAX_NEARBY_LIMIT),
+    order: Literal["recent", "location_id"] = Query(
+        "recent", description="recent: 최근 스캔 순 상위 limit건, location_id: 전체 순회용 keyset 페이지네이션"
+    ),
+    cursor: Optional[str] = Query(None, description=f"이전 응답의 {NEXT_CURSOR_HEADER} 헤더 값 (location_id 순)"),
+    bbox: Optional[str] = Query(None, description="지도 뷰포트: minLng,minLat,maxLng,maxLat"),
+    near: Optional[str] = Query(None, description="반경 조회 기준점: lat,lng (거리순 정렬)"),
+    radius_m: float = Query(500, gt=0, le=MAX_RADIUS_M, description="near 기준 반경 (m)"),
     db: AsyncSession = Depends(get_db),
-) -> list[DrainageDataOut]:
-    """location_id당 최신 1건만 반환 (웹 지도 중복 마커 방지)."""
-    stmt = (
-        select(DrainageData)
-        .order_by(DrainageData.created_at.desc())
-        .limit(limit * 3)
-    )
-    result = await db.execute(stmt)
-    rows = result.scalars().all()
-    seen: set[str] = set()
-    out: list[DrainageDataOut] = []
-    for r in rows:
-        if r.location_id in seen:
-            continue
-        seen.add(r.location_id)
-        out.append(DrainageDataOut.model_validate(r))
-        if len(out) >= limit:
-            break
-    return out
+) -> Response:
+    """
+    location_id당 최신 1건만 반환 (웹 지도 중복 마커 방지). drainage_latest 인덱스 조회.
+    기본은 최근 스캔 순(created_at DESC, location_id DESC) 상위 limit건 (지도 첫 화면).
+    order=location_id 또는 cursor: keyset 페이지네이션 — 다음 페이지가 있으면 X-Next-Cursor 헤더를 cursor로 넘겨
+    이어서 조회 (OFFSET 없음). 정렬 키는 바뀌지 않는 location_id — 조회 도중 재스캔된 빗물받이도 건너뛰거나 두 번 나오지 않음.
+    bbox: 뷰포트 안의 빗물받이만 (격자 셀 인덱스), near+radius_m: 반경 내 가까운 순 (cursor 미지원).
+    ETag·Last-Modified 응답: If-None-Match로 다시 요청하면 데이터가 그대로일 때 DB 조회 없이 304.
+    """
+
+    async def build() -> Payload:
+        if near:
+            if cursor or bbox:
+                raise HTTPException(status_code=400, detail="near는 cursor/bbox와 함께 사용할 수 없습니다.")
+            lat, lng = _parse_near(near)
+            hits = await find_nearby(db, lat, lng, radius_m, limit)
+            return Payload(
+                [_out(row, round(distance, 1)) for row, distance in hits],
+                _last_modified([row for row, _ in hits]),
+            )
+
+        stmt = select(DrainageLatest)
+        if bbox:
+            try:
+                stmt = stmt.where(bbox_clause(BBox.parse(bbox)))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        paged = cursor is not None or order == "location_id"
+        if not paged:
+            stmt = stmt.order_by(DrainageLatest.created_at.desc(), DrainageLatest.location_id.desc())
+        else:
+            if cursor:
+                stmt = stmt.where(DrainageLatest.location_id > _decode_cursor(cursor))
+            stmt = stmt.order_by(DrainageLatest.location_id)
+        result = await db.execute(stmt.limit(limit + 1))
+        rows = result.scalars().all()
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            if paged:
+                headers[NEXT_CURSOR_HEADER] = _encode_cursor(rows[-1])
+        return Payload([_out(r) for r in rows], _last_modified(rows), headers)
+
+    key = f"list?limit={limit}&order={order}&cursor={cursor or ''}&bbox={bbox or ''}&near={near or ''}&radius_m={radius_m if near else ''}"
+    return await cached_response(request, key, build)
+
+
+@router.get("/tiles/{z}/{x}/{y}", response_model=DrainageTileOut)
+async def get_drainage_tile(
+    z: int,
+    x: int,
+    y: int,
+    db: AsyncSession = Depends(get_db),
+) -> DrainageTileOut:
+    """
+    줌아웃 지도용 타일 클러스터 (Web Mercator z/x/y).
+    셀별 개수·최대 CRI·평균 침수 확률·중심 좌표 — 빗물받이 수와 무관하게 응답 크기 일정.
+    """
+    if not (0 <= z <= MAX_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z):
+        raise HTTPException(status_code=400, detail="유효하지 않은 타일 좌표입니다.")
+    return DrainageTileOut.model_validate(await get_tile(db, z, x, y))
+
+
+@router.get("/search", response_model=list[DrainageSearchHit])
+async def search_drains(
+    q: str = Query(..., min_length=1, max_length=100, description="이름·주소 검색어 또는 location_id 접두어"),
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_LIMIT),
+    db: AsyncSession = Depends(get_db),
+) -> list[DrainageSearchHit]:
+    """
+    검색창 자동완성: 이름·주소 부분 일치(한글 bigram 전문 검색) + location_id 접두 일치, 관련도 순.
+    입력 중인 마지막 한 글자는 접두어로 처리 ("반포동 3" → "3…"으로 시작하는 번지).
+    """
+    return [DrainageSearchHit.model_validate(hit) for hit in await search_drainage(db, q, limit)]
+
+
+@router.get("/trends", response_model=list[DrainageTrendPoint])
+async def drainage_trends(
+    period: Literal["day", "week"] = Query("day"),
+    days: int = Query(30, ge=1, le=3660, description="최근 N일"),
+    location_id: Optional[str] = Query(None),
+    region: Optional[str] = Query(None, max_length=50, description="주소에 포함된 지역명 (예: 강남구)"),
+    db: AsyncSession = Depends(get_db),
+) -> list[DrainageTrendPoint]:
+    """
+    일/주 단위 쓰레기량·스캔 수·최대 CRI 추이. drain_rollup만 조회 (원본 스캔 이력을 읽지 않음).
+    마감된 날짜만 집계되므로 오늘(현지 기준)은 포함되지 않음.
+    """
+    today = local_today()
+    start = today - timedelta(days=days)
+    if period == "week":
+        start -= timedelta(days=start.weekday())  # 구간 첫 주 포함
+    rows = await get_trend(db, period, start, today + timedelta(days=1), location_id, region)
+    return [DrainageTrendPoint.model_validate(row) for row in rows]
+
+
+@router.get("/regions", response_model=list[RegionRiskOut])
+async def drainage_regions(
+    level: Literal["sigungu", "sido"] = Query("sigungu"),
+    sido: Optional[str] = Query(None, max_length=32, description="시도 한정 (예: 서울특별시)"),
+    db: AsyncSession = Depends(get_db),
+) -> list[RegionRiskOut]:
+    """
+    시군구(또는 시도)별 빗물받이 수·평균/최대 CRI·priority 1 개수·쓰레기 부피 합계, 평균 CRI 높은 순.
+    증분 유지되는 region_stats만 조회 (O(시군구 수)). 시군구 경계 파일이 없으면 빈 목록.
+    """
+    return [RegionRiskOut.model_validate(r) for r in await get_region_summaries(db, level, sido)]
 
 
 @router.get("/{location_id}", response_model=Optional[DrainageDataOut])
 async def get_drainage(
+    request: Request,
     location_id: str,
     db: AsyncSession = Depends(get_db),
-) -> Optional[DrainageDataOut]:
-    """특정 빗물받이의 최신 데이터 조회 (원본 + ML 분석)."""
-    stmt = (
-        select(DrainageData)
-        .where(DrainageData.location_id == location_id)
-        .order_by(DrainageData.created_at.desc())
-        .limit(1)
-    )
-    result = await db.execute(stmt)
-    row = result.scalar_one_or_none()
-    if not row:
-        return None
-    return DrainageDataOut.model_validate(row)
+) -> Response:
+    """특정 빗물받이의 최신 데이터 조회 (원본 + ML 분석). ETag·Last-Modified 조건부 GET 지원."""
+
+    async def build() -> Payload:
+        row = await get_latest(db, location_id)
+        if not row:
+            return Payload(None)
+        return Payload(_out(row), _last_modified([row]))
+
+    return await cached_response(request, f"location?{location_id}", build, location_id)
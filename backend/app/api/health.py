@@ -1,6 +1,14 @@
 """Health check."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.schemas import AnswerCacheMetrics, HttpCacheMetrics, LiveMetrics, MLQueueMetrics
+from app.services.answer_cache import answer_cache
+from app.services.http_cache import response_cache
+from app.services.live import live_hub
+from app.services.ml_queue import queue_metrics
 
 router = APIRouter(tags=["health"])
 
@@ -8,3 +16,27 @@ router = APIRouter(tags=["health"])
 @router.get("/health")
 async def health():
     return {"status": "ok", "service": "nova-storm-drain-backend"}
+
+
+@router.get("/health/ml-queue", response_model=MLQueueMetrics)
+async def ml_queue_health(db: AsyncSession = Depends(get_db)) -> MLQueueMetrics:
+    """ML 작업 큐 깊이·대기 시간(lag)·워커 처리 통계."""
+    return MLQueueMetrics.model_validate(await queue_metrics(db))
+
+
+@router.get("/health/answer-cache", response_model=AnswerCacheMetrics)
+async def answer_cache_health() -> AnswerCacheMetrics:
+    """Chat 응답 캐시 적중률·크기 (이 프로세스 기준)."""
+    return AnswerCacheMetrics.model_validate(answer_cache.metrics())
+
+
+@router.get("/health/http-cache", response_model=HttpCacheMetrics)
+async def http_cache_health() -> HttpCacheMetrics:
+    """조회 API 응답 캐시 적중률(200 재사용·304)·크기 (이 프로세스 기준)."""
+    return HttpCacheMetrics.model_validate(response_cache.metrics())
+
+
+@router.get("/health/live", response_model=LiveMetrics)
+async def live_health() -> LiveMetrics:
+    """지도 실시간 갱신 구독자 수·발행 통계 (이 프로세스 기준)."""
+    return LiveMetrics.model_validate(live_hub.metrics())
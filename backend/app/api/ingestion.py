@@ -1,19 +1,38 @@
 """Data Ingestion API: 모바일 앱 → 포인트 클라우드·스캔 데이터 수신.
 
 - 실시간 Ingestion: 앱에서 산출된 값(GPS 포함) POST /ingestion/drainage
+- 일괄 Ingestion: 교대 종료 후 스캔 수백 건 동기화 POST /ingestion/drainage/batch (JSON 배열 / NDJSON)
 - 위치 동기화: 앱에서 수집한 GPS를 last_measured_lat/lng에 우선 반영
-- 실시간성: 응답 즉시 반환, CRI/AI 분석은 BackgroundTasks로 처리
+- 실시간성: 응답 즉시 반환, CRI/AI 분석은 같은 트랜잭션에서 ML 작업 큐(ml_job)에 등록 → 워커가 처리
 """
 
-from fastapi import APIRouter, BackgroundTasks, Depends
+import json
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import async_session, get_db
-from app.models import DrainageData
-from app.schemas import IngestionRequest, IngestionResponse
-from app.services.ml_pipeline import trigger_ml_analysis
+from app.config import get_settings
+from app.database import get_db
+from app.schemas import (
+    IngestionBatchItemResult,
+    IngestionBatchResponse,
+    IngestionRequest,
+    IngestionResponse,
+)
+from app.services.drainage_latest import upsert_latest
+from app.services.ml_queue import enqueue_ml_jobs
+from app.services.scans import record_scans
 
 router = APIRouter(prefix="/ingestion", tags=["ingestion"])
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
 
 
 def _trash_vol_L(before: float | None, after: float | None) -> float | None:
@@ -22,44 +41,45 @@ def _trash_vol_L(before: float | None, after: float | None) -> float | None:
     return None
 
 
+def _row_values(body: IngestionRequest) -> dict[str, Any]:
+    """IngestionRequest → 스캔 기록 값 (record_scans 입력, 단건/배치 공용)."""
+    trash = _trash_vol_L(body.before_volume_L, body.after_volume_L)
+    volume = body.after_volume_L if body.after_volume_L is not None else body.volume_L
+    return {
+        "location_id": body.location_id,
+        # Master
+        "address": body.address,
+        "elevation_type": body.elevation_type,
+        "max_height_mm": body.max_height_mm,
+        "name": body.name,
+        # Session: GPS 우선 — 앱에서 보낸 좌표를 실측으로 저장
+        "lat": body.lat,
+        "lng": body.lng,
+        "last_measured_lat": body.lat,
+        "last_measured_lng": body.lng,
+        "cleaned_at": body.cleaned_at,
+        "defect_status": body.defect_status,
+        # 원본·Analytics
+        "volume_L": volume,
+        "trash_vol_L": trash,
+    }
+
+
 @router.post("/drainage", response_model=IngestionResponse)
 async def ingest_drainage_data(
     body: IngestionRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ) -> IngestionResponse:
     """
     앱에서 산출된 모든 값(GPS 포함) 수신.
     After - Before = 쓰레기 부피 산출, GPS 우선 정책으로 실측 좌표 갱신.
-    응답은 즉시 반환하고, CRI·AI 권장조치는 백그라운드에서 처리.
+    응답은 즉시 반환하고, CRI·AI 권장조치는 ML 작업 큐 워커가 처리.
     """
-    trash = _trash_vol_L(body.before_volume_L, body.after_volume_L)
-    volume = body.after_volume_L if body.after_volume_L is not None else body.volume_L
+    await upsert_latest(db, await record_scans(db, [_row_values(body)]))
 
-    row = DrainageData(
-        location_id=body.location_id,
-        # Master
-        address=body.address,
-        elevation_type=body.elevation_type,
-        max_height_mm=body.max_height_mm,
-        name=body.name,
-        # Session: GPS 우선 — 앱에서 보낸 좌표를 실측으로 저장
-        lat=body.lat,
-        lng=body.lng,
-        last_measured_lat=body.lat,
-        last_measured_lng=body.lng,
-        cleaned_at=body.cleaned_at,
-        defect_status=body.defect_status,
-        # 원본·Analytics
-        volume_L=volume,
-        trash_vol_L=trash,
-    )
-    db.add(row)
-    await db.flush()
-
-    # 실시간성: 응답 먼저 보내고, CRI/AI 분석은 백그라운드에서 수행
+    # 실시간성: 응답 먼저 보내고, CRI/AI 분석은 작업 큐에 등록 (스캔과 같은 트랜잭션으로 커밋)
     location_id = body.location_id
-    background_tasks.add_task(_run_ml_after_commit, location_id)
+    await enqueue_ml_jobs(db, [location_id])
 
     return IngestionResponse(
         ok=True,
@@ -68,10 +88,151 @@ async def ingest_drainage_data(
     )
 
 
-async def _run_ml_after_commit(location_id: str) -> None:
-    """새 세션을 열어 ML 분석 실행 (요청 세션은 이미 종료된 후 호출됨)."""
-    async with async_session() as session:
+async def _iter_batch_items(request: Request) -> AsyncIterator[tuple[int, Any]]:
+    """
+    요청 본문에서 (index, 원본 항목) 순회.
+    NDJSON은 수신되는 대로 한 줄씩 파싱(스트리밍), JSON은 배열 전체를 파싱.
+    파싱 실패한 줄은 항목 대신 ValueError를 넘겨 해당 항목만 실패 처리.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in NDJSON_CONTENT_TYPES:
+        index = 0
+        buf = b""
+        async for chunk in request.stream():
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    yield index, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield index, ValueError(f"JSON 파싱 실패: {e.msg}")
+                index += 1
+        if buf.strip():
+            try:
+                yield index, json.loads(buf)
+            except json.JSONDecodeError as e:
+                yield index, ValueError(f"JSON 파싱 실패: {e.msg}")
+        return
+
+    try:
+        payload = json.loads(await request.body())
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"JSON 파싱 실패: {e.msg}")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=422, detail="요청 본문은 IngestionRequest 배열이어야 합니다.")
+    for index, item in enumerate(payload):
+        yield index, item
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'body'}: {err['msg']}" for err in e.errors()
+    )
+
+
+async def _insert_chunk(
+    db: AsyncSession,
+    chunk: list[tuple[int, dict[str, Any]]],
+    results: list[IngestionBatchItemResult],
+) -> list[str]:
+    """
+    청크 단위 스캔 multi-row INSERT 1회 (+ 바뀐 기준 값 upsert, 최신 상태 upsert 각 1회).
+    SAVEPOINT로 감싸 실패 시 해당 청크만 롤백.
+    Returns: 저장된 location_id 목록.
+    """
+    if not chunk:
+        return []
+    try:
+        async with db.begin_nested():
+            await upsert_latest(db, await record_scans(db, [values for _, values in chunk]))
+    except Exception as e:
+        logger.exception("batch ingestion chunk insert failed (%d rows)", len(chunk))
+        results.extend(
+            IngestionBatchItemResult(
+                index=i, ok=False, location_id=values["location_id"], error=f"DB 저장 실패: {e.__class__.__name__}"
+            )
+            for i, values in chunk
+        )
+        return []
+    results.extend(
+        IngestionBatchItemResult(index=i, ok=True, location_id=values["location_id"]) for i, values in chunk
+    )
+    return [values["location_id"] for _, values in chunk]
+
+
+@router.post(
+    "/drainage/batch",
+    response_model=IngestionBatchResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": IngestionRequest.model_json_schema()},
+                },
+                "application/x-ndjson": {
+                    "schema": {"type": "string", "description": "줄마다 IngestionRequest JSON 1건"},
+                },
+            },
+        },
+    },
+)
+async def ingest_drainage_batch(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> IngestionBatchResponse:
+    """
+    현장 스캔 일괄 수신 (JSON 배열 또는 NDJSON 스트리밍).
+    항목별로 IngestionRequest 검증 → 청크당 multi-row INSERT 1회 →
+    고유 location_id별 ML 분석 작업 1건(중복 제거·큐에서 병합)을 등록.
+    일부 항목이 실패해도 배치 전체를 거부하지 않고 항목별 결과를 반환.
+    """
+    chunk_size = max(1, settings.ingestion_batch_chunk_size)
+    results: list[IngestionBatchItemResult] = []
+    chunk: list[tuple[int, dict[str, Any]]] = []
+    stored_ids: list[str] = []
+    now = datetime.utcnow()
+
+    async for index, item in _iter_batch_items(request):
+        if index >= settings.ingestion_batch_max_items:
+            raise HTTPException(
+                status_code=413,
+                detail=f"배치 항목은 최대 {settings.ingestion_batch_max_items}건입니다.",
+            )
+        if isinstance(item, ValueError):
+            results.append(IngestionBatchItemResult(index=index, ok=False, error=str(item)))
+            continue
         try:
-            await trigger_ml_analysis(session, location_id)
-        except Exception:
-            pass  # 로깅만 하고 앱에는 이미 성공 응답을 보냄
+            body = IngestionRequest.model_validate(item)
+        except ValidationError as e:
+            location_id = item.get("location_id") if isinstance(item, dict) else None
+            results.append(
+                IngestionBatchItemResult(
+                    index=index,
+                    ok=False,
+                    location_id=location_id if isinstance(location_id, str) else None,
+                    error=_validation_message(e),
+                )
+            )
+            continue
+        chunk.append((index, {**_row_values(body), "created_at": now}))
+        if len(chunk) >= chunk_size:
+            stored_ids += await _insert_chunk(db, chunk, results)
+            chunk = []
+    stored_ids += await _insert_chunk(db, chunk, results)
+
+    # 같은 location_id가 여러 번 스캔돼도 최신 레코드 기준 ML 분석은 1회면 충분
+    await enqueue_ml_jobs(db, stored_ids)
+
+    results.sort(key=lambda r: r.index)
+    accepted = sum(1 for r in results if r.ok)
+    return IngestionBatchResponse(
+        ok=accepted == len(results),
+        accepted=accepted,
+        rejected=len(results) - accepted,
+        results=results,
+    )
+
@@ -0,0 +1,142 @@
+"""지도 실시간 갱신 API: 빗물받이 변경 diff 푸시 (WebSocket, SSE 대체 경로).
+
+메시지 (JSON):
+- subscribed: 적용된 구독 범위 {"bbox": [minLng, minLat, maxLng, maxLat] | null, "districts": [...]}
+- diff: {"ts", "upsert": [지도 표시용 컬럼 행], "remove": [범위 밖으로 이동한 location_id]}
+- resync: 대량 변경·전송 지연으로 diff를 생략 → GET /drainage로 다시 조회
+- error: 잘못된 구독 변경 요청 (WebSocket, 연결 유지)
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any, Optional
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.config import get_settings
+from app.services.live import live_hub, parse_districts
+from app.services.spatial import BBox
+
+logger = logging.getLogger(__name__)
+router = APIRouter(tags=["live"])
+settings = get_settings()
+
+_BBOX_DESCRIPTION = "구독 범위(지도 뷰포트): minLng,minLat,maxLng,maxLat"
+_DISTRICT_DESCRIPTION = "구독 시군구 코드 (쉼표 구분, 예: 11680,11650). bbox와 함께 주면 어느 한 쪽에 속하면 전달"
+
+
+def _parse_filter(bbox: Any, district: Any) -> tuple[Optional[BBox], frozenset[str]]:
+    """쿼리 문자열 또는 WebSocket 메시지(bbox 숫자 배열 허용)의 구독 범위. 잘못되면 ValueError."""
+    if isinstance(bbox, (list, tuple)):
+        bbox = ",".join(str(v) for v in bbox)
+    if bbox is not None and not isinstance(bbox, str):
+        raise ValueError("bbox는 minLng,minLat,maxLng,maxLat 형식이어야 합니다.")
+    return (BBox.parse(bbox) if bbox else None), parse_districts(district)
+
+
+def _dumps(message: dict[str, Any]) -> str:
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+
+
+@router.websocket("/ws/drainage")
+async def drainage_ws(
+    websocket: WebSocket,
+    bbox: Optional[str] = Query(None, description=_BBOX_DESCRIPTION),
+    district: Optional[str] = Query(None, description=_DISTRICT_DESCRIPTION),
+) -> None:
+    """
+    빗물받이 변경 푸시 (수신·ML/강우 재계산 커밋 후 live_batch_window_ms 안에 전달).
+    지도 이동 시 {"type": "subscribe", "bbox": "..." | null, "district": "..." | [...]}를 보내 구독 범위 변경.
+    """
+    if not live_hub.running or live_hub.full:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    try:
+        sub_filter = _parse_filter(bbox, district)
+    except ValueError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+    await websocket.accept()
+    sub = live_hub.subscribe(*sub_filter)
+
+    async def send() -> None:
+        await websocket.send_text(_dumps(sub.describe()))
+        while (message := await sub.queue.get()) is not None:
+            await websocket.send_text(_dumps(message))
+        await websocket.close(code=status.WS_1001_GOING_AWAY)
+
+    async def receive() -> None:
+        while True:
+            try:
+                try:
+                    request = json.loads(await websocket.receive_text())
+                except json.JSONDecodeError:
+                    raise ValueError("메시지는 JSON이어야 합니다.")
+                if not isinstance(request, dict) or request.get("type") != "subscribe":
+                    raise ValueError('{"type": "subscribe", "bbox": ..., "district": ...} 형식만 지원합니다.')
+                sub.update(*_parse_filter(request.get("bbox"), request.get("district")))
+                sub.offer(sub.describe())
+            except ValueError as e:
+                sub.offer({"type": "error", "detail": str(e)})
+
+    tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        live_hub.unsubscribe(sub)
+        for task in tasks:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        # 연결 종료(WebSocketDisconnect, 닫힌 소켓 전송 RuntimeError)는 정상 종료
+        if isinstance(result, Exception) and not isinstance(result, (WebSocketDisconnect, RuntimeError)):
+            logger.error("live websocket failed: %r", result)
+
+
+def _sse(message: dict[str, Any]) -> str:
+    return f"event: {message['type']}\ndata: {_dumps(message)}\n\n"
+
+
+async def _sse_events(bbox: Optional[BBox], districts: frozenset[str]) -> AsyncIterator[str]:
+    # 응답 전송이 시작된 뒤 구독 (연결 종료 시 finally에서 해제)
+    sub = live_hub.subscribe(bbox, districts)
+    try:
+        yield "retry: 3000\n" + _sse(sub.describe())
+        while True:
+            try:
+                message = await asyncio.wait_for(sub.queue.get(), timeout=settings.live_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if message is None:
+                return
+            yield _sse(message)
+    finally:
+        live_hub.unsubscribe(sub)
+
+
+@router.get("/drainage/stream")
+async def drainage_stream(
+    bbox: Optional[str] = Query(None, description=_BBOX_DESCRIPTION),
+    district: Optional[str] = Query(None, description=_DISTRICT_DESCRIPTION),
+) -> StreamingResponse:
+    """
+    /ws/drainage의 Server-Sent Events 버전 (WebSocket을 쓸 수 없는 프록시·클라이언트용).
+    이벤트: subscribed, diff, resync. 구독 범위를 바꾸려면 새 쿼리로 다시 연결.
+    """
+    if not live_hub.running:
+        raise HTTPException(status_code=503, detail="실시간 갱신이 비활성화되어 있습니다.")
+    if live_hub.full:
+        raise HTTPException(status_code=503, detail="실시간 구독자 수가 최대입니다. 잠시 후 다시 연결하세요.")
+    try:
+        sub_filter = _parse_filter(bbox, district)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        _sse_events(*sub_filter),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
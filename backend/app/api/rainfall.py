@@ -0,0 +1,121 @@
+"""강우 예보 API: 격자 강우 파일 수신(재계산은 RainfallScheduler), 예보·점수 이력 조회."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import get_db
+from app.models import RainfallForecast, RainfallScore
+from app.schemas import RainfallForecastOut, RainfallScoreOut
+from app.services.rainfall import parse_forecast, store_forecast
+from app.services.scheduler import rainfall_scheduler
+
+router = APIRouter(prefix="/rainfall", tags=["rainfall"])
+settings = get_settings()
+
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+NETCDF_CONTENT_TYPES = ("application/x-netcdf", "application/netcdf", "application/x-hdf5")
+
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """DB 시각은 UTC naive — 시간대가 있는 입력은 UTC로 변환."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _format_from_content_type(request: Request) -> Optional[str]:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in CSV_CONTENT_TYPES:
+        return "csv"
+    if content_type in NETCDF_CONTENT_TYPES:
+        return "netcdf"
+    return None
+
+
+@router.post(
+    "/forecasts",
+    response_model=RainfallForecastOut,
+    status_code=202,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {
+                    "schema": {"type": "string", "description": "헤더 lat,lng,rain_mm — 행마다 격자 셀 중심 1개 (mm/h)"},
+                },
+                "application/x-netcdf": {"schema": {"type": "string", "format": "binary"}},
+            },
+        },
+    },
+)
+async def ingest_forecast(
+    request: Request,
+    fmt: Optional[Literal["csv", "netcdf"]] = Query(None, alias="format", description="미지정 시 Content-Type·파일 시그니처로 판별"),
+    variable: Optional[str] = Query(None, max_length=64, description="NetCDF 강우 변수명 (미지정 시 위도·경도 차원의 첫 변수)"),
+    source: Optional[str] = Query(None, max_length=128, description="예보 출처·파일명"),
+    issued_at: Optional[datetime] = Query(None, description="발표 시각 (기본 수신 시각)"),
+    valid_from: Optional[datetime] = Query(None, description="유효 시작 (기본 수신 시각)"),
+    valid_to: Optional[datetime] = Query(None, description="유효 종료 (기본 valid_from + rainfall_default_valid_hours)"),
+    db: AsyncSession = Depends(get_db),
+) -> RainfallForecastOut:
+    """
+    격자 강우 예보(CSV 긴 형식 / NetCDF, 셀 값은 시간당 강우량 mm/h) 저장 → 예보 버전(id) 발급, 202.
+    재계산은 리더 임대를 가진 RainfallScheduler가 실행 (이 워커의 스케줄러는 바로 깨움) —
+    적용 여부는 GET /rainfall/forecasts의 applied_at으로 확인.
+    """
+    max_bytes = settings.rainfall_max_upload_mb * 1024 * 1024
+    if int(request.headers.get("content-length") or 0) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"예보 파일은 최대 {settings.rainfall_max_upload_mb}MB입니다.")
+    data = await request.body()
+    if not data:
+        raise HTTPException(status_code=400, detail="요청 본문에 예보 파일이 없습니다.")
+    if len(data) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"예보 파일은 최대 {settings.rainfall_max_upload_mb}MB입니다.")
+
+    now = datetime.utcnow()
+    valid_from = _utc_naive(valid_from) or now
+    valid_to = _utc_naive(valid_to) or valid_from + timedelta(hours=settings.rainfall_default_valid_hours)
+    try:
+        grid = await asyncio.to_thread(parse_forecast, data, fmt or _format_from_content_type(request), variable)
+        forecast = await store_forecast(db, grid, _utc_naive(issued_at) or now, valid_from, valid_to, source)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await db.commit()
+    rainfall_scheduler.wake()
+    return RainfallForecastOut.model_validate(forecast)
+
+
+@router.get("/forecasts", response_model=list[RainfallForecastOut])
+async def list_forecasts(
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+) -> list[RainfallForecastOut]:
+    """최근 수신한 예보 목록 (적용·해제 시각 포함, 격자 값 제외)."""
+    result = await db.execute(
+        select(*[c for c in RainfallForecast.__table__.columns if c.name != "grid"])
+        .order_by(RainfallForecast.id.desc())
+        .limit(limit)
+    )
+    return [RainfallForecastOut.model_validate(dict(row)) for row in result.mappings().all()]
+
+
+@router.get("/scores/{location_id}", response_model=list[RainfallScoreOut])
+async def location_scores(
+    location_id: str,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+) -> list[RainfallScoreOut]:
+    """빗물받이별 강우 반영 점수 이력: 어느 예보 버전이 어떤 침수 확률·우선순위를 만들었는지 (최근 순)."""
+    result = await db.execute(
+        select(RainfallScore)
+        .where(RainfallScore.location_id == location_id)
+        .order_by(RainfallScore.computed_at.desc(), RainfallScore.id.desc())
+        .limit(limit)
+    )
+    return [RainfallScoreOut.model_validate(row) for row in result.scalars().all()]
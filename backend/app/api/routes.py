@@ -0,0 +1,78 @@
+"""청소 동선 최적화 API (크루별 방문 순서·도착 예정 시각)."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import get_db
+from app.schemas import CrewRouteOut, RouteOptimizeRequest, RouteOptimizeResponse, RouteStopOut
+from app.services.routing import Crew, RouteOptions, optimize_routes
+from app.services.spatial import BBox
+
+router = APIRouter(prefix="/routes", tags=["routes"])
+settings = get_settings()
+
+
+@router.post("/optimize", response_model=RouteOptimizeResponse)
+async def optimize(
+    payload: RouteOptimizeRequest,
+    db: AsyncSession = Depends(get_db),
+) -> RouteOptimizeResponse:
+    """
+    CRI 가중 다중 크루 경로: 크루 출발지·용량·근무 시간 안에서 위험도 높은 빗물받이를 최대한 방문하는 순서.
+    후보는 drainage_latest (location_ids 지정 또는 min_cri·bbox 조건, CRI 높은 순 max_candidates곳).
+    """
+    if payload.max_candidates > settings.route_max_candidates:
+        raise HTTPException(status_code=400, detail=f"max_candidates는 {settings.route_max_candidates} 이하여야 합니다.")
+    try:
+        bbox = BBox.parse(payload.bbox) if payload.bbox else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    crews = [
+        Crew(c.crew_id, c.start_lat, c.start_lng, c.capacity_L, c.max_stops, c.shift_minutes)
+        for c in payload.crews
+    ]
+    if len({c.crew_id for c in crews}) != len(crews):
+        raise HTTPException(status_code=400, detail="crew_id가 중복되었습니다.")
+    options = RouteOptions(
+        speed_kmh=payload.speed_kmh or settings.route_speed_kmh,
+        service_minutes=(
+            payload.service_minutes if payload.service_minutes is not None else settings.route_service_minutes
+        ),
+        return_to_start=payload.return_to_start,
+        time_budget_ms=(
+            payload.time_budget_ms if payload.time_budget_ms is not None else settings.route_time_budget_ms
+        ),
+    )
+    plan = await optimize_routes(
+        db, crews, options, payload.min_cri, payload.max_candidates, bbox, payload.location_ids
+    )
+    return RouteOptimizeResponse(
+        routes=[
+            CrewRouteOut(
+                crew_id=route.crew.crew_id,
+                stops=[
+                    RouteStopOut(
+                        location_id=stop.candidate.location_id,
+                        name=stop.candidate.name,
+                        address=stop.candidate.address,
+                        lat=stop.candidate.lat,
+                        lng=stop.candidate.lng,
+                        cri=stop.candidate.cri,
+                        priority_score=stop.candidate.priority_score,
+                        trash_vol_L=stop.candidate.trash_vol_L,
+                        arrival_min=stop.arrival_min,
+                        distance_from_prev_m=stop.distance_from_prev_m,
+                    )
+                    for stop in route.stops
+                ],
+                distance_m=route.distance_m,
+                duration_min=route.duration_min,
+                load_L=route.load_L,
+                weight=route.weight,
+            )
+            for route in plan.routes
+        ],
+        unassigned=[c.location_id for c in plan.unassigned],
+        stats=plan.stats,
+    )
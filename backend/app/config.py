@@ -11,6 +11,22 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./storm_drain.db"
+    db_profile: str = "auto"  # 엔진 프로필: auto(database_url로 선택) / sqlite / postgres / none(드라이버 기본값)
+
+    # SQLite 프로필: 연결마다 PRAGMA (WAL — 수신 중에도 읽기가 막히지 않음)
+    sqlite_synchronous: str = "NORMAL"  # WAL에서는 NORMAL도 DB 손상 없음 (전원 장애 시 마지막 커밋만 유실 가능)
+    sqlite_busy_timeout_ms: int = 5000  # 쓰기 잠금 대기 (즉시 "database is locked" 대신)
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size_mb: int = 256
+
+    # PostgreSQL 프로필 (asyncpg): 연결 풀 + prepared statement 캐시
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    pg_statement_cache_size: int = 256  # asyncpg 연결별 server-side prepared statement 캐시 (PgBouncer transaction 모드면 0)
+    pg_prepared_statement_cache_size: int = 256  # SQLAlchemy asyncpg 어댑터의 prepared statement 캐시
+    pg_command_timeout_seconds: Optional[float] = None
 
     # vLLM (Tailscale IP 필수)
     vllm_base_url: str = "http://100.x.x.x:8000/v1"
@@ -20,6 +36,103 @@ class Settings(BaseSettings):
     # Fallback & Timeout
     fallback_enabled: bool = True
     llm_timeout_seconds: int = 30
+    llm_max_retries: int = 2
+
+    # Chat 컨텍스트 검색 (질문 기반 조회 → 압축 표)
+    retrieval_token_budget: int = 800  # 컨텍스트 표의 프롬프트 토큰 상한 (근사치)
+
+    # Chat 응답 캐시 (정확 일치 + 임베딩 유사 일치, 데이터 버전 스탬프로 무효화)
+    answer_cache_enabled: bool = True
+    answer_cache_max_entries: int = 1000
+    answer_cache_ttl_seconds: float = 600.0
+    answer_cache_similarity_threshold: float = 0.85
+    answer_cache_embedding_model: Optional[str] = None  # 예: sentence-transformers 모델명 (미지정 시 문자 n-gram 해싱)
+
+    # 외부 HTTP 클라이언트 (앱 범위 재사용, app.core.clients)
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry_seconds: float = 30.0
+    http_connect_timeout_seconds: float = 5.0
+    http_timeout_seconds: float = 10.0  # 웹훅 등 LLM 외 요청
+    http2_enabled: bool = True  # h2 패키지가 있을 때만 적용
+
+    # Chat 오케스트레이션 단계별 마감시간 (초과 시 기본값으로 계속 진행)
+    chat_deadline_seconds: float = 60.0  # 요청 전체 — 각 단계 timeout은 남은 시간으로 제한
+    intent_stage_timeout_seconds: float = 5.0  # 로컬 분류 실패 시 LLM 분류 왕복 포함
+    context_stage_timeout_seconds: float = 3.0
+    tool_stage_timeout_seconds: float = 10.0  # 도구 호출 1건 (한 턴의 호출들은 동시 실행)
+    tool_max_rounds: int = 2  # 도구 호출 → 재요청 반복 상한 (마지막 재요청은 도구 없이 답변 강제)
+
+    # 로컬 Intent 분류 (규칙 → 경량 모델, 확신 없을 때만 LLM 분류)
+    intent_local_enabled: bool = True
+    intent_model_threshold: float = 0.6  # 모델 확률이 이 값 미만이면 LLM으로 분류
+
+    # Batch Ingestion (현장 스캔 일괄 동기화)
+    ingestion_batch_chunk_size: int = 200  # multi-row INSERT 1회당 행 수
+    ingestion_batch_max_items: int = 10000
+
+    # ML 작업 큐 (ml_job) 워커
+    ml_workers_enabled: bool = True
+    ml_worker_count: int = 2
+    ml_worker_batch_size: int = 100  # 워커가 한 번에 가져와 배치 스코어링하는 작업 수
+    ml_worker_poll_seconds: float = 5.0  # 신규 작업 알림이 없을 때 폴링 간격
+    ml_job_lease_seconds: int = 60  # running 작업 임대 시간 (워커 비정상 종료 시 회수)
+    ml_job_max_attempts: int = 5
+    ml_job_backoff_base_seconds: float = 2.0
+    ml_job_backoff_max_seconds: float = 300.0
+
+    # 주기 스케줄러 (미분석 스캔 catch-up, 리더 1개만 실행)
+    scheduler_enabled: bool = True
+    ml_catchup_interval_seconds: float = 60.0
+    ml_catchup_max_seconds_per_tick: float = 10.0  # tick당 최대 처리 시간
+    ml_catchup_grace_seconds: float = 30.0  # drain_scan.id 빈 구간을 처음 본 뒤 이만큼 기다렸다 넘어감 (늦게 커밋되는 트랜잭션 보호)
+
+    # 스캔 이력: 지난달 스캔 → 월별 파티션, 보존 기간, 일/주 rollup (scheduler_enabled, 리더 1개만 실행)
+    scan_history_interval_seconds: float = 3600.0
+    scan_history_max_seconds_per_tick: float = 60.0  # tick당 파티션 이동 최대 시간
+    scan_archive_batch_size: int = 5000  # 한 번에 이동·커밋하는 스캔 수
+    scan_retention_months: int = 24  # 원본 스캔 이력 보존 개월 (월 파티션 단위 DROP, 0이면 무기한)
+    rollup_daily_retention_days: int = 400  # 일별 rollup 보존 일수 (주별은 계속 보관, 0이면 무기한)
+    rollup_delay_seconds: float = 3600.0  # 하루가 끝나고 이만큼 지난 뒤 집계 (늦게 도착한 스캔 반영)
+    rollup_utc_offset_hours: int = 9  # rollup 날짜 경계 시간대 (KST)
+
+    # 청소 동선 최적화 (POST /routes/optimize, plan_cleaning_routes 도구)
+    route_max_candidates: int = 5000
+    route_time_budget_ms: int = 1000  # 구성 + 2-opt/Or-opt 개선 전체 기본 시간 예산 (요청마다 최대 10초)
+    route_speed_kmh: float = 20.0  # 크루 평균 이동 속도 (도심 차량)
+    route_service_minutes: float = 10.0  # 빗물받이 1곳 청소 시간
+    route_depot_lat: Optional[float] = None  # 도구 호출 시 출발지 (없으면 후보 중심)
+    route_depot_lng: Optional[float] = None
+
+    # 지역 집계 (GET /drainage/regions): 시군구 경계 GeoJSON, 전체 재집계 주기 (scheduler_enabled, 리더 1개만 실행)
+    district_boundaries_path: Optional[str] = None  # 기본 app/data/district_boundaries.geojson
+    region_stats_reconcile_interval_seconds: float = 3600.0
+
+    # 강우 예보 (POST /rainfall/forecasts): 격자 강우량으로 침수 확률·우선순위 재계산
+    # 예보 교체·만료 확인 주기 (scheduler_enabled, 리더 1개만 실행)
+    rainfall_check_interval_seconds: float = 300.0
+    rainfall_default_valid_hours: float = 6.0  # valid_to 미지정 시 예보 유효 시간
+    rainfall_max_upload_mb: int = 64
+    rainfall_max_grid_cells: int = 4_000_000
+    rainfall_recompute_chunk_size: int = 5000  # 재계산 1청크(읽기·executemany·커밋) 빗물받이 수
+    rainfall_history_days: int = 90  # 점수 이력·만료 예보 보존 일수 (0이면 무기한)
+
+    # 지도 실시간 갱신 (WebSocket /ws/drainage, SSE /drainage/stream): 변경 diff 푸시, 워커당 구독자 기준
+    live_enabled: bool = True
+    live_batch_window_ms: int = 200  # 이 구간의 변경 커밋을 모아 1회 조회·발행
+    live_max_diff_rows: int = 2000  # 한 구간 변경이 이보다 많으면 행 대신 resync (REST 재조회 요청)
+    live_resync_quiet_ms: int = 1000  # 대량 변경이 이만큼 멈추면 resync 발행
+    live_resync_max_delay_seconds: float = 5.0  # 대량 변경이 계속돼도 이 시간 안에는 resync 발행
+    live_max_subscribers: int = 1000
+    live_subscriber_queue_size: int = 64  # 구독자별 미전송 메시지 상한 (초과 시 resync로 대체)
+    live_max_districts: int = 50  # 구독 1건의 시군구 코드 수 상한
+    live_heartbeat_seconds: float = 20.0  # SSE keepalive 주석 간격 (프록시 유휴 연결 종료 방지)
+
+    # 조회 API 응답 캐시 (GET /drainage, /drainage/{location_id}): ETag·Last-Modified 조건부 GET, 워커별 LRU
+    http_cache_enabled: bool = True
+    http_cache_max_entries: int = 5000
+    http_cache_max_mb: int = 64  # 저장된 응답 바이트 합계 상한
+    http_cache_ttl_seconds: float = 5.0  # 다중 워커에서 다른 워커의 변경이 반영되는 최대 지연
 
     # Admin Alert
     admin_webhook_url: Optional[str] = None
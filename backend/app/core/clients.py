@@ -0,0 +1,86 @@
+"""앱 수명 동안 재사용하는 외부 HTTP 클라이언트 (vLLM용 AsyncOpenAI, 웹훅용 httpx).
+
+- lifespan에서 start/aclose → 요청마다 TCP/TLS 핸드셰이크 없이 keep-alive 연결 재사용
+- 연결 풀 한도·타임아웃은 Settings에서 조정
+- HTTP/2: http2_enabled이고 h2 패키지(httpx[http2])가 설치된 경우에만 사용 (TLS 엔드포인트에서 ALPN으로 협상)
+"""
+
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available(settings: Settings) -> bool:
+    return settings.http2_enabled and importlib.util.find_spec("h2") is not None
+
+
+class ClientRegistry:
+    """vLLM·웹훅 클라이언트 보관소. start 전에 접근하면 지연 생성 (스크립트 등 lifespan 밖 사용)."""
+
+    def __init__(self, settings: Optional[Settings] = None) -> None:
+        self.settings = settings or get_settings()
+        self._llm_http: Optional[httpx.AsyncClient] = None
+        self._openai: Optional[AsyncOpenAI] = None
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.settings.http_max_connections,
+            max_keepalive_connections=self.settings.http_max_keepalive_connections,
+            keepalive_expiry=self.settings.http_keepalive_expiry_seconds,
+        )
+
+    def _timeout(self, seconds: float) -> httpx.Timeout:
+        return httpx.Timeout(seconds, connect=self.settings.http_connect_timeout_seconds)
+
+    def start(self) -> None:
+        http2 = _http2_available(self.settings)
+        llm_timeout = self._timeout(self.settings.llm_timeout_seconds)
+        self._llm_http = httpx.AsyncClient(limits=self._limits(), timeout=llm_timeout, http2=http2)
+        self._openai = AsyncOpenAI(
+            base_url=self.settings.vllm_base_url,
+            api_key=self.settings.vllm_api_key or "not-needed",
+            timeout=llm_timeout,  # openai는 요청마다 자체 timeout을 지정하므로 함께 설정
+            max_retries=self.settings.llm_max_retries,
+            http_client=self._llm_http,
+        )
+        self._http = httpx.AsyncClient(
+            limits=self._limits(),
+            timeout=self._timeout(self.settings.http_timeout_seconds),
+            http2=http2,
+        )
+        logger.info("HTTP clients started (http2=%s)", http2)
+
+    async def aclose(self) -> None:
+        if self._openai is not None:
+            await self._openai.close()  # _llm_http도 함께 닫힘
+        if self._http is not None:
+            await self._http.aclose()
+        self._llm_http = self._openai = self._http = None
+
+    @property
+    def openai(self) -> AsyncOpenAI:
+        if self._openai is None:
+            self.start()
+        return self._openai
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self.start()
+        return self._http
+
+
+clients = ClientRegistry()
+
+
+def get_clients() -> ClientRegistry:
+    """FastAPI 의존성: 앱 범위 클라이언트 레지스트리."""
+    return clients
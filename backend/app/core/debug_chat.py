@@ -26,11 +26,13 @@ def debug_request(query: str, session_id: str | None = None) -> None:
     _debug_log.debug("-" * 60)
 
 
-def debug_intent(query: str, intent: str) -> None:
+def debug_intent(query: str, intent: str, source: str | None = None, confidence: float | None = None) -> None:
     """[2] Intent 분류 결과."""
     _debug_log.debug("[2] Intent Routing 결과")
     _debug_log.debug("    사용자 질문: %s", repr(query))
     _debug_log.debug("    분류된 Intent: %s", intent)
+    if source:
+        _debug_log.debug("    분류 경로: %s (confidence=%.2f)", source, confidence or 0.0)
     _debug_log.debug("-" * 60)
 
 
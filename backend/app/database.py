@@ -1,24 +1,161 @@
-"""비동기 DB 연결 및 세션."""
+"""비동기 DB 연결 및 세션.
+
+엔진 프로필 (settings.db_profile, auto면 database_url의 DB 종류로 선택):
+- sqlite: 연결마다 PRAGMA — WAL(수신 중에도 읽기 가능), synchronous=NORMAL, mmap/cache, busy_timeout.
+  파일 DB는 연결 풀 사용 (aiosqlite 기본 NullPool은 세션마다 연결·스레드를 새로 열고 PRAGMA를 반복)
+- postgres: asyncpg 드라이버 + 크기 지정 연결 풀·pre-ping + prepared statement 캐시
+- none: 드라이버 기본값
+"""
 
 from collections.abc import AsyncGenerator
+from typing import Any, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, inspect, make_url, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import get_settings
 from app.models import Base
 
 settings = get_settings()
-engine = create_async_engine(
-    settings.database_url,
-    echo=False,
-)
+
+DB_PROFILES = ("auto", "sqlite", "postgres", "none")
+
+
+def _sqlite_pragmas() -> list[str]:
+    return [
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}",  # 이후 PRAGMA도 잠금을 기다리도록 먼저
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}",  # 음수 = KiB 단위
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_mb) * 1024 * 1024}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def _resolve_profile(url: URL, profile: str) -> str:
+    if profile not in DB_PROFILES:
+        raise ValueError(f"알 수 없는 db_profile: {profile} (가능: {', '.join(DB_PROFILES)})")
+    backend = url.get_backend_name()
+    if profile == "auto":
+        if backend == "sqlite":
+            return "sqlite"
+        return "postgres" if backend in ("postgresql", "postgres") else "none"
+    if profile == "sqlite" and backend != "sqlite":
+        raise ValueError(f"db_profile=sqlite는 SQLite URL에만 적용됩니다: {backend}")
+    if profile == "postgres" and backend not in ("postgresql", "postgres"):
+        raise ValueError(f"db_profile=postgres는 PostgreSQL URL에만 적용됩니다: {backend}")
+    return profile
+
+
+def create_engine(database_url: Optional[str] = None, profile: Optional[str] = None) -> AsyncEngine:
+    """프로필을 적용한 비동기 엔진 생성 (앱 전역 engine, 스크립트·부하 테스트 공용)."""
+    url = make_url(database_url or settings.database_url)
+    profile = _resolve_profile(url, profile or settings.db_profile)
+    kwargs: dict[str, Any] = {"echo": False}
+
+    if profile == "postgres":
+        url = url.set(drivername="postgresql+asyncpg")
+        kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_pre_ping=True,
+            connect_args={
+                "statement_cache_size": settings.pg_statement_cache_size,
+                "prepared_statement_cache_size": settings.pg_prepared_statement_cache_size,
+                "command_timeout": settings.pg_command_timeout_seconds,
+                "server_settings": {"application_name": "storm-drain-backend"},
+            },
+        )
+
+    if profile == "sqlite" and url.database not in (None, "", ":memory:"):
+        kwargs.update(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+        )
+
+    new_engine = create_async_engine(url, **kwargs)
+
+    if profile == "sqlite":
+        pragmas = _sqlite_pragmas()
+
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, _record) -> None:
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return new_engine
+
+
+engine = create_engine()
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+def dialect_insert(session: AsyncSession):
+    """ON CONFLICT(upsert)를 지원하는 DB별 insert 생성자 (SQLite / PostgreSQL)."""
+    name = session.get_bind().dialect.name
+    if name == "postgresql":
+        return postgresql.insert
+    if name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"upsert 미지원 DB: {name}")
+
+
+def _add_missing_columns(sync_conn) -> None:
+    """create_all은 기존 테이블을 변경하지 않으므로, 새로 추가된 nullable 컬럼을 ALTER TABLE로 보강."""
+    inspector = inspect(sync_conn)
+    preparer = sync_conn.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            col_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.execute(
+                text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {col_type}")
+            )
+
+
+def _create_missing_indexes(sync_conn) -> None:
+    """create_all은 기존 테이블에 새로 추가된 인덱스를 만들지 않으므로 개별 생성."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 async def init_db() -> None:
-    """테이블 생성."""
+    """
+    테이블 생성 + 기존 drainage_data 분리 이관 + 최신 상태 projection(drainage_latest)·검색 색인 초기 backfill
+    + 시군구 미배정 행 배정·지역 집계(region_stats) 초기 재집계.
+    """
+    from app.services.drainage_latest import backfill_latest_if_empty
+    from app.services.legacy_migration import migrate_legacy_drainage_data
+    from app.services.regions import ensure_region_stats
+    from app.services.search import create_search_index, rebuild_search_index_if_empty
+    from app.services.spatial import fill_missing_geo_cells
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_create_missing_indexes)
+        await conn.run_sync(create_search_index)
+    async with async_session() as session:
+        await migrate_legacy_drainage_data(session)
+        await backfill_latest_if_empty(session)
+        await fill_missing_geo_cells(session)
+        await rebuild_search_index_if_empty(session)
+        await ensure_region_stats(session)
+        await session.commit()
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -8,15 +8,45 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import chat, drainage, health, ingestion
+from app.api import chat, drainage, health, ingestion, live, rainfall, routes
+from app.config import get_settings
+from app.core.clients import clients
 from app.database import init_db
+from app.services.intent_router import get_intent_model
+from app.services.live import live_hub
+from app.services.ml_queue import worker_pool
+from app.services.scheduler import (
+    ml_catchup_scheduler,
+    rainfall_scheduler,
+    region_stats_scheduler,
+    scan_history_scheduler,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    settings = get_settings()
     await init_db()
+    clients.start()
+    if settings.intent_local_enabled:
+        get_intent_model()  # 첫 질문이 학습 시간을 기다리지 않도록 미리 학습
+    if settings.ml_workers_enabled:
+        worker_pool.start()
+    if settings.live_enabled:
+        live_hub.start()
+    if settings.scheduler_enabled:
+        ml_catchup_scheduler.start()
+        scan_history_scheduler.start()
+        region_stats_scheduler.start()
+        rainfall_scheduler.start()
     yield
-    # cleanup if needed
+    await rainfall_scheduler.stop()
+    await region_stats_scheduler.stop()
+    await scan_history_scheduler.stop()
+    await ml_catchup_scheduler.stop()
+    await worker_pool.stop()
+    await live_hub.stop()
+    await clients.aclose()
 
 
 app = FastAPI(
@@ -32,11 +62,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[drainage.NEXT_CURSOR_HEADER, "ETag", "Last-Modified"],
 )
 
 app.include_router(ingestion.router)
 app.include_router(chat.router)
+app.include_router(live.router)  # /drainage/stream이 drainage의 /drainage/{location_id}보다 먼저 매칭되도록
 app.include_router(drainage.router)
+app.include_router(routes.router)
+app.include_router(rainfall.router)
 app.include_router(health.router)
 
 
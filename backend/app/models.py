@@ -1,15 +1,22 @@
 """DB 모델 - 실시간 관리를 위한 3분류 스키마 반영.
 
 [구조] Master / Session / Analytics
-- Master: 기준 데이터 (mgmt_id=location_id, address, elevation_type, max_height_mm)
-- Session: 스캔 시마다 생성 (GPS, cleaned_at, defect_status) → 앱 GPS 우선 시 last_measured_lat/lng 갱신
-- Analytics: 산출값 (trash_vol, cycle_days, CRI, AI 권장조치)
+- Master(drain_master): 기준 데이터 (mgmt_id=location_id, address, elevation_type, max_height_mm)
+- Session(drain_scan): 스캔 시마다 생성 (GPS, cleaned_at, defect_status, 측정 부피·trash_vol)
+  → 앱 GPS 우선 시 last_measured_lat/lng 갱신
+- Analytics(drain_analytics): 스캔별 ML 산출값 (cycle_days, CRI, AI 권장조치)
+  → cycle_days는 지점별 running state(drain_cycle_state)에서 증분 산출
+- drainage_latest: location_id당 최신 상태를 세 분류를 합친 1행으로 유지 (조회용 projection)
+- 스캔 이력: 마감된 달의 스캔은 월별 파티션(drain_scan_history)으로 이동, 추이는 drain_rollup (일/주)
+- 지역 집계: drainage_latest.district_code(시군구)별 위험 집계를 region_stats에 증분 유지
+- 강우 예보: 격자 강우량(rainfall_forecast)으로 침수 확률·우선순위 재계산, 예보별 점수 이력은 rainfall_score
+- 기존 통합 테이블 drainage_data는 app.services.legacy_migration이 init 시 분리·이관
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Float, Integer, String, Text
+from sqlalchemy import Date, DateTime, Float, Index, Integer, LargeBinary, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -17,37 +24,32 @@ class Base(DeclarativeBase):
     pass
 
 
-class DrainageData(Base):
-    """
-    빗물받이 데이터: Master + Session + Analytics 통합 테이블.
-    청소/스캔 1회 = 1레코드, 동일 location_id로 세션 누적.
-    """
-
-    __tablename__ = "drainage_data"
-
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    location_id: Mapped[str] = mapped_column(String(64), index=True, nullable=False)  # 관리번호(mgmt_id)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+class MasterFieldsMixin:
+    """Master: 변하지 않는 기준 데이터."""
 
-    # === Master: 변하지 않는 기준 데이터 ===
     address: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
     elevation_type: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)  # highland | lowland (고지/저지대)
     max_height_mm: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     name: Mapped[Optional[str]] = mapped_column(String(256), nullable=True)
 
-    # === Session: 스캔 시마다 생성·갱신 (GPS 우선 정책) ===
+
+class SessionFieldsMixin:
+    """Session: 스캔 시마다 생성 (GPS 우선 정책) + 스캔 시 측정값."""
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     lat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     lng: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     last_measured_lat: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 앱 실측 좌표 우선
     last_measured_lng: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     cleaned_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # 청소 일시
     defect_status: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # none | crack | subsidence | etc (구조적 결함)
-
-    # === 원본 수치 (스캔 시 측정값, Before/After 산출용) ===
     volume_L: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 측정 부피 (After 또는 단일)
+    trash_vol_L: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 쓰레기 부피 (After - Before, 수신 시 산출)
+
+
+class AnalyticsFieldsMixin:
+    """Analytics: ML 산출값 (포인트 클라우드 비교 후)."""
 
-    # === Analytics: 포인트 클라우드 비교 후 산출 ===
-    trash_vol_L: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 쓰레기 부피 (After - Before)
     cycle_days: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # 청소 주기(일)
     cri: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # CRI 수치 (저지대 가중치 반영)
     risk_reason: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # AI 권장조치
@@ -56,3 +58,223 @@ class DrainageData(Base):
     foot_traffic_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     damage_scale: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     ml_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class DrainageFieldsMixin(SessionFieldsMixin, MasterFieldsMixin, AnalyticsFieldsMixin):
+    """drainage_latest 평탄화 컬럼 (Master + Session + Analytics)."""
+
+
+class DrainMaster(MasterFieldsMixin, Base):
+    """Master: location_id(관리번호, mgmt_id)당 1행. 값이 바뀔 때만 갱신 (스캔마다 중복 저장하지 않음)."""
+
+    __tablename__ = "drain_master"
+
+    location_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class DrainScan(SessionFieldsMixin, Base):
+    """
+    Session: 청소/스캔 1회 = 1행 (append-only), 동일 location_id로 세션 누적.
+    기준 데이터·ML 산출값은 별도 테이블 → 수신 경로에서 쓰는 행이 좁음.
+    """
+
+    __tablename__ = "drain_scan"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    location_id: Mapped[str] = mapped_column(String(64), nullable=False)
+
+
+# location_id별 최신 스캔 조회 (WHERE location_id = ? ORDER BY created_at DESC) 및 전체 시간순 정렬용
+Index("ix_drain_scan_location_created", DrainScan.location_id, DrainScan.created_at.desc())
+Index("ix_drain_scan_created_at", DrainScan.created_at)
+
+
+class DrainAnalytics(AnalyticsFieldsMixin, Base):
+    """Analytics: 스캔별 ML 산출값 (drain_scan.id와 1:1). 재분석 시 이 행만 갱신."""
+
+    __tablename__ = "drain_analytics"
+
+    scan_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+
+
+class DrainRollup(Base):
+    """
+    location_id별 일/주 단위 스캔 집계 (app.services.scan_history가 마감된 날짜만 증분 생성).
+    추이 대시보드는 원본 스캔 대신 이 테이블을 읽음. period_start: 현지(rollup_utc_offset_hours) 날짜, 주는 월요일.
+    """
+
+    __tablename__ = "drain_rollup"
+    __table_args__ = (
+        # 지점별 추이: WHERE location_id = ? AND period = ? ORDER BY period_start
+        Index("ix_drain_rollup_location", "location_id", "period", "period_start"),
+    )
+
+    period: Mapped[str] = mapped_column(String(8), primary_key=True)  # day | week
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    location_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    trash_vol_L: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)  # 쓰레기 부피 합계
+    scan_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_cri: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_cleaned_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class DrainCycleState(Base):
+    """
+    location_id별 청소 주기 추정 running state (app.services.cycle_estimation).
+    새 스캔마다 이 1행만 읽고 갱신 — 스캔 이력을 다시 읽지 않음.
+    """
+
+    __tablename__ = "drain_cycle_state"
+
+    location_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_scan_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # 마지막으로 반영한 drain_scan.id
+    baseline_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # 누적 기준 시점 (직전 측정 또는 청소)
+    baseline_trash_vol_L: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 기준 시점의 쓰레기 부피 (청소 직후 0)
+    last_cleaned_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    clean_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # 관측한 청소 횟수
+    clean_interval_days: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 청소 간격 EWMA (일)
+    fill_rate_L_per_day: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 쓰레기 누적 속도 EWMA (L/일)
+    days_until_full: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 기준 시점부터 150 L 도달까지 예상 일수
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class RegionStats(Base):
+    """
+    시군구(district_code)별 위험 집계 1행 (app.services.regions가 drainage_latest 변경분으로 증분 갱신).
+    지역 대시보드·Chat 컨텍스트는 drainage_latest 대신 이 테이블만 읽음 — O(시군구 수).
+    """
+
+    __tablename__ = "region_stats"
+
+    district_code: Mapped[str] = mapped_column(String(16), primary_key=True)  # 시군구 코드 (sig_cd)
+    sido: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    sigungu: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    drain_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cri_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # CRI 산출된 빗물받이 수 (평균 분모)
+    cri_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    max_cri: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    priority1_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # priority_score == 1
+    trash_vol_L: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)  # 최신 스캔 쓰레기 부피 합계
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class RainfallForecast(Base):
+    """
+    강우 예보 격자 1건 (id = 예보 버전). 정규 위경도 격자의 셀 중심 강우량(mm/h)을 float32 배열로 보관.
+    applied_at이 있고 cleared_at이 없는 예보가 현재 점수에 반영 중인 예보 (app.services.rainfall).
+    """
+
+    __tablename__ = "rainfall_forecast"
+    __table_args__ = (Index("ix_rainfall_forecast_valid", "valid_to", "valid_from"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    source: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)  # 파일명·발표 기관 등
+    issued_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # 예보 발표 시각
+    valid_from: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    valid_to: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    lat0: Mapped[float] = mapped_column(Float, nullable=False)  # 첫 행·열 셀 중심 좌표
+    lng0: Mapped[float] = mapped_column(Float, nullable=False)
+    dlat: Mapped[float] = mapped_column(Float, nullable=False)  # 셀 간격 (도)
+    dlng: Mapped[float] = mapped_column(Float, nullable=False)
+    n_lat: Mapped[int] = mapped_column(Integer, nullable=False)
+    n_lng: Mapped[int] = mapped_column(Integer, nullable=False)
+    grid: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # float32 [n_lat, n_lng] 행 우선, NaN = 결측
+    max_rain_mm: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    mean_rain_mm: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    applied_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # 점수 재계산에 적용한 시각
+    cleared_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # 다른 예보로 교체·만료되어 해제된 시각
+
+
+class RainfallScore(Base):
+    """
+    예보 적용으로 바뀐 점수 이력 (append-only): 어떤 예보 버전이 어느 스캔의 침수 확률·우선순위를 만들었는지.
+    forecast_id가 NULL이면 예보 해제로 강우 없는 점수로 되돌린 행.
+    """
+
+    __tablename__ = "rainfall_score"
+    __table_args__ = (
+        Index("ix_rainfall_score_location", "location_id", "computed_at"),
+        Index("ix_rainfall_score_forecast", "forecast_id"),
+        Index("ix_rainfall_score_computed_at", "computed_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    forecast_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    location_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    scan_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    rain_mm: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)  # 지점 격자 셀의 시간당 강우량
+    flood_probability: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    priority_score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class DrainageLatest(DrainageFieldsMixin, Base):
+    """
+    location_id당 최신 상태 1행 (drain_master + 최신 drain_scan + drain_analytics의 materialized projection).
+    수신·ML 갱신 시 증분 upsert되며, 지도 목록·상세·ML·LLM 도구는 이 테이블을 읽음.
+    """
+
+    __tablename__ = "drainage_latest"
+    __table_args__ = (
+        # 최근 스캔 순 조회: ORDER BY created_at DESC, location_id DESC (지도 목록 기본 정렬, Chat 컨텍스트 "recent")
+        Index("ix_drainage_latest_created_location", "created_at", "location_id"),
+        # bbox/반경 조회: 격자 셀 범위 1차 필터
+        Index("ix_drainage_latest_geo_cell", "geo_cell_y", "geo_cell_x"),
+        # 지역 집계: 시군구별 최대 CRI 재계산 (app.services.regions)
+        Index("ix_drainage_latest_district_cri", "district_code", "cri"),
+        # 데이터 버전 스탬프: max(scan_id), max(ml_updated_at) (app.services.data_version)
+        Index("ix_drainage_latest_scan_id", "scan_id"),
+        Index("ix_drainage_latest_ml_updated_at", "ml_updated_at"),
+        # Chat 컨텍스트 검색: 위험도 순위·임계값 조회 (app.services.retrieval)
+        Index("ix_drainage_latest_cri", "cri"),
+        Index("ix_drainage_latest_flood", "flood_probability"),
+        Index("ix_drainage_latest_priority_cri", "priority_score", "cri"),
+    )
+
+    location_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    scan_id: Mapped[int] = mapped_column(Integer, nullable=False)  # 원본 drain_scan.id
+    # 공간 인덱스: GPS 우선 좌표의 격자 셀 (app.services.spatial.grid_cell)
+    geo_cell_y: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    geo_cell_x: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # 행정구역: GPS 우선 좌표가 속한 시군구 코드 (app.services.regions, 경계 밖·경계 미설정이면 NULL)
+    district_code: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    # 강우 보정: 현재 flood_probability·priority_score를 만든 예보와 지점 강우량 (예보 미적용이면 NULL)
+    forecast_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    forecast_rain_mm: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+
+class MLJob(Base):
+    """
+    ML 분석 작업 큐 (DB 영속). location_id당 1행으로 대기 작업을 병합(coalesce)하며,
+    재시작 후에도 남은 작업을 워커가 이어서 처리.
+    status: pending(대기) | running(처리 중, locked_until까지 임대) | failed(재시도 초과)
+    """
+
+    __tablename__ = "ml_job"
+    __table_args__ = (Index("ix_ml_job_status_available", "status", "available_at"),)
+
+    location_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending")
+    enqueued_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # 현재 대기 구간의 최초 요청 (lag 산출)
+    requested_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # 마지막 요청 (처리 중 재요청 감지)
+    available_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # 재시도 backoff 이후 처리 가능 시각
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+
+class SchedulerState(Base):
+    """
+    주기 작업 상태: 다중 uvicorn 워커 중 1개만 실행하도록 리더 임대(owner, lease_until)와
+    증분 처리 위치(high_water_id, 마지막으로 확인한 drain_scan.id)를 보관.
+    """
+
+    __tablename__ = "scheduler_state"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    owner: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    lease_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    high_water_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_run_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
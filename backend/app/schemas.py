@@ -1,6 +1,6 @@
 """API 요청/응답 스키마."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 from pydantic import BaseModel, Field, model_validator
@@ -43,16 +43,42 @@ class IngestionResponse(BaseModel):
     location_id: str
 
 
+class IngestionBatchItemResult(BaseModel):
+    """배치 항목별 처리 결과 (index = 요청 배열/NDJSON 줄 순서, 0부터)."""
+
+    index: int
+    ok: bool
+    location_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class IngestionBatchResponse(BaseModel):
+    """배치 수신 결과: 일부 항목 실패 시에도 나머지는 저장되고 항목별 결과를 반환."""
+
+    ok: bool
+    accepted: int
+    rejected: int
+    results: list[IngestionBatchItemResult]
+
+
 # === User Query (Chat / LLM) ===
 class ChatRequest(BaseModel):
     query: str = Field(..., description="사용자 질문")
     session_id: Optional[str] = None
 
 
+class ChatDebugInfo(BaseModel):
+    stage_timings_ms: dict[str, float] = Field(default_factory=dict, description="단계별 소요 시간 (intent, context, llm, tools, llm_followup, total)")
+    degraded_stages: list[str] = Field(default_factory=list, description="마감시간 초과/오류로 기본값을 사용한 단계")
+    cache: Optional[str] = Field(None, description="응답 캐시: exact / semantic / miss / bypass")
+
+
 class ChatResponse(BaseModel):
     answer: str
     intent: Optional[str] = None
+    intent_source: Optional[str] = Field(None, description="Intent 분류 경로: rule / model / llm / timeout")
     tools_used: Optional[list[str]] = None
+    debug: Optional[ChatDebugInfo] = None
 
 
 # === Drainage Data (DB ↔ API) ===
@@ -82,6 +108,203 @@ class DrainageDataOut(BaseModel):
     damage_scale: Optional[str] = None
     created_at: Optional[datetime] = None
     ml_updated_at: Optional[datetime] = None
+    # 강우 보정: 침수 확률·우선순위에 반영된 예보와 지점 강우량 (mm/h, 비가 오지 않으면 None)
+    forecast_id: Optional[int] = None
+    forecast_rain_mm: Optional[float] = None
+    # 반경 조회(near) 시에만: 기준점으로부터 거리 (m)
+    distance_m: Optional[float] = None
 
     class Config:
         from_attributes = True
+
+
+class DrainageSearchHit(BaseModel):
+    location_id: str
+    name: Optional[str] = None
+    address: Optional[str] = None
+    lat: Optional[float] = None  # GPS 우선 좌표
+    lng: Optional[float] = None
+    cri: Optional[int] = None
+    priority_score: Optional[int] = None
+    score: float  # 관련도 (어절 일치 점수, location_id 접두 일치는 100)
+
+    class Config:
+        from_attributes = True
+
+
+# === Map Tiles (줌아웃 클러스터) ===
+class TileClusterOut(BaseModel):
+    count: int
+    max_cri: Optional[int] = None
+    mean_flood_probability: Optional[float] = None
+    lat: float  # 클러스터 중심 (GPS 우선 좌표 평균)
+    lng: float
+
+
+class DrainageTileOut(BaseModel):
+    z: int
+    x: int
+    y: int
+    count: int
+    clusters: list[TileClusterOut]
+
+
+# === Trends (일/주 rollup) ===
+class DrainageTrendPoint(BaseModel):
+    period_start: date  # 일: 해당 날짜, 주: 월요일 (rollup_utc_offset_hours 기준 현지 날짜)
+    trash_vol_L: float  # 구간 내 스캔 쓰레기량 합계
+    scan_count: int
+    drains: int  # 스캔된 빗물받이 수
+    max_cri: Optional[int] = None
+    last_cleaned_at: Optional[datetime] = None
+
+
+# === Regions (시도·시군구 집계) ===
+class RegionRiskOut(BaseModel):
+    sido: str
+    sigungu: Optional[str] = None  # level=sido면 None
+    district_code: Optional[str] = None  # 시군구 코드 (sig_cd)
+    drain_count: int
+    mean_cri: Optional[float] = None  # CRI 산출된 빗물받이 평균
+    max_cri: Optional[int] = None
+    priority1_count: int  # priority_score == 1
+    trash_vol_L: float  # 최신 스캔 쓰레기 부피 합계
+
+    class Config:
+        from_attributes = True
+
+
+# === Route Optimization (청소 동선) ===
+class RouteCrewIn(BaseModel):
+    crew_id: str = Field(..., min_length=1, max_length=64)
+    start_lat: float = Field(..., ge=-90, le=90, description="출발지 위도")
+    start_lng: float = Field(..., ge=-180, le=180, description="출발지 경도")
+    capacity_L: float | None = Field(None, gt=0, description="수거 용량 (방문 지점 trash_vol_L 합)")
+    max_stops: int | None = Field(None, ge=1, description="최대 방문 수")
+    shift_minutes: float | None = Field(None, gt=0, description="근무 시간 (이동 + 청소, 분)")
+
+
+class RouteOptimizeRequest(BaseModel):
+    crews: list[RouteCrewIn] = Field(..., min_length=1, max_length=50)
+    location_ids: list[str] | None = Field(None, max_length=5000, description="후보 지정 (없으면 CRI 높은 순 조회)")
+    min_cri: int = Field(0, ge=0, le=100, description="후보 최소 CRI")
+    max_candidates: int = Field(1000, ge=1, description="후보 최대 수 (route_max_candidates 이하)")
+    bbox: str | None = Field(None, description="후보 영역: minLng,minLat,maxLng,maxLat")
+    speed_kmh: float | None = Field(None, gt=0, le=120, description="평균 이동 속도 (기본 route_speed_kmh)")
+    service_minutes: float | None = Field(None, ge=0, le=240, description="지점당 청소 시간 (기본 route_service_minutes)")
+    return_to_start: bool = True
+    time_budget_ms: int | None = Field(None, ge=100, le=10_000, description="구성 + 개선 전체 시간 예산 (기본 route_time_budget_ms)")
+
+
+class RouteStopOut(BaseModel):
+    location_id: str
+    name: Optional[str] = None
+    address: Optional[str] = None
+    lat: float
+    lng: float
+    cri: Optional[int] = None
+    priority_score: Optional[int] = None
+    trash_vol_L: Optional[float] = None
+    arrival_min: float  # 출발 후 도착까지 (분)
+    distance_from_prev_m: float
+
+
+class CrewRouteOut(BaseModel):
+    crew_id: str
+    stops: list[RouteStopOut]
+    distance_m: float
+    duration_min: float
+    load_L: float
+    weight: float  # 방문 지점 가중치 합 (CRI × priority 배수)
+
+
+class RouteOptimizeResponse(BaseModel):
+    routes: list[CrewRouteOut]
+    unassigned: list[str]  # 제약(용량·근무 시간·방문 수) 때문에 배정하지 못한 location_id
+    stats: dict[str, float]
+
+
+# === Rainfall Forecast (강우 예보 → 침수 확률 재계산) ===
+class RainfallForecastOut(BaseModel):
+    id: int  # 예보 버전
+    source: Optional[str] = None
+    issued_at: datetime
+    valid_from: datetime
+    valid_to: datetime
+    lat0: float  # 첫 셀 중심 (남서쪽)
+    lng0: float
+    dlat: float
+    dlng: float
+    n_lat: int
+    n_lng: int
+    max_rain_mm: Optional[float] = None  # 시간당 강우량 (mm/h)
+    mean_rain_mm: Optional[float] = None
+    created_at: Optional[datetime] = None
+    applied_at: Optional[datetime] = None
+    cleared_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class RainfallScoreOut(BaseModel):
+    forecast_id: Optional[int] = None
+    scan_id: int
+    rain_mm: float
+    flood_probability: Optional[float] = None
+    priority_score: Optional[int] = None
+    computed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# === ML Job Queue (운영 지표) ===
+class AnswerCacheMetrics(BaseModel):
+    entries: int
+    max_entries: int
+    hits_exact: int
+    hits_semantic: int
+    misses: int
+    stale: int  # 데이터 버전 변경·TTL 만료로 버려진 항목
+    evictions: int  # LRU 용량 초과로 밀려난 항목
+    stores: int
+    hit_rate: float
+
+
+class HttpCacheMetrics(BaseModel):
+    entries: int
+    max_entries: int
+    bytes: int  # 저장된 응답 본문 합계
+    max_bytes: int
+    hits: int  # 저장된 바이트로 200 응답 (DB 조회 없음)
+    not_modified: int  # If-None-Match/If-Modified-Since 일치로 304 (DB 조회 없음)
+    shared: int  # 같은 키를 조회 중이던 요청의 결과를 받아 응답 (DB 조회 없음)
+    misses: int
+    stale: int  # 버전 변경·TTL 만료로 버려진 항목
+    evictions: int  # LRU 용량 초과로 밀려난 항목
+    hit_rate: float
+
+
+class LiveMetrics(BaseModel):
+    running: bool
+    subscribers: int  # 이 프로세스의 WebSocket·SSE 구독자 수
+    pending: int  # 다음 발행을 기다리는 변경 location_id 수
+    overflows: int  # 느린 구독자 큐가 가득 차 resync로 대체된 횟수 (현재 구독자 합)
+    # 이하 이 프로세스 발행 누적 통계
+    batches: int
+    rows: int
+    resyncs: int  # 대량 변경으로 행 대신 보낸 resync 수
+
+
+class MLQueueMetrics(BaseModel):
+    pending: int
+    running: int
+    failed: int
+    oldest_lag_seconds: float  # 가장 오래 대기 중인 작업의 대기 시간
+    workers: int  # 이 프로세스에서 실행 중인 워커 수
+    # 이하 이 프로세스 워커의 누적 통계
+    processed: int
+    retried: int
+    exhausted: int  # 최대 재시도 초과로 failed 처리된 작업 수
+    batches: int
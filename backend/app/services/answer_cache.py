@@ -0,0 +1,240 @@
+"""Chat 응답 캐시: 반복 질문을 LLM 호출 없이 즉시 응답.
+
+- 정확 일치: 정규화 질문 키 LRU
+- 유사 일치: 질문 임베딩 코사인 유사도 ≥ answer_cache_similarity_threshold
+  (기본: 문자 n-gram 해싱 임베딩, answer_cache_embedding_model 지정 시 sentence-transformers CPU 모델)
+  location_id·숫자가 같은 질문끼리만 비교 → "AA-013"과 "AA-014", "CRI 80"과 "CRI 90"은 섞이지 않음
+- 유효성: 응답 생성 전에 읽은 데이터 버전 스탬프(app.services.data_version)를 조회 시 DB와 비교
+  · 질문이 지점만 지정(다른 조건 없음)하고 get_drainage_data만 사용: 해당 지점 버전
+  · 그 외 데이터 질문: 전체 버전 (어느 지점이든 수신·ML 갱신 시 무효)
+  · 도구 없이 답했고 프롬프트 컨텍스트에 DB 행도 없던 general 질문: TTL만 적용
+    (general이라도 컨텍스트에 빗물받이·지역 행이 들어갔으면 전체 버전 — "안녕, 제일 위험한 곳은?" 등)
+- 부수효과가 있는 응답(system_action, send_admin_alert)과 단계가 degraded된 응답은 캐시하지 않음
+"""
+
+import asyncio
+import logging
+import re
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.services.data_version import global_version, location_versions
+from app.services.intent_router import LOCATION_ID_PATTERN, char_ngrams, extract_location_ids, normalize
+from app.services.retrieval import parse_query
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+EMBEDDING_DIM = 4096
+SCOPED_TOOLS = {"get_drainage_data"}  # 질문에 지정된 지점만 읽는 도구
+UNCACHEABLE_TOOLS = {"send_admin_alert"}  # 부수효과가 있는 도구
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_TRAILING = re.compile(r"[\s?!.~…]+$")
+
+Embedder = Callable[[str], np.ndarray]
+
+
+def cache_key(query: str) -> str:
+    return _TRAILING.sub("", normalize(query))
+
+
+def _signature(query: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """유사 일치를 허용하는 질문 묶음: 언급된 location_id와 숫자가 모두 같아야 함."""
+    ids = tuple(sorted(lid.upper() for lid in extract_location_ids(query)))
+    numbers = tuple(sorted(_NUMBER.findall(LOCATION_ID_PATTERN.sub(" ", query))))
+    return ids, numbers
+
+
+def hashed_char_embedding(text: str) -> np.ndarray:
+    """문자 n-gram 해싱 임베딩 (L2 정규화, 외부 모델 불필요)."""
+    vec = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for gram in char_ngrams(text):
+        h = zlib.crc32(gram.encode("utf-8"))
+        vec[h % EMBEDDING_DIM] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def make_embedder(model_name: Optional[str]) -> Embedder:
+    if model_name:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            logger.warning("sentence-transformers not installed; answer cache uses hashed char n-gram embeddings")
+        else:
+            model = SentenceTransformer(model_name, device="cpu")
+            return lambda text: np.asarray(model.encode(text, normalize_embeddings=True), dtype=np.float32)
+    return hashed_char_embedding
+
+
+@dataclass(frozen=True)
+class CachedAnswer:
+    answer: str
+    intent: Optional[str]
+    intent_source: Optional[str]
+    tools_used: tuple[str, ...] = ()
+
+
+@dataclass
+class CacheTicket:
+    """캐시 미스 시 발급: 응답 생성 전에 읽은 버전 스탬프 (생성 중 갱신돼도 다음 조회에서 무효 처리)."""
+
+    key: str
+    signature: tuple
+    embedding: np.ndarray
+    location_ids: tuple[str, ...]
+    global_version: str
+    location_versions: dict[str, str]
+
+
+@dataclass
+class CacheLookup:
+    answer: Optional[CachedAnswer]
+    kind: str  # exact / semantic / miss
+    ticket: Optional[CacheTicket] = None
+
+
+@dataclass
+class _Entry:
+    answer: CachedAnswer
+    signature: tuple
+    embedding: np.ndarray
+    scope: str  # location / global / static
+    version: Any
+    expires_at: float
+    location_ids: tuple[str, ...] = field(default_factory=tuple)
+
+
+class AnswerCache:
+    """LRU + TTL 응답 캐시 (프로세스 로컬, 유효성은 DB 버전 스탬프로 검사)."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        similarity_threshold: float,
+        embed: Embedder,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.stats = {"hits_exact": 0, "hits_semantic": 0, "misses": 0, "stale": 0, "evictions": 0, "stores": 0}
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def _is_fresh(self, session: AsyncSession, key: str, entry: _Entry) -> bool:
+        if entry.expires_at <= time.monotonic():
+            fresh = False
+        elif entry.scope == "static":
+            fresh = True
+        elif entry.scope == "location":
+            fresh = await location_versions(session, entry.location_ids) == entry.version
+        else:
+            fresh = await global_version(session) == entry.version
+        if not fresh:
+            self._entries.pop(key, None)
+            self.stats["stale"] += 1
+        return fresh
+
+    def _hit(self, key: str, entry: _Entry, kind: str) -> CacheLookup:
+        self._entries.move_to_end(key)
+        self.stats[f"hits_{kind}"] += 1
+        return CacheLookup(entry.answer, kind)
+
+    async def lookup(self, session: AsyncSession, query: str) -> CacheLookup:
+        key = cache_key(query)
+        entry = self._entries.get(key)
+        if entry and await self._is_fresh(session, key, entry):
+            return self._hit(key, entry, "exact")
+
+        signature = _signature(query)
+        embedding = await asyncio.to_thread(self.embed, key)
+        candidates = [(k, e) for k, e in self._entries.items() if e.signature == signature]
+        if candidates:
+            sims = np.stack([e.embedding for _, e in candidates]) @ embedding
+            best = int(sims.argmax())
+            if sims[best] >= self.similarity_threshold:
+                best_key, best_entry = candidates[best]
+                if await self._is_fresh(session, best_key, best_entry):
+                    return self._hit(best_key, best_entry, "semantic")
+
+        self.stats["misses"] += 1
+        # 지점만 지정한 질문은 컨텍스트도 해당 지점뿐 (app.services.retrieval) → 지점 버전으로 범위 한정
+        filters = parse_query(query)
+        location_ids = () if filters.has_conditions else tuple(filters.location_ids)
+        return CacheLookup(
+            None,
+            "miss",
+            CacheTicket(
+                key=key,
+                signature=signature,
+                embedding=embedding,
+                location_ids=location_ids,
+                global_version=await global_version(session),
+                location_versions=await location_versions(session, location_ids),
+            ),
+        )
+
+    def store(
+        self,
+        ticket: CacheTicket,
+        answer: CachedAnswer,
+        degraded_stages: list[str],
+        context_rows: int,
+    ) -> bool:
+        """캐시 가능한 응답만 저장. context_rows: 답변 프롬프트에 담긴 DB 행 수. Returns: 저장 여부."""
+        tools = set(answer.tools_used)
+        if degraded_stages or answer.intent == "system_action" or tools & UNCACHEABLE_TOOLS:
+            return False
+        if ticket.location_ids and tools <= SCOPED_TOOLS:
+            scope, version = "location", ticket.location_versions
+        elif answer.intent == "general" and not tools and not context_rows:
+            scope, version = "static", None
+        else:
+            scope, version = "global", ticket.global_version
+
+        self._entries[ticket.key] = _Entry(
+            answer=answer,
+            signature=ticket.signature,
+            embedding=ticket.embedding,
+            scope=scope,
+            version=version,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            location_ids=ticket.location_ids,
+        )
+        self._entries.move_to_end(ticket.key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+        self.stats["stores"] += 1
+        return True
+
+    def metrics(self) -> dict[str, Any]:
+        hits = self.stats["hits_exact"] + self.stats["hits_semantic"]
+        lookups = hits + self.stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            **self.stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+answer_cache = AnswerCache(
+    max_entries=settings.answer_cache_max_entries,
+    ttl_seconds=settings.answer_cache_ttl_seconds,
+    similarity_threshold=settings.answer_cache_similarity_threshold,
+    embed=make_embedder(settings.answer_cache_embedding_model),
+)
@@ -0,0 +1,179 @@
+"""청소 주기 추정: 스캔 이력 기반 쓰레기 누적 속도 · 청소 간격 · 만수까지 남은 일수.
+
+- location_id별 running state(drain_cycle_state) 1행만 읽고 갱신 → 새 스캔당 O(1), 이력 재조회 없음
+- 누적 속도(L/일): 기준 시점(직전 측정 또는 청소 직후 0 L) 대비 trash_vol_L 증가량 ÷ 경과 일수의 EWMA
+  · 측정 후 같은 방문에서 청소(cleaned_at ≈ 스캔 시각): 측정값으로 표본을 만든 뒤 기준을 0 L로 재설정
+  · 스캔보다 앞선 청소 기록: 기준을 청소 시점 0 L로 먼저 재설정하고 표본
+  · 청소 기록 없이 감소(미기록 청소·측정 오차): 표본 없이 기준만 재설정
+- 청소 간격(일): 연속 cleaned_at 사이 간격의 EWMA
+- cycle_days: 기준 시점부터 TRASH_REFERENCE_L(150 L) 도달까지 예상 일수 (누적 속도를 모르면 None)
+- 최신 스캔만 분석하는 경로(ML 작업 큐)는 fill_gaps=True: 상태에 아직 반영하지 않은 사이 스캔을 함께 읽어 순서대로 반영
+  (각 스캔은 상태에 한 번만 반영 — 처음 보는 지점은 hot 테이블의 스캔으로 초기 상태 구성)
+- 이미 반영한 id 이하 스캔(재분석·늦게 처리된 이전 스캔)은 상태를 바꾸지 않고 현재 속도로만 예측
+"""
+
+import math
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import dialect_insert
+from app.models import DrainCycleState, DrainScan
+from app.services.ml_scoring import TRASH_REFERENCE_L
+
+EWMA_ALPHA = 0.3  # 새 표본 가중치 (최근 약 3~5회 스캔이 추정을 좌우)
+MIN_SAMPLE_DAYS = 1 / 24  # 이보다 짧은 간격은 같은 방문으로 보고 속도 표본에서 제외
+
+
+class ScanObservation(NamedTuple):
+    """상태 갱신 입력: drain_scan 1행의 필요한 컬럼 (ml_pipeline 조회 행도 같은 속성명)."""
+
+    id: int
+    location_id: str
+    created_at: Optional[datetime]
+    trash_vol_L: Optional[float]
+    cleaned_at: Optional[datetime]
+
+
+@dataclass
+class CycleState:
+    location_id: str
+    last_scan_id: int = 0
+    baseline_at: Optional[datetime] = None
+    baseline_trash_vol_L: Optional[float] = None
+    last_cleaned_at: Optional[datetime] = None
+    clean_count: int = 0
+    clean_interval_days: Optional[float] = None
+    fill_rate_L_per_day: Optional[float] = None
+    days_until_full: Optional[float] = None
+
+
+def _ewma(previous: Optional[float], sample: float) -> float:
+    return sample if previous is None else EWMA_ALPHA * sample + (1 - EWMA_ALPHA) * previous
+
+
+def _days(later: datetime, earlier: datetime) -> float:
+    return (later - earlier).total_seconds() / 86400
+
+
+def days_until_full(trash_vol_L: Optional[float], fill_rate_L_per_day: Optional[float]) -> Optional[float]:
+    """현재 쓰레기 부피에서 150 L 도달까지 예상 일수. 속도를 모르거나 0 이하면 None."""
+    if trash_vol_L is None or not fill_rate_L_per_day or fill_rate_L_per_day <= 0:
+        return None
+    return max(0.0, (TRASH_REFERENCE_L - trash_vol_L) / fill_rate_L_per_day)
+
+
+def to_cycle_days(days: Optional[float]) -> Optional[int]:
+    """drain_analytics.cycle_days(정수 일) 표현: 남은 일수 올림."""
+    return None if days is None else math.ceil(days)
+
+
+def advance(state: CycleState, scan: ScanObservation) -> None:
+    """스캔 1건을 running state에 반영 (O(1)). scan.id > state.last_scan_id일 때만 호출."""
+    scanned_at = scan.created_at or datetime.utcnow()
+    cleaned_at = scan.cleaned_at
+    new_cleaning = cleaned_at is not None and (state.last_cleaned_at is None or cleaned_at > state.last_cleaned_at)
+    if new_cleaning:
+        if state.last_cleaned_at is not None:
+            state.clean_interval_days = _ewma(state.clean_interval_days, _days(cleaned_at, state.last_cleaned_at))
+        state.clean_count += 1
+        state.last_cleaned_at = cleaned_at
+    cleaned_before_scan = new_cleaning and _days(scanned_at, cleaned_at) >= MIN_SAMPLE_DAYS
+    if cleaned_before_scan:
+        state.baseline_at, state.baseline_trash_vol_L = cleaned_at, 0.0
+
+    trash = scan.trash_vol_L
+    if trash is not None:
+        if state.baseline_at is None or state.baseline_trash_vol_L is None:
+            state.baseline_at, state.baseline_trash_vol_L = scanned_at, trash
+        else:
+            elapsed = _days(scanned_at, state.baseline_at)
+            if trash < state.baseline_trash_vol_L:
+                state.baseline_at, state.baseline_trash_vol_L = scanned_at, trash
+            elif elapsed >= MIN_SAMPLE_DAYS:
+                rate = (trash - state.baseline_trash_vol_L) / elapsed
+                state.fill_rate_L_per_day = _ewma(state.fill_rate_L_per_day, rate)
+                state.baseline_at, state.baseline_trash_vol_L = scanned_at, trash
+
+    if new_cleaning and not cleaned_before_scan:
+        state.baseline_at, state.baseline_trash_vol_L = max(cleaned_at, scanned_at), 0.0
+    state.days_until_full = days_until_full(state.baseline_trash_vol_L, state.fill_rate_L_per_day)
+    state.last_scan_id = scan.id
+
+
+async def _unapplied_scans(
+    session: AsyncSession,
+    states: dict[str, CycleState],
+    scans: Sequence[ScanObservation],
+) -> list[ScanObservation]:
+    """지점별로 상태에 반영된 id와 입력 스캔 id 사이의 스캔 (입력에 없는 것만)."""
+    upper: dict[str, int] = {}
+    for scan in scans:
+        upper[scan.location_id] = max(upper.get(scan.location_id, 0), scan.id)
+    given = {scan.id for scan in scans}
+    result = await session.execute(
+        select(DrainScan.id, DrainScan.location_id, DrainScan.created_at, DrainScan.trash_vol_L, DrainScan.cleaned_at)
+        .where(
+            or_(
+                *[
+                    and_(
+                        DrainScan.location_id == location_id,
+                        DrainScan.id > (states[location_id].last_scan_id if location_id in states else 0),
+                        DrainScan.id < scan_id,
+                    )
+                    for location_id, scan_id in upper.items()
+                ]
+            )
+        )
+    )
+    return [ScanObservation(*row) for row in result.all() if row.id not in given]
+
+
+async def advance_cycles(
+    session: AsyncSession,
+    scans: Sequence[ScanObservation],
+    fill_gaps: bool = False,
+) -> dict[int, Optional[int]]:
+    """
+    스캔 목록을 id 순으로 지점별 running state에 반영 (상태 PK 조회 1회 + 변경분 executemany upsert 1회).
+    fill_gaps: 입력에 없는 미반영 스캔도 읽어 반영 (지점별 최신 스캔만 넘기는 경로용).
+    Returns: 입력 scan id → cycle_days.
+    """
+    if not scans:
+        return {}
+    location_ids = list(dict.fromkeys(s.location_id for s in scans))
+    result = await session.execute(
+        select(*[DrainCycleState.__table__.c[name] for name in CycleState.__dataclass_fields__])
+        .where(DrainCycleState.location_id.in_(location_ids))
+    )
+    states = {row.location_id: CycleState(**row._mapping) for row in result.all()}
+    gaps = await _unapplied_scans(session, states, scans) if fill_gaps else []
+
+    changed: dict[str, CycleState] = {}
+    cycle_days: dict[int, Optional[int]] = {}
+    for scan in sorted([*scans, *gaps], key=lambda s: s.id):
+        state = states.setdefault(scan.location_id, CycleState(scan.location_id))
+        if scan.id > state.last_scan_id:
+            advance(state, scan)
+            changed[scan.location_id] = state
+            cycle_days[scan.id] = to_cycle_days(state.days_until_full)
+        else:
+            cycle_days[scan.id] = to_cycle_days(days_until_full(scan.trash_vol_L, state.fill_rate_L_per_day))
+
+    if changed:
+        now = datetime.utcnow()
+        table = DrainCycleState.__table__
+        stmt = dialect_insert(session)(table)
+        columns = [name for name in CycleState.__dataclass_fields__ if name != "location_id"] + ["updated_at"]
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.location_id],
+            set_={name: stmt.excluded[name] for name in columns},
+            # 동시에 같은 지점을 처리한 다른 워커가 더 최신 스캔을 이미 반영했으면 덮어쓰지 않음
+            where=table.c.last_scan_id < stmt.excluded.last_scan_id,
+        )
+        await session.execute(stmt, [{**asdict(state), "updated_at": now} for state in changed.values()])
+    return {scan.id: cycle_days[scan.id] for scan in scans}
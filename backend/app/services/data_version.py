@@ -0,0 +1,38 @@
+"""drainage_latest 데이터 버전 스탬프 (응답 캐시 등 파생 결과의 유효성 검사용).
+
+DB에서 직접 읽으므로 여러 uvicorn 워커·ML 워커가 갱신해도 프로세스 간 일관됨.
+- 지점 버전: (scan_id, ml_updated_at) — 새 스캔 upsert 또는 ML 재분석 시 바뀜
+- 전체 버전: (max(scan_id), max(ml_updated_at)) — 새 스캔 id는 항상 기존 최대보다 크고
+  ML 갱신 시각은 단조 증가하므로, 어느 지점이 바뀌어도 바뀜 (두 인덱스 끝값 조회)
+"""
+
+from collections.abc import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DrainageLatest
+
+
+def _stamp(scan_id, ml_updated_at) -> str:
+    return f"{scan_id or 0}:{ml_updated_at.isoformat() if ml_updated_at else '-'}"
+
+
+async def global_version(session: AsyncSession) -> str:
+    """전체 최신 상태 버전."""
+    max_scan = await session.scalar(select(func.max(DrainageLatest.scan_id)))
+    max_ml = await session.scalar(select(func.max(DrainageLatest.ml_updated_at)))
+    return _stamp(max_scan, max_ml)
+
+
+async def location_versions(session: AsyncSession, location_ids: Iterable[str]) -> dict[str, str]:
+    """지점별 버전. 아직 없는 지점은 '0:-' (이후 수신되면 바뀜)."""
+    ids = list(dict.fromkeys(location_ids))
+    if not ids:
+        return {}
+    result = await session.execute(
+        select(DrainageLatest.location_id, DrainageLatest.scan_id, DrainageLatest.ml_updated_at)
+        .where(DrainageLatest.location_id.in_(ids))
+    )
+    found = {lid: _stamp(scan_id, ml) for lid, scan_id, ml in result.all()}
+    return {lid: found.get(lid, _stamp(None, None)) for lid in ids}
@@ -0,0 +1,273 @@
+"""최신 상태 Projection: location_id당 1행(drainage_latest)을 증분 유지.
+
+- 수신(ingestion) 시 새 스캔 레코드를 upsert → 이력이 많은 지점이 있어도 지도 목록이 O(limit)
+- ML 갱신 시 해당 스캔이 여전히 최신이면 Analytics 컬럼만 반영
+- 기존 DB(프로젝션 도입 전)는 init 시 drain_scan(+ master·analytics)에서 1회 backfill
+- upsert 시 GPS 우선 좌표의 격자 셀(geo_cell_y/x)·시군구 코드(district_code)도 함께 계산 (공간 조회·지역 집계용)
+- 변경 전/후 행의 차이로 시군구별 집계(region_stats)를 같은 트랜잭션에서 증분 갱신 (app.services.regions)
+- 이름·주소가 바뀐 지점은 같은 트랜잭션에서 검색 색인(app.services.search)도 갱신
+- 변경된 location_id는 커밋 직후 등록된 리스너(타일 캐시 무효화 등)에 통지
+"""
+
+import logging
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import bindparam, event, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import dialect_insert
+from app.models import DrainAnalytics, DrainageLatest, DrainMaster, DrainScan
+from app.services.regions import REGION_COLUMNS, apply_region_deltas, locate_district, region_row
+from app.services.scans import ANALYTICS_FIELDS, MASTER_FIELDS, SCAN_FIELDS
+from app.services.search import index_locations
+from app.services.spatial import effective_coords, grid_cell
+
+# 스캔 기록(app.services.scans.record_scans 평탄화 dict) → drainage_latest 로 그대로 복사되는 컬럼
+# (id는 scan_id로 매핑)
+_PROJECTED_COLUMNS = [
+    c.name
+    for c in DrainageLatest.__table__.columns
+    if c.name in (*MASTER_FIELDS, *SCAN_FIELDS, *ANALYTICS_FIELDS)
+]
+# upsert 시 갱신되는 컬럼: 복사 컬럼 + 원본 스캔 id + 격자 셀 + 시군구 코드 + 강우 보정 출처 (새 스캔은 ML 분석 전까지 NULL)
+_UPSERT_COLUMNS = [
+    *_PROJECTED_COLUMNS, "scan_id", "geo_cell_y", "geo_cell_x", "district_code", "forecast_id", "forecast_rain_mm",
+]
+_COORD_COLUMNS = (
+    DrainageLatest.location_id,
+    DrainageLatest.lat,
+    DrainageLatest.lng,
+    DrainageLatest.last_measured_lat,
+    DrainageLatest.last_measured_lng,
+)
+
+logger = logging.getLogger(__name__)
+_PENDING_KEY = "drainage_latest_changes"
+
+
+@dataclass(frozen=True)
+class LatestChange:
+    """
+    커밋된 최신 상태 변경 1건. prev_* 는 변경 전 좌표·시군구
+    (지점 이동 시 이전 위치 캐시 무효화, 실시간 구독 범위에서 벗어난 지점 제거 통지용).
+    """
+
+    location_id: str
+    lat: Optional[float]
+    lng: Optional[float]
+    prev_lat: Optional[float] = None
+    prev_lng: Optional[float] = None
+    district_code: Optional[str] = None
+    prev_district_code: Optional[str] = None
+
+
+ChangeListener = Callable[[list[LatestChange]], None]
+_listeners: list[ChangeListener] = []
+
+
+def register_change_listener(listener: ChangeListener) -> None:
+    """drainage_latest 변경 커밋 시 호출될 리스너 등록 (동기 함수, 빠르게 반환해야 함)."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _mark_changed(session: AsyncSession, changes: Iterable[LatestChange]) -> None:
+    session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session: Session) -> None:
+    changes = session.info.pop(_PENDING_KEY, None)
+    if not changes:
+        return
+    for listener in _listeners:
+        try:
+            listener(changes)
+        except Exception:
+            logger.exception("drainage_latest change listener failed: %r", listener)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _change(row: Any, prev: Any = None) -> LatestChange:
+    """좌표 컬럼(_COORD_COLUMNS)·district_code를 가진 변경 후/전 행 → LatestChange."""
+    prev_coords = (
+        effective_coords(prev.lat, prev.lng, prev.last_measured_lat, prev.last_measured_lng)
+        if prev is not None else (None, None)
+    )
+    return LatestChange(
+        row.location_id,
+        *effective_coords(row.lat, row.lng, row.last_measured_lat, row.last_measured_lng),
+        *prev_coords,
+        district_code=row.district_code,
+        prev_district_code=prev.district_code if prev is not None else None,
+    )
+
+
+def _latest_values(scan: Mapping[str, Any]) -> dict[str, Any]:
+    values = {name: scan.get(name) for name in _PROJECTED_COLUMNS}
+    values["location_id"] = scan["location_id"]
+    values["scan_id"] = scan["id"]
+    lat, lng = effective_coords(
+        scan.get("lat"), scan.get("lng"), scan.get("last_measured_lat"), scan.get("last_measured_lng")
+    )
+    values["geo_cell_y"], values["geo_cell_x"] = grid_cell(lat, lng)
+    values["district_code"] = locate_district(lat, lng)
+    values["forecast_id"] = values["forecast_rain_mm"] = None
+    return values
+
+
+async def upsert_latest(session: AsyncSession, scans: Iterable[Mapping[str, Any]]) -> None:
+    """
+    새 스캔(record_scans 반환 dict, id 포함)을 최신 상태에 반영.
+    같은 location_id가 여러 건이면 created_at·id가 가장 큰 1건만 사용하고,
+    기존 최신보다 오래된 스캔(뒤늦게 도착한 동기화 등)은 덮어쓰지 않음.
+    """
+    newest: dict[str, Mapping[str, Any]] = {}
+    for scan in scans:
+        prev = newest.get(scan["location_id"])
+        if prev is None or (scan["created_at"], scan["id"]) >= (prev["created_at"], prev["id"]):
+            newest[scan["location_id"]] = scan
+    if not newest:
+        return
+
+    # 변경 전 행 잠금: 지역 집계 가감이 동시 갱신과 겹치지 않도록 (SQLite는 쓰기 자체가 직렬)
+    prev_rows = (
+        await session.execute(
+            select(*_COORD_COLUMNS, DrainageLatest.name, DrainageLatest.address, *REGION_COLUMNS)
+            .where(DrainageLatest.location_id.in_(newest))
+            .with_for_update()
+        )
+    ).all()
+    prev = {r.location_id: r for r in prev_rows}
+
+    table = DrainageLatest.__table__
+    stmt = dialect_insert(session)(table).values([_latest_values(s) for s in newest.values()])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.location_id],
+        set_={name: stmt.excluded[name] for name in _UPSERT_COLUMNS},
+        where=stmt.excluded.created_at >= table.c.created_at,
+    ).returning(*[table.c[c.key] for c in (*_COORD_COLUMNS, *REGION_COLUMNS)])
+    applied = (await session.execute(stmt)).all()
+    await apply_region_deltas(
+        session,
+        (region_row(prev[r.location_id]) for r in applied if r.location_id in prev),
+        (region_row(r) for r in applied),
+    )
+    await index_locations(
+        session,
+        (
+            r.location_id
+            for r in applied
+            if r.location_id not in prev
+            or (prev[r.location_id].name, prev[r.location_id].address)
+            != (newest[r.location_id].get("name"), newest[r.location_id].get("address"))
+        ),
+    )
+    _mark_changed(session, (_change(r, prev.get(r.location_id)) for r in applied))
+
+
+async def _lock_current(
+    session: AsyncSession,
+    scan_ids: Mapping[str, int],
+) -> list[Any]:
+    """ML 반영 대상 행 잠금 조회: 분석한 스캔이 아직 최신인 location_id만 (좌표 + 지역 집계 컬럼)."""
+    result = await session.execute(
+        select(*_COORD_COLUMNS, DrainageLatest.scan_id, *REGION_COLUMNS)
+        .where(DrainageLatest.location_id.in_(scan_ids))
+        .with_for_update()
+    )
+    return [r for r in result.all() if scan_ids[r.location_id] == r.scan_id]
+
+
+def _with_values(row: Any, values: Mapping[str, Any]) -> Any:
+    """잠금 조회 행에 ML 산출값을 덮어쓴 변경 후 지역 집계 행."""
+    return region_row(row)._replace(**{k: values[k] for k in ("cri", "priority_score") if k in values})
+
+
+async def update_latest_analytics(
+    session: AsyncSession,
+    location_id: str,
+    scan_id: int,
+    values: Mapping[str, Any],
+) -> None:
+    """ML 산출값 반영 — 분석한 스캔이 아직 최신일 때만 (그 사이 새 스캔이 오면 무시)."""
+    await update_latest_analytics_many(session, [{"location_id": location_id, "scan_id": scan_id, **values}])
+
+
+async def update_latest_analytics_many(
+    session: AsyncSession,
+    rows: Sequence[Mapping[str, Any]],
+) -> None:
+    """
+    배치 ML 산출값 반영: {"location_id", "scan_id", ...Analytics 컬럼} 목록을 executemany 1회로 UPDATE.
+    분석한 스캔이 아직 최신인 location_id만 갱신됨.
+    """
+    if not rows:
+        return
+    current = await _lock_current(session, {r["location_id"]: r["scan_id"] for r in rows})
+    if not current:
+        return
+    by_location = {r["location_id"]: r for r in rows}
+    table = DrainageLatest.__table__
+    columns = [k for k in rows[0] if k not in ("location_id", "scan_id")]
+    stmt = (
+        update(table)
+        .where(table.c.location_id == bindparam("b_location_id"), table.c.scan_id == bindparam("b_scan_id"))
+        .values({c: bindparam(f"b_{c}") for c in columns})
+    )
+    await session.execute(stmt, [{f"b_{k}": v for k, v in by_location[r.location_id].items()} for r in current])
+    await apply_region_deltas(
+        session,
+        (region_row(r) for r in current),
+        (_with_values(r, by_location[r.location_id]) for r in current),
+    )
+    _mark_changed(session, (_change(r) for r in current))
+
+
+async def get_latest(session: AsyncSession, location_id: str) -> Optional[DrainageLatest]:
+    """location_id의 최신 상태 1행 (PK 조회)."""
+    result = await session.execute(
+        select(DrainageLatest).where(DrainageLatest.location_id == location_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def backfill_latest_if_empty(session: AsyncSession) -> int:
+    """
+    drainage_latest가 비어 있으면 location_id별 최신 drain_scan 1건(+ 기준 값·산출값)으로 채움.
+    Returns: backfill된 행 수.
+    """
+    if await session.scalar(select(func.count()).select_from(DrainageLatest)):
+        return 0
+    ranked = select(
+        DrainScan,
+        func.row_number()
+        .over(
+            partition_by=DrainScan.location_id,
+            order_by=(DrainScan.created_at.desc(), DrainScan.id.desc()),
+        )
+        .label("rn"),
+    ).subquery()
+    sources = {
+        **{name: DrainMaster.__table__.c[name] for name in MASTER_FIELDS},
+        **{name: ranked.c[name] for name in SCAN_FIELDS},
+        **{name: DrainAnalytics.__table__.c[name] for name in ANALYTICS_FIELDS},
+    }
+    source = (
+        select(ranked.c.location_id, ranked.c.id, *[sources[name] for name in _PROJECTED_COLUMNS])
+        .select_from(ranked)
+        .outerjoin(DrainMaster, DrainMaster.location_id == ranked.c.location_id)
+        .outerjoin(DrainAnalytics, DrainAnalytics.scan_id == ranked.c.id)
+        .where(ranked.c.rn == 1)
+    )
+    result = await session.execute(
+        insert(DrainageLatest).from_select(["location_id", "scan_id", *_PROJECTED_COLUMNS], source)
+    )
+    return result.rowcount or 0
@@ -0,0 +1,255 @@
+"""조회 API 응답 캐시: 직렬화된 응답 바이트 LRU + 강한 ETag / Last-Modified 조건부 GET (GET /drainage, /drainage/{location_id}).
+
+- 버전 카운터: drainage_latest 변경 커밋 통지(register_change_listener)마다 해당 지점 카운터와 전체 카운터 증가
+  (수신 upsert·ML 갱신·강우 재계산 모두 같은 통지 경로)
+- 캐시 항목: 경로·쿼리 → 응답 바이트(orjson)·ETag·Last-Modified·추가 헤더 + 생성 시점 버전.
+  목록은 전체 버전, 단건은 해당 지점 버전이 그대로일 때만 유효 (DB 조회 중 커밋된 변경이 있으면 저장하지 않음)
+- If-None-Match / If-Modified-Since가 유효한 항목과 맞으면 DB 조회·직렬화 없이 304, 아니면 저장된 바이트를 그대로 응답
+- 같은 키의 동시 miss는 조회 1회를 공유 (변경 직후 폴링 클라이언트가 한꺼번에 DB를 조회하지 않도록)
+- ETag는 본문 바이트 해시 → 워커·재시작과 무관하게 같은 응답이면 같은 값 (다른 워커가 발급한 ETag도 재검증됨)
+- 워커별 캐시이므로 다른 워커의 변경은 http_cache_ttl_seconds 안에 재조회로 반영 (타일 캐시와 같은 방식)
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.config import get_settings
+from app.services.drainage_latest import LatestChange, register_change_listener
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json (느리지만 같은 본문)
+    orjson = None
+
+settings = get_settings()
+
+CACHE_CONTROL = "no-cache"  # 클라이언트는 저장하되 매번 재검증 (폴링 → 대부분 304)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"JSON 직렬화 불가: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """응답 본문 직렬화 (FastAPI 기본 JSONResponse와 같은 compact 형식, 날짜는 ISO 8601)."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode()
+
+
+def _http_date(value: datetime) -> str:
+    """DB 시각(UTC naive) → HTTP-date."""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+@dataclass(frozen=True)
+class Payload:
+    """캐시에 저장할 응답 원본: JSON 직렬화 가능한 본문 + Last-Modified 기준 시각 + 추가 헤더."""
+
+    content: Any
+    last_modified: Optional[datetime] = None
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime]
+    headers: tuple[tuple[str, str], ...]
+    location_id: Optional[str]  # None이면 목록 (전체 버전 기준)
+    version: int
+    stored_at: float
+
+    def _headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = _http_date(self.last_modified)
+        return headers
+
+    def not_modified(self, request: Request) -> bool:
+        """조건부 GET 판정: If-None-Match(약한 비교) 우선, 없을 때만 If-Modified-Since (초 단위)."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                return False
+            return self.last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+        return False
+
+    def response(self, request: Request) -> Response:
+        if self.not_modified(request):
+            return Response(status_code=304, headers=self._headers())
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers={**self._headers(), **dict(self.headers)},
+        )
+
+
+def serialize(payload: Payload, location_id: Optional[str] = None, version: int = 0) -> CachedResponse:
+    """응답 원본 → 본문 바이트 + 강한 ETag(본문 해시)."""
+    body = dumps(payload.content)
+    return CachedResponse(
+        body=body,
+        etag='"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"',
+        last_modified=payload.last_modified,
+        headers=tuple(payload.headers.items()),
+        location_id=location_id,
+        version=version,
+        stored_at=time.monotonic(),
+    )
+
+
+class ResponseCache:
+    """키 → 직렬화된 응답. LRU(항목 수·바이트 상한) + TTL, 변경 통지 기반 버전 무효화."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self.global_version = 0
+        self._location_versions: dict[str, int] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "not_modified": 0, "misses": 0, "shared": 0, "stale": 0, "evictions": 0}
+
+    def version(self, location_id: Optional[str]) -> int:
+        if location_id is None:
+            return self.global_version
+        return self._location_versions.get(location_id, 0)
+
+    def on_changes(self, changes: list[LatestChange]) -> None:
+        self.global_version += 1
+        for change in changes:
+            self._location_versions[change.location_id] = self._location_versions.get(change.location_id, 0) + 1
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if (
+            entry.version != self.version(entry.location_id)
+            or time.monotonic() - entry.stored_at > self.ttl_seconds
+        ):
+            self._remove(key)
+            self.stats["stale"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: str, entry: CachedResponse) -> None:
+        """저장. 조회 시작(entry.version) 이후 변경이 커밋됐으면 저장하지 않음 (그 응답은 이번 요청에만 사용)."""
+        if entry.version != self.version(entry.location_id) or len(entry.body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._bytes += len(entry.body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    async def build_once(
+        self,
+        key: str,
+        location_id: Optional[str],
+        build: Callable[[], Awaitable[Payload]],
+    ) -> CachedResponse:
+        """miss 처리: 같은 키를 이미 조회 중이면 그 결과를 기다리고, 아니면 조회·직렬화 후 저장."""
+        waiter = self._inflight.get(key)
+        if waiter is not None:
+            try:
+                entry = await asyncio.shield(waiter)
+                self.stats["shared"] += 1
+                return entry
+            except asyncio.CancelledError:
+                if not waiter.cancelled():
+                    raise
+                # 먼저 조회하던 요청이 취소됨 (클라이언트 연결 종료) → 직접 조회
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            version = self.version(location_id)
+            entry = serialize(await build(), location_id, version)
+            self.store(key, entry)
+            future.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:  # 잘못된 요청(HTTPException 400 등)은 기다리던 요청에도 같은 오류
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 "never retrieved" 경고가 나지 않도록
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _remove(self, key: str) -> None:
+        self._bytes -= len(self._entries.pop(key).body)
+
+    def clear(self) -> None:
+        self.global_version += 1
+        self._entries.clear()
+        self._bytes = 0
+
+    def metrics(self) -> dict[str, Any]:
+        served = self.stats["hits"] + self.stats["not_modified"] + self.stats["shared"] + self.stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            **self.stats,
+            "hit_rate": round((served - self.stats["misses"]) / served, 4) if served else 0.0,
+        }
+
+
+response_cache = ResponseCache(
+    max_entries=settings.http_cache_max_entries,
+    max_bytes=settings.http_cache_max_mb * 1024 * 1024,
+    ttl_seconds=settings.http_cache_ttl_seconds,
+)
+register_change_listener(response_cache.on_changes)
+
+
+async def cached_response(
+    request: Request,
+    key: str,
+    build: Callable[[], Awaitable[Payload]],
+    location_id: Optional[str] = None,
+) -> Response:
+    """
+    캐시 우선 응답. 유효한 항목이 있으면 DB 조회 없이 200(저장된 바이트) 또는 304,
+    없으면 build()로 조회(같은 키 동시 요청은 1회 공유) → 직렬화·저장 후 응답.
+    location_id를 주면 그 지점 버전, 아니면 전체 버전으로 무효화.
+    """
+    if not settings.http_cache_enabled:
+        return serialize(await build()).response(request)
+    entry = response_cache.get(key)
+    if entry is None:
+        entry = await response_cache.build_once(key, location_id, build)
+    else:
+        response_cache.stats["not_modified" if entry.not_modified(request) else "hits"] += 1
+    return entry.response(request)
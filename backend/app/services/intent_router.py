@@ -0,0 +1,180 @@
+"""로컬 Intent 분류: 규칙(키워드/정규식) → 경량 모델(문자 n-gram TF-IDF + 로지스틱 회귀) → LLM.
+
+- 규칙이 한 Intent로만 일치하면 즉시 결정 (source="rule")
+- 아니면 CPU 모델 확률이 intent_model_threshold 이상일 때 결정 (source="model")
+- 둘 다 확신이 없을 때만 LLM 분류 왕복 (source="llm", llm_orchestrator.classify_intent)
+- 모델은 app/data/intent_train.jsonl로 프로세스 시작 시 학습 (수십 ms, scikit-learn 불필요)
+"""
+
+import json
+import re
+import unicodedata
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.config import get_settings
+
+settings = get_settings()
+
+INTENTS = ("data_analysis", "system_action", "general")
+TRAIN_PATH = Path(__file__).resolve().parent.parent / "data" / "intent_train.jsonl"
+
+NGRAM_RANGE = (1, 3)
+
+# location_id (예: AA-013). 정규화(소문자) 텍스트와 원문 모두에 적용
+LOCATION_ID_PATTERN = re.compile(r"(?<![A-Za-z0-9])[A-Za-z]{2,4}-\d{1,6}(?!\d)")
+
+_RULES: dict[str, tuple[re.Pattern, ...]] = {
+    "system_action": (
+        re.compile(r"(알림|알람|메시지|문자|메일|경보|경고|공지|보고서?|웹훅).{0,12}(보내|전송|발송|전달|띄워)"),
+        re.compile(r"(차트|그래프).{0,8}(만들|생성|그려|그리|보여|로)"),
+        re.compile(r"시각화"),
+        re.compile(r"(출동|청소팀|현장팀|담당자).{0,8}(보내|요청|지시|호출)"),
+    ),
+    "data_analysis": (
+        LOCATION_ID_PATTERN,
+        re.compile(r"\d+\s*번\s*(빗물받이|지점)"),
+        re.compile(r"\d+\s*(이상|이하|초과|미만|넘)"),
+        re.compile(r"(top\s*\d+|상위|순위|목록|현황|통계|평균|총량|몇\s*(개|곳))"),
+        # 위험도·순위 질문 ("제일 위험한 곳 어디야", "가장 높은 지점")
+        re.compile(r"(제일|가장|젤)\s*\S*(위험|높|많|심|막힌|찬)"),
+        re.compile(r"위험.{0,8}(곳|지점|빗물받이|어디)"),
+    ),
+    "general": (
+        # 인사만 있는 질문 ("안녕, 제일 위험한 곳은?"처럼 뒤에 질문이 이어지면 해당 없음)
+        re.compile(r"^(안녕|하이|hello|hi\b|반가|고마|감사|수고|ㅎㅇ|도움말)\S*[\s!.?~ㅎㅋ]*$"),
+        re.compile(r"(뭐야|무슨\s*뜻|의미가?\s*뭐|어떻게\s*(계산|측정)|사용법|사용\s*방법|소개해)"),
+    ),
+}
+
+
+@dataclass(frozen=True)
+class IntentDecision:
+    intent: str
+    source: str  # rule / model / llm
+    confidence: float
+
+
+def normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip().lower()
+
+
+def extract_location_ids(text: str) -> list[str]:
+    """질문에 언급된 location_id (원문 표기, 중복 제거)."""
+    return list(dict.fromkeys(m.group(0) for m in LOCATION_ID_PATTERN.finditer(text)))
+
+
+def match_rules(text: str) -> Optional[str]:
+    """
+    규칙이 정확히 한 Intent로만 일치하면 그 Intent, 충돌하거나 없으면 None.
+    general은 다른 Intent와 함께 일치하면 양보 ("CRI가 뭐야? 지금 제일 높은 곳은?" → data_analysis).
+    """
+    text = normalize(text)
+    matched = {intent for intent, patterns in _RULES.items() if any(p.search(text) for p in patterns)}
+    if len(matched) > 1:
+        matched.discard("general")
+    return matched.pop() if len(matched) == 1 else None
+
+
+def char_ngrams(text: str) -> list[str]:
+    padded = f" {normalize(text)} "
+    lo, hi = NGRAM_RANGE
+    return [padded[i:i + n] for n in range(lo, hi + 1) for i in range(len(padded) - n + 1)]
+
+
+class IntentModel:
+    """문자 n-gram TF-IDF + 다항 로지스틱 회귀 (NumPy 경사하강)."""
+
+    def __init__(self, vocab: dict[str, int], idf: np.ndarray, weights: np.ndarray, bias: np.ndarray) -> None:
+        self.vocab = vocab
+        self.idf = idf
+        self.weights = weights
+        self.bias = bias
+
+    @staticmethod
+    def _tf(texts: Iterable[str], vocab: dict[str, int]) -> np.ndarray:
+        texts = list(texts)
+        x = np.zeros((len(texts), len(vocab)))
+        for row, text in enumerate(texts):
+            for gram in char_ngrams(text):
+                col = vocab.get(gram)
+                if col is not None:
+                    x[row, col] += 1.0
+        return np.log1p(x)  # sublinear tf
+
+    def _features(self, texts: Iterable[str]) -> np.ndarray:
+        x = self._tf(texts, self.vocab) * self.idf
+        norms = np.linalg.norm(x, axis=1, keepdims=True)
+        return x / np.where(norms == 0, 1.0, norms)
+
+    @classmethod
+    def train(
+        cls,
+        texts: list[str],
+        labels: list[str],
+        epochs: int = 300,
+        lr: float = 2.0,
+        l2: float = 1e-3,
+    ) -> "IntentModel":
+        vocab: dict[str, int] = {}
+        for text in texts:
+            for gram in char_ngrams(text):
+                vocab.setdefault(gram, len(vocab))
+        df = (cls._tf(texts, vocab) > 0).sum(axis=0)
+        idf = np.log((1 + len(texts)) / (1 + df)) + 1.0
+
+        model = cls(vocab, idf, np.zeros((len(vocab), len(INTENTS))), np.zeros(len(INTENTS)))
+        x = model._features(texts)
+        y = np.eye(len(INTENTS))[[INTENTS.index(label) for label in labels]]
+        for _ in range(epochs):
+            grad = (model._softmax(x) - y) / len(texts)
+            model.weights -= lr * (x.T @ grad + l2 * model.weights)
+            model.bias -= lr * grad.sum(axis=0)
+        return model
+
+    def _softmax(self, x: np.ndarray) -> np.ndarray:
+        logits = x @ self.weights + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        p = np.exp(logits)
+        return p / p.sum(axis=1, keepdims=True)
+
+    def predict(self, text: str) -> tuple[str, float]:
+        """Returns: (intent, 확률)."""
+        probs = self._softmax(self._features([text]))[0]
+        best = int(probs.argmax())
+        return INTENTS[best], float(probs[best])
+
+
+def load_examples(path: Path) -> tuple[list[str], list[str]]:
+    texts, labels = [], []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if item["intent"] not in INTENTS:
+                raise ValueError(f"{path}: unknown intent {item['intent']!r}")
+            texts.append(item["text"])
+            labels.append(item["intent"])
+    return texts, labels
+
+
+@lru_cache
+def get_intent_model() -> IntentModel:
+    return IntentModel.train(*load_examples(TRAIN_PATH))
+
+
+def route_local(query: str, threshold: Optional[float] = None) -> Optional[IntentDecision]:
+    """규칙 → 모델 순으로 로컬 분류. 확신이 없으면 None (LLM 분류 필요)."""
+    intent = match_rules(query)
+    if intent:
+        return IntentDecision(intent, "rule", 1.0)
+    intent, confidence = get_intent_model().predict(query)
+    if confidence >= (settings.intent_model_threshold if threshold is None else threshold):
+        return IntentDecision(intent, "model", confidence)
+    return None
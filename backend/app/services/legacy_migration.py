@@ -0,0 +1,111 @@
+"""기존 통합 테이블(drainage_data) → Master / Session / Analytics 분리 이관.
+
+- init_db에서 자동 실행: drainage_data에 행이 있고 drain_scan이 비어 있을 때 1회 (호출 측 트랜잭션)
+- 스캔 id를 그대로 유지 → drainage_latest.scan_id, 스케줄러 high-water mark가 계속 유효
+- 행 단위 Python 왕복 없이 INSERT … SELECT 3회 (Master는 location_id별 최신 스캔의 기준 값)
+- 원본 테이블은 남겨 둠 → 검증 후 scripts/migrate_drainage_split.py --drop-legacy 로 삭제
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import column, func, inspect, insert, or_, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DrainAnalytics, DrainMaster, DrainScan
+from app.services.scans import ANALYTICS_FIELDS, MASTER_FIELDS, SCAN_FIELDS
+
+logger = logging.getLogger(__name__)
+
+LEGACY_TABLE = "drainage_data"
+
+
+@dataclass(frozen=True)
+class MigrationResult:
+    scans: int
+    masters: int
+    analytics: int
+
+
+def _legacy_columns(sync_conn) -> list[str]:
+    inspector = inspect(sync_conn)
+    if not inspector.has_table(LEGACY_TABLE):
+        return []
+    return [c["name"] for c in inspector.get_columns(LEGACY_TABLE)]
+
+
+async def legacy_columns(session: AsyncSession) -> list[str]:
+    """drainage_data 컬럼 목록 (테이블이 없으면 빈 목록). 예전 DB는 일부 컬럼이 없을 수 있음."""
+    conn = await session.connection()
+    return await conn.run_sync(_legacy_columns)
+
+
+async def migrate_legacy_drainage_data(session: AsyncSession) -> Optional[MigrationResult]:
+    """
+    drainage_data 전체를 drain_scan / drain_master / drain_analytics로 복사.
+    이관할 것이 없으면(테이블 없음·비어 있음·이미 drain_scan에 데이터 있음) None.
+    """
+    columns = await legacy_columns(session)
+    if not columns:
+        return None
+    legacy = table(LEGACY_TABLE, *(column(name) for name in columns))
+    if await session.scalar(select(DrainScan.id).limit(1)) is not None:
+        return None
+    if await session.scalar(select(legacy.c.id).limit(1)) is None:
+        return None
+
+    scan_cols = [name for name in SCAN_FIELDS if name in legacy.c]
+    scans = await session.execute(
+        insert(DrainScan).from_select(
+            ["id", "location_id", *scan_cols],
+            select(legacy.c.id, legacy.c.location_id, *[legacy.c[name] for name in scan_cols]),
+        )
+    )
+
+    analytics_count = 0
+    analytics_cols = [name for name in ANALYTICS_FIELDS if name in legacy.c]
+    if analytics_cols:
+        analytics = await session.execute(
+            insert(DrainAnalytics).from_select(
+                ["scan_id", *analytics_cols],
+                select(legacy.c.id, *[legacy.c[name] for name in analytics_cols])
+                .where(or_(*[legacy.c[name].is_not(None) for name in analytics_cols])),
+            )
+        )
+        analytics_count = analytics.rowcount or 0
+
+    master_cols = [name for name in MASTER_FIELDS if name in legacy.c]
+    ranked = select(
+        legacy.c.location_id,
+        legacy.c.created_at,
+        *[legacy.c[name] for name in master_cols],
+        func.row_number()
+        .over(partition_by=legacy.c.location_id, order_by=(legacy.c.created_at.desc(), legacy.c.id.desc()))
+        .label("rn"),
+    ).subquery()
+    masters = await session.execute(
+        insert(DrainMaster).from_select(
+            ["location_id", *master_cols, "updated_at"],
+            select(ranked.c.location_id, *[ranked.c[name] for name in master_cols], ranked.c.created_at)
+            .where(ranked.c.rn == 1),
+        )
+    )
+
+    if session.get_bind().dialect.name == "postgresql":
+        # id를 직접 넣었으므로 이후 수신이 기존 id와 겹치지 않도록 시퀀스를 맞춤
+        await session.execute(
+            text("SELECT setval(pg_get_serial_sequence('drain_scan', 'id'), (SELECT max(id) FROM drain_scan))")
+        )
+
+    result = MigrationResult(scans.rowcount or 0, masters.rowcount or 0, analytics_count)
+    logger.info(
+        "migrated %s → drain_scan %d, drain_master %d, drain_analytics %d",
+        LEGACY_TABLE, result.scans, result.masters, result.analytics,
+    )
+    return result
+
+
+async def drop_legacy_table(session: AsyncSession) -> None:
+    """이관 검증 후 drainage_data 삭제."""
+    await session.execute(text(f"DROP TABLE {LEGACY_TABLE}"))
@@ -0,0 +1,347 @@
+"""지도 실시간 갱신: drainage_latest 변경 → 구독 범위별 compact diff 푸시 (WebSocket /ws/drainage, SSE /drainage/stream).
+
+- 커밋 직후 변경 통지(register_change_listener)로 location_id를 모아 live_batch_window_ms마다 1회 조회
+  → 지도 표시용 컬럼만 담은 diff를 LiveBus에 발행 (수신 upsert·ML 갱신·강우 재계산 모두 같은 경로)
+- 구독 범위: bbox(GPS 우선 좌표) / 시군구 코드 목록 — 어느 한 쪽에 속하면 전달, 둘 다 없으면 전체.
+  범위 밖으로 이동한 지점은 remove로 통지
+- LiveBus: 기본 InProcessBus(워커 안에서 발행 → 구독). 다중 워커는 브로커(Redis pub/sub 등) 구현으로 교체하면
+  각 워커의 변경이 모든 워커의 구독자에게 전달됨 (메시지는 JSON 직렬화 가능한 dict)
+- 한 배치가 live_max_diff_rows를 넘는 대량 변경(강우 예보 재계산 등)은 변경이 잦아든 뒤 resync(REST 재조회 요청) 1회,
+  느린 구독자는 큐가 차면 쌓인 diff를 버리고 resync 1건으로 대체 → 워커 메모리·지연 상한
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Optional, Protocol
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import async_session
+from app.models import DrainageLatest
+from app.services.drainage_latest import LatestChange, register_change_listener
+from app.services.spatial import BBox, effective_coords
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# diff 1행에 담는 컬럼 (지도 마커·상태 표시용, 좌표는 GPS 우선 lat/lng 1쌍으로 합침)
+LIVE_COLUMNS = (
+    DrainageLatest.location_id,
+    DrainageLatest.name,
+    DrainageLatest.lat,
+    DrainageLatest.lng,
+    DrainageLatest.last_measured_lat,
+    DrainageLatest.last_measured_lng,
+    DrainageLatest.district_code,
+    DrainageLatest.cri,
+    DrainageLatest.priority_score,
+    DrainageLatest.flood_probability,
+    DrainageLatest.forecast_rain_mm,
+    DrainageLatest.trash_vol_L,
+    DrainageLatest.volume_L,
+    DrainageLatest.cycle_days,
+    DrainageLatest.cleaned_at,
+    DrainageLatest.created_at,
+    DrainageLatest.ml_updated_at,
+)
+_FETCH_CHUNK = 500
+
+
+class LiveBus(Protocol):
+    """발행 → 모든 워커의 구독 루프로 전달하는 메시지 버스."""
+
+    # True면 다른 워커가 없으므로 이 워커에 구독자가 없을 때 발행을 생략
+    local_only: bool
+
+    async def publish(self, message: dict[str, Any]) -> None: ...
+
+    def listen(self) -> AsyncIterator[dict[str, Any]]: ...
+
+
+class InProcessBus:
+    """단일 워커용 버스 (asyncio.Queue). 수신 측 분배는 대기 없이 구독자 큐에 넣기만 하므로 쌓이지 않음."""
+
+    local_only = True
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def publish(self, message: dict[str, Any]) -> None:
+        self._queue.put_nowait(message)
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            yield await self._queue.get()
+
+
+def parse_districts(value: Optional[Iterable[str] | str]) -> frozenset[str]:
+    """시군구 코드 목록 (쉼표 구분 문자열 또는 배열) → 집합. 형식이 잘못되면 ValueError."""
+    if value is None:
+        return frozenset()
+    parts = value.split(",") if isinstance(value, str) else list(value)
+    codes = frozenset(str(p).strip() for p in parts if str(p).strip())
+    if len(codes) > settings.live_max_districts:
+        raise ValueError(f"시군구는 최대 {settings.live_max_districts}곳까지 구독할 수 있습니다.")
+    if any(not code.isdigit() or len(code) > 10 for code in codes):
+        raise ValueError("시군구 코드는 숫자여야 합니다 (예: 11680).")
+    return codes
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _compact(row: Any) -> dict[str, Any]:
+    lat, lng = effective_coords(row.lat, row.lng, row.last_measured_lat, row.last_measured_lng)
+    return {
+        "location_id": row.location_id,
+        "name": row.name,
+        "lat": lat,
+        "lng": lng,
+        "district_code": row.district_code,
+        "cri": row.cri,
+        "priority_score": row.priority_score,
+        "flood_probability": row.flood_probability,
+        "forecast_rain_mm": row.forecast_rain_mm,
+        "trash_vol_L": row.trash_vol_L,
+        "volume_L": row.volume_L,
+        "cycle_days": row.cycle_days,
+        "cleaned_at": _iso(row.cleaned_at),
+        "created_at": _iso(row.created_at),
+        "ml_updated_at": _iso(row.ml_updated_at),
+    }
+
+
+def _moved(change: LatestChange) -> bool:
+    """변경 전 위치(좌표·시군구)가 알려져 있고 지금과 다름 — 이전 범위 구독자에게 remove 필요."""
+    if change.prev_lat is None and change.prev_district_code is None:
+        return False
+    return (change.prev_lat, change.prev_lng, change.prev_district_code) != (
+        change.lat, change.lng, change.district_code,
+    )
+
+
+class Subscription:
+    """구독자 1명 (WebSocket·SSE 연결 1개): 구독 범위 + 보낼 메시지 큐 (None = 종료)."""
+
+    def __init__(self, bbox: Optional[BBox], districts: frozenset[str], queue_size: int) -> None:
+        self.bbox = bbox
+        self.districts = districts
+        self.queue: asyncio.Queue[Optional[dict[str, Any]]] = asyncio.Queue(maxsize=queue_size)
+        self.overflows = 0
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "type": "subscribed",
+            "bbox": [self.bbox.min_lng, self.bbox.min_lat, self.bbox.max_lng, self.bbox.max_lat] if self.bbox else None,
+            "districts": sorted(self.districts),
+        }
+
+    def update(self, bbox: Optional[BBox], districts: frozenset[str]) -> None:
+        self.bbox = bbox
+        self.districts = districts
+
+    def matches(self, lat: Optional[float], lng: Optional[float], district_code: Optional[str]) -> bool:
+        if self.bbox is None and not self.districts:
+            return True
+        if self.bbox is not None and self.bbox.contains(lat, lng):
+            return True
+        return district_code is not None and district_code in self.districts
+
+    def render(self, message: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """버스 메시지 → 이 구독자에게 보낼 메시지 (해당 없으면 None)."""
+        if message["type"] != "diff":
+            return message
+        upsert = [r for r in message["rows"] if self.matches(r["lat"], r["lng"], r["district_code"])]
+        remove = [lid for lid, prev in message["moved"].items() if self.matches(*prev)]
+        if remove:
+            sent = {r["location_id"] for r in upsert}
+            remove = [lid for lid in remove if lid not in sent]
+        if not upsert and not remove:
+            return None
+        return {"type": "diff", "ts": message["ts"], "upsert": upsert, "remove": remove}
+
+    def offer(self, message: Optional[dict[str, Any]]) -> None:
+        """대기 없이 큐에 추가. 가득 차면 쌓인 메시지를 버리고 resync 1건으로 대체."""
+        try:
+            self.queue.put_nowait(message)
+            return
+        except asyncio.QueueFull:
+            pass
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.overflows += 1
+        self.queue.put_nowait({"type": "resync", "reason": "overflow"} if message is not None else None)
+
+
+class LiveHub:
+    """변경 통지 → 배치 조회·발행(LiveBus) → 구독자 분배. lifespan에서 start/stop."""
+
+    def __init__(
+        self,
+        bus: LiveBus,
+        batch_window_ms: int,
+        max_diff_rows: int,
+        resync_quiet_ms: int,
+        resync_max_delay_seconds: float,
+        max_subscribers: int,
+        queue_size: int,
+    ) -> None:
+        self.bus = bus  # 다중 워커 브로커로 교체는 start 전에
+        self.batch_window = batch_window_ms / 1000
+        self.max_diff_rows = max_diff_rows
+        self.resync_quiet = resync_quiet_ms / 1000
+        self.resync_max_delay = resync_max_delay_seconds
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._subscribers: set[Subscription] = set()
+        self._pending: dict[str, LatestChange] = {}
+        self._wakeup = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: list[asyncio.Task] = []
+        self.stats = {"batches": 0, "rows": 0, "resyncs": 0}
+
+    @property
+    def running(self) -> bool:
+        return any(not t.done() for t in self._tasks)
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._pending.clear()
+        self._tasks = [
+            asyncio.create_task(self._publish_loop(), name="live-publish"),
+            asyncio.create_task(self._dispatch_loop(), name="live-dispatch"),
+        ]
+
+    async def stop(self) -> None:
+        self._loop = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for sub in list(self._subscribers):
+            sub.offer(None)  # 스트림 종료
+
+    def subscribe(self, bbox: Optional[BBox], districts: frozenset[str]) -> Subscription:
+        sub = Subscription(bbox, districts, self.queue_size)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "subscribers": len(self._subscribers),
+            "pending": len(self._pending),
+            "overflows": sum(s.overflows for s in self._subscribers),
+            **self.stats,
+        }
+
+    # --- 변경 통지 (drainage_latest 커밋 직후, 동기) ---
+
+    def on_changes(self, changes: list[LatestChange]) -> None:
+        loop = self._loop
+        if loop is None or (self.bus.local_only and not self._subscribers):
+            return
+        try:
+            loop.call_soon_threadsafe(self._enqueue, changes)
+        except RuntimeError:  # 종료 중인 루프
+            pass
+
+    def _enqueue(self, changes: list[LatestChange]) -> None:
+        for change in changes:
+            earlier = self._pending.get(change.location_id)
+            if earlier is not None and _moved(earlier):
+                # 배치 안에서 여러 번 바뀌면 배치 시작 전 위치를 remove 기준으로 유지
+                change = replace(
+                    change,
+                    prev_lat=earlier.prev_lat,
+                    prev_lng=earlier.prev_lng,
+                    prev_district_code=earlier.prev_district_code,
+                )
+            self._pending[change.location_id] = change
+        self._wakeup.set()
+
+    # --- 발행 ---
+
+    async def _publish_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(self.batch_window)  # 같은 구간의 커밋을 1회 조회로 병합
+            self._wakeup.clear()
+            pending, self._pending = self._pending, {}
+            try:
+                if len(pending) > self.max_diff_rows:
+                    await self._settle_and_resync()
+                elif pending:
+                    await self._publish_diff(pending)
+            except Exception:
+                logger.exception("live update publish failed (%d changes)", len(pending))
+
+    async def _settle_and_resync(self) -> None:
+        """대량 변경(청크 단위 커밋이 이어짐)이 잦아들 때까지 기다렸다가 resync 1회 — 도중 변경은 resync에 포함."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.resync_max_delay
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=min(self.resync_quiet, remaining))
+            except asyncio.TimeoutError:
+                break
+            self._wakeup.clear()
+            self._pending.clear()
+        self._pending.clear()
+        self.stats["resyncs"] += 1
+        await self.bus.publish({"type": "resync", "reason": "bulk", "ts": datetime.utcnow().isoformat()})
+
+    async def _publish_diff(self, pending: dict[str, LatestChange]) -> None:
+        ids = list(pending)
+        rows: list[dict[str, Any]] = []
+        async with async_session() as session:
+            for start in range(0, len(ids), _FETCH_CHUNK):
+                result = await session.execute(
+                    select(*LIVE_COLUMNS).where(DrainageLatest.location_id.in_(ids[start:start + _FETCH_CHUNK]))
+                )
+                rows.extend(_compact(r) for r in result.all())
+        moved = {
+            c.location_id: [c.prev_lat, c.prev_lng, c.prev_district_code]
+            for c in pending.values()
+            if _moved(c)
+        }
+        self.stats["batches"] += 1
+        self.stats["rows"] += len(rows)
+        await self.bus.publish({"type": "diff", "ts": datetime.utcnow().isoformat(), "rows": rows, "moved": moved})
+
+    # --- 분배 ---
+
+    async def _dispatch_loop(self) -> None:
+        async for message in self.bus.listen():
+            for sub in list(self._subscribers):
+                try:
+                    payload = sub.render(message)
+                except Exception:
+                    logger.exception("live update render failed")
+                    continue
+                if payload is not None:
+                    sub.offer(payload)
+
+
+live_hub = LiveHub(
+    InProcessBus(),
+    batch_window_ms=settings.live_batch_window_ms,
+    max_diff_rows=settings.live_max_diff_rows,
+    resync_quiet_ms=settings.live_resync_quiet_ms,
+    resync_max_delay_seconds=settings.live_resync_max_delay_seconds,
+    max_subscribers=settings.live_max_subscribers,
+    queue_size=settings.live_subscriber_queue_size,
+)
+register_change_listener(live_hub.on_changes)
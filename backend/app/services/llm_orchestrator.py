@@ -1,12 +1,17 @@
 """LLM Orchestrator: Intent Routing → Context Retrieval → Prompt Synthesis → vLLM (Tailscale)."""
 
-from typing import Any, Optional
+import asyncio
+import logging
+import math
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Optional, TypeVar
 
-from openai import AsyncOpenAI
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.core.clients import ClientRegistry
 from app.core.fallback import get_fallback_response, get_default_ml_values
 from app.core.debug_chat import (
     debug_context,
@@ -16,18 +21,23 @@ from app.core.debug_chat import (
     debug_llm_response,
     debug_prompt_synthesis,
 )
-from app.models import DrainageData
+from app.services.drainage_latest import get_latest
+from app.services.intent_router import IntentDecision, route_local
+from app.services.retrieval import retrieve_context
+from app.services.routing import Crew, RouteOptions, load_candidates, plan_routes
+from app.services.search import MAX_SEARCH_LIMIT, search_drainage
+from app.services.spatial import MAX_NEARBY_LIMIT, MAX_RADIUS_M, check_point, effective_coords, find_nearby
 from app.services.tools import get_tool_definitions
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Tailscale IP로 vLLM 서버 연결 (OpenAI 호환)
-def _get_openai_client() -> AsyncOpenAI:
-    return AsyncOpenAI(
-        base_url=settings.vllm_base_url,
-        api_key=settings.vllm_api_key or "not-needed",
-    )
+T = TypeVar("T")
 
+# plan_cleaning_routes 도구: 프롬프트에 넣을 결과 크기 제한
+ROUTE_TOOL_MAX_CREWS = 10
+ROUTE_TOOL_MAX_CANDIDATES = 500
+ROUTE_TOOL_MAX_VISITS = 15  # 크루별 앞쪽 방문 지점만 반환 (전체 동선은 /routes/optimize)
 
 INTENT_SYSTEM = """당신은 빗물받이 관리 플랫폼의 의도 분류기입니다.
 사용자 질문을 다음 중 하나로만 분류하세요:
@@ -38,11 +48,10 @@ INTENT_SYSTEM = """당신은 빗물받이 관리 플랫폼의 의도 분류기
 답변은 반드시 한 단어로만: data_analysis / system_action / general"""
 
 
-async def classify_intent(query: str) -> str:
+async def classify_intent(clients: ClientRegistry, query: str) -> str:
     """Intent Routing: LLM으로 질문 분류."""
     try:
-        client = _get_openai_client()
-        resp = await client.chat.completions.create(
+        resp = await clients.openai.chat.completions.create(
             model=settings.vllm_model,
             messages=[
                 {"role": "system", "content": INTENT_SYSTEM},
@@ -59,58 +68,165 @@ async def classify_intent(query: str) -> str:
         return "general"
 
 
+async def route_intent(clients: ClientRegistry, query: str) -> IntentDecision:
+    """Intent Routing: 로컬 규칙/모델로 먼저 분류하고, 확신이 없을 때만 LLM 분류."""
+    if settings.intent_local_enabled:
+        decision = route_local(query)
+        if decision:
+            return decision
+    return IntentDecision(await classify_intent(clients, query), "llm", 0.0)
+
+
 async def get_context_for_query(
     session: AsyncSession,
     query: str,
     location_id: Optional[str] = None,
-) -> str:
-    """Context Retrieval: DB에서 원본 + ML 분석 결과 조회."""
-    stmt = select(DrainageData).order_by(DrainageData.created_at.desc())
-    if location_id:
-        stmt = stmt.where(DrainageData.location_id == location_id)
-    stmt = stmt.limit(20)
-    result = await session.execute(stmt)
-    rows = result.scalars().all()
-
-    if not rows:
+) -> tuple[str, int]:
+    """
+    Context Retrieval: 질문에서 지점·지역·임계값을 추출해 필요한 행·컬럼만 조회 (location_id당 최신 상태).
+    Returns: (프롬프트 컨텍스트, 담긴 DB 행 수).
+    """
+    context, data_rows = await retrieve_context(session, query, location_id)
+    if context is None:
         defs = get_default_ml_values()
-        return f"[DB 데이터 없음] ML 기본값: {defs}"
-
-    lines = []
-    for r in rows:
-        d = {
-            "location_id": r.location_id,
-            "volume_L": r.volume_L,
-            "max_height_mm": r.max_height_mm,
-            "priority_score": r.priority_score,
-            "risk_reason": r.risk_reason,
-            "flood_probability": r.flood_probability,
-            "cri": r.cri,
-            "address": r.address,
-        }
-        lines.append(str(d))
-    return "\n".join(lines)
+        return f"[DB 데이터 없음] ML 기본값: {defs}", 0
+    return context, data_rows
 
 
 AGENT_SYSTEM = """당신은 Nova Robotics 빗물받이 관리 플랫폼의 AI 에이전트입니다.
 - ML이 만든 수치(priority_score, risk_reason, flood_probability)를 해석해 사용자에게 실행 가능한 권고를 제공합니다.
 - 예: "이곳은 90% 차있고 유동인구가 많아 우선순위 1위야" → "매우 위험하니 당장 청소팀을 보내세요"처럼 구체적으로 제안합니다.
-- 필요한 경우 get_drainage_data, generate_risk_chart, send_admin_alert 도구를 호출하세요.
+- 필요한 경우 get_drainage_data, search_drainage, find_nearby_drainage, plan_cleaning_routes, generate_risk_chart, send_admin_alert 도구를 호출하세요.
+- 주소나 이름으로 지칭된 지점은 search_drainage로 location_id를 먼저 확인하세요.
 - 한글로 답변합니다."""
 
 
-async def orchestrate(
+@dataclass
+class OrchestrationResult:
+    answer: str
+    intent: Optional[str]
+    intent_source: Optional[str]  # rule / model / llm / timeout
+    tools_used: list[str] = field(default_factory=list)
+    stage_timings_ms: dict[str, float] = field(default_factory=dict)
+    degraded_stages: list[str] = field(default_factory=list)
+    context_rows: int = 0  # 프롬프트 컨텍스트에 담긴 DB 행 수 (0이 아니면 답변이 현재 데이터에 의존)
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """요청 전체 마감시각."""
+
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+
+@dataclass
+class StageRunner:
+    """
+    단계별 마감시간 적용 + 소요 시간 기록. 시간 초과/오류 시 fallback 값으로 계속 진행.
+    deadline이 있으면 각 단계 timeout을 요청 전체의 남은 시간으로 제한.
+    """
+
+    deadline: Optional[Deadline] = None
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    degraded: list[str] = field(default_factory=list)
+
+    def timeout(self, seconds: float) -> float:
+        return min(seconds, self.deadline.remaining()) if self.deadline else seconds
+
+    def record(self, name: str, t0: float) -> None:
+        """name 단계 소요 시간 누적 (t0: time.perf_counter() 시작값)."""
+        elapsed = (time.perf_counter() - t0) * 1000
+        self.timings_ms[name] = round(self.timings_ms.get(name, 0.0) + elapsed, 1)
+
+    async def run(self, name: str, coro: Awaitable[T], timeout: float, fallback: T) -> T:
+        try:
+            return await self.run_or_raise(name, coro, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("orchestrate stage %s timed out after %.1fs", name, timeout)
+            return fallback
+        except Exception:
+            logger.exception("orchestrate stage %s failed", name)
+            return fallback
+
+    async def run_or_raise(self, name: str, coro: Awaitable[T], timeout: float) -> T:
+        """fallback 없이 실행 (실패 처리는 호출 측에서)."""
+        t0 = time.perf_counter()
+        try:
+            return await asyncio.wait_for(coro, timeout=self.timeout(timeout))
+        except Exception:
+            self.degraded.append(name)
+            raise
+        finally:
+            self.record(name, t0)
+
+
+async def _context_stage(session: AsyncSession, query: str) -> tuple[str, int]:
+    try:
+        return await get_context_for_query(session, query)
+    except asyncio.CancelledError:
+        # 취소된 조회의 트랜잭션을 정리해야 요청 세션을 이후에도 쓸 수 있음
+        await asyncio.shield(session.rollback())
+        raise
+
+
+_INTENT_TIMEOUT = IntentDecision("general", "timeout", 0.0)
+_CONTEXT_UNAVAILABLE = ("[컨텍스트 조회 실패] DB 조회가 지연되어 컨텍스트 없이 답변합니다. 필요하면 도구로 데이터를 조회하세요.", 0)
+
+
+async def _run_tools(
     session: AsyncSession,
-    query: str,
-) -> tuple[str, Optional[str], list[str]]:
+    clients: ClientRegistry,
+    calls: list[tuple[str, str]],
+    stages: StageRunner,
+) -> list[Any]:
     """
-    Agentic Workflow: Intent → Context → Prompt → vLLM.
-    Returns: (answer, intent, tools_used)
+    한 턴의 tool_calls [(name, arguments)]를 동시에 실행 → 턴 소요 = 가장 느린 도구 (합계 아님).
+    AsyncSession은 동시 사용이 불가하므로 도구마다 같은 엔진의 세션을 따로 열고,
+    도구별로 마감시간을 적용 (초과·오류 시 해당 도구만 error 결과). 결과는 호출 순서대로.
     """
-    intent = await classify_intent(query)
-    debug_intent(query, intent)
 
-    context = await get_context_for_query(session, query)
+    async def run_one(name: str, args_str: str) -> Any:
+        async with AsyncSession(session.bind, expire_on_commit=False) as tool_session:
+            return await _execute_tool(tool_session, clients, name, args_str)
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(
+        stages.run(
+            f"tool:{name}",
+            run_one(name, args_str),
+            settings.tool_stage_timeout_seconds,
+            {"error": f"도구 실행 시간 초과 또는 오류: {name}"},
+        )
+        for name, args_str in calls
+    ))
+    stages.record("tools", t0)
+    return list(results)
+
+
+async def _prepare(
+    session: AsyncSession,
+    clients: ClientRegistry,
+    query: str,
+    stages: StageRunner,
+) -> tuple[IntentDecision, list[dict[str, Any]], int]:
+    """[Intent Routing ∥ Context Retrieval] → Prompt Synthesis. Returns: (intent 판정, LLM 메시지, 컨텍스트 DB 행 수)."""
+    decision, (context, context_rows) = await asyncio.gather(
+        stages.run("intent", route_intent(clients, query), settings.intent_stage_timeout_seconds, _INTENT_TIMEOUT),
+        stages.run(
+            "context",
+            _context_stage(session, query),
+            settings.context_stage_timeout_seconds,
+            _CONTEXT_UNAVAILABLE,
+        ),
+    )
+    debug_intent(query, decision.intent, decision.source, decision.confidence)
     debug_context(context)
 
     user_msg = f"""[컨텍스트 - DB 조회 결과]
@@ -120,79 +236,233 @@ async def orchestrate(
 {query}
 """
     debug_prompt_synthesis(user_msg, AGENT_SYSTEM)
-
-    tools_used: list[str] = []
-    messages = [
+    return decision, [
         {"role": "system", "content": AGENT_SYSTEM},
         {"role": "user", "content": user_msg},
-    ]
+    ], context_rows
 
-    try:
-        client = _get_openai_client()
-        debug_llm_request(settings.vllm_base_url, settings.vllm_model)
-        resp = await client.chat.completions.create(
+
+async def orchestrate(
+    session: AsyncSession,
+    clients: ClientRegistry,
+    query: str,
+) -> OrchestrationResult:
+    """
+    Agentic Workflow (async DAG):
+        [Intent Routing ∥ Context Retrieval] → Prompt Synthesis → vLLM (+ Tool rounds)
+    서로 독립인 Intent·Context 단계는 동시에 실행하고, 단계별 마감시간을 넘기면 기본값으로 계속 진행.
+    """
+    stages = StageRunner(Deadline.after(settings.chat_deadline_seconds))
+    t0 = time.perf_counter()
+    decision, messages, context_rows = await _prepare(session, clients, query, stages)
+    intent = decision.intent
+    tools_used: list[str] = []
+
+    def result(answer: str) -> OrchestrationResult:
+        stages.timings_ms["total"] = round((time.perf_counter() - t0) * 1000, 1)
+        return OrchestrationResult(
+            answer, intent, decision.source, tools_used, stages.timings_ms, list(dict.fromkeys(stages.degraded)),
+            context_rows,
+        )
+
+    client = clients.openai
+
+    async def complete(allow_tools: bool = True) -> Any:
+        return await client.chat.completions.create(
             model=settings.vllm_model,
             messages=messages,
             tools=get_tool_definitions(),
-            tool_choice="auto",
+            tool_choice="auto" if allow_tools else "none",
             max_tokens=1024,
         )
+
+    try:
+        debug_llm_request(settings.vllm_base_url, settings.vllm_model)
+        resp = await stages.run_or_raise("llm", complete(allow_tools=settings.tool_max_rounds > 0), settings.llm_timeout_seconds)
     except Exception as e:
         debug_llm_error(e)
-        err = "llm_timeout" if "timeout" in str(e).lower() else "llm_error"
-        return (
-            get_fallback_response(err, query, settings.fallback_enabled),
-            intent,
-            tools_used,
-        )
+        return result(get_fallback_response(_llm_error_type(e), query, settings.fallback_enabled))
 
     choice = resp.choices[0]
     msg = choice.message
 
-    # Tool calls 처리 (최대 2회 루프)
-    for _ in range(2):
+    # Tool calls 처리: 턴마다 동시 실행, 최대 tool_max_rounds회 (마지막 재요청은 도구 없이 답변)
+    for round_no in range(1, settings.tool_max_rounds + 1):
         tc_list = getattr(msg, "tool_calls", None) or []
         if not tc_list:
             break
         # Assistant 메시지 추가 (API 호환 dict)
         asst: dict[str, Any] = {"role": "assistant", "content": msg.content or ""}
-        if tc_list and hasattr(msg, "model_dump"):
+        if hasattr(msg, "model_dump"):
             d = msg.model_dump(exclude_none=True)
             if "tool_calls" in d:
                 asst["tool_calls"] = d["tool_calls"]
         messages.append(asst)
-        for tc in tc_list:
-            name = getattr(tc.function, "name", "") or ""
-            args_str = getattr(tc.function, "arguments", "{}") or "{}"
-            tools_used.append(name)
-            result = await _execute_tool(session, name, args_str)
+        calls = [
+            (getattr(tc.function, "name", "") or "", getattr(tc.function, "arguments", "{}") or "{}")
+            for tc in tc_list
+        ]
+        tools_used.extend(name for name, _ in calls)
+        tool_results = await _run_tools(session, clients, calls, stages)
+        for tc, tool_result in zip(tc_list, tool_results):
             messages.append({
                 "role": "tool",
                 "tool_call_id": tc.id,
-                "content": str(result),
+                "content": str(tool_result),
             })
-        resp = await client.chat.completions.create(
-            model=settings.vllm_model,
-            messages=messages,
-            tools=get_tool_definitions(),
-            tool_choice="auto",
-            max_tokens=1024,
-        )
+        try:
+            resp = await stages.run_or_raise(
+                "llm_followup",
+                complete(allow_tools=round_no < settings.tool_max_rounds),
+                settings.llm_timeout_seconds,
+            )
+        except Exception as e:
+            debug_llm_error(e)
+            return result(get_fallback_response(_llm_error_type(e), query, settings.fallback_enabled))
         msg = resp.choices[0].message
 
     answer = (msg.content or "").strip()
     if not answer:
         answer = get_fallback_response("llm_error", query, settings.fallback_enabled)
     debug_llm_response(answer, tools_used)
-    return answer, intent, tools_used
+    return result(answer)
+
+
+async def orchestrate_stream(
+    session: AsyncSession,
+    clients: ClientRegistry,
+    query: str,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    orchestrate의 스트리밍 버전 (vLLM stream=True). (event, data)를 생성:
+        intent → [token...] → [tool_call → tool_result ...] → token... → done
+    done의 answer는 모든 라운드에서 보낸 token을 이어 붙인 값 (클라이언트가 받은 본문과 같음).
+    요청 전체 마감시간(chat_deadline_seconds)은 토큰 수신에도 적용 — 넘기면 error 후 done.
+    실패 시 error 이벤트 후 done (보낸 token이 없으면 fallback 답변).
+    """
+    stages = StageRunner(Deadline.after(settings.chat_deadline_seconds))
+    t0 = time.perf_counter()
+    decision, messages, context_rows = await _prepare(session, clients, query, stages)
+    yield "intent", {"intent": decision.intent, "source": decision.source, "confidence": decision.confidence}
+
+    client = clients.openai
+    tools_used: list[str] = []
+    streamed: list[str] = []  # 모든 라운드에서 클라이언트에 보낸 token
+    stage = "llm"
+    try:
+        debug_llm_request(settings.vllm_base_url, settings.vllm_model)
+        max_rounds = settings.tool_max_rounds
+        for round_no in range(max_rounds + 1):
+            stage = "llm" if round_no == 0 else "llm_followup"
+            stream = await stages.run_or_raise(
+                stage,
+                client.chat.completions.create(
+                    model=settings.vllm_model,
+                    messages=messages,
+                    tools=get_tool_definitions(),
+                    tool_choice="auto" if round_no < max_rounds else "none",
+                    max_tokens=1024,
+                    stream=True,
+                ),
+                settings.llm_timeout_seconds,
+            )
+            content: list[str] = []
+            calls: dict[int, dict[str, str]] = {}
+            async for chunk in _with_idle_timeout(stream, lambda: stages.timeout(settings.llm_timeout_seconds)):
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    if "first_token" not in stages.timings_ms:
+                        stages.timings_ms["first_token"] = round((time.perf_counter() - t0) * 1000, 1)
+                    content.append(delta.content)
+                    streamed.append(delta.content)
+                    yield "token", {"delta": delta.content}
+                for tc in delta.tool_calls or []:
+                    call = calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                    call["id"] = tc.id or call["id"]
+                    if tc.function:
+                        call["name"] += tc.function.name or ""
+                        call["arguments"] += tc.function.arguments or ""
+            if not calls or round_no == max_rounds:
+                break
+
+            messages.append({
+                "role": "assistant",
+                "content": "".join(content),
+                "tool_calls": [
+                    {"id": c["id"], "type": "function", "function": {"name": c["name"], "arguments": c["arguments"]}}
+                    for c in calls.values()
+                ],
+            })
+            for call in calls.values():
+                tools_used.append(call["name"])
+                yield "tool_call", {"name": call["name"], "arguments": call["arguments"]}
+            tool_results = await _run_tools(
+                session, clients, [(c["name"], c["arguments"] or "{}") for c in calls.values()], stages
+            )
+            for call, tool_result in zip(calls.values(), tool_results):
+                yield "tool_result", {"name": call["name"], "result": tool_result}
+                messages.append({"role": "tool", "tool_call_id": call["id"], "content": str(tool_result)})
+    except Exception as e:
+        debug_llm_error(e)
+        if stage not in stages.degraded:
+            stages.degraded.append(stage)  # 스트림 도중 실패·마감 초과 → 캐시하지 않음
+        error_type = _llm_error_type(e)
+        yield "error", {"type": error_type, "message": get_fallback_response(error_type, query, settings.fallback_enabled)}
+
+    answer = "".join(streamed).strip()
+    if not answer:
+        answer = get_fallback_response("llm_error", query, settings.fallback_enabled)
+    debug_llm_response(answer, tools_used)
+    stages.timings_ms["total"] = round((time.perf_counter() - t0) * 1000, 1)
+    yield "done", {
+        "answer": answer,
+        "intent": decision.intent,
+        "intent_source": decision.source,
+        "tools_used": tools_used or None,
+        "debug": {
+            "stage_timings_ms": stages.timings_ms,
+            "degraded_stages": list(dict.fromkeys(stages.degraded)),
+            "context_rows": context_rows,
+        },
+    }
+
+
+async def _with_idle_timeout(stream: AsyncIterable[T], timeout: Callable[[], float]) -> AsyncIterator[T]:
+    """스트림 청크 간 대기 시간이 timeout()을 넘으면 asyncio.TimeoutError (청크마다 다시 계산 → 남은 마감시간 반영)."""
+    it = stream.__aiter__()
+    while True:
+        try:
+            yield await asyncio.wait_for(it.__anext__(), timeout=timeout())
+        except StopAsyncIteration:
+            return
+
+
+def _llm_error_type(e: BaseException) -> str:
+    if isinstance(e, asyncio.TimeoutError) or "timeout" in str(e).lower():
+        return "llm_timeout"
+    return "llm_error"
+
+
+def _number_arg(args: dict[str, Any], name: str, default: float, low: float, high: float) -> float:
+    """LLM이 만든 도구 인자 → 숫자 (없거나 잘못된 값이면 default, 범위 밖이면 [low, high]로 제한)."""
+    try:
+        value = float(args.get(name) or default)
+    except (TypeError, ValueError):
+        value = default
+    if not math.isfinite(value):
+        value = default
+    return max(low, min(value, high))
 
 
 async def _execute_tool(
     session: AsyncSession,
+    clients: ClientRegistry,
     name: str,
     args_str: str,
 ) -> Any:
-    """도구 실행 (get_drainage_data, generate_risk_chart, send_admin_alert)."""
+    """도구 실행 (get_drainage_data, search_drainage, find_nearby_drainage, plan_cleaning_routes, generate_risk_chart, send_admin_alert)."""
     import json
 
     try:
@@ -202,15 +472,7 @@ async def _execute_tool(
 
     if name == "get_drainage_data":
         lid = args.get("location_id", "")
-        from sqlalchemy import select
-        stmt = (
-            select(DrainageData)
-            .where(DrainageData.location_id == lid)
-            .order_by(DrainageData.created_at.desc())
-            .limit(1)
-        )
-        r = await session.execute(stmt)
-        row = r.scalar_one_or_none()
+        row = await get_latest(session, lid)
         if not row:
             return {"error": "해당 location_id 데이터 없음", "location_id": lid}
         return {
@@ -223,17 +485,117 @@ async def _execute_tool(
             "cri": row.cri,
         }
 
+    if name == "search_drainage":
+        query = str(args.get("query") or "").strip()
+        if not query:
+            return {"error": "검색어(query)가 필요합니다."}
+        hits = await search_drainage(session, query, int(_number_arg(args, "limit", 10, 1, MAX_SEARCH_LIMIT)))
+        return {
+            "query": query,
+            "count": len(hits),
+            "drains": [
+                {
+                    "location_id": h.location_id,
+                    "name": h.name,
+                    "address": h.address,
+                    "cri": h.cri,
+                    "priority_score": h.priority_score,
+                }
+                for h in hits
+            ],
+        }
+
+    if name == "find_nearby_drainage":
+        lat, lng = args.get("lat"), args.get("lng")
+        if (lat is None or lng is None) and args.get("location_id"):
+            center = await get_latest(session, args["location_id"])
+            if center:
+                lat, lng = effective_coords(center.lat, center.lng, center.last_measured_lat, center.last_measured_lng)
+        if lat is None or lng is None:
+            return {"error": "기준 좌표(lat, lng) 또는 좌표가 있는 location_id가 필요합니다."}
+        radius_m = _number_arg(args, "radius_m", 500, 1, MAX_RADIUS_M)
+        limit = int(_number_arg(args, "limit", 20, 1, MAX_NEARBY_LIMIT))
+        try:
+            lat, lng = float(lat), float(lng)
+        except (TypeError, ValueError):
+            return {"error": "기준 좌표(lat, lng)는 숫자여야 합니다."}
+        try:
+            check_point(lat, lng)
+        except ValueError as e:
+            return {"error": str(e)}
+        hits = await find_nearby(session, lat, lng, radius_m, limit)
+        return {
+            "center": {"lat": lat, "lng": lng},
+            "radius_m": radius_m,
+            "count": len(hits),
+            "drains": [
+                {
+                    "location_id": row.location_id,
+                    "name": row.name,
+                    "address": row.address,
+                    "distance_m": round(distance, 1),
+                    "cri": row.cri,
+                    "priority_score": row.priority_score,
+                    "flood_probability": row.flood_probability,
+                }
+                for row, distance in hits
+            ],
+        }
+
+    if name == "plan_cleaning_routes":
+        crew_count = min(max(int(args.get("crew_count") or 1), 1), ROUTE_TOOL_MAX_CREWS)
+        min_cri = args.get("min_cri")
+        candidates = await load_candidates(
+            session, 50 if min_cri is None else int(min_cri), ROUTE_TOOL_MAX_CANDIDATES
+        )
+        if not candidates:
+            return {"error": "조건에 맞는 좌표 있는 빗물받이가 없습니다."}
+        lat = args.get("start_lat", settings.route_depot_lat)
+        lng = args.get("start_lng", settings.route_depot_lng)
+        if lat is None or lng is None:
+            lat = sum(c.lat for c in candidates) / len(candidates)
+            lng = sum(c.lng for c in candidates) / len(candidates)
+        shift = float(args.get("shift_minutes") or 480)
+        crews = [Crew(f"crew-{i + 1}", float(lat), float(lng), shift_minutes=shift) for i in range(crew_count)]
+        options = RouteOptions(
+            speed_kmh=settings.route_speed_kmh,
+            service_minutes=settings.route_service_minutes,
+            time_budget_ms=settings.route_time_budget_ms,
+        )
+        plan = await asyncio.to_thread(plan_routes, crews, candidates, options)
+        return {
+            "start": {"lat": round(float(lat), 6), "lng": round(float(lng), 6)},
+            "candidates": len(candidates),
+            "unassigned": len(plan.unassigned),
+            "routes": [
+                {
+                    "crew_id": route.crew.crew_id,
+                    "stops": len(route.stops),
+                    "distance_km": round(route.distance_m / 1000, 1),
+                    "duration_min": route.duration_min,
+                    "visits": [
+                        {
+                            "location_id": stop.candidate.location_id,
+                            "name": stop.candidate.name,
+                            "cri": stop.candidate.cri,
+                            "arrival_min": stop.arrival_min,
+                        }
+                        for stop in route.stops[:ROUTE_TOOL_MAX_VISITS]
+                    ],
+                }
+                for route in plan.routes
+            ],
+        }
+
     if name == "generate_risk_chart":
         data = args.get("data", {})
         return {"chart_data": data, "message": "차트용 JSON 생성됨"}
 
     if name == "send_admin_alert":
         msg = args.get("message", "")
-        # Webhook/이메일 전송 (실제 구현 시 httpx 등 사용)
+        # Webhook/이메일 전송 (앱 범위 httpx 클라이언트 재사용)
         if settings.admin_webhook_url:
-            import httpx
-            async with httpx.AsyncClient() as c:
-                await c.post(settings.admin_webhook_url, json={"text": msg})
+            await clients.http.post(settings.admin_webhook_url, json={"text": msg})
         return {"ok": True, "message": "관리자 알림 전송 완료"}
 
     return {"error": f"알 수 없는 도구: {name}"}
@@ -1,81 +1,204 @@
-"""ML 분석 파이프라인: 데이터 수신 시 트리거 또는 주기적 DB 읽기.
+"""ML 분석 파이프라인: 스캔 → CRI·침수 확률·우선순위 산출 (호출 경로는 아래 두 가지).
 
-- CRI 산출: 쓰레기 부피(trash_vol) + 저지대(elevation_type=lowland) 가중치 반영
-- 실시간성: ingestion에서 BackgroundTasks로 호출되어 앱 대기 시간 최소화
+- CRI 산출: 쓰레기 부피(trash_vol) + 저지대(elevation_type=lowland) 가중치 반영 (수식: ml_scoring)
+- 실시간: ingestion이 수신 트랜잭션 안에서 ml_job을 등록 → ml_queue 워커 풀이 claim한 지점을 score_locations로 배치 분석
+- catch-up: MLCatchupScheduler(리더 1개)가 drain_scan.id high-water 이후 미분석 스캔을 score_new_scans로 보충
+  (큐에서 빠진 스캔·큐 도입 전 데이터), 전체 일괄 재분석은 run_periodic_ml_update
+- 배치 스코어링: 미분석 스캔을 청크 단위 NumPy 벡터 연산 + 청크당 bulk UPDATE(executemany) 1회
+- cycle_days: 지점별 running state로 누적 속도·만수까지 남은 일수 증분 추정 (cycle_estimation)
+- 강우: 적용 중인 예보의 지점 강우량을 침수 확률·우선순위에 반영, 예보별 점수 이력 기록 (rainfall)
 """
 
-import asyncio
+from collections.abc import Callable
 from datetime import datetime
 
-from sqlalchemy import select, update
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import DrainageData
+from app.models import DrainAnalytics, DrainageLatest, DrainMaster, DrainScan
+from app.services.cycle_estimation import ScanObservation, advance_cycles
+from app.services.drainage_latest import get_latest, update_latest_analytics, update_latest_analytics_many
+from app.services.ml_scoring import LOWLAND_CRI_BOOST  # noqa: F401 (기존 import 경로 호환)
+from app.services.ml_scoring import score_batch, score_row
+from app.services.rainfall import current_rain, provenance, record_scores
+from app.services.scans import upsert_scan_analytics
 
-# CRI 보정: 저지대일 때 가중치 (저지대 + 쓰레기 많음 = CRI 최고점)
-LOWLAND_CRI_BOOST = 15  # 0~100 기준 가점
+BATCH_CHUNK_SIZE = 2000
+
+
+def _scan_inputs():
+    """스코어링 입력: drain_scan 측정값·좌표 + drain_master 기준 값 + 기존 산출 여부 (스캔 id 순 조회용)."""
+    return (
+        select(
+            DrainScan.id,
+            DrainScan.location_id,
+            DrainScan.lat,
+            DrainScan.lng,
+            DrainScan.last_measured_lat,
+            DrainScan.last_measured_lng,
+            DrainScan.trash_vol_L,
+            DrainScan.volume_L,
+            DrainMaster.max_height_mm,
+            DrainMaster.elevation_type,
+            DrainScan.created_at,
+            DrainScan.cleaned_at,
+            DrainAnalytics.ml_updated_at,
+        )
+        .outerjoin(DrainMaster, DrainMaster.location_id == DrainScan.location_id)
+        .outerjoin(DrainAnalytics, DrainAnalytics.scan_id == DrainScan.id)
+    )
 
 
 async def trigger_ml_analysis(session: AsyncSession, location_id: str) -> None:
     """
-    최신 레코드 기준으로 CRI·AI 권장조치 산출.
-    저지대(lowland)면 CRI에 가중치 부여.
+    최신 레코드(drainage_latest) 기준으로 CRI·AI 권장조치·cycle_days 산출.
+    저지대(lowland)면 CRI에 가중치 부여, 적용 중인 강우 예보가 있으면 지점 강우량 반영.
+    스캔별 산출값(drain_analytics)과 최신 상태에 함께 기록.
     """
-    stmt = (
-        select(DrainageData)
-        .where(DrainageData.location_id == location_id)
-        .order_by(DrainageData.created_at.desc())
-        .limit(1)
-    )
-    result = await session.execute(stmt)
-    row = result.scalar_one_or_none()
+    row = await get_latest(session, location_id)
     if not row:
         return
 
-    # 쓰레기 부피 기반 위험도 (0~1). trash_vol_L 없으면 volume_L·max_height로 대체
-    trash_L = row.trash_vol_L
-    if trash_L is not None:
-        fill_ratio = min(1.0, trash_L / 150.0)  # 150L 기준
-    else:
-        volume = row.volume_L or 0
-        height = row.max_height_mm or 0
-        fill_ratio = min(1.0, (volume / 100) * (height / 200)) if volume and height else 0
-
-    cri_base = int(fill_ratio * 100)
-    is_lowland = (row.elevation_type or "").strip().lower() == "lowland"
-    cri = min(100, cri_base + (LOWLAND_CRI_BOOST if is_lowland else 0))
-
-    priority = 1 if cri >= 80 else (2 if cri >= 50 else 3)
-    flood_prob = min(1.0, fill_ratio * 1.2)
-    reason = (
-        "저지대·쓰레기 과다로 즉시 점검 권장" if is_lowland and fill_ratio > 0.5
-        else "부피 과다·유동인구 밀집" if fill_ratio > 0.7
-        else "중간 수준 점검 권장" if fill_ratio > 0.4
-        else "상대적으로 양호"
+    scan = ScanObservation(row.scan_id, location_id, row.created_at, row.trash_vol_L, row.cleaned_at)
+    cycle_days = await advance_cycles(session, [scan], fill_gaps=True)
+    forecast_id, rain = await current_rain(session, [row])
+    now = datetime.utcnow()
+    values = {
+        **score_row(row.trash_vol_L, row.volume_L, row.max_height_mm, row.elevation_type, float(rain[0])),
+        **provenance(forecast_id, rain[0]),
+        "cycle_days": cycle_days[row.scan_id],
+        "ml_updated_at": now,
+    }
+    await upsert_scan_analytics(session, [{"scan_id": row.scan_id, **values}])
+    await update_latest_analytics(session, location_id, row.scan_id, values)
+    if values["forecast_id"] is not None:
+        await record_scores(session, forecast_id, [{"location_id": location_id, "scan_id": row.scan_id, **values}], now)
+    await session.flush()
+
+
+async def score_scan_chunk(session: AsyncSession, scans: list, latest_only: bool = False) -> int:
+    """
+    스캔 행 목록(id, location_id, 좌표, trash_vol_L, volume_L, max_height_mm, elevation_type, created_at, cleaned_at)을
+    벡터화 스코어링(+ 적용 중인 예보의 강우량) + 청소 주기 상태 갱신 후
+    drain_analytics·drainage_latest에 각각 executemany 1회로 기록.
+    latest_only: 지점별 최신 스캔만 넘긴 경우 — 사이 스캔도 청소 주기 상태에 반영.
+    Returns: 기록한 행 수.
+    """
+    if not scans:
+        return 0
+    forecast_id, rain = await current_rain(session, scans)
+    scores = score_batch(
+        [s.trash_vol_L for s in scans],
+        [s.volume_L for s in scans],
+        [s.max_height_mm for s in scans],
+        [s.elevation_type for s in scans],
+        rain_mm=rain,
     )
+    cycle_days = await advance_cycles(session, scans, fill_gaps=latest_only)
+    now = datetime.utcnow()
+    rows = [
+        {
+            "location_id": s.location_id,
+            "scan_id": s.id,
+            "priority_score": scores["priority_score"][i],
+            "risk_reason": scores["risk_reason"][i],
+            "flood_probability": scores["flood_probability"][i],
+            "cri": scores["cri"][i],
+            **provenance(forecast_id, rain[i]),
+            "cycle_days": cycle_days[s.id],
+            "ml_updated_at": now,
+        }
+        for i, s in enumerate(scans)
+    ]
+
+    await upsert_scan_analytics(session, rows)
+    await update_latest_analytics_many(session, rows)
+    await record_scores(session, forecast_id, [r for r in rows if r["forecast_id"] is not None], now)
+    await session.flush()
+    return len(rows)
 
-    await session.execute(
-        update(DrainageData)
-        .where(DrainageData.id == row.id)
-        .values(
-            priority_score=priority,
-            risk_reason=reason,
-            flood_probability=round(flood_prob, 3),
-            cri=cri,
-            ml_updated_at=datetime.utcnow(),
+
+async def score_locations(session: AsyncSession, location_ids: list[str]) -> int:
+    """location_id 목록의 최신 스캔을 한 번에 배치 스코어링 (trigger_ml_analysis의 배치 버전)."""
+    if not location_ids:
+        return 0
+    result = await session.execute(
+        select(
+            DrainageLatest.scan_id.label("id"),
+            DrainageLatest.location_id,
+            DrainageLatest.lat,
+            DrainageLatest.lng,
+            DrainageLatest.last_measured_lat,
+            DrainageLatest.last_measured_lng,
+            DrainageLatest.trash_vol_L,
+            DrainageLatest.volume_L,
+            DrainageLatest.max_height_mm,
+            DrainageLatest.elevation_type,
+            DrainageLatest.created_at,
+            DrainageLatest.cleaned_at,
+        ).where(DrainageLatest.location_id.in_(location_ids))
+    )
+    return await score_scan_chunk(session, result.all(), latest_only=True)
+
+
+async def score_unscored(
+    session: AsyncSession,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    max_rows: int | None = None,
+) -> int:
+    """
+    산출값(drain_analytics.ml_updated_at)이 없는 스캔을 id 순 청크로 읽어 배치 스코어링
+    (각 스캔 자신의 측정값 + 지점 기준 값).
+    Returns: 스코어링한 행 수.
+    """
+    last_id = 0
+    total = 0
+    while max_rows is None or total < max_rows:
+        limit = chunk_size if max_rows is None else min(chunk_size, max_rows - total)
+        result = await session.execute(
+            _scan_inputs()
+            .where(DrainAnalytics.ml_updated_at.is_(None), DrainScan.id > last_id)
+            .order_by(DrainScan.id)
+            .limit(limit)
         )
+        scans = result.all()
+        if not scans:
+            break
+        total += await score_scan_chunk(session, scans)
+        last_id = scans[-1].id
+    return total
+
+
+async def score_new_scans(
+    session: AsyncSession,
+    after_id: int,
+    gap_settled: Callable[[int], bool],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> tuple[int, int]:
+    """
+    high-water mark(after_id) 이후 스캔을 id 순으로 1청크 확인하고 그중 미분석 행만 스코어링.
+    id 빈 구간(아직 커밋되지 않은 트랜잭션이 잡은 id일 수 있음)에서는 gap_settled(빠진 첫 id)가 True일 때만 넘어감
+    — created_at(요청 시작 시각)이 아니라 id 순서로 진행하므로 오래 걸린 일괄 수신의 행도 건너뛰지 않음.
+    PK 범위만 읽으므로 전체 테이블의 ml_updated_at IS NULL 재조회가 필요 없음.
+    Returns: (스코어링 행 수, 새 high-water mark).
+    """
+    result = await session.execute(
+        _scan_inputs().where(DrainScan.id > after_id).order_by(DrainScan.id).limit(chunk_size)
     )
-    await session.flush()
+    high_water = after_id
+    pending = []
+    for scan in result.all():
+        if scan.id != high_water + 1 and not gap_settled(high_water + 1):
+            break
+        high_water = scan.id
+        if scan.ml_updated_at is None:
+            pending.append(scan)
+    return await score_scan_chunk(session, pending), high_water
 
 
 async def run_periodic_ml_update(session: AsyncSession) -> None:
     """
-    주기적으로 DB를 읽어 ML 분석 실행.
-    Celery/APScheduler 등으로 스케줄링 시 이 함수 호출.
+    DB 전체의 미분석 스캔을 배치 스코어링 (수동 일괄 실행용).
+    상시 주기 실행은 app.services.scheduler가 high-water mark 기반 증분 catch-up으로 수행.
     """
-    stmt = select(DrainageData).where(DrainageData.ml_updated_at.is_(None))
-    result = await session.execute(stmt)
-    rows = result.scalars().all()
-    for row in rows:
-        await trigger_ml_analysis(session, row.location_id)
-        await asyncio.sleep(0.1)  # 부하 완화
+    await score_unscored(session)
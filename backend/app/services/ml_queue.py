@@ -0,0 +1,273 @@
+"""ML 분석 작업 큐: DB 영속(ml_job) + 워커 풀.
+
+- 수신 트랜잭션 안에서 enqueue → 커밋되면 작업이 유실되지 않음 (재시작 후에도 처리)
+- location_id당 1행으로 병합: 처리 전 여러 번 수신돼도 최신 스캔 기준 분석 1회
+- 워커: 대기 작업을 최대 ml_worker_batch_size건 원자적으로 가져와(claim) 배치 스코어링
+- 실패 시 지수 backoff 재시도, ml_job_max_attempts 초과 시 failed로 보존 (last_error 기록)
+- API 응답 지연은 ML 비용과 무관 (enqueue는 upsert 1회)
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import and_, bindparam, case, delete, event, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import async_session, dialect_insert
+from app.models import MLJob
+from app.services.ml_pipeline import score_locations
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_ENQUEUED_KEY = "ml_jobs_enqueued"
+
+
+def _claimable(now: datetime):
+    """처리 가능한 작업: backoff가 끝난 pending, 또는 임대가 만료된 running(워커 비정상 종료)."""
+    return or_(
+        and_(MLJob.status == "pending", MLJob.available_at <= now),
+        and_(MLJob.status == "running", MLJob.locked_until < now),
+    )
+
+
+async def enqueue_ml_jobs(session: AsyncSession, location_ids: Iterable[str]) -> None:
+    """
+    location_id별 ML 분석 작업 등록 (호출 측 트랜잭션에 포함).
+    이미 대기/처리 중이면 requested_at만 갱신해 병합하고, failed면 재시도 카운트를 초기화해 다시 대기.
+    """
+    ids = list(dict.fromkeys(location_ids))
+    if not ids:
+        return
+    now = datetime.utcnow()
+    table = MLJob.__table__
+    stmt = dialect_insert(session)(table).values([
+        {
+            "location_id": lid,
+            "status": "pending",
+            "enqueued_at": now,
+            "requested_at": now,
+            "available_at": now,
+            "attempts": 0,
+        }
+        for lid in ids
+    ])
+    was_failed = table.c.status == "failed"
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.location_id],
+        set_={
+            "requested_at": stmt.excluded.requested_at,
+            "status": case((was_failed, "pending"), else_=table.c.status),
+            "attempts": case((was_failed, 0), else_=table.c.attempts),
+            "enqueued_at": case((was_failed, stmt.excluded.enqueued_at), else_=table.c.enqueued_at),
+            "available_at": case((was_failed, stmt.excluded.available_at), else_=table.c.available_at),
+        },
+    )
+    await session.execute(stmt)
+    session.info[_ENQUEUED_KEY] = True
+
+
+async def claim_jobs(session: AsyncSession, limit: int) -> list[tuple[str, datetime, int]]:
+    """처리할 작업을 원자적으로 running 상태로 전환. Returns: [(location_id, requested_at, attempts)]."""
+    now = datetime.utcnow()
+    candidates = (
+        select(MLJob.location_id)
+        .where(_claimable(now))
+        .order_by(MLJob.available_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await session.execute(
+        update(MLJob)
+        .where(MLJob.location_id.in_(candidates), _claimable(now))
+        .values(status="running", locked_until=now + timedelta(seconds=settings.ml_job_lease_seconds))
+        .returning(MLJob.location_id, MLJob.requested_at, MLJob.attempts)
+        .execution_options(synchronize_session=False)
+    )
+    return [tuple(r) for r in result.all()]
+
+
+async def _complete(session: AsyncSession, jobs: list[tuple[str, datetime, int]]) -> None:
+    """완료 처리: 처리 중 재요청이 없었던 작업은 삭제, 재요청된 작업은 다시 pending."""
+    table = MLJob.__table__
+    await session.execute(
+        delete(table).where(
+            table.c.location_id == bindparam("b_location_id"),
+            table.c.requested_at == bindparam("b_requested_at"),
+        ),
+        [{"b_location_id": lid, "b_requested_at": requested_at} for lid, requested_at, _ in jobs],
+    )
+    now = datetime.utcnow()
+    await session.execute(
+        update(MLJob)
+        .where(MLJob.location_id.in_([lid for lid, _, _ in jobs]), MLJob.status == "running")
+        .values(
+            status="pending",
+            attempts=0,
+            enqueued_at=MLJob.requested_at,
+            available_at=now,
+            locked_until=None,
+            last_error=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _backoff(attempts: int) -> timedelta:
+    delay = settings.ml_job_backoff_base_seconds * (2 ** max(0, attempts - 1))
+    return timedelta(seconds=min(delay, settings.ml_job_backoff_max_seconds))
+
+
+async def _fail(session: AsyncSession, job: tuple[str, datetime, int], error: BaseException) -> None:
+    """실패 처리: attempts 증가 + 지수 backoff, 최대 횟수 초과 시 failed."""
+    location_id, _, attempts = job
+    attempts += 1
+    exhausted = attempts >= settings.ml_job_max_attempts
+    await session.execute(
+        update(MLJob)
+        .where(MLJob.location_id == location_id)
+        .values(
+            status="failed" if exhausted else "pending",
+            attempts=attempts,
+            available_at=datetime.utcnow() + _backoff(attempts),
+            locked_until=None,
+            last_error=f"{error.__class__.__name__}: {error}"[:2000],
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+class MLWorkerPool:
+    """ml_job 큐를 처리하는 asyncio 워커 풀 (lifespan에서 start/stop)."""
+
+    def __init__(
+        self,
+        worker_count: int,
+        batch_size: int,
+        poll_seconds: float,
+    ) -> None:
+        self.worker_count = worker_count
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+        self.stats = {"processed": 0, "retried": 0, "exhausted": 0, "batches": 0}
+
+    @property
+    def active_workers(self) -> int:
+        return sum(1 for t in self._tasks if not t.done())
+
+    def notify(self) -> None:
+        """새 작업 커밋 알림 → 대기 중인 워커를 즉시 깨움."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._run(i), name=f"ml-worker-{i}") for i in range(self.worker_count)
+        ]
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, worker_id: int) -> None:
+        while not self._stopping:
+            # claim 전에 초기화해야 조회 직후 도착한 알림을 놓치지 않음
+            self._wakeup.clear()
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("ml-worker-%d: queue poll failed", worker_id)
+                processed = 0
+            if processed:
+                continue  # 남은 작업이 있을 수 있으므로 바로 다음 배치
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self) -> int:
+        """작업 1배치 처리. Returns: 가져온 작업 수."""
+        async with async_session() as session:
+            jobs = await claim_jobs(session, self.batch_size)
+            await session.commit()
+        if not jobs:
+            return 0
+        self.stats["batches"] += 1
+
+        try:
+            await self._process(jobs)
+        except Exception as e:
+            if len(jobs) == 1:
+                await self._record_failure(jobs[0], e)
+                return 1
+            # 배치 실패 시 문제 지점을 격리하기 위해 작업별로 재처리
+            logger.warning("ML batch of %d jobs failed; retrying individually", len(jobs), exc_info=True)
+            for job in jobs:
+                try:
+                    await self._process([job])
+                except Exception as e:
+                    await self._record_failure(job, e)
+        return len(jobs)
+
+    async def _process(self, jobs: list[tuple[str, datetime, int]]) -> None:
+        async with async_session() as session:
+            await score_locations(session, [lid for lid, _, _ in jobs])
+            await _complete(session, jobs)
+            await session.commit()
+        self.stats["processed"] += len(jobs)
+
+    async def _record_failure(self, job: tuple[str, datetime, int], error: BaseException) -> None:
+        logger.error("ML job failed for location_id=%s (attempt %d): %s", job[0], job[2] + 1, error)
+        async with async_session() as session:
+            await _fail(session, job, error)
+            await session.commit()
+        if job[2] + 1 >= settings.ml_job_max_attempts:
+            self.stats["exhausted"] += 1
+        else:
+            self.stats["retried"] += 1
+
+
+worker_pool = MLWorkerPool(
+    worker_count=settings.ml_worker_count,
+    batch_size=settings.ml_worker_batch_size,
+    poll_seconds=settings.ml_worker_poll_seconds,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session: Session) -> None:
+    if session.info.pop(_ENQUEUED_KEY, False):
+        worker_pool.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_enqueued(session: Session) -> None:
+    session.info.pop(_ENQUEUED_KEY, None)
+
+
+async def queue_metrics(session: AsyncSession) -> dict[str, Any]:
+    """큐 깊이(pending/running/failed)·최대 대기 시간(lag)·워커 누적 통계."""
+    result = await session.execute(select(MLJob.status, func.count()).group_by(MLJob.status))
+    counts = {status: n for status, n in result.all()}
+    oldest: Optional[datetime] = await session.scalar(
+        select(func.min(MLJob.enqueued_at)).where(MLJob.status.in_(("pending", "running")))
+    )
+    return {
+        "pending": counts.get("pending", 0),
+        "running": counts.get("running", 0),
+        "failed": counts.get("failed", 0),
+        "oldest_lag_seconds": (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0,
+        "workers": worker_pool.active_workers,
+        **worker_pool.stats,
+    }
@@ -0,0 +1,149 @@
+"""CRI 스코어링 수식: 단건(스칼라) / 배치(NumPy 벡터화) 공용.
+
+- fill_ratio: 쓰레기 부피(trash_vol_L, 150L 기준) 또는 volume_L·max_height_mm로 대체
+- CRI = int(fill_ratio × 100) + 저지대 가중치(LOWLAND_CRI_BOOST), 최대 100
+- 강우 예보(rain_mm, mm/h)가 있으면 강우 위험(rain_risk)을 침수 확률·우선순위에 반영 (CRI는 빗물받이 상태만 반영)
+  · rain_risk = min(1, rain_mm / RAIN_REFERENCE_MM × (0.5 + 0.5 × fill_ratio) × 저지대 배수)
+  · flood_probability = 1 − (1 − min(1, fill_ratio × 1.2)) × (1 − rain_risk)
+  · priority_score: CRI + int(RAIN_PRIORITY_BOOST × rain_risk) 기준 — 강우 없으면(0·None) 기존 값과 동일
+- 배치 결과는 스칼라 경로와 비트 단위로 동일해야 함 (scripts/bench_ml_scoring.py에서 검증)
+"""
+
+from collections.abc import Sequence
+from typing import Any, Optional
+
+import numpy as np
+
+# CRI 보정: 저지대일 때 가중치 (저지대 + 쓰레기 많음 = CRI 최고점)
+LOWLAND_CRI_BOOST = 15  # 0~100 기준 가점
+TRASH_REFERENCE_L = 150.0  # fill_ratio 1.0 기준 쓰레기 부피
+
+# 강우 보정 (app.services.rainfall 예보 격자 → 지점별 시간당 강우량)
+RAIN_REFERENCE_MM = 50.0  # 시간당 강우량 이 값에서 막힘 없는 빗물받이의 강우 위험 0.5 (호우경보 수준)
+LOWLAND_RAIN_MULTIPLIER = 1.5  # 저지대는 같은 비에도 물이 모임
+RAIN_PRIORITY_BOOST = 40  # 강우 위험 1.0일 때 우선순위 판정 CRI 가점
+
+RISK_REASONS = (
+    "저지대·쓰레기 과다로 즉시 점검 권장",
+    "부피 과다·유동인구 밀집",
+    "중간 수준 점검 권장",
+    "상대적으로 양호",
+)
+
+
+def _is_lowland(elevation_type: Optional[str]) -> bool:
+    return (elevation_type or "").strip().lower() == "lowland"
+
+
+def _priority(cri: int) -> int:
+    return 1 if cri >= 80 else (2 if cri >= 50 else 3)
+
+
+def score_row(
+    trash_vol_L: Optional[float],
+    volume_L: Optional[float],
+    max_height_mm: Optional[float],
+    elevation_type: Optional[str],
+    rain_mm: Optional[float] = None,
+) -> dict[str, Any]:
+    """스캔 1건 (+ 지점 예보 강우량 mm/h) → priority_score, risk_reason, flood_probability, cri."""
+    # 쓰레기 부피 기반 위험도 (0~1). trash_vol_L 없으면 volume_L·max_height로 대체
+    if trash_vol_L is not None:
+        fill_ratio = min(1.0, trash_vol_L / TRASH_REFERENCE_L)
+    else:
+        volume = volume_L or 0
+        height = max_height_mm or 0
+        fill_ratio = min(1.0, (volume / 100) * (height / 200)) if volume and height else 0
+
+    cri_base = int(fill_ratio * 100)
+    is_lowland = _is_lowland(elevation_type)
+    cri = min(100, cri_base + (LOWLAND_CRI_BOOST if is_lowland else 0))
+
+    flood_prob = min(1.0, fill_ratio * 1.2)
+    rain_risk = 0.0
+    if rain_mm is not None and rain_mm > 0:
+        # 막힌 빗물받이일수록 같은 비에 넘침 (fill_ratio 0 → 배수 절반 반영, 1 → 전부)
+        rain_risk = min(
+            1.0,
+            (rain_mm / RAIN_REFERENCE_MM) * (0.5 + 0.5 * fill_ratio) * (LOWLAND_RAIN_MULTIPLIER if is_lowland else 1.0),
+        )
+        flood_prob = 1.0 - (1.0 - flood_prob) * (1.0 - rain_risk)
+    priority = _priority(cri + int(RAIN_PRIORITY_BOOST * rain_risk))
+    reason = (
+        RISK_REASONS[0] if is_lowland and fill_ratio > 0.5
+        else RISK_REASONS[1] if fill_ratio > 0.7
+        else RISK_REASONS[2] if fill_ratio > 0.4
+        else RISK_REASONS[3]
+    )
+    return {
+        "priority_score": priority,
+        "risk_reason": reason,
+        "flood_probability": round(flood_prob, 3),
+        "cri": cri,
+    }
+
+
+def _to_float_array(values: Sequence[Optional[float]]) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def score_batch(
+    trash_vol_L: Sequence[Optional[float]],
+    volume_L: Sequence[Optional[float]],
+    max_height_mm: Sequence[Optional[float]],
+    elevation_type: Sequence[Optional[str]],
+    rain_mm: Optional[Sequence[Optional[float]]] = None,
+) -> dict[str, list[Any]]:
+    """
+    score_row의 벡터화 버전 (같은 길이의 컬럼 시퀀스 입력, rain_mm은 시퀀스 또는 NumPy 배열).
+    Returns: 컬럼별 리스트 {"priority_score", "risk_reason", "flood_probability", "cri", "fill_ratio"}.
+    """
+    trash = _to_float_array(trash_vol_L)
+    volume = np.nan_to_num(_to_float_array(volume_L), nan=0.0)
+    height = np.nan_to_num(_to_float_array(max_height_mm), nan=0.0)
+    lowland = np.fromiter((_is_lowland(e) for e in elevation_type), dtype=bool, count=len(trash))
+
+    has_trash = ~np.isnan(trash)
+    fill_trash = np.minimum(1.0, np.where(has_trash, trash, 0.0) / TRASH_REFERENCE_L)
+    fill_vh = np.where(
+        (volume != 0) & (height != 0),
+        np.minimum(1.0, (volume / 100) * (height / 200)),
+        0.0,
+    )
+    fill_ratio = np.where(has_trash, fill_trash, fill_vh)
+
+    # fill_ratio ≥ 0 이므로 정수 변환(절삭) = int()
+    cri_base = (fill_ratio * 100).astype(np.int64)
+    cri = np.minimum(100, cri_base + np.where(lowland, LOWLAND_CRI_BOOST, 0))
+    flood_prob = np.minimum(1.0, fill_ratio * 1.2)
+    rain_risk = np.zeros(len(trash))
+    if rain_mm is not None:
+        rain = rain_mm.astype(np.float64) if isinstance(rain_mm, np.ndarray) else _to_float_array(rain_mm)
+        rain = np.nan_to_num(rain, nan=0.0)
+        raining = rain > 0
+        rain_risk = np.where(
+            raining,
+            np.minimum(
+                1.0,
+                (rain / RAIN_REFERENCE_MM) * (0.5 + 0.5 * fill_ratio) * np.where(lowland, LOWLAND_RAIN_MULTIPLIER, 1.0),
+            ),
+            0.0,
+        )
+        # 강우 없는 지점은 기존 식 그대로 (1 − (1 − p)은 부동소수점에서 p와 다를 수 있음)
+        flood_prob = np.where(raining, 1.0 - (1.0 - flood_prob) * (1.0 - rain_risk), flood_prob)
+    # rain_risk ≥ 0 이므로 정수 변환(절삭) = int()
+    boosted = cri + (RAIN_PRIORITY_BOOST * rain_risk).astype(np.int64)
+    priority = np.where(boosted >= 80, 1, np.where(boosted >= 50, 2, 3))
+    reason_idx = np.select(
+        [lowland & (fill_ratio > 0.5), fill_ratio > 0.7, fill_ratio > 0.4],
+        [0, 1, 2],
+        default=3,
+    )
+    return {
+        "priority_score": priority.tolist(),
+        "risk_reason": [RISK_REASONS[i] for i in reason_idx.tolist()],
+        # np.round은 Python round와 반올림 방식이 달라 요소별 round 사용 (스칼라 경로와 동일 결과 보장)
+        "flood_probability": [round(f, 3) for f in flood_prob.tolist()],
+        "cri": cri.tolist(),
+        "fill_ratio": fill_ratio.tolist(),
+    }
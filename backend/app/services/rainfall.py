@@ -0,0 +1,518 @@
+"""강우 예보 반영: 격자 강우량(mm/h)으로 침수 확률·우선순위를 도시 전체 일괄 재계산.
+
+- 예보 수신: CSV(lat·lng·강우량 열의 긴 형식) / NetCDF(1차원 위도·경도 좌표 + 강우 변수, netCDF4 패키지 필요)
+  → 정규 위경도 격자 float32 배열로 rainfall_forecast에 저장 (행 id = 예보 버전)
+- 적용 예보: 유효 구간(valid_from ≤ 현재 < valid_to) 안에서 발표가 가장 늦은 예보, 없으면 강우 0 (기존 점수로 복귀)
+- 재계산: drainage_latest를 location_id keyset 청크로 읽어 GPS 우선 좌표 → 최근접 격자 셀(벡터 연산) → score_batch(rain_mm)
+  → flood_probability·priority_score가 바뀐 지점만 drain_analytics·drainage_latest에 executemany
+  (지역 집계·변경 통지·데이터 버전 스탬프는 update_latest_analytics_many 경로 그대로)
+- 이력: 바뀐 점수를 rainfall_score에 (예보 id, 스캔 id, 지점 강우량)과 함께 기록, rainfall_history_days 지나면 삭제
+- ML 분석(작업 큐·catch-up)도 적용 중인 예보의 강우량으로 산출 → 폭우 중 새 스캔이 강우 반영 점수를 되돌리지 않음
+- 예보 교체·만료는 RainfallScheduler가 주기적으로 확인해 적용 (app.services.scheduler) — 리더 임대 안에서만 재계산,
+  적용 예보 표시는 마지막 청크 커밋 뒤
+"""
+
+import csv
+import io
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models import DrainageLatest, RainfallForecast, RainfallScore
+from app.services.drainage_latest import update_latest_analytics_many
+from app.services.ml_scoring import score_batch
+from app.services.scans import upsert_scan_analytics
+from app.services.spatial import effective_coords
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+GRID_CACHE_SIZE = 4  # 디코딩한 예보 격자 보관 수 (적용 중 + 교체 직전 예보)
+_AXIS_TOLERANCE = 1e-3  # 격자 간격 대비 허용 오차 (좌표 반올림)
+
+# CSV 헤더 이름 (소문자 비교)
+LAT_COLUMNS = ("lat", "latitude", "위도", "y")
+LNG_COLUMNS = ("lng", "lon", "long", "longitude", "경도", "x")
+RAIN_COLUMNS = ("rain_mm", "rain", "rainfall", "precip", "precipitation", "rn1", "pcp", "value", "강우량")
+# NetCDF 좌표 변수 이름
+NC_LAT_NAMES = ("lat", "latitude", "y")
+NC_LNG_NAMES = ("lon", "lng", "longitude", "x")
+
+
+@dataclass(frozen=True)
+class ForecastGrid:
+    """정규 위경도 격자: values[i, j] = (lat0 + i·dlat, lng0 + j·dlng) 셀 중심의 강우량 (dlat·dlng > 0)."""
+
+    lat0: float
+    lng0: float
+    dlat: float
+    dlng: float
+    values: np.ndarray  # float32 [n_lat, n_lng], NaN = 결측
+
+    def rain_at(self, lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+        """좌표 배열 → 최근접 셀 강우량 (mm/h). 격자 밖·결측·좌표 없음(NaN)은 0."""
+        n_lat, n_lng = self.values.shape
+        iy = np.rint((np.asarray(lat, dtype=np.float64) - self.lat0) / self.dlat)
+        ix = np.rint((np.asarray(lng, dtype=np.float64) - self.lng0) / self.dlng)
+        inside = (iy >= 0) & (iy < n_lat) & (ix >= 0) & (ix < n_lng)  # NaN 비교는 False
+        rain = np.zeros(len(iy))
+        rain[inside] = self.values[iy[inside].astype(np.intp), ix[inside].astype(np.intp)]
+        return np.nan_to_num(rain, nan=0.0)
+
+
+@dataclass
+class RecomputeStats:
+    forecast_id: Optional[int]  # 적용한 예보 (None이면 강우 없음으로 복귀)
+    drains: int = 0  # 재계산한 빗물받이 수 (ML 산출값이 있는 지점)
+    raining: int = 0  # 지점 강우량 > 0
+    changed: int = 0  # 점수·강우량이 바뀌어 기록한 지점
+    read_ms: float = 0.0
+    score_ms: float = 0.0
+    write_ms: float = 0.0
+
+
+# === 예보 파일 → 격자 ===
+
+def _axis(values: np.ndarray, name: str) -> tuple[float, float, int]:
+    """정렬된 고유 좌표 → (시작, 간격, 개수). 간격이 일정하지 않으면 ValueError."""
+    if len(values) < 2:
+        raise ValueError(f"{name} 좌표가 2개 이상이어야 합니다 (정규 격자).")
+    step = float(np.min(np.diff(values)))
+    if step <= 0:
+        raise ValueError(f"{name} 좌표가 중복되었습니다.")
+    cells = int(np.rint((values[-1] - values[0]) / step))
+    step = float(values[-1] - values[0]) / cells  # 최소 간격 대신 전체 폭으로 (좌표 반올림 오차 완화)
+    offsets = (values - values[0]) / step
+    if np.max(np.abs(offsets - np.rint(offsets))) > _AXIS_TOLERANCE:
+        raise ValueError(f"{name} 좌표 간격이 일정하지 않습니다 (정규 격자만 지원).")
+    return float(values[0]), step, cells + 1
+
+
+def _check_size(n_lat: int, n_lng: int) -> None:
+    if n_lat * n_lng > settings.rainfall_max_grid_cells:
+        raise ValueError(f"격자 셀이 너무 많습니다 ({n_lat}×{n_lng}, 최대 {settings.rainfall_max_grid_cells}).")
+
+
+def grid_from_points(lat: np.ndarray, lng: np.ndarray, rain: np.ndarray) -> ForecastGrid:
+    """격자 셀 중심 점 목록(긴 형식) → 정규 격자. 빠진 셀은 NaN, 같은 셀이 중복되면 큰 값."""
+    lat0, dlat, n_lat = _axis(np.unique(lat), "위도")
+    lng0, dlng, n_lng = _axis(np.unique(lng), "경도")
+    _check_size(n_lat, n_lng)
+    values = np.full((n_lat, n_lng), np.nan, dtype=np.float32)
+    iy = np.rint((lat - lat0) / dlat).astype(np.intp)
+    ix = np.rint((lng - lng0) / dlng).astype(np.intp)
+    np.fmax.at(values, (iy, ix), rain.astype(np.float32))
+    return ForecastGrid(lat0, lng0, dlat, dlng, values)
+
+
+def grid_from_axes(lat: np.ndarray, lng: np.ndarray, values: np.ndarray) -> ForecastGrid:
+    """1차원 위도·경도 축 + [n_lat, n_lng] 값 → 격자 (내림차순 축은 뒤집어 간격을 양수로)."""
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float32)
+    if values.shape != (len(lat), len(lng)):
+        raise ValueError(f"강우 배열 모양 {values.shape}이 좌표 ({len(lat)}, {len(lng)})와 맞지 않습니다.")
+    if len(lat) > 1 and lat[1] < lat[0]:
+        lat, values = lat[::-1], values[::-1, :]
+    if len(lng) > 1 and lng[1] < lng[0]:
+        lng, values = lng[::-1], values[:, ::-1]
+    lat0, dlat, n_lat = _axis(lat, "위도")
+    lng0, dlng, n_lng = _axis(lng, "경도")
+    if (n_lat, n_lng) != values.shape:
+        raise ValueError("좌표 축에 빠진 값이 있습니다 (정규 격자만 지원).")
+    _check_size(n_lat, n_lng)
+    return ForecastGrid(lat0, lng0, dlat, dlng, np.ascontiguousarray(values))
+
+
+def _find_column(header: list[str], names: Sequence[str], label: str) -> int:
+    lowered = [h.strip().lower() for h in header]
+    for name in names:
+        if name in lowered:
+            return lowered.index(name)
+    raise ValueError(f"CSV에 {label} 열이 없습니다 (가능한 이름: {', '.join(names)}).")
+
+
+def parse_csv_grid(data: bytes) -> ForecastGrid:
+    """CSV 긴 형식 (헤더 필수: 위도·경도·강우량 열, 행마다 셀 중심 1개) → 격자."""
+    reader = csv.reader(io.StringIO(data.decode("utf-8-sig")))
+    header = next(reader, None)
+    if not header:
+        raise ValueError("CSV가 비어 있습니다.")
+    cols = (
+        _find_column(header, LAT_COLUMNS, "위도"),
+        _find_column(header, LNG_COLUMNS, "경도"),
+        _find_column(header, RAIN_COLUMNS, "강우량"),
+    )
+    lat: list[float] = []
+    lng: list[float] = []
+    rain: list[float] = []
+    for line_no, row in enumerate(reader, start=2):
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        try:
+            y, x, r = (row[c].strip() for c in cols)
+            lat.append(float(y))
+            lng.append(float(x))
+            rain.append(float(r) if r else np.nan)
+        except (IndexError, ValueError):
+            raise ValueError(f"CSV {line_no}행을 읽을 수 없습니다: {','.join(row)[:80]}")
+    if not lat:
+        raise ValueError("CSV에 격자 행이 없습니다.")
+    return grid_from_points(np.array(lat), np.array(lng), np.array(rain))
+
+
+def parse_netcdf_grid(data: bytes, variable: Optional[str] = None) -> ForecastGrid:
+    """
+    NetCDF → 격자. 1차원 위도·경도 좌표 변수와 마지막 두 차원이 (위도, 경도)인 강우 변수 (variable 미지정 시 첫 변수).
+    앞 차원(예보 시간 등)이 있으면 셀별 최대값 — 예보 구간의 최대 시간당 강우량.
+    """
+    try:
+        import netCDF4
+    except ImportError:
+        raise ValueError("NetCDF 예보는 netCDF4 패키지가 필요합니다 (pip install netCDF4). CSV 격자를 사용하세요.")
+
+    with netCDF4.Dataset("forecast.nc", mode="r", memory=data) as ds:
+        lat_name = next((n for n in NC_LAT_NAMES if n in ds.variables), None)
+        lng_name = next((n for n in NC_LNG_NAMES if n in ds.variables), None)
+        if lat_name is None or lng_name is None:
+            raise ValueError("NetCDF에 위도·경도 좌표 변수가 없습니다.")
+        lat_var, lng_var = ds.variables[lat_name], ds.variables[lng_name]
+        if lat_var.ndim != 1 or lng_var.ndim != 1:
+            raise ValueError("NetCDF 위도·경도는 1차원 좌표여야 합니다 (정규 격자만 지원).")
+        axes = (lat_var.dimensions[0], lng_var.dimensions[0])
+        if variable is None:
+            variable = next(
+                (n for n, v in ds.variables.items() if v.ndim >= 2 and tuple(v.dimensions[-2:]) == axes),
+                None,
+            )
+        if variable is None or variable not in ds.variables:
+            raise ValueError(f"NetCDF 강우 변수를 찾을 수 없습니다: {variable or '(위도·경도 차원 변수 없음)'}")
+        var = ds.variables[variable]
+        if tuple(var.dimensions[-2:]) != axes:
+            raise ValueError(f"NetCDF 변수 {variable}의 마지막 두 차원이 (위도, 경도)가 아닙니다.")
+        values = np.ma.filled(np.ma.asarray(var[:], dtype=np.float32), np.nan)
+        lat = np.asarray(lat_var[:], dtype=np.float64)
+        lng = np.asarray(lng_var[:], dtype=np.float64)
+    if values.ndim > 2:
+        values = np.fmax.reduce(values.reshape(-1, *values.shape[-2:]), axis=0)
+    return grid_from_axes(lat, lng, values)
+
+
+def parse_forecast(data: bytes, fmt: Optional[str] = None, variable: Optional[str] = None) -> ForecastGrid:
+    """fmt: csv | netcdf (None이면 파일 시그니처로 판별 — NetCDF3 'CDF', NetCDF4/HDF5)."""
+    if fmt is None:
+        fmt = "netcdf" if data[:3] == b"CDF" or data[:8] == b"\x89HDF\r\n\x1a\n" else "csv"
+    if fmt == "netcdf":
+        return parse_netcdf_grid(data, variable)
+    if fmt == "csv":
+        return parse_csv_grid(data)
+    raise ValueError(f"지원하지 않는 예보 형식: {fmt} (csv | netcdf)")
+
+
+# === 저장·조회 ===
+
+async def store_forecast(
+    session: AsyncSession,
+    grid: ForecastGrid,
+    issued_at: datetime,
+    valid_from: datetime,
+    valid_to: datetime,
+    source: Optional[str] = None,
+) -> RainfallForecast:
+    if valid_to <= valid_from:
+        raise ValueError("valid_to는 valid_from보다 늦어야 합니다.")
+    finite = grid.values[np.isfinite(grid.values)]
+    forecast = RainfallForecast(
+        source=source,
+        issued_at=issued_at,
+        valid_from=valid_from,
+        valid_to=valid_to,
+        lat0=grid.lat0,
+        lng0=grid.lng0,
+        dlat=grid.dlat,
+        dlng=grid.dlng,
+        n_lat=grid.values.shape[0],
+        n_lng=grid.values.shape[1],
+        grid=grid.values.astype("<f4").tobytes(),
+        max_rain_mm=float(finite.max()) if len(finite) else None,
+        mean_rain_mm=float(finite.mean()) if len(finite) else None,
+        created_at=datetime.utcnow(),
+    )
+    session.add(forecast)
+    await session.flush()
+    return forecast
+
+
+_grid_cache: "OrderedDict[int, ForecastGrid]" = OrderedDict()
+
+
+async def load_grid(session: AsyncSession, forecast_id: int) -> Optional[ForecastGrid]:
+    """예보 격자 (디코딩 결과는 GRID_CACHE_SIZE개까지 캐시 — 예보 행은 저장 후 바뀌지 않음)."""
+    grid = _grid_cache.get(forecast_id)
+    if grid is not None:
+        _grid_cache.move_to_end(forecast_id)
+        return grid
+    row = (
+        await session.execute(
+            select(
+                RainfallForecast.lat0, RainfallForecast.lng0, RainfallForecast.dlat, RainfallForecast.dlng,
+                RainfallForecast.n_lat, RainfallForecast.n_lng, RainfallForecast.grid,
+            ).where(RainfallForecast.id == forecast_id)
+        )
+    ).one_or_none()
+    if row is None:
+        return None
+    values = np.frombuffer(row.grid, dtype="<f4").reshape(row.n_lat, row.n_lng)
+    grid = ForecastGrid(row.lat0, row.lng0, row.dlat, row.dlng, values)
+    _grid_cache[forecast_id] = grid
+    while len(_grid_cache) > GRID_CACHE_SIZE:
+        _grid_cache.popitem(last=False)
+    return grid
+
+
+async def active_forecast_id(session: AsyncSession, now: Optional[datetime] = None) -> Optional[int]:
+    """지금 유효한 예보 중 발표가 가장 늦은 예보."""
+    now = now or datetime.utcnow()
+    return await session.scalar(
+        select(RainfallForecast.id)
+        .where(RainfallForecast.valid_from <= now, RainfallForecast.valid_to > now)
+        .order_by(RainfallForecast.issued_at.desc(), RainfallForecast.id.desc())
+        .limit(1)
+    )
+
+
+async def applied_forecast_id(session: AsyncSession) -> Optional[int]:
+    """현재 점수에 반영 중인 예보 (applied_at 있고 cleared_at 없음)."""
+    return await session.scalar(
+        select(RainfallForecast.id)
+        .where(RainfallForecast.applied_at.is_not(None), RainfallForecast.cleared_at.is_(None))
+        .order_by(RainfallForecast.applied_at.desc(), RainfallForecast.id.desc())
+        .limit(1)
+    )
+
+
+def _effective_coords(lat: Sequence, lng: Sequence, measured_lat: Sequence, measured_lng: Sequence) -> tuple[np.ndarray, np.ndarray]:
+    """effective_coords(GPS 우선)의 벡터 버전: 앱 실측 좌표가 둘 다 있으면 사용, 없는 값은 NaN."""
+    lat, lng, measured_lat, measured_lng = (np.array(v, dtype=np.float64) for v in (lat, lng, measured_lat, measured_lng))
+    measured = ~np.isnan(measured_lat) & ~np.isnan(measured_lng)
+    return np.where(measured, measured_lat, lat), np.where(measured, measured_lng, lng)
+
+
+def _coords(rows: Sequence[Any]) -> tuple[np.ndarray, np.ndarray]:
+    """lat·lng·last_measured_lat/lng 속성을 가진 행(스캔·최신 상태) → GPS 우선 좌표 배열."""
+    return _effective_coords(
+        [r.lat for r in rows], [r.lng for r in rows], [r.last_measured_lat for r in rows], [r.last_measured_lng for r in rows]
+    )
+
+
+async def current_rain(session: AsyncSession, rows: Sequence[Any]) -> tuple[Optional[int], np.ndarray]:
+    """
+    ML 분석용: 적용 중인 예보 id와 행별 강우량 (좌표 컬럼을 가진 스캔·최신 상태 행).
+    적용 중인 예보가 없으면 (None, 0 배열).
+    """
+    forecast_id = await applied_forecast_id(session)
+    grid = await load_grid(session, forecast_id) if forecast_id is not None else None
+    if grid is None:
+        return None, np.zeros(len(rows))
+    return forecast_id, grid.rain_at(*_coords(rows))
+
+
+def provenance(forecast_id: Optional[int], rain_mm: float) -> dict[str, Any]:
+    """drainage_latest 강우 보정 컬럼: 지점에 비가 올 때만 예보 id·강우량 (강우 0이면 NULL)."""
+    if forecast_id is None or rain_mm <= 0:
+        return {"forecast_id": None, "forecast_rain_mm": None}
+    return {"forecast_id": forecast_id, "forecast_rain_mm": round(float(rain_mm), 2)}
+
+
+async def record_scores(
+    session: AsyncSession,
+    forecast_id: Optional[int],
+    rows: Sequence[dict[str, Any]],
+    now: datetime,
+) -> None:
+    """점수 이력 기록: ML 산출 행({"location_id", "scan_id", "flood_probability", "priority_score", ...}) 목록."""
+    if not rows:
+        return
+    await session.execute(
+        RainfallScore.__table__.insert(),
+        [
+            {
+                "forecast_id": forecast_id,
+                "location_id": r["location_id"],
+                "scan_id": r["scan_id"],
+                "rain_mm": r.get("forecast_rain_mm") or 0.0,
+                "flood_probability": r["flood_probability"],
+                "priority_score": r["priority_score"],
+                "computed_at": now,
+            }
+            for r in rows
+        ],
+    )
+
+
+# === 재계산 ===
+
+def _score_columns():
+    return (
+        DrainageLatest.location_id,
+        DrainageLatest.scan_id,
+        DrainageLatest.lat,
+        DrainageLatest.lng,
+        DrainageLatest.last_measured_lat,
+        DrainageLatest.last_measured_lng,
+        DrainageLatest.trash_vol_L,
+        DrainageLatest.volume_L,
+        DrainageLatest.max_height_mm,
+        DrainageLatest.elevation_type,
+        DrainageLatest.flood_probability,
+        DrainageLatest.priority_score,
+        DrainageLatest.forecast_id,
+        DrainageLatest.forecast_rain_mm,
+    )
+
+
+async def _recompute_chunk(
+    session: AsyncSession,
+    rows: Sequence[Any],
+    forecast_id: Optional[int],
+    grid: Optional[ForecastGrid],
+    stats: RecomputeStats,
+) -> None:
+    t0 = time.perf_counter()
+    # Row 속성 접근 대신 컬럼별로 한 번에 전치 (_score_columns 순서)
+    (
+        location_id, scan_id, lat, lng, measured_lat, measured_lng,
+        trash_vol_L, volume_L, max_height_mm, elevation_type, *previous,
+    ) = zip(*rows)
+    rain = grid.rain_at(*_effective_coords(lat, lng, measured_lat, measured_lng)) if grid is not None else np.zeros(len(rows))
+    scores = score_batch(trash_vol_L, volume_L, max_height_mm, elevation_type, rain_mm=rain)
+
+    # 바뀐 지점만: (침수 확률, 우선순위, 예보 id, 지점 강우량) 비교 — None은 NaN으로 같게 취급
+    raining = rain > 0 if forecast_id is not None else np.zeros(len(rows), dtype=bool)
+    rain_list = rain.tolist()
+    rain_mm = [round(x, 2) for x in rain_list]
+    new = np.column_stack([
+        scores["flood_probability"],
+        scores["priority_score"],
+        np.where(raining, forecast_id if forecast_id is not None else np.nan, np.nan),
+        np.where(raining, rain_mm, np.nan),
+    ])
+    old = np.array(previous, dtype=np.float64).T
+    same = (old == new) | (np.isnan(old) & np.isnan(new))
+    now = datetime.utcnow()
+    changed = [
+        {
+            "location_id": location_id[i],
+            "scan_id": scan_id[i],
+            "flood_probability": scores["flood_probability"][i],
+            "priority_score": scores["priority_score"][i],
+            **provenance(forecast_id, rain_list[i]),
+            "ml_updated_at": now,
+        }
+        for i in np.flatnonzero(~same.all(axis=1)).tolist()
+    ]
+    t1 = time.perf_counter()
+
+    await upsert_scan_analytics(session, changed)
+    await update_latest_analytics_many(session, changed)
+    await record_scores(session, forecast_id, changed, now)
+    stats.drains += len(rows)
+    stats.raining += int(np.count_nonzero(raining))
+    stats.changed += len(changed)
+    stats.score_ms += (t1 - t0) * 1000
+    stats.write_ms += (time.perf_counter() - t1) * 1000
+
+
+async def _recompute_all(
+    session: AsyncSession,
+    forecast_id: Optional[int],
+    grid: Optional[ForecastGrid],
+    stats: RecomputeStats,
+    chunk_size: int,
+    after_scan_id: Optional[int] = None,
+) -> None:
+    """drainage_latest를 location_id keyset 청크로 재계산, 청크마다 커밋. after_scan_id: 그보다 새 스캔의 지점만."""
+    last = ""
+    while True:
+        t0 = time.perf_counter()
+        stmt = select(*_score_columns()).where(
+            DrainageLatest.location_id > last, DrainageLatest.ml_updated_at.is_not(None)
+        )
+        if after_scan_id is not None:
+            stmt = stmt.where(DrainageLatest.scan_id > after_scan_id)
+        rows = (await session.execute(stmt.order_by(DrainageLatest.location_id).limit(chunk_size))).all()
+        stats.read_ms += (time.perf_counter() - t0) * 1000
+        if not rows:
+            return
+        await _recompute_chunk(session, rows, forecast_id, grid, stats)
+        await session.commit()
+        last = rows[-1].location_id
+
+
+async def apply_forecast(
+    session: AsyncSession,
+    forecast_id: Optional[int],
+    chunk_size: Optional[int] = None,
+) -> RecomputeStats:
+    """
+    drainage_latest 전체의 침수 확률·우선순위를 forecast_id 예보(None이면 강우 없음)로 재계산한 뒤 적용 예보로 표시.
+    리더 임대를 가진 RainfallScheduler에서만 호출 (여러 워커·요청이 동시에 재계산하지 않음).
+    - 표시(applied_at·cleared_at)는 마지막 청크 커밋 뒤 — 중간에 실패하면 적용 예보가 그대로라 다음 sync_forecast가 다시 실행
+    - 재계산 중 수신된 스캔은 이전 예보로 분석되므로, 표시 후 시작 시점보다 새 스캔의 지점만 한 번 더 재계산
+    """
+    chunk_size = chunk_size or settings.rainfall_recompute_chunk_size
+    stats = RecomputeStats(forecast_id)
+    grid = await load_grid(session, forecast_id) if forecast_id is not None else None
+    scan_mark = await session.scalar(select(func.coalesce(func.max(DrainageLatest.scan_id), 0)))
+    await session.commit()
+    await _recompute_all(session, forecast_id, grid, stats, chunk_size)
+
+    now = datetime.utcnow()
+    applied = RainfallForecast.applied_at.is_not(None) & RainfallForecast.cleared_at.is_(None)
+    if forecast_id is not None:
+        applied &= RainfallForecast.id != forecast_id
+        await session.execute(
+            update(RainfallForecast)
+            .where(RainfallForecast.id == forecast_id)
+            .values(applied_at=now, cleared_at=None)
+        )
+    await session.execute(update(RainfallForecast).where(applied).values(cleared_at=now))
+    await session.commit()
+    await _recompute_all(session, forecast_id, grid, stats, chunk_size, after_scan_id=scan_mark)
+    logger.info(
+        "rainfall forecast %s applied: %d drains (%d raining), %d changed",
+        forecast_id if forecast_id is not None else "-", stats.drains, stats.raining, stats.changed,
+    )
+    return stats
+
+
+async def sync_forecast(session: AsyncSession, now: Optional[datetime] = None) -> Optional[RecomputeStats]:
+    """지금 유효한 예보가 적용 중인 예보와 다르면 적용 (만료 시 강우 없음으로 복귀). 같으면 None."""
+    active = await active_forecast_id(session, now)
+    if active == await applied_forecast_id(session):
+        return None
+    return await apply_forecast(session, active)
+
+
+async def prune_rainfall_history(session: AsyncSession, now: Optional[datetime] = None) -> tuple[int, int]:
+    """보존 기간(rainfall_history_days)이 지난 점수 이력·만료 예보 삭제. Returns: (이력 행 수, 예보 수)."""
+    if settings.rainfall_history_days <= 0:
+        return 0, 0
+    cutoff = (now or datetime.utcnow()) - timedelta(days=settings.rainfall_history_days)
+    scores = await session.execute(delete(RainfallScore).where(RainfallScore.computed_at < cutoff))
+    forecasts = await session.execute(
+        delete(RainfallForecast).where(
+            RainfallForecast.valid_to < cutoff,
+            or_(RainfallForecast.applied_at.is_(None), RainfallForecast.cleared_at.is_not(None)),
+        )
+    )
+    return scores.rowcount or 0, forecasts.rowcount or 0
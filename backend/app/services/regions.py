@@ -0,0 +1,403 @@
+"""행정구역(시도·시군구) 배정과 지역별 위험 집계.
+
+- 경계: app/data/district_boundaries.geojson(또는 district_boundaries_path)의 시군구 경계 GeoJSON (EPSG:4326, 브이월드 LT_C_ADSIGG_INFO 속성 sig_cd·sig_kor_nm·full_nm)
+  → scripts/fetch_district_boundaries.py로 로컬 저장, 파일이 없으면 배정·집계 없이 동작
+- 배정: 격자 셀 → 후보 폴리곤 → bbox → 짝홀 광선 교차(NumPy 벡터화) point-in-polygon.
+  drainage_latest upsert 시 GPS 우선 좌표로 district_code(시군구 코드) 저장
+- 집계: region_stats(시군구당 1행)를 drainage_latest 변경 전/후 행의 차이로 같은 트랜잭션에서 증분 갱신
+  · 개수·CRI 합/개수·priority 1 개수·쓰레기 부피 합은 가감, 최대 CRI만 해당 시군구 인덱스(district_code, cri)로 재계산
+  · 같은 지점을 동시에 처음 수신하는 등 드문 경합 오차는 리더 작업이 주기적으로 전체 재집계해 보정
+- 조회: GET /drainage/regions · Chat 컨텍스트는 region_stats만 읽음 (O(시군구 수), 시도는 시군구 행 합산)
+"""
+
+import json
+import logging
+import math
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import bindparam, case, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import dialect_insert
+from app.models import DrainageLatest, RegionStats
+from app.services.spatial import effective_coords
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+DEFAULT_BOUNDARIES_PATH = Path(__file__).resolve().parent.parent / "data" / "district_boundaries.geojson"
+INDEX_CELL_DEG = 0.05  # 폴리곤 후보 격자 (시군구 1곳이 수~수십 셀)
+_PIP_CHUNK = 256  # point-in-polygon 1회 행렬 연산의 점 수 (점 × 변 행렬 크기 제한)
+
+# 시군구 코드 앞 2자리 → 시도 (full_nm 속성이 없는 경계 파일용, 강원·전북은 특별자치도 전환 전후 코드 모두)
+SIDO_BY_CODE = {
+    "11": "서울특별시", "26": "부산광역시", "27": "대구광역시", "28": "인천광역시",
+    "29": "광주광역시", "30": "대전광역시", "31": "울산광역시", "36": "세종특별자치시",
+    "41": "경기도", "42": "강원특별자치도", "51": "강원특별자치도", "43": "충청북도",
+    "44": "충청남도", "45": "전북특별자치도", "52": "전북특별자치도", "46": "전라남도",
+    "47": "경상북도", "48": "경상남도", "50": "제주특별자치도",
+}
+
+
+@dataclass(frozen=True)
+class District:
+    code: str
+    sido: str
+    sigungu: str
+
+
+class _Polygon(NamedTuple):
+    district: District
+    bbox: tuple[float, float, float, float]  # min_lng, min_lat, max_lng, max_lat
+    x1: np.ndarray  # 모든 링(외곽·구멍, MultiPolygon 각 부분)의 변 시작/끝 좌표 (경도 x, 위도 y)
+    y1: np.ndarray
+    x2: np.ndarray
+    y2: np.ndarray
+    slope: np.ndarray  # dx/dy (수평 변은 0 — 교차 판정에서 제외됨)
+
+
+def _prop(props: dict[str, Any], key: str) -> Optional[str]:
+    value = props.get(key, props.get(key.upper()))
+    return str(value).strip() if value not in (None, "") else None
+
+
+def _district(props: dict[str, Any]) -> Optional[District]:
+    code = _prop(props, "sig_cd")
+    sigungu = _prop(props, "sig_kor_nm")
+    if not code or not sigungu:
+        return None
+    full = _prop(props, "full_nm")
+    sido = full.split()[0] if full else SIDO_BY_CODE.get(code[:2], "")
+    return District(code, sido, sigungu)
+
+
+def _rings(geometry: dict[str, Any]) -> list[list[list[float]]]:
+    if geometry.get("type") == "Polygon":
+        return geometry["coordinates"]
+    if geometry.get("type") == "MultiPolygon":
+        return [ring for polygon in geometry["coordinates"] for ring in polygon]
+    return []
+
+
+def _polygon(district: District, rings: list[list[list[float]]]) -> Optional[_Polygon]:
+    starts, ends = [], []
+    for ring in rings:
+        points = np.asarray(ring, dtype=np.float64)[:, :2]
+        if len(points) < 3:
+            continue
+        starts.append(points)
+        ends.append(np.roll(points, -1, axis=0))  # 닫히지 않은 링도 처리 (닫힌 링의 마지막 변은 길이 0)
+    if not starts:
+        return None
+    a, b = np.concatenate(starts), np.concatenate(ends)
+    dy = b[:, 1] - a[:, 1]
+    slope = np.divide(b[:, 0] - a[:, 0], dy, out=np.zeros_like(dy), where=dy != 0)
+    return _Polygon(
+        district,
+        (float(a[:, 0].min()), float(a[:, 1].min()), float(a[:, 0].max()), float(a[:, 1].max())),
+        a[:, 0], a[:, 1], b[:, 0], b[:, 1], slope,
+    )
+
+
+class DistrictIndex:
+    """시군구 경계 point-in-polygon 색인 (프로세스당 1개, 읽기 전용)."""
+
+    def __init__(self, polygons: Sequence[_Polygon]) -> None:
+        self.polygons = list(polygons)
+        self.districts = {p.district.code: p.district for p in self.polygons}
+        self._grid: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for k, p in enumerate(self.polygons):
+            min_lng, min_lat, max_lng, max_lat = p.bbox
+            for cy in range(math.floor(min_lat / INDEX_CELL_DEG), math.floor(max_lat / INDEX_CELL_DEG) + 1):
+                for cx in range(math.floor(min_lng / INDEX_CELL_DEG), math.floor(max_lng / INDEX_CELL_DEG) + 1):
+                    self._grid[(cy, cx)].append(k)
+
+    @classmethod
+    def from_geojson(cls, data: dict[str, Any]) -> "DistrictIndex":
+        polygons = []
+        for feature in data.get("features", []):
+            district = _district(feature.get("properties") or {})
+            polygon = district and _polygon(district, _rings(feature.get("geometry") or {}))
+            if polygon:
+                polygons.append(polygon)
+        return cls(polygons)
+
+    def __len__(self) -> int:
+        return len(self.districts)
+
+    def _contains(self, p: _Polygon, lng: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        inside = np.zeros(len(lng), dtype=bool)
+        for s in range(0, len(lng), _PIP_CHUNK):
+            px = lng[s:s + _PIP_CHUNK, None]
+            py = lat[s:s + _PIP_CHUNK, None]
+            crosses = ((p.y1 > py) != (p.y2 > py)) & (px < p.x1 + (py - p.y1) * p.slope)
+            inside[s:s + _PIP_CHUNK] = np.count_nonzero(crosses, axis=1) % 2 == 1
+        return inside
+
+    def locate_many(self, lat: Sequence[Optional[float]], lng: Sequence[Optional[float]]) -> list[Optional[str]]:
+        """좌표 목록 → 시군구 코드 목록 (좌표 없음·경계 밖은 None). 후보 폴리곤별로 점을 모아 벡터 판정."""
+        codes: list[Optional[str]] = [None] * len(lat)
+        pending: dict[int, list[int]] = defaultdict(list)
+        for i, (y, x) in enumerate(zip(lat, lng)):
+            if y is None or x is None:
+                continue
+            for k in self._grid.get((math.floor(y / INDEX_CELL_DEG), math.floor(x / INDEX_CELL_DEG)), ()):
+                pending[k].append(i)
+        for k, idx in pending.items():
+            p = self.polygons[k]
+            idx = [i for i in idx if codes[i] is None]
+            if not idx:
+                continue
+            ys = np.array([lat[i] for i in idx], dtype=np.float64)
+            xs = np.array([lng[i] for i in idx], dtype=np.float64)
+            in_box = (xs >= p.bbox[0]) & (ys >= p.bbox[1]) & (xs <= p.bbox[2]) & (ys <= p.bbox[3])
+            if not in_box.any():
+                continue
+            hit = np.zeros(len(idx), dtype=bool)
+            hit[in_box] = self._contains(p, xs[in_box], ys[in_box])
+            for i in np.asarray(idx)[hit].tolist():
+                codes[i] = p.district.code
+        return codes
+
+    def locate(self, lat: Optional[float], lng: Optional[float]) -> Optional[str]:
+        return self.locate_many([lat], [lng])[0]
+
+
+def load_district_index(path: Optional[str] = None) -> DistrictIndex:
+    path = Path(path or settings.district_boundaries_path or DEFAULT_BOUNDARIES_PATH)
+    if not path.exists():
+        logger.warning("district boundaries not found at %s; regional aggregates disabled", path)
+        return DistrictIndex([])
+    with path.open(encoding="utf-8") as f:
+        index = DistrictIndex.from_geojson(json.load(f))
+    logger.info("loaded %d district boundaries from %s", len(index), path)
+    return index
+
+
+@lru_cache
+def get_district_index() -> DistrictIndex:
+    return load_district_index()
+
+
+def locate_district(lat: Optional[float], lng: Optional[float]) -> Optional[str]:
+    """GPS 우선 좌표 → 시군구 코드 (drainage_latest upsert 시 호출)."""
+    return get_district_index().locate(lat, lng)
+
+
+# --- 증분 집계 ---
+
+
+class RegionRow(NamedTuple):
+    """집계에 쓰이는 drainage_latest 컬럼 (변경 전/후 1행)."""
+
+    district_code: Optional[str]
+    cri: Optional[int]
+    priority_score: Optional[int]
+    trash_vol_L: Optional[float]
+
+
+REGION_COLUMNS = (
+    DrainageLatest.district_code,
+    DrainageLatest.cri,
+    DrainageLatest.priority_score,
+    DrainageLatest.trash_vol_L,
+)
+_DELTA_FIELDS = ("drain_count", "cri_count", "cri_sum", "priority1_count", "trash_vol_L")
+
+
+def region_row(row: Any) -> RegionRow:
+    return RegionRow(row.district_code, row.cri, row.priority_score, row.trash_vol_L)
+
+
+def _names(code: str) -> dict[str, Optional[str]]:
+    district = get_district_index().districts.get(code)
+    return {"sido": district.sido if district else None, "sigungu": district.sigungu if district else None}
+
+
+def _max_cri_subquery():
+    return (
+        select(func.max(DrainageLatest.cri))
+        .where(DrainageLatest.district_code == RegionStats.district_code)
+        .scalar_subquery()
+    )
+
+
+async def apply_region_deltas(
+    session: AsyncSession,
+    before: Iterable[RegionRow],
+    after: Iterable[RegionRow],
+) -> None:
+    """
+    drainage_latest 변경 전/후 행 → region_stats 가감 upsert 1회 + 바뀐 시군구 최대 CRI 재계산 1회.
+    drainage_latest를 갱신한 뒤(같은 트랜잭션) 호출. 새 지점은 before 없이, 값이 같으면 변화 없음.
+    """
+    deltas: dict[str, list[float]] = {}
+    for sign, rows in ((-1, before), (1, after)):
+        for row in rows:
+            if row.district_code is None:
+                continue
+            d = deltas.setdefault(row.district_code, [0, 0, 0.0, 0, 0.0])
+            d[0] += sign
+            if row.cri is not None:
+                d[1] += sign
+                d[2] += sign * row.cri
+            d[3] += sign * (row.priority_score == 1)
+            d[4] += sign * (row.trash_vol_L or 0.0)
+    deltas = {code: d for code, d in deltas.items() if any(d)}
+    if not deltas:
+        return
+
+    now = datetime.utcnow()
+    table = RegionStats.__table__
+    stmt = dialect_insert(session)(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.district_code],
+        set_={
+            **{name: table.c[name] + stmt.excluded[name] for name in _DELTA_FIELDS},
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    await session.execute(
+        stmt,
+        [
+            {"district_code": code, **_names(code), **dict(zip(_DELTA_FIELDS, d)), "updated_at": now}
+            for code, d in deltas.items()
+        ],
+    )
+    await session.execute(
+        update(RegionStats)
+        .where(RegionStats.district_code.in_(list(deltas)))
+        .values(max_cri=_max_cri_subquery())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def rebuild_region_stats(session: AsyncSession) -> int:
+    """drainage_latest 전체에서 region_stats 재집계 (init·주기 보정용, O(빗물받이 수)). Returns: 시군구 수."""
+    result = await session.execute(
+        select(
+            DrainageLatest.district_code,
+            func.count().label("drain_count"),
+            func.count(DrainageLatest.cri).label("cri_count"),
+            func.coalesce(func.sum(DrainageLatest.cri), 0).label("cri_sum"),
+            func.max(DrainageLatest.cri).label("max_cri"),
+            func.sum(case((DrainageLatest.priority_score == 1, 1), else_=0)).label("priority1_count"),
+            func.coalesce(func.sum(DrainageLatest.trash_vol_L), 0.0).label("trash_vol_L"),
+        )
+        .where(DrainageLatest.district_code.is_not(None))
+        .group_by(DrainageLatest.district_code)
+    )
+    now = datetime.utcnow()
+    rows = [{**row._mapping, **_names(row.district_code), "updated_at": now} for row in result.all()]
+    await session.execute(delete(RegionStats))
+    if rows:
+        await session.execute(RegionStats.__table__.insert(), rows)
+    return len(rows)
+
+
+async def assign_districts(session: AsyncSession, only_missing: bool = True) -> int:
+    """
+    drainage_latest 시군구 코드 일괄 배정 (경계 파일 추가·교체 후). only_missing이면 코드가 없는 행만.
+    Returns: 코드가 바뀐 행 수 — 0보다 크면 rebuild_region_stats로 재집계 필요.
+    """
+    index = get_district_index()
+    if not len(index):
+        return 0
+    stmt = select(
+        DrainageLatest.location_id,
+        DrainageLatest.district_code,
+        DrainageLatest.lat,
+        DrainageLatest.lng,
+        DrainageLatest.last_measured_lat,
+        DrainageLatest.last_measured_lng,
+    )
+    if only_missing:
+        stmt = stmt.where(DrainageLatest.district_code.is_(None))
+    rows = (await session.execute(stmt)).all()
+    coords = [effective_coords(r.lat, r.lng, r.last_measured_lat, r.last_measured_lng) for r in rows]
+    codes = index.locate_many([c[0] for c in coords], [c[1] for c in coords])
+    changed = [
+        {"b_location_id": r.location_id, "b_district_code": code}
+        for r, code in zip(rows, codes)
+        if code != r.district_code
+    ]
+    if changed:
+        table = DrainageLatest.__table__
+        await session.execute(
+            update(table)
+            .where(table.c.location_id == bindparam("b_location_id"))
+            .values(district_code=bindparam("b_district_code")),
+            changed,
+        )
+    return len(changed)
+
+
+async def ensure_region_stats(session: AsyncSession) -> None:
+    """init 시: 코드 없는 행 배정, 배정이 바뀌었거나 집계가 비어 있으면 재집계."""
+    assigned = await assign_districts(session)
+    if assigned or not await session.scalar(select(func.count()).select_from(RegionStats)):
+        count = await rebuild_region_stats(session)
+        if count:
+            logger.info("region stats rebuilt for %d districts (%d drains newly assigned)", count, assigned)
+
+
+# --- 조회 ---
+
+
+@dataclass
+class RegionSummary:
+    sido: str
+    sigungu: Optional[str]  # 시도 단위 합산이면 None
+    district_code: Optional[str]
+    drain_count: int
+    mean_cri: Optional[float]
+    max_cri: Optional[int]
+    priority1_count: int
+    trash_vol_L: float
+
+
+def _summary(sido: str, sigungu: Optional[str], code: Optional[str], rows: Sequence[RegionStats]) -> RegionSummary:
+    cri_count = sum(r.cri_count for r in rows)
+    max_values = [r.max_cri for r in rows if r.max_cri is not None]
+    return RegionSummary(
+        sido=sido,
+        sigungu=sigungu,
+        district_code=code,
+        drain_count=sum(r.drain_count for r in rows),
+        mean_cri=round(sum(r.cri_sum for r in rows) / cri_count, 1) if cri_count else None,
+        max_cri=max(max_values) if max_values else None,
+        priority1_count=sum(r.priority1_count for r in rows),
+        trash_vol_L=round(sum(r.trash_vol_L for r in rows), 1),
+    )
+
+
+async def get_region_summaries(
+    session: AsyncSession,
+    level: str = "sigungu",
+    sido: Optional[str] = None,
+) -> list[RegionSummary]:
+    """
+    region_stats → 지역별 요약 (level: sigungu | sido, sido로 시도 한정). 평균 CRI 높은 순.
+    빗물받이가 없는 시군구(모두 이동·삭제)는 제외.
+    """
+    stmt = select(RegionStats).where(RegionStats.drain_count > 0)
+    if sido:
+        stmt = stmt.where(RegionStats.sido == sido)
+    rows = (await session.execute(stmt)).scalars().all()
+    if level == "sido":
+        groups: dict[str, list[RegionStats]] = defaultdict(list)
+        for row in rows:
+            groups[row.sido or ""].append(row)
+        summaries = [_summary(name, None, None, group) for name, group in groups.items()]
+    else:
+        summaries = [_summary(row.sido or "", row.sigungu, row.district_code, [row]) for row in rows]
+    summaries.sort(key=lambda s: (s.mean_cri is None, -(s.mean_cri or 0), -s.drain_count))
+    return summaries
@@ -0,0 +1,362 @@
+"""질문 기반 컨텍스트 검색: 질문에서 조건을 추출해 인덱스 조회 → 순위화 → 토큰 예산 내 압축 표.
+
+- 추출: location_id, 지역명(구·동·로·길), CRI/침수 확률 임계값, 우선순위, 저지대·결함, 상위 N, 정렬 의도
+- 조회: 지정 지점은 PK 조회, 나머지는 조건 + 정렬 키 인덱스(cri, flood_probability, priority_score) LIMIT
+- 지역: 시군구·시도 이름이나 '구별/지역별' 비교 질문이면 지역 집계(region_stats) 요약 표를 함께 첨부
+- 출력: 질문에 필요한 컬럼만 CSV 형식 (str(dict) 대비 프롬프트 토큰 대폭 감소), retrieval_token_budget 초과 시 행 생략
+"""
+
+import csv
+import io
+import math
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models import DrainageLatest
+from app.services.intent_router import extract_location_ids, normalize
+from app.services.regions import RegionSummary, get_region_summaries
+
+settings = get_settings()
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+REGION_LIMIT = 30  # 지역 비교 질문에 첨부하는 시군구 수 상한 (평균 CRI 높은 순)
+BASE_COLUMNS = ("location_id", "cri", "priority_score", "flood_probability", "risk_reason")
+
+# 질문 키워드 → 추가 컬럼
+_TOPIC_COLUMNS: tuple[tuple[re.Pattern, tuple[str, ...]], ...] = (
+    (re.compile(r"쓰레기|부피|가득|꽉|차\s*있|용량"), ("trash_vol_L", "volume_L")),
+    (re.compile(r"높이|수위"), ("max_height_mm",)),
+    (re.compile(r"저지대|고지대|지대"), ("elevation_type",)),
+    (re.compile(r"청소|주기"), ("cleaned_at", "cycle_days")),
+    (re.compile(r"결함|파손|균열|침하"), ("defect_status",)),
+    (re.compile(r"최근|스캔|측정|언제"), ("created_at",)),
+    (re.compile(r"유동\s*인구"), ("foot_traffic_score",)),
+    (re.compile(r"이름|명칭"), ("name",)),
+)
+DETAIL_COLUMNS = (
+    "name", "address", "elevation_type", "trash_vol_L", "volume_L", "max_height_mm",
+    "cleaned_at", "cycle_days", "defect_status", "created_at",
+)
+
+# 정렬 키만 사용 (동점 tie-breaker를 붙이면 인덱스 순서를 못 써서 동점 행 전체를 정렬하게 됨)
+_SORTS: dict[str, tuple[str, Any]] = {
+    "risk": ("CRI 높은 순", (DrainageLatest.cri.desc(),)),
+    "flood": ("침수 확률 높은 순", (DrainageLatest.flood_probability.desc(),)),
+    "priority": ("우선순위 순", (DrainageLatest.priority_score, DrainageLatest.cri.desc())),
+    "trash": ("쓰레기 부피 큰 순", (DrainageLatest.trash_vol_L.desc(),)),
+    "recent": ("최근 스캔 순", (DrainageLatest.created_at.desc(), DrainageLatest.location_id.desc())),
+    "stale_cleaning": ("청소 오래된 순", (DrainageLatest.cleaned_at,)),
+}
+_SORT_KEY_COLUMN = {
+    "risk": "cri",
+    "flood": "flood_probability",
+    "priority": "priority_score",
+    "trash": "trash_vol_L",
+}
+_SORT_HINTS = (
+    (re.compile(r"침수"), "flood"),
+    (re.compile(r"우선\s*순위"), "priority"),
+    (re.compile(r"쓰레기|가득|꽉|부피"), "trash"),
+    (re.compile(r"청소\s*(안|못|오래)|오래\s*(된|전)"), "stale_cleaning"),
+    (re.compile(r"최근|방금|새로"), "recent"),
+)
+
+_REGION = re.compile(r"([가-힣0-9]{1,10}(?:특별시|광역시|시|군|구|읍|면|동|로|길|역)|[가-힣]{1,10}\d{1,2}가)(?![가-힣])")
+_REGION_STOPWORDS = {"이동", "자동", "행동", "활동", "작동", "변동", "가동", "어디역", "지역", "구역", "전역", "이번구"}
+_REGION_SUMMARY = re.compile(r"(?:구|군|시|시도|시군구|자치구|지역|동네)\s*별|지역\s*(?:현황|비교|순위|집계)|어느\s*(?:구|지역|동네)")
+_CMP = r"\s*(이상|이하|초과|미만|넘는|넘|보다\s*높|보다\s*낮|아래|위)?"
+_CRI = re.compile(r"cri\s*(?:가|는|이)?\s*(\d{1,3})" + _CMP)
+_FLOOD = re.compile(r"침수\s*(?:확률|위험)?\s*(?:이|가)?\s*(\d{1,3}(?:\.\d+)?)\s*(%|퍼센트)?" + _CMP)
+_PRIORITY = re.compile(r"우선\s*순위\s*(?:가|는|이)?\s*([1-3])(?!\d)")
+_TOP_N = re.compile(r"(?:top|상위)\s*(\d{1,3})|(\d{1,3})\s*(?:개|곳|건|군데)(?!\s*(?:이상|이하))")
+
+
+@dataclass
+class QueryFilters:
+    location_ids: list[str] = field(default_factory=list)
+    regions: list[str] = field(default_factory=list)
+    cri_min: Optional[int] = None
+    cri_max: Optional[int] = None
+    flood_min: Optional[float] = None
+    flood_max: Optional[float] = None
+    priority: Optional[int] = None
+    lowland: bool = False
+    defect: bool = False
+    region_summary: bool = False  # 구별·지역별 비교 질문
+    limit: int = DEFAULT_LIMIT
+    sort: str = "risk"
+    extra_columns: list[str] = field(default_factory=list)
+
+    @property
+    def has_conditions(self) -> bool:
+        return bool(
+            self.regions or self.cri_min is not None or self.cri_max is not None
+            or self.flood_min is not None or self.flood_max is not None
+            or self.priority is not None or self.lowland or self.defect
+        )
+
+    def describe(self) -> str:
+        parts = []
+        if self.location_ids:
+            parts.append("location_id=" + ",".join(self.location_ids))
+        if self.regions:
+            parts.append("지역=" + ",".join(self.regions))
+        if self.cri_min is not None:
+            parts.append(f"CRI≥{self.cri_min}")
+        if self.cri_max is not None:
+            parts.append(f"CRI≤{self.cri_max}")
+        if self.flood_min is not None:
+            parts.append(f"침수확률≥{self.flood_min:g}")
+        if self.flood_max is not None:
+            parts.append(f"침수확률≤{self.flood_max:g}")
+        if self.priority is not None:
+            parts.append(f"우선순위={self.priority}")
+        if self.lowland:
+            parts.append("저지대")
+        if self.defect:
+            parts.append("결함 있음")
+        return " · ".join(parts) or "조건 없음"
+
+
+def _is_upper_bound(op: Optional[str]) -> bool:
+    return bool(op) and any(k in op for k in ("이하", "미만", "낮", "아래"))
+
+
+def parse_query(query: str) -> QueryFilters:
+    """질문 → 검색 조건 (규칙 기반, LLM 호출 없음)."""
+    text = normalize(query)
+    f = QueryFilters(location_ids=extract_location_ids(query))
+    scrubbed = text
+    for lid in f.location_ids:
+        scrubbed = scrubbed.replace(lid.lower(), " ")
+
+    f.regions = [
+        r for r in dict.fromkeys(m.group(1) for m in _REGION.finditer(scrubbed))
+        if r not in _REGION_STOPWORDS and not r[0].isdigit()
+    ]
+    if m := _CRI.search(scrubbed):
+        value, op = int(m.group(1)), m.group(2)
+        if _is_upper_bound(op):
+            f.cri_max = value
+        else:
+            f.cri_min = value
+    if m := _FLOOD.search(scrubbed):
+        value = float(m.group(1))
+        value = value / 100 if m.group(2) or value > 1 else value
+        if _is_upper_bound(m.group(3)):
+            f.flood_max = value
+        else:
+            f.flood_min = value
+    if m := _PRIORITY.search(scrubbed):
+        f.priority = int(m.group(1))
+    f.region_summary = bool(_REGION_SUMMARY.search(scrubbed))
+    f.lowland = "저지대" in scrubbed
+    f.defect = bool(re.search(r"결함|파손|균열|침하", scrubbed))
+    if m := _TOP_N.search(scrubbed):
+        f.limit = min(MAX_LIMIT, int(m.group(1) or m.group(2)))
+    for pattern, sort in _SORT_HINTS:
+        if pattern.search(scrubbed):
+            f.sort = sort
+            break
+    for pattern, columns in _TOPIC_COLUMNS:
+        if pattern.search(scrubbed):
+            f.extra_columns.extend(c for c in columns if c not in f.extra_columns)
+    if f.regions and "address" not in f.extra_columns:
+        f.extra_columns.append("address")
+    return f
+
+
+def _conditions(f: QueryFilters) -> list:
+    t = DrainageLatest
+    conds = []
+    if f.regions:
+        conds.append(or_(*[or_(t.address.contains(r), t.name.contains(r)) for r in f.regions]))
+    if f.cri_min is not None:
+        conds.append(t.cri >= f.cri_min)
+    if f.cri_max is not None:
+        conds.append(t.cri <= f.cri_max)
+    if f.flood_min is not None:
+        conds.append(t.flood_probability >= f.flood_min)
+    if f.flood_max is not None:
+        conds.append(t.flood_probability <= f.flood_max)
+    if f.priority is not None:
+        conds.append(t.priority_score == f.priority)
+    if f.lowland:
+        conds.append(func.lower(func.trim(t.elevation_type)) == "lowland")
+    if f.defect:
+        conds.append(func.lower(t.defect_status).not_in(("none", "")))  # NULL도 제외됨
+    return conds
+
+
+@dataclass
+class RetrievalResult:
+    filters: QueryFilters
+    columns: list[str]
+    rows: list[dict[str, Any]]
+    matched: Optional[int]  # 조건 일치 행 수 (조건이 없으면 None)
+    missing_ids: list[str]
+    regions: list[RegionSummary] = field(default_factory=list)
+
+
+async def _region_context(session: AsyncSession, f: QueryFilters) -> list[RegionSummary]:
+    """질문에 언급된 시군구·시도 집계, 지역 비교 질문이면 시군구 전체(상위 REGION_LIMIT곳)."""
+    if not f.regions and not f.region_summary:
+        return []
+    summaries = await get_region_summaries(session)
+    named = set(f.regions)
+    sidos = {s.sido for s in summaries if s.sido in named}
+    if f.region_summary:
+        return [s for s in summaries if not sidos or s.sido in sidos][:REGION_LIMIT]
+    return [s for s in summaries if s.sigungu in named or s.sido in named][:REGION_LIMIT]
+
+
+async def retrieve(session: AsyncSession, query: str, location_id: Optional[str] = None) -> RetrievalResult:
+    f = parse_query(query)
+    if location_id and location_id not in f.location_ids:
+        f.location_ids.insert(0, location_id)
+
+    columns = list(BASE_COLUMNS)
+    extra = list(f.extra_columns)
+    if f.location_ids:
+        extra = [*DETAIL_COLUMNS]  # 지정 지점은 상세 컬럼 전부
+    columns += [c for c in extra if c not in columns]
+    select_cols = [getattr(DrainageLatest, c) for c in columns]
+
+    rows: list[dict[str, Any]] = []
+    missing: list[str] = []
+    if f.location_ids:
+        result = await session.execute(select(*select_cols).where(DrainageLatest.location_id.in_(f.location_ids)))
+        found = {r.location_id: dict(r._mapping) for r in result.all()}
+        rows = [found[lid] for lid in f.location_ids if lid in found]
+        missing = [lid for lid in f.location_ids if lid not in found]
+
+    matched = None
+    # 지점만 지정한 질문(조건 없음)은 해당 지점만, 그 외에는 조건/정렬로 순위화한 목록 추가
+    if not f.location_ids or f.has_conditions:
+        conds = _conditions(f)
+        stmt = select(*select_cols).where(*conds)
+        if f.location_ids:
+            stmt = stmt.where(DrainageLatest.location_id.not_in(f.location_ids))
+        _, order_by = _SORTS[f.sort]
+        sort_column = _SORT_KEY_COLUMN.get(f.sort)
+        if sort_column:
+            # 정렬 키가 있는 행을 인덱스 순서로 먼저, 모자라면 미분석(NULL) 행으로 채움 (NULL 정렬 방언 차이 회피)
+            key = getattr(DrainageLatest, sort_column)
+            result = await session.execute(stmt.where(key.is_not(None)).order_by(*order_by).limit(f.limit))
+            ranked = [dict(r._mapping) for r in result.all()]
+            if len(ranked) < f.limit:
+                result = await session.execute(stmt.where(key.is_(None)).limit(f.limit - len(ranked)))
+                ranked += [dict(r._mapping) for r in result.all()]
+            rows += ranked
+        else:
+            result = await session.execute(stmt.order_by(*order_by).limit(f.limit))
+            rows += [dict(r._mapping) for r in result.all()]
+        if f.has_conditions:
+            matched = await session.scalar(select(func.count()).select_from(DrainageLatest).where(*conds))
+    return RetrievalResult(f, columns, rows, matched, missing, await _region_context(session, f))
+
+
+def estimate_tokens(text: str) -> int:
+    """프롬프트 토큰 근사치 (Llama-3 BPE 기준: ASCII 약 4자당 1토큰, 한글 약 1자당 1토큰)."""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars))
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.3g}" if abs(value) < 1 else f"{value:.1f}".rstrip("0").rstrip(".")
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M")
+    return str(value)
+
+
+_HEADER_ALIASES = {"priority_score": "priority", "flood_probability": "flood_prob"}
+LEGEND = "[열] priority: 1=최우선~3, flood_prob: 침수 확률(0~1), cri: 위험지수(0~100, 저지대 가중)"
+
+
+def _append_regions(lines: list[str], regions: list[RegionSummary], token_budget: int) -> int:
+    """지역 집계 CSV 표를 lines에 추가 (token_budget 이내). Returns: 사용한 토큰 수."""
+    header = "[지역별 집계] sido,sigungu,drains,mean_cri,max_cri,priority1,trash_vol_L"
+    lines.append(header)
+    used = estimate_tokens(header) + 1
+    for shown, r in enumerate(regions):
+        line = ",".join(_cell(v) for v in (
+            r.sido, r.sigungu, r.drain_count, r.mean_cri, r.max_cri, r.priority1_count, r.trash_vol_L
+        ))
+        cost = estimate_tokens(line) + 1
+        if shown and used + cost > token_budget:
+            lines.append(f"... 외 {len(regions) - shown}곳 생략 (토큰 예산)")
+            break
+        lines.append(line)
+        used += cost
+    return used
+
+
+def format_context(result: RetrievalResult, token_budget: int) -> str:
+    """검색 결과 → 토큰 예산 내 CSV 표. 예산을 넘는 행은 생략하고 생략 수를 표기."""
+    f = result.filters
+    sort_label, _ = _SORTS[f.sort]
+    summary = f"[조회 조건] {f.describe()} · 정렬: {sort_label}"
+    if result.matched is not None:
+        summary += f" · 일치 {result.matched}건"
+    lines = [summary, LEGEND]
+    if result.missing_ids:
+        lines.append("[데이터 없음] " + ", ".join(result.missing_ids))
+
+    used = estimate_tokens("\n".join(lines))
+    if result.regions:
+        used += _append_regions(lines, result.regions, token_budget // 2)
+
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow([_HEADER_ALIASES.get(c, c) for c in result.columns])
+    lines.append(buf.getvalue().rstrip("\n"))
+    used += estimate_tokens(lines[-1]) + 1
+
+    shown = 0
+    for row in result.rows:
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow([_cell(row[c]) for c in result.columns])
+        line = buf.getvalue().rstrip("\n")
+        cost = estimate_tokens(line) + 1
+        if shown and used + cost > token_budget:
+            break
+        lines.append(line)
+        used += cost
+        shown += 1
+    if shown < len(result.rows):
+        lines.append(f"... 외 {len(result.rows) - shown}건 생략 (토큰 예산)")
+    if not result.rows:
+        lines.append("(조건에 맞는 빗물받이 없음)")
+    return "\n".join(lines)
+
+
+async def retrieve_context(
+    session: AsyncSession, query: str, location_id: Optional[str] = None
+) -> tuple[Optional[str], int]:
+    """
+    질문에 맞는 컨텍스트 표와 표에 담긴 DB 행 수(빗물받이 + 지역 집계). DB가 비어 있으면 (None, 0).
+    행 수가 0이 아니면 답변이 현재 데이터에 의존 (응답 캐시 유효성 범위 판단용).
+    """
+    result = await retrieve(session, query, location_id)
+    if not result.rows and not result.missing_ids and not result.regions:
+        has_any = await session.scalar(select(DrainageLatest.location_id).limit(1))
+        if has_any is None:
+            return None, 0
+    return format_context(result, settings.retrieval_token_budget), len(result.rows) + len(result.regions)
+
+
+async def build_context(session: AsyncSession, query: str, location_id: Optional[str] = None) -> Optional[str]:
+    """질문에 맞는 컨텍스트 표. DB가 비어 있으면 None."""
+    context, _ = await retrieve_context(session, query, location_id)
+    return context
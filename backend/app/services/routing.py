@@ -0,0 +1,610 @@
+"""청소 동선 최적화: CRI 가중 다중 크루 경로 (브라우저 computeOptimalRoute의 서버 버전).
+
+- 후보: drainage_latest에서 min_cri 이상인 빗물받이 (GPS 우선 좌표), 가중치 = CRI × priority 배수
+- 구성: 가중치 ÷ 추가 소요 시간이 큰 후보부터 가장 싼 크루 경로 위치에 삽입 (prize-collecting 삽입,
+  모든 경로·위치의 추가 거리를 NumPy 벡터 연산으로 한 번에 평가).
+  크루별 수거 용량(L)·방문 수·근무 시간(이동 + 작업) 제약 — 넣을 곳이 없으면 미배정 (멀고 위험도 낮은 곳부터 빠짐)
+- 시간 예산(time_budget_ms): 준비·구성·개선 전체의 마감. 구성이 마감에 닿으면 남은 후보는 미배정,
+  개선은 구성 후 남은 시간 동안 반복하고 줄어든 시간만큼 미배정 후보 재삽입
+  · 2-opt: 경로별 haversine 거리 행렬로 모든 구간 뒤집기 개선량을 한 번에 계산해 최선 이동 적용
+  · Or-opt: 1~3곳 구간을 다른 위치·다른 크루 경로로 이동 — 배정된 지점의 KD-tree k-최근접 이웃 주변만 평가
+CPU 연산이므로 API·도구는 asyncio.to_thread로 실행.
+"""
+
+import asyncio
+import heapq
+import math
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DrainageLatest
+from app.services.spatial import EARTH_RADIUS_M, BBox, bbox_clause, effective_coords
+
+PRIORITY_WEIGHT = {1: 2.0, 2: 1.5, 3: 1.0}  # priority_score별 CRI 가중치 배수
+NEIGHBOR_K = 12
+KD_LEAF_SIZE = 32
+OR_OPT_MAX_SEGMENT = 3
+_EPS = 1e-6
+
+
+@dataclass(frozen=True)
+class Crew:
+    crew_id: str
+    lat: float
+    lng: float
+    capacity_L: Optional[float] = None  # 수거 용량 (방문 지점 trash_vol_L 합)
+    max_stops: Optional[int] = None
+    shift_minutes: Optional[float] = None  # 근무 시간 (이동 + 작업)
+
+
+@dataclass(frozen=True)
+class RouteCandidate:
+    location_id: str
+    lat: float
+    lng: float
+    cri: Optional[int] = None
+    priority_score: Optional[int] = None
+    trash_vol_L: Optional[float] = None
+    name: Optional[str] = None
+    address: Optional[str] = None
+
+    @property
+    def weight(self) -> float:
+        return max(self.cri or 0, 1) * PRIORITY_WEIGHT.get(self.priority_score, 1.0)
+
+
+@dataclass(frozen=True)
+class RouteOptions:
+    speed_kmh: float = 20.0
+    service_minutes: float = 10.0
+    return_to_start: bool = True
+    time_budget_ms: float = 1000.0
+
+
+@dataclass
+class RouteStop:
+    candidate: RouteCandidate
+    arrival_min: float  # 출발 후 도착까지 (이동 + 앞선 지점 작업 시간)
+    distance_from_prev_m: float
+
+
+@dataclass
+class CrewRoute:
+    crew: Crew
+    stops: list[RouteStop]
+    distance_m: float
+    duration_min: float
+    load_L: float
+    weight: float
+
+
+@dataclass
+class RoutePlan:
+    routes: list[CrewRoute]
+    unassigned: list[RouteCandidate]
+    stats: dict[str, float] = field(default_factory=dict)
+
+
+# === 거리 · KD-tree ===
+
+def haversine_matrix(lat1: Sequence[float], lng1: Sequence[float], lat2: Sequence[float], lng2: Sequence[float]) -> np.ndarray:
+    """좌표 배열(도) 간 대원 거리 행렬 (m): len(lat1) × len(lat2)."""
+    p1 = np.radians(np.asarray(lat1, dtype=np.float64))[:, None]
+    p2 = np.radians(np.asarray(lat2, dtype=np.float64))[None, :]
+    dl = np.radians(np.asarray(lng2, dtype=np.float64))[None, :] - np.radians(np.asarray(lng1, dtype=np.float64))[:, None]
+    a = np.sin((p2 - p1) / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _haversine_pairs(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """좌표 쌍별 대원 거리 (m, 브로드캐스트)."""
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    dl = np.radians(lng2) - np.radians(lng1)
+    a = np.sin((p2 - p1) / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def project(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """위경도 → 평면 좌표 (m, 중심 위도 기준 등장방형 투영). 도시 규모에서 haversine과 거의 같음."""
+    lat0 = math.radians(float(np.mean(lat))) if len(lat) else 0.0
+    return np.column_stack((
+        np.radians(lng) * EARTH_RADIUS_M * math.cos(lat0),
+        np.radians(lat) * EARTH_RADIUS_M,
+    ))
+
+
+class KDTree:
+    """정적 2차원 KD-tree. 전체 점의 k-최근접 이웃을 leaf 단위 NumPy 거리 연산으로 일괄 계산."""
+
+    def __init__(self, points: np.ndarray, leaf_size: int = KD_LEAF_SIZE) -> None:
+        self.points = points
+        self._lo: list[tuple[float, float]] = []
+        self._hi: list[tuple[float, float]] = []
+        self._children: list[Optional[tuple[int, int]]] = []
+        self._members: list[Optional[np.ndarray]] = []
+        self.leaves: list[int] = []
+        if len(points):
+            self._build(np.arange(len(points)), leaf_size)
+
+    def _build(self, idx: np.ndarray, leaf_size: int) -> int:
+        node = len(self._lo)
+        pts = self.points[idx]
+        lo, hi = pts.min(axis=0), pts.max(axis=0)
+        self._lo.append((float(lo[0]), float(lo[1])))
+        self._hi.append((float(hi[0]), float(hi[1])))
+        self._children.append(None)
+        self._members.append(None)
+        if len(idx) <= leaf_size:
+            self._members[node] = idx
+            self.leaves.append(node)
+            return node
+        axis = int(np.argmax(hi - lo))
+        mid = len(idx) // 2
+        order = np.argpartition(pts[:, axis], mid)
+        left = self._build(idx[order[:mid]], leaf_size)
+        right = self._build(idx[order[mid:]], leaf_size)
+        self._children[node] = (left, right)
+        return node
+
+    def _leaves_within(self, lo: tuple[float, float], hi: tuple[float, float], r: float) -> list[int]:
+        """상자(lo, hi)에서 거리 r 이내에 있는 leaf 목록."""
+        found, stack = [], [0]
+        while stack:
+            node = stack.pop()
+            (x0, y0), (x1, y1) = self._lo[node], self._hi[node]
+            dx = max(0.0, x0 - hi[0], lo[0] - x1)
+            dy = max(0.0, y0 - hi[1], lo[1] - y1)
+            if dx * dx + dy * dy > r * r:
+                continue
+            children = self._children[node]
+            if children is None:
+                found.append(node)
+            else:
+                stack.extend(children)
+        return found
+
+    def knn_all(self, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        모든 점의 (자기 자신 제외) k-최근접 이웃: (indices n×k, distances n×k), 가까운 순.
+        leaf마다 주변 leaf 후보로 k번째 거리 상한을 구한 뒤, 그 반경 안의 leaf로 한 번 더 계산해 정확한 결과.
+        """
+        n = len(self.points)
+        k = min(k, n - 1)
+        indices = np.zeros((n, max(k, 0)), dtype=np.int64)
+        distances = np.zeros((n, max(k, 0)), dtype=np.float64)
+        if k <= 0:
+            return indices, distances
+        for leaf in self.leaves:
+            members = self._members[leaf]
+            lo, hi = self._lo[leaf], self._hi[leaf]
+            r = 0.0
+            while True:
+                candidates = np.concatenate([self._members[node] for node in self._leaves_within(lo, hi, r)])
+                if len(candidates) <= k:
+                    r = max(r * 2, math.hypot(hi[0] - lo[0], hi[1] - lo[1]), 1.0)
+                    continue
+                diff = self.points[members][:, None, :] - self.points[candidates][None, :, :]
+                dist = np.hypot(diff[..., 0], diff[..., 1])
+                dist[members[:, None] == candidates[None, :]] = np.inf
+                nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+                kth = np.take_along_axis(dist, nearest, axis=1)
+                bound = float(kth.max())
+                if bound <= r or len(candidates) == n:
+                    order = np.argsort(kth, axis=1)
+                    indices[members] = candidates[np.take_along_axis(nearest, order, axis=1)]
+                    distances[members] = np.take_along_axis(kth, order, axis=1)
+                    break
+                r = bound
+        return indices, distances
+
+
+# === 경로 탐색 ===
+
+class _Solver:
+    """노드 0..m-1 = 크루 출발지(경로 r의 출발지 노드 = r), m.. = 후보. 경로는 [출발지, 방문 노드…]."""
+
+    def __init__(self, crews: Sequence[Crew], candidates: Sequence[RouteCandidate], options: RouteOptions) -> None:
+        self.crews = list(crews)
+        self.candidates = list(candidates)
+        self.options = options
+        m = len(self.crews)
+        self.m = m
+        lat = np.array([c.lat for c in self.crews] + [c.lat for c in self.candidates], dtype=np.float64)
+        lng = np.array([c.lng for c in self.crews] + [c.lng for c in self.candidates], dtype=np.float64)
+        self.lat = lat
+        self.lng = lng
+        self.xy = project(lat, lng)
+        self.lat_r = np.radians(lat).tolist()
+        self.lng_r = np.radians(lng).tolist()
+        self.cos_lat = np.cos(np.radians(lat)).tolist()
+        self.demand = [0.0] * m + [c.trash_vol_L or 0.0 for c in self.candidates]
+        self.weight = [0.0] * m + [c.weight for c in self.candidates]
+
+        self.routes: list[list[int]] = [[r] for r in range(m)]
+        self.route_of = list(range(m)) + [-1] * len(self.candidates)
+        self.pos = [0] * (m + len(self.candidates))
+        self.length = [0.0] * m
+        self.load = [0.0] * m
+        self.neighbors: list[list[int]] = [[] for _ in self.route_of]  # 배정된 노드끼리의 k-최근접 (개선 단계)
+        self.meters_per_min = options.speed_kmh * 1000 / 60
+        self.improvements = 0
+        self._slots: Optional[tuple[np.ndarray, ...]] = None
+
+    def dist(self, i: int, j: int) -> float:
+        if i == j:
+            return 0.0
+        dp = self.lat_r[j] - self.lat_r[i]
+        dl = self.lng_r[j] - self.lng_r[i]
+        a = math.sin(dp / 2) ** 2 + self.cos_lat[i] * self.cos_lat[j] * math.sin(dl / 2) ** 2
+        return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(1.0, a)))
+
+    def edge(self, r: int, a: int, b: Optional[int]) -> float:
+        """a → b 간선 비용. b가 None(경로 끝)이면 출발지 복귀 거리 (복귀하지 않으면 0)."""
+        if b is None:
+            return self.dist(a, r) if self.options.return_to_start else 0.0
+        return self.dist(a, b)
+
+    def succ(self, r: int, p: int) -> Optional[int]:
+        route = self.routes[r]
+        return route[p + 1] if p + 1 < len(route) else None
+
+    def duration(self, length_m: float, stops: int) -> float:
+        return length_m / self.meters_per_min + self.options.service_minutes * stops
+
+    def fits(self, r: int, extra_m: float, extra_load: float, extra_stops: int) -> bool:
+        crew = self.crews[r]
+        stops = len(self.routes[r]) - 1 + extra_stops
+        if crew.max_stops is not None and stops > crew.max_stops:
+            return False
+        if crew.capacity_L is not None and self.load[r] + extra_load > crew.capacity_L + _EPS:
+            return False
+        if crew.shift_minutes is not None and self.duration(self.length[r] + extra_m, stops) > crew.shift_minutes + _EPS:
+            return False
+        return True
+
+    def _reindex(self, r: int, start: int = 0) -> None:
+        route = self.routes[r]
+        for p in range(start, len(route)):
+            node = route[p]
+            self.pos[node] = p
+            self.route_of[node] = r
+        self._slots = None
+
+    def _matrix(self, nodes: Sequence[int]) -> np.ndarray:
+        return haversine_matrix(self.lat[nodes], self.lng[nodes], self.lat[nodes], self.lng[nodes])
+
+    # --- 구성: CRI 가중 삽입 ---
+
+    def _insertion_slots(self) -> tuple[np.ndarray, ...]:
+        """모든 경로의 삽입 위치(간선 a → b) 평탄화 배열: (a, b, 경로 끝 여부, 경로, 위치, 간선 길이)."""
+        if self._slots is None:
+            a = np.fromiter((n for route in self.routes for n in route), dtype=np.int64)
+            route_idx = np.fromiter((r for r, route in enumerate(self.routes) for _ in route), dtype=np.int64)
+            position = np.fromiter((p for route in self.routes for p in range(len(route))), dtype=np.int64)
+            b = np.fromiter(
+                (route[p + 1] if p + 1 < len(route) else r for r, route in enumerate(self.routes) for p in range(len(route))),
+                dtype=np.int64,
+            )
+            at_end = position == np.array([len(self.routes[r]) - 1 for r in route_idx.tolist()], dtype=np.int64)
+            edge = _haversine_pairs(self.lat[a], self.lng[a], self.lat[b], self.lng[b])
+            if not self.options.return_to_start:
+                edge[at_end] = 0.0
+            self._slots = (a, b, at_end, route_idx, position, edge)
+        return self._slots
+
+    def _slack_m(self, c: int) -> np.ndarray:
+        """경로별로 c를 넣을 때 허용되는 추가 이동 거리 (m). 용량·방문 수 초과면 -inf."""
+        slack = np.full(self.m, np.inf)
+        for r, crew in enumerate(self.crews):
+            stops = len(self.routes[r])
+            if crew.max_stops is not None and stops > crew.max_stops:
+                slack[r] = -np.inf
+            elif crew.capacity_L is not None and self.load[r] + self.demand[c] > crew.capacity_L + _EPS:
+                slack[r] = -np.inf
+            elif crew.shift_minutes is not None:
+                minutes = crew.shift_minutes - self.options.service_minutes * stops
+                slack[r] = minutes * self.meters_per_min - self.length[r]
+        return slack
+
+    def best_insertion(self, c: int) -> Optional[tuple[float, int, int]]:
+        """c의 최소 추가 거리 삽입 위치 (추가 거리, 경로, 앞 노드 위치) — 모든 경로·위치를 벡터 연산으로 평가."""
+        a, b, at_end, route_idx, position, edge = self._insertion_slots()
+        lat, lng = self.lat[c], self.lng[c]
+        to_a = _haversine_pairs(lat, lng, self.lat[a], self.lng[a])
+        to_b = _haversine_pairs(lat, lng, self.lat[b], self.lng[b])
+        if not self.options.return_to_start:
+            to_b[at_end] = 0.0
+        delta = to_a + to_b - edge
+        delta[delta > self._slack_m(c)[route_idx] + _EPS] = np.inf
+        k = int(np.argmin(delta))
+        if not np.isfinite(delta[k]):
+            return None
+        return float(delta[k]), int(route_idx[k]), int(position[k])
+
+    def insert_all(self, nodes: Sequence[int], deadline: Optional[float] = None) -> list[int]:
+        """
+        가중치 ÷ 추가 소요 시간(이동 + 작업)이 가장 큰 후보부터 삽입 (lazy 우선순위 큐:
+        꺼낸 후보의 삽입 비용을 다시 계산해 여전히 최선일 때만 삽입). Returns: 넣지 못한 노드.
+        """
+        service = max(self.options.service_minutes, _EPS)
+        heap = [(-self.weight[c] / service, c) for c in nodes]
+        heapq.heapify(heap)
+        left = []
+        while heap:
+            if deadline is not None and time.perf_counter() > deadline:
+                left.extend(c for _, c in heap)
+                break
+            _, c = heapq.heappop(heap)
+            best = self.best_insertion(c)
+            if best is None:
+                left.append(c)  # 경로는 길어지기만 하므로 이후에도 넣을 수 없음
+                continue
+            delta, r, p = best
+            score = self.weight[c] / (delta / self.meters_per_min + service)
+            if heap and score < -heap[0][0] - _EPS:
+                heapq.heappush(heap, (-score, c))
+                continue
+            self.routes[r].insert(p + 1, c)
+            self._reindex(r, p + 1)
+            self.length[r] += delta
+            self.load[r] += self.demand[c]
+        return left
+
+    # --- 개선: 2-opt / Or-opt ---
+
+    def refresh_neighbors(self) -> None:
+        """배정된 노드(출발지 포함)끼리 KD-tree k-최근접 이웃 목록 재계산."""
+        routed = np.fromiter((n for route in self.routes for n in route), dtype=np.int64)
+        nearest, _ = KDTree(self.xy[routed]).knn_all(NEIGHBOR_K)
+        self.neighbors = [[] for _ in self.route_of]
+        for node, row in zip(routed.tolist(), routed[nearest].tolist()):
+            self.neighbors[node] = row
+
+    def two_opt(self, r: int, deadline: float) -> bool:
+        """
+        경로 내 최선 2-opt 이동을 반복 (경로 거리 행렬로 모든 (i, j) 쌍의 개선량을 한 번에 계산).
+        위치 n(경로 끝)은 출발지 복귀 — 복귀하지 않으면 거리 0인 가상 노드.
+        """
+        route = self.routes[r]
+        n = len(route)
+        if n < 3:
+            return False
+        dist = self._matrix(route + [r])
+        if not self.options.return_to_start:
+            dist[:, n] = 0.0
+            dist[n, :] = 0.0
+        order = np.arange(n + 1)
+        invalid = np.tril_indices(n, 1)  # j ≤ i + 1은 변화 없음
+        improved = False
+        while time.perf_counter() < deadline:
+            d = dist[np.ix_(order, order)]
+            edges = np.diagonal(d, 1)
+            delta = d[:-1, :-1] + d[1:, 1:] - edges[:, None] - edges[None, :]
+            delta[invalid] = np.inf
+            i, j = divmod(int(np.argmin(delta)), n)
+            if delta[i, j] >= -_EPS:
+                break
+            order[i + 1:j + 1] = order[j:i:-1].copy()
+            self.length[r] += float(delta[i, j])
+            self.improvements += 1
+            improved = True
+        if improved:
+            route[:] = [route[k] for k in order[:-1].tolist()]
+            self._reindex(r)
+        return improved
+
+    def _segment_length(self, segment: list[int]) -> float:
+        return sum(self.dist(segment[k], segment[k + 1]) for k in range(len(segment) - 1))
+
+    def or_opt(self, deadline: float) -> bool:
+        """1~OR_OPT_MAX_SEGMENT곳 구간을 이웃 근처(같은 경로 또는 다른 크루 경로)로 옮김."""
+        improved = False
+        for u in range(self.m, len(self.route_of)):
+            if time.perf_counter() > deadline:
+                break
+            for size in range(1, OR_OPT_MAX_SEGMENT + 1):
+                r = self.route_of[u]
+                if r < 0:
+                    break
+                route = self.routes[r]
+                s = self.pos[u]
+                if s + size > len(route):
+                    break
+                segment = route[s:s + size]
+                first, last, prev = segment[0], segment[-1], route[s - 1]
+                nxt = self.succ(r, s + size - 1)
+                gain = self.edge(r, prev, first) + self.edge(r, last, nxt) - self.edge(r, prev, nxt)
+                inner = self._segment_length(segment)
+                seg_load = sum(self.demand[v] for v in segment)
+                members = set(segment)
+
+                best = None
+                for c in {*self.neighbors[first], *self.neighbors[last]}:
+                    r2 = self.route_of[c]
+                    if r2 < 0:
+                        continue
+                    for anchor in (c, self.routes[r2][self.pos[c] - 1] if self.pos[c] > 0 else None):
+                        if anchor is None or anchor in members or anchor == prev:
+                            continue
+                        an = self.succ(r2, self.pos[anchor])
+                        base = self.edge(r2, anchor, an)
+                        for reverse in ((False, True) if size > 1 else (False,)):
+                            head, tail = (last, first) if reverse else (first, last)
+                            ins = self.dist(anchor, head) + self.edge(r2, tail, an) - base
+                            delta = ins - gain
+                            if delta >= -_EPS or (best is not None and delta >= best[0]):
+                                continue
+                            if r2 != r and not self.fits(r2, ins + inner, seg_load, size):
+                                continue
+                            best = (delta, r2, anchor, reverse, ins)
+                if best is None:
+                    continue
+                delta, r2, anchor, reverse, ins = best
+                del route[s:s + size]
+                if reverse:
+                    segment.reverse()
+                target = self.routes[r2]
+                at = target.index(anchor) + 1 if r2 == r else self.pos[anchor] + 1
+                target[at:at] = segment
+                if r2 == r:
+                    self.length[r] += delta
+                    self._reindex(r, min(s, at))
+                else:
+                    self.length[r] -= gain + inner
+                    self.length[r2] += ins + inner
+                    self.load[r] -= seg_load
+                    self.load[r2] += seg_load
+                    self._reindex(r, s)
+                    self._reindex(r2, at)
+                self.improvements += 1
+                improved = True
+                break
+        return improved
+
+    def improve(self, deadline: float) -> None:
+        if time.perf_counter() >= deadline:
+            return
+        self.refresh_neighbors()
+        while time.perf_counter() < deadline:
+            improved = False
+            for r in range(self.m):
+                improved |= self.two_opt(r, deadline)
+            improved |= self.or_opt(deadline)
+            if not improved:
+                break
+
+    # --- 결과 ---
+
+    def plan(self, unassigned: Sequence[int], stats: dict[str, float]) -> RoutePlan:
+        routes = []
+        for r, route in enumerate(self.routes):
+            stops, elapsed, total = [], 0.0, 0.0
+            for p in range(1, len(route)):
+                leg = self.dist(route[p - 1], route[p])
+                total += leg
+                elapsed += leg / self.meters_per_min
+                stops.append(RouteStop(self.candidates[route[p] - self.m], round(elapsed, 1), round(leg, 1)))
+                elapsed += self.options.service_minutes
+            closing = self.edge(r, route[-1], None) if len(route) > 1 else 0.0
+            total += closing
+            elapsed += closing / self.meters_per_min
+            routes.append(CrewRoute(
+                crew=self.crews[r],
+                stops=stops,
+                distance_m=round(total, 1),
+                duration_min=round(elapsed, 1),
+                load_L=round(self.load[r], 1),
+                weight=round(sum(self.weight[v] for v in route), 1),
+            ))
+        return RoutePlan(routes, [self.candidates[c - self.m] for c in unassigned], stats)
+
+
+def plan_routes(
+    crews: Sequence[Crew],
+    candidates: Sequence[RouteCandidate],
+    options: RouteOptions = RouteOptions(),
+) -> RoutePlan:
+    """
+    다중 크루 경로 계획 (동기 CPU 연산). candidates는 순서 무관 — 가중치(CRI × priority 배수) 대비 비용 순으로 삽입.
+    전체 소요 시간은 options.time_budget_ms 이내 (개선은 구성에 쓰고 남은 시간만).
+    stats: 단계별 소요 시간(ms), 개선 횟수, 배정 가중치 비율.
+    """
+    if not crews:
+        raise ValueError("크루가 1개 이상 필요합니다.")
+    t0 = time.perf_counter()
+    deadline = t0 + options.time_budget_ms / 1000
+    solver = _Solver(crews, candidates, options)
+    t_setup = time.perf_counter()
+    unassigned = solver.insert_all(range(solver.m, len(solver.route_of)), deadline)
+    t_build = time.perf_counter()
+    constructed_m = sum(solver.length)
+
+    solver.improve(deadline)
+    if unassigned and time.perf_counter() < deadline:
+        # 개선으로 줄어든 이동 시간만큼 미배정 후보를 다시 넣고 한 번 더 개선
+        before = len(unassigned)
+        unassigned = solver.insert_all(unassigned, deadline)
+        if len(unassigned) < before:
+            solver.improve(deadline)
+    t_done = time.perf_counter()
+
+    total_weight = sum(solver.weight)
+    served_weight = total_weight - sum(solver.weight[c] for c in unassigned)
+    stats = {
+        "candidates": len(candidates),
+        "assigned": len(candidates) - len(unassigned),
+        "served_weight_ratio": round(served_weight / total_weight, 4) if total_weight else 1.0,
+        "constructed_distance_m": round(constructed_m, 1),
+        "distance_m": round(sum(solver.length), 1),
+        "improvements": solver.improvements,
+        "setup_ms": round((t_setup - t0) * 1000, 1),
+        "construct_ms": round((t_build - t_setup) * 1000, 1),
+        "improve_ms": round((t_done - t_build) * 1000, 1),
+    }
+    return solver.plan(unassigned, stats)
+
+
+async def load_candidates(
+    session: AsyncSession,
+    min_cri: int = 0,
+    limit: int = 1000,
+    bbox: Optional[BBox] = None,
+    location_ids: Optional[Sequence[str]] = None,
+) -> list[RouteCandidate]:
+    """drainage_latest에서 경로 후보 조회 (CRI 높은 순 최대 limit곳, 좌표 없는 지점 제외)."""
+    stmt = select(
+        DrainageLatest.location_id,
+        DrainageLatest.name,
+        DrainageLatest.address,
+        DrainageLatest.lat,
+        DrainageLatest.lng,
+        DrainageLatest.last_measured_lat,
+        DrainageLatest.last_measured_lng,
+        DrainageLatest.cri,
+        DrainageLatest.priority_score,
+        DrainageLatest.trash_vol_L,
+    )
+    if min_cri > 0:
+        stmt = stmt.where(DrainageLatest.cri >= min_cri)
+    if bbox is not None:
+        stmt = stmt.where(bbox_clause(bbox))
+    if location_ids:
+        stmt = stmt.where(DrainageLatest.location_id.in_(list(location_ids)))
+    stmt = stmt.order_by(DrainageLatest.cri.desc(), DrainageLatest.location_id).limit(limit)
+    result = await session.execute(stmt)
+    candidates = []
+    for row in result.all():
+        lat, lng = effective_coords(row.lat, row.lng, row.last_measured_lat, row.last_measured_lng)
+        if lat is None or lng is None:
+            continue
+        candidates.append(RouteCandidate(
+            location_id=row.location_id,
+            lat=lat,
+            lng=lng,
+            cri=row.cri,
+            priority_score=row.priority_score,
+            trash_vol_L=row.trash_vol_L,
+            name=row.name,
+            address=row.address,
+        ))
+    return candidates
+
+
+async def optimize_routes(
+    session: AsyncSession,
+    crews: Sequence[Crew],
+    options: RouteOptions,
+    min_cri: int = 0,
+    limit: int = 1000,
+    bbox: Optional[BBox] = None,
+    location_ids: Optional[Sequence[str]] = None,
+) -> RoutePlan:
+    """후보 조회 후 경로 계획을 워커 스레드에서 실행 (이벤트 루프 차단 방지)."""
+    candidates = await load_candidates(session, min_cri, limit, bbox, location_ids)
+    return await asyncio.to_thread(plan_routes, crews, candidates, options)
@@ -0,0 +1,314 @@
+"""스캔 이력 관리: 월별 파티션 · 보존 기간 · 일/주 rollup.
+
+- drain_scan(hot)에는 이번 달 스캔 + 지점별 최신 스캔만 남기고, 마감된 달의 스캔은 월별 파티션으로 이동
+  · PostgreSQL: drain_scan_history (PARTITION BY RANGE created_at) + 월별 PARTITION OF
+  · SQLite: 기간별 테이블 drain_scan_history_YYYYMM
+  이동 시 스캔별 ML 산출값(drain_analytics)을 함께 옮겨 이력 행 1개로 평탄화 (이후 변경 없음)
+- 보존: scan_retention_months보다 오래된 파티션은 통째로 DROP (행 단위 DELETE 없음)
+- rollup: 마감된 날짜(현지 기준)를 location_id별로 집계해 drain_rollup(day)에 기록하고 해당 주(week)를 재집계.
+  진행 위치는 scheduler_state.high_water_id(마지막으로 집계한 날짜의 ordinal).
+  이동은 rollup이 끝난 날짜까지만 → 집계 전 원본이 hot 테이블을 떠나지 않음
+- 추이 조회(get_trend)는 rollup 테이블만 읽음
+"""
+
+import re
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import (
+    Column,
+    Date,
+    Index,
+    Integer,
+    Interval,
+    MetaData,
+    PrimaryKeyConstraint,
+    String,
+    Table,
+    cast,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal,
+    literal_column,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import dialect_insert
+from app.models import DrainAnalytics, DrainageLatest, DrainMaster, DrainRollup, DrainScan
+from app.services.scans import ANALYTICS_FIELDS, SCAN_FIELDS
+
+settings = get_settings()
+
+HISTORY_TABLE = "drain_scan_history"
+PERIODS = ("day", "week")
+_PARTITION_NAME = re.compile(rf"^{HISTORY_TABLE}_(\d{{4}})(\d{{2}})$")
+_ROLLUP_COLUMNS = ["period", "period_start", "location_id", "trash_vol_L", "scan_count", "max_cri", "last_cleaned_at"]
+
+
+def _month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def _add_months(d: date, months: int) -> date:
+    years, month = divmod(d.month - 1 + months, 12)
+    return date(d.year + years, month + 1, 1)
+
+
+def _utc_offset() -> timedelta:
+    return timedelta(hours=settings.rollup_utc_offset_hours)
+
+
+def local_today(now: Optional[datetime] = None) -> date:
+    """rollup 기준 시간대의 오늘 날짜 (created_at은 UTC naive)."""
+    return ((now or datetime.utcnow()) + _utc_offset()).date()
+
+
+def _local_day_start_utc(day: date) -> datetime:
+    return datetime.combine(day, time.min) - _utc_offset()
+
+
+# === 월별 파티션 ===
+
+def partition_name(month: date) -> str:
+    return f"{HISTORY_TABLE}_{month:%Y%m}"
+
+
+def _history_table(name: str, postgres: bool) -> Table:
+    """이력 테이블: drain_scan 컬럼 + drain_analytics 산출값, PK (id, created_at) — PostgreSQL 파티션 키 포함."""
+    columns = [Column("id", Integer, nullable=False), Column("location_id", String(64), nullable=False)]
+    for source in (DrainScan.__table__, DrainAnalytics.__table__):
+        for c in source.columns:
+            if c.name in SCAN_FIELDS or c.name in ANALYTICS_FIELDS:
+                columns.append(Column(c.name, c.type, nullable=c.name != "created_at"))
+    kwargs = {"postgresql_partition_by": "RANGE (created_at)"} if postgres else {}
+    table = Table(name, MetaData(), *columns, PrimaryKeyConstraint("id", "created_at"), **kwargs)
+    Index(f"ix_{name}_location_created", table.c.location_id, table.c.created_at)
+    return table
+
+
+def _ensure_partition(sync_conn, month: date) -> Table:
+    """month 파티션이 없으면 생성. Returns: INSERT 대상 (PostgreSQL은 부모 테이블 → 자동 라우팅)."""
+    if sync_conn.dialect.name == "postgresql":
+        parent = _history_table(HISTORY_TABLE, postgres=True)
+        parent.create(sync_conn, checkfirst=True)
+        sync_conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {HISTORY_TABLE} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+        ))
+        return parent
+    table = _history_table(partition_name(month), postgres=False)
+    table.create(sync_conn, checkfirst=True)
+    return table
+
+
+def _partitions(sync_conn) -> list[tuple[date, str]]:
+    months = []
+    for name in inspect(sync_conn).get_table_names():
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months.append((date(int(match[1]), int(match[2]), 1), name))
+    return sorted(months)
+
+
+async def list_partitions(session: AsyncSession) -> list[tuple[date, str]]:
+    """(월, 테이블명) 목록 — 오래된 순."""
+    conn = await session.connection()
+    return await conn.run_sync(_partitions)
+
+
+def archive_cutoff(rolled_through: int, now: datetime) -> Optional[datetime]:
+    """이동 가능한 스캔의 created_at 상한: 이번 달 시작과 rollup이 끝난 날짜의 끝 중 이른 쪽."""
+    if not rolled_through:
+        return None
+    month = datetime.combine(_month_start(now.date()), time.min)
+    return min(month, _local_day_start_utc(date.fromordinal(rolled_through + 1)))
+
+
+async def archive_closed_scans(session: AsyncSession, before: datetime, batch_size: int) -> int:
+    """
+    before 이전 스캔(지점의 최신 스캔 제외)을 id 순 batch_size건 월 파티션으로 이동.
+    Returns: 이동한 행 수 (0이면 더 없음).
+    """
+    result = await session.execute(
+        select(
+            DrainScan.id,
+            DrainScan.location_id,
+            *[DrainScan.__table__.c[name] for name in SCAN_FIELDS],
+            *[DrainAnalytics.__table__.c[name] for name in ANALYTICS_FIELDS],
+        )
+        .outerjoin(DrainAnalytics, DrainAnalytics.scan_id == DrainScan.id)
+        .where(DrainScan.created_at < before, DrainScan.id.not_in(select(DrainageLatest.scan_id)))
+        .order_by(DrainScan.id)
+        .limit(batch_size)
+    )
+    rows = [dict(r) for r in result.mappings().all()]
+    if not rows:
+        return 0
+    by_month: dict[date, list[dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        by_month[_month_start(row["created_at"].date())].append(row)
+    conn = await session.connection()
+    for month, items in by_month.items():
+        table = await conn.run_sync(_ensure_partition, month)
+        await session.execute(insert(table), items)
+    ids = [row["id"] for row in rows]
+    await session.execute(delete(DrainAnalytics).where(DrainAnalytics.scan_id.in_(ids)))
+    await session.execute(delete(DrainScan).where(DrainScan.id.in_(ids)))
+    return len(rows)
+
+
+async def apply_retention(session: AsyncSession, now: datetime) -> list[str]:
+    """보존 기간이 지난 월 파티션 DROP + 오래된 일별 rollup 삭제. Returns: 삭제한 파티션 이름."""
+    dropped: list[str] = []
+    if settings.scan_retention_months > 0:
+        keep_from = _add_months(_month_start(now.date()), -settings.scan_retention_months)
+        for month, name in await list_partitions(session):
+            if month < keep_from:
+                await session.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+    if settings.rollup_daily_retention_days > 0:
+        await session.execute(
+            delete(DrainRollup).where(
+                DrainRollup.period == "day",
+                DrainRollup.period_start < local_today(now) - timedelta(days=settings.rollup_daily_retention_days),
+            )
+        )
+    return dropped
+
+
+# === 일/주 rollup ===
+
+def _local_day(column, dialect: str):
+    hours = settings.rollup_utc_offset_hours
+    if dialect == "sqlite":
+        return func.date(column, f"{hours:+d} hours")
+    return cast(column + literal_column(f"interval '{hours} hours'", Interval), Date)
+
+
+def _week_start(day_column, dialect: str):
+    """날짜 → 그 주 월요일."""
+    if dialect == "sqlite":
+        return func.date(day_column, "weekday 0", "-6 days")
+    return cast(func.date_trunc("week", day_column), Date)
+
+
+def _upsert_rollup(session: AsyncSession, source):
+    table = DrainRollup.__table__
+    stmt = dialect_insert(session)(table).from_select(_ROLLUP_COLUMNS, source)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.period, table.c.period_start, table.c.location_id],
+        set_={name: stmt.excluded[name] for name in _ROLLUP_COLUMNS[3:]},
+    )
+
+
+async def rollup_days(session: AsyncSession, first_day: date, end_day: date) -> int:
+    """
+    현지 날짜 [first_day, end_day)의 hot 스캔을 location_id별 집계 → day rollup upsert,
+    해당 날짜가 속한 주의 week rollup을 day rollup에서 재집계. Returns: day rollup 행 수.
+    """
+    if first_day >= end_day:
+        return 0
+    dialect = session.get_bind().dialect.name
+    day = _local_day(DrainScan.created_at, dialect)
+    days = (
+        select(
+            literal("day"),
+            day,
+            DrainScan.location_id,
+            func.coalesce(func.sum(DrainScan.trash_vol_L), 0.0),
+            func.count(),
+            func.max(DrainAnalytics.cri),
+            func.max(DrainScan.cleaned_at),
+        )
+        .select_from(DrainScan)
+        .outerjoin(DrainAnalytics, DrainAnalytics.scan_id == DrainScan.id)
+        .where(
+            DrainScan.created_at >= _local_day_start_utc(first_day),
+            DrainScan.created_at < _local_day_start_utc(end_day),
+        )
+        .group_by(day, DrainScan.location_id)
+    )
+    result = await session.execute(_upsert_rollup(session, days))
+
+    r = DrainRollup
+    week = _week_start(r.period_start, dialect)
+    weeks = (
+        select(
+            literal("week"),
+            week,
+            r.location_id,
+            func.sum(r.trash_vol_L),
+            func.sum(r.scan_count),
+            func.max(r.max_cri),
+            func.max(r.last_cleaned_at),
+        )
+        .where(
+            r.period == "day",
+            r.period_start >= first_day - timedelta(days=first_day.weekday()),
+            r.period_start < end_day,
+        )
+        .group_by(week, r.location_id)
+    )
+    await session.execute(_upsert_rollup(session, weeks))
+    return result.rowcount or 0
+
+
+async def rollup_closed_days(session: AsyncSession, rolled_through: int, now: datetime) -> int:
+    """
+    rolled_through(집계를 마친 마지막 날짜 ordinal, 0이면 처음) 다음 날부터
+    마감된 날짜(now - rollup_delay_seconds 기준 어제)까지 집계. Returns: 새 rolled_through.
+    """
+    end_day = local_today(now - timedelta(seconds=settings.rollup_delay_seconds))
+    if rolled_through:
+        first_day = date.fromordinal(rolled_through + 1)
+    else:
+        oldest = await session.scalar(select(func.min(DrainScan.created_at)))
+        if oldest is None:
+            return rolled_through
+        first_day = local_today(oldest)
+    if first_day >= end_day:
+        return rolled_through
+    await rollup_days(session, first_day, end_day)
+    return (end_day - timedelta(days=1)).toordinal()
+
+
+async def get_trend(
+    session: AsyncSession,
+    period: str,
+    start: date,
+    end: date,
+    location_id: Optional[str] = None,
+    region: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """
+    rollup 테이블에서 [start, end) 구간의 일/주 추이 (구간별 전체 합계).
+    location_id: 해당 지점만, region: 주소에 포함된 지역명(예: "강남구")으로 지점 필터.
+    """
+    r = DrainRollup
+    stmt = (
+        select(
+            r.period_start,
+            func.sum(r.trash_vol_L).label("trash_vol_L"),
+            func.sum(r.scan_count).label("scan_count"),
+            func.count(r.location_id).label("drains"),
+            func.max(r.max_cri).label("max_cri"),
+            func.max(r.last_cleaned_at).label("last_cleaned_at"),
+        )
+        .where(r.period == period, r.period_start >= start, r.period_start < end)
+        .group_by(r.period_start)
+        .order_by(r.period_start)
+    )
+    if location_id:
+        stmt = stmt.where(r.location_id == location_id)
+    if region:
+        stmt = stmt.join(DrainMaster, DrainMaster.location_id == r.location_id).where(
+            DrainMaster.address.contains(region, autoescape=True)
+        )
+    result = await session.execute(stmt)
+    return [dict(row) for row in result.mappings().all()]
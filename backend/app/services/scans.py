@@ -0,0 +1,130 @@
+"""스캔 기록: 수신 값을 Master / Session / Analytics 테이블로 나눠 저장.
+
+- drain_master: location_id당 1행. PK 조회 1회로 현재 값과 비교해 새 지점·바뀐 값만 upsert
+  (수신 값이 없는(None) 기준 필드는 기존 값 유지, drainage_latest보다 오래된 스캔은 병합하지 않음)
+- drain_scan: 스캔마다 좁은 행 1개 append (GPS·청소·측정값만)
+- drain_analytics: 스캔별 ML 산출값. 수신 값에 산출값이 함께 있으면(가져오기·벤치마크) 같이 기록
+- record_scans 반환값은 drainage_latest.upsert_latest 입력과 같은 평탄화 dict (id = drain_scan.id)
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import dialect_insert
+from app.models import DrainAnalytics, DrainageLatest, DrainMaster, DrainScan
+
+MASTER_FIELDS = tuple(
+    c.name for c in DrainMaster.__table__.columns if c.name not in ("location_id", "updated_at")
+)
+SCAN_FIELDS = tuple(c.name for c in DrainScan.__table__.columns if c.name not in ("id", "location_id"))
+ANALYTICS_FIELDS = tuple(c.name for c in DrainAnalytics.__table__.columns if c.name != "scan_id")
+
+
+async def _merge_masters(
+    session: AsyncSession,
+    items: Sequence[Mapping[str, Any]],
+    scans: Sequence[tuple[datetime, int]],
+    now: datetime,
+) -> list[dict[str, Any]]:
+    """
+    기준 값 병합. Returns: 항목별 병합된 기준 값 (변경분은 drain_master에 upsert).
+    scans: 항목별 (created_at, scan id). 최신 판정은 upsert_latest와 같은 (created_at, id) 순서 —
+    drainage_latest에 반영된 스캔보다 새 스캔의 기준 값만 drain_master에 누적하고,
+    늦게 도착한 과거 스캔은 자기 행에만 반영 (최신 기준 값을 되돌리지 않음).
+    """
+    ids = list(dict.fromkeys(item["location_id"] for item in items))
+    result = await session.execute(
+        select(DrainMaster.location_id, *[DrainMaster.__table__.c[f] for f in MASTER_FIELDS])
+        .where(DrainMaster.location_id.in_(ids))
+    )
+    stored = {r.location_id: {f: getattr(r, f) for f in MASTER_FIELDS} for r in result.all()}
+    result = await session.execute(
+        select(DrainageLatest.location_id, DrainageLatest.created_at, DrainageLatest.scan_id)
+        .where(DrainageLatest.location_id.in_(ids))
+    )
+    applied = {r.location_id: (r.created_at, r.scan_id) for r in result.all()}
+    current = dict(stored)
+    merged: list[dict[str, Any]] = [{} for _ in items]
+    for i in sorted(range(len(items)), key=lambda i: scans[i]):
+        item = items[i]
+        location_id = item["location_id"]
+        base = current.get(location_id, {})
+        values = {f: item[f] if item.get(f) is not None else base.get(f) for f in MASTER_FIELDS}
+        if location_id not in applied or scans[i] > applied[location_id]:
+            current[location_id] = values
+            applied[location_id] = scans[i]
+        merged[i] = values
+
+    changed = [
+        {"location_id": location_id, **values, "updated_at": now}
+        for location_id, values in current.items()
+        if stored.get(location_id) != values
+    ]
+    if changed:
+        table = DrainMaster.__table__
+        stmt = dialect_insert(session)(table).values(changed)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.location_id],
+            set_={name: stmt.excluded[name] for name in (*MASTER_FIELDS, "updated_at")},
+        )
+        await session.execute(stmt)
+    return merged
+
+
+async def record_scans(session: AsyncSession, items: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
+    """
+    수신 값(IngestionRequest → 평탄화 dict) 목록을 세 테이블에 기록.
+    drain_scan은 multi-row INSERT … RETURNING id 1회 (입력 순서 보존).
+    Returns: 항목별 {기준 + 스캔 + (산출) 값, "id": scan id} — upsert_latest에 그대로 전달.
+    """
+    if not items:
+        return []
+    now = datetime.utcnow()
+    scan_rows = [
+        {
+            "location_id": item["location_id"],
+            **{f: item.get(f) for f in SCAN_FIELDS},
+            "created_at": item.get("created_at") or now,
+        }
+        for item in items
+    ]
+    result = await session.execute(
+        insert(DrainScan).returning(DrainScan.id, sort_by_parameter_order=True),
+        scan_rows,
+    )
+    scan_ids = result.scalars().all()
+    masters = await _merge_masters(
+        session, items, [(scan["created_at"], scan_id) for scan, scan_id in zip(scan_rows, scan_ids)], now
+    )
+
+    records: list[dict[str, Any]] = []
+    analytics: list[dict[str, Any]] = []
+    for item, master, scan, scan_id in zip(items, masters, scan_rows, scan_ids):
+        values = {f: item.get(f) for f in ANALYTICS_FIELDS}
+        if any(v is not None for v in values.values()):
+            analytics.append({"scan_id": scan_id, **values})
+        records.append({**master, **scan, **values, "id": scan_id})
+    await upsert_scan_analytics(session, analytics)
+    return records
+
+
+async def upsert_scan_analytics(session: AsyncSession, rows: Iterable[Mapping[str, Any]]) -> None:
+    """
+    스캔별 ML 산출값 기록: {"scan_id", ...Analytics 컬럼} 목록을 executemany 1회로 upsert.
+    없는 컬럼은 건드리지 않음 (재분석 시 해당 값만 갱신).
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    columns = [k for k in rows[0] if k in ANALYTICS_FIELDS]
+    table = DrainAnalytics.__table__
+    stmt = dialect_insert(session)(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.scan_id],
+        set_={c: stmt.excluded[c] for c in columns},
+    )
+    await session.execute(stmt, [{"scan_id": r["scan_id"], **{c: r[c] for c in columns}} for r in rows])
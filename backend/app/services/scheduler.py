@@ -0,0 +1,287 @@
+"""앱 내장 주기 스케줄러 (LeaderJob 하위 작업).
+
+- MLCatchupScheduler: 미분석 스캔 catch-up (run_periodic_ml_update의 증분 버전)
+- ScanHistoryScheduler: 일/주 rollup, 지난 스캔 월 파티션 이동, 보존 기간 정리 (app.services.scan_history)
+- RegionStatsScheduler: 지역 집계(region_stats) 전체 재집계 — 증분 갱신의 드문 경합 오차 보정 (app.services.regions)
+- RainfallScheduler: 강우 예보 교체·만료 시 침수 확률·우선순위 재계산(예보 수신 시 wake로 바로 확인), 점수 이력 보존 기간 정리 (app.services.rainfall)
+- lifespan에서 시작, 작업별 interval마다 tick
+- 리더 임대(scheduler_state.owner/lease_until): 여러 uvicorn 워커 중 1개만 실행, 리더가 죽으면 임대 만료 후 인계
+- high-water mark(scheduler_state.high_water_id): catch-up은 마지막으로 확인한 drain_scan.id, 이력 관리는 집계를 마친 날짜
+  (catch-up은 id 빈 구간 — 아직 커밋 중인 트랜잭션 — 을 ml_catchup_grace_seconds 동안 기다린 뒤 넘어감)
+- tick당 처리 시간 상한(*_max_seconds_per_tick), 청크마다 커밋해 진행 위치 보존
+"""
+
+import abc
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import async_session, dialect_insert
+from app.models import SchedulerState
+from app.services.ml_pipeline import score_new_scans
+from app.services.rainfall import prune_rainfall_history, sync_forecast
+from app.services.regions import rebuild_region_stats
+from app.services.scan_history import apply_retention, archive_closed_scans, archive_cutoff, rollup_closed_days
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ML_CATCHUP_JOB = "ml_catchup"
+SCAN_HISTORY_JOB = "scan_history"
+REGION_STATS_JOB = "region_stats"
+RAINFALL_JOB = "rainfall"
+
+
+async def acquire_leadership(
+    session: AsyncSession,
+    name: str,
+    owner: str,
+    lease_seconds: float,
+) -> Optional[int]:
+    """
+    리더 임대 획득/갱신. 다른 워커가 유효한 임대를 가지고 있으면 None.
+    Returns: 획득 시 저장된 high_water_id.
+    """
+    now = datetime.utcnow()
+    await session.execute(
+        dialect_insert(session)(SchedulerState.__table__)
+        .values(name=name, high_water_id=0)
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    result = await session.execute(
+        update(SchedulerState)
+        .where(
+            SchedulerState.name == name,
+            or_(
+                SchedulerState.owner.is_(None),
+                SchedulerState.owner == owner,
+                SchedulerState.lease_until < now,
+            ),
+        )
+        .values(owner=owner, lease_until=now + timedelta(seconds=lease_seconds), last_run_at=now)
+        .returning(SchedulerState.high_water_id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+async def save_high_water(session: AsyncSession, name: str, owner: str, high_water_id: int) -> bool:
+    """임대를 보유한 경우에만 진행 위치 저장. Returns: 저장 여부 (False면 리더십 상실)."""
+    result = await session.execute(
+        update(SchedulerState)
+        .where(SchedulerState.name == name, SchedulerState.owner == owner)
+        .values(high_water_id=high_water_id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+
+async def release_leadership(session: AsyncSession, name: str, owner: str) -> None:
+    """정상 종료 시 임대 반납 → 다른 워커가 만료를 기다리지 않고 인계."""
+    await session.execute(
+        update(SchedulerState)
+        .where(SchedulerState.name == name, SchedulerState.owner == owner)
+        .values(owner=None, lease_until=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class LeaderJob(abc.ABC):
+    """리더 임대를 가진 워커 1개만 실행하는 주기 작업. 하위 클래스가 name과 run_as_leader를 구현."""
+
+    name: str
+
+    def __init__(self, interval_seconds: float, max_seconds_per_tick: float) -> None:
+        self.interval_seconds = interval_seconds
+        self.max_seconds_per_tick = max_seconds_per_tick
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    @property
+    def lease_seconds(self) -> float:
+        # 리더가 tick 사이에 임대를 잃지 않도록 주기보다 넉넉하게
+        return self.interval_seconds * 2 + self.max_seconds_per_tick
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name=f"{self.name}-scheduler")
+
+    def wake(self) -> None:
+        """다음 tick을 interval 대기 없이 바로 실행 (이 워커의 루프만 — 리더가 아니면 tick은 그냥 끝남)."""
+        self._wake.set()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        try:
+            async with async_session() as session:
+                await release_leadership(session, self.name, self.owner)
+                await session.commit()
+        except Exception:
+            logger.warning("failed to release %s leadership", self.name, exc_info=True)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("%s tick failed", self.name)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def tick(self) -> int:
+        """리더일 때만 1회 실행. Returns: 처리한 행 수."""
+        async with async_session() as session:
+            high_water = await acquire_leadership(session, self.name, self.owner, self.lease_seconds)
+            await session.commit()
+        if high_water is None:
+            return 0
+        return await self.run_as_leader(high_water)
+
+    @abc.abstractmethod
+    async def run_as_leader(self, high_water: int) -> int:
+        """리더 임대를 얻은 tick에서 실행. high_water: 저장된 진행 위치. Returns: 처리한 행 수."""
+
+
+class MLCatchupScheduler(LeaderJob):
+    """미분석 스캔 증분 catch-up 주기 실행기."""
+
+    name = ML_CATCHUP_JOB
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        max_seconds_per_tick: float,
+        grace_seconds: float,
+    ) -> None:
+        super().__init__(interval_seconds, max_seconds_per_tick)
+        self.grace_seconds = grace_seconds
+        self._gaps: dict[int, float] = {}  # 빠진 첫 drain_scan.id → 처음 본 시각 (monotonic)
+
+    def _gap_settled(self, missing_id: int) -> bool:
+        """id 빈 구간을 처음 본 뒤 grace_seconds가 지났으면 True (그동안 커밋되지 않았으면 롤백·이관된 id로 보고 넘어감)."""
+        now = time.monotonic()
+        return now - self._gaps.setdefault(missing_id, now) >= self.grace_seconds
+
+    async def run_as_leader(self, high_water: int) -> int:
+        deadline = time.monotonic() + self.max_seconds_per_tick
+        total = 0
+        async with async_session() as session:
+            while time.monotonic() < deadline:
+                scored, new_high_water = await score_new_scans(session, high_water, self._gap_settled)
+                if new_high_water == high_water:
+                    break
+                if not await save_high_water(session, self.name, self.owner, new_high_water):
+                    await session.rollback()
+                    logger.warning("ml catch-up leadership lost; stopping tick")
+                    break
+                await session.commit()
+                total += scored
+                high_water = new_high_water
+        self._gaps = {gap: seen for gap, seen in self._gaps.items() if gap > high_water}
+        if total:
+            logger.info("ml catch-up scored %d scans (high-water id=%d)", total, high_water)
+        return total
+
+
+class ScanHistoryScheduler(LeaderJob):
+    """
+    스캔 이력 관리 주기 실행기: 마감된 날짜 rollup → 지난 스캔 월 파티션 이동 → 보존 기간 정리.
+    high_water_id = 집계를 마친 마지막 날짜 ordinal (app.services.scan_history).
+    """
+
+    name = SCAN_HISTORY_JOB
+
+    async def run_as_leader(self, rolled_through: int) -> int:
+        now = datetime.utcnow()
+        async with async_session() as session:
+            new_rolled_through = await rollup_closed_days(session, rolled_through, now)
+            if new_rolled_through != rolled_through:
+                if not await save_high_water(session, self.name, self.owner, new_rolled_through):
+                    await session.rollback()
+                    logger.warning("scan history leadership lost; stopping tick")
+                    return 0
+            await session.commit()
+
+        deadline = time.monotonic() + self.max_seconds_per_tick
+        cutoff = archive_cutoff(new_rolled_through, now)
+        moved = 0
+        async with async_session() as session:
+            while cutoff is not None and time.monotonic() < deadline:
+                count = await archive_closed_scans(session, cutoff, settings.scan_archive_batch_size)
+                await session.commit()
+                if not count:
+                    break
+                moved += count
+            dropped = await apply_retention(session, now)
+            await session.commit()
+        if new_rolled_through != rolled_through or moved or dropped:
+            logger.info(
+                "scan history: rolled up through %s, archived %d scans, dropped %s",
+                date.fromordinal(new_rolled_through) if new_rolled_through else "-", moved, dropped or "none",
+            )
+        return moved
+
+
+class RegionStatsScheduler(LeaderJob):
+    """지역 집계 주기 재집계 (high_water_id 미사용)."""
+
+    name = REGION_STATS_JOB
+
+    async def run_as_leader(self, high_water: int) -> int:
+        async with async_session() as session:
+            count = await rebuild_region_stats(session)
+            await session.commit()
+        return count
+
+
+class RainfallScheduler(LeaderJob):
+    """
+    강우 예보 적용 주기 확인: 유효한 예보가 바뀌었거나 만료됐으면 재계산 (high_water_id 미사용).
+    재계산은 이 작업에서만 실행 — 예보 수신 API는 저장 후 wake()만 호출.
+    """
+
+    name = RAINFALL_JOB
+
+    async def run_as_leader(self, high_water: int) -> int:
+        async with async_session() as session:
+            stats = await sync_forecast(session)
+            scores, forecasts = await prune_rainfall_history(session)
+            await session.commit()
+        if scores or forecasts:
+            logger.info("rainfall history pruned: %d scores, %d forecasts", scores, forecasts)
+        return stats.changed if stats else 0
+
+
+ml_catchup_scheduler = MLCatchupScheduler(
+    interval_seconds=settings.ml_catchup_interval_seconds,
+    max_seconds_per_tick=settings.ml_catchup_max_seconds_per_tick,
+    grace_seconds=settings.ml_catchup_grace_seconds,
+)
+scan_history_scheduler = ScanHistoryScheduler(
+    interval_seconds=settings.scan_history_interval_seconds,
+    max_seconds_per_tick=settings.scan_history_max_seconds_per_tick,
+)
+region_stats_scheduler = RegionStatsScheduler(
+    interval_seconds=settings.region_stats_reconcile_interval_seconds,
+    max_seconds_per_tick=60.0,
+)
+rainfall_scheduler = RainfallScheduler(
+    interval_seconds=settings.rainfall_check_interval_seconds,
+    max_seconds_per_tick=60.0,
+)
@@ -0,0 +1,336 @@
+"""빗물받이 이름·주소 전문 검색 (자동완성 / LLM 지점 식별용).
+
+한국어는 어절에 조사·접미사가 붙어 어절 단위 색인만으로는 "삼동" → "역삼동"을 못 찾으므로,
+어절 그대로(words)와 어절을 나눈 문자 bigram(grams: "역삼동" → "역삼 삼동", 한 글자 어절은 그대로)을 함께 색인.
+검색은 세 단계로, 앞 단계에서 limit건이 차면 멈춤 (단계 안에서는 어절 일치 점수 → CRI 순):
+  1. exact  — 모든 어절이 완전 일치 ("역삼동 빗물받이 12")
+  2. prefix — 마지막 어절만 접두 일치 (입력 중 자동완성: "역삼동 빗" → 역삼동 빗물받이…)
+  3. infix  — 모든 bigram 일치 = 어절 내부 부분 문자열 ("삼동", "역삼 빗물"), 마지막 한 글자는 접두어
+
+- SQLite: FTS5 가상 테이블 2개 (drainage_search: 어절, drainage_search_grams: bigram), 각 행에 location_id(UNINDEXED)
+  한 테이블 두 컬럼에 컬럼 필터를 걸면 위치 목록까지 읽어야 해서 느림 → 테이블 분리
+  FTS rowid는 drainage_search_doc(location_id → doc_id, 명시적 INTEGER PRIMARY KEY)이 발급
+  — drainage_latest의 암묵적 rowid는 VACUUM 때 바뀔 수 있어 키로 쓰지 않음 (일치 결과는 location_id로 연결)
+- PostgreSQL: drainage_search(location_id, words, grams tsvector) + GIN 인덱스
+  pg_trgm은 C 로케일에서 한글을 무시하고 2글자 검색에 인덱스를 못 쓰므로 같은 토큰을 tsvector로 색인
+- 그 외 DB: drainage_latest LIKE 검색 (인덱스 없음)
+
+색인은 upsert_latest에서 이름·주소가 바뀐 지점만 같은 트랜잭션으로 갱신하고,
+init_db에서 색인이 비어 있으면 drainage_latest 전체로 재구축.
+
+bm25/ts_rank를 쓰지 않는 이유: 질문 토큰마다 전체 문서 빈도를 세야 해서 "서울특별시"처럼 모든 지점에
+걸리는 토큰이 많을수록 느려짐 (10만 건 기준 20~40ms). 단계마다 순위 없이 SEARCH_CANDIDATES건에서
+조기 종료하므로 일치 건수와 무관하게 지연이 일정.
+"""
+
+import re
+import unicodedata
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import cast, column, or_, select, table, text
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DrainageLatest
+from app.services.spatial import effective_coords
+
+SEARCH_TABLE = "drainage_search"
+GRAMS_TABLE = "drainage_search_grams"  # SQLite 전용 (PostgreSQL은 SEARCH_TABLE.grams 컬럼)
+DOC_TABLE = "drainage_search_doc"  # SQLite 전용: location_id → FTS rowid (색인 갱신 시 기존 행 삭제용)
+SEARCH_CANDIDATES = 200  # 단계별 점수 계산 대상 최대 후보 수
+MAX_SEARCH_LIMIT = 50
+TIERS = ("exact", "prefix", "infix")
+ID_MATCH_SCORE = 100.0  # location_id 접두 일치 (어절 점수보다 항상 큼)
+_REBUILD_CHUNK = 5000
+
+_search_table = table(SEARCH_TABLE, column("location_id"), column("words"), column("grams"))
+_grams_table = table(GRAMS_TABLE, column("location_id"))
+_doc_table = table(DOC_TABLE, column("doc_id"), column("location_id"))
+
+_WORD = re.compile(r"[^\W_]+")
+_JAMO = re.compile("[\u1100-\u11ff\u3131-\u318e]")  # 조합 중인 자모 (IME 입력 중간 상태)
+_ID_PREFIX = re.compile(r"[A-Za-z0-9][A-Za-z0-9-]*")
+
+
+def _words(value: Optional[str]) -> list[str]:
+    return _WORD.findall(unicodedata.normalize("NFKC", value or "").lower())
+
+
+def _bigrams(word: str) -> list[str]:
+    if len(word) == 1:
+        return [word]
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def index_tokens(name: Optional[str], address: Optional[str]) -> tuple[str, str]:
+    """색인용 (어절, bigram) 문자열 — 각각 공백 구분."""
+    words = _words(name) + _words(address)
+    return " ".join(words), " ".join(g for w in words for g in _bigrams(w))
+
+
+def _ts_lexemes(tokens: str) -> str:
+    """공백 구분 토큰 → tsvector 리터럴 (to_tsvector 파서가 "3번길"을 쪼개지 않도록 직접 구성)."""
+    return " ".join(f"'{t}'" for t in dict.fromkeys(tokens.split()))
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """검색어 분해: 어절(words)·bigram(grams)·마지막 한 글자 어절(prefix, infix 단계의 접두어)."""
+
+    words: tuple[str, ...]
+    grams: tuple[str, ...]
+    prefix: Optional[str]
+
+    @classmethod
+    def parse(cls, query: str) -> "SearchQuery":
+        words = _words(_JAMO.sub(" ", query))
+        prefix = words[-1] if words and len(words[-1]) == 1 else None
+        full = words[:-1] if prefix else words
+        grams = tuple(dict.fromkeys(g for w in full for g in _bigrams(w)))
+        return cls(tuple(words), grams, prefix)
+
+    @property
+    def empty(self) -> bool:
+        return not self.words
+
+    def _terms(self, tier: str) -> tuple[list[str], list[str]]:
+        """(완전 일치 토큰, 접두 일치 토큰)."""
+        if tier == "exact":
+            return list(self.words), []
+        if tier == "prefix":
+            return list(self.words[:-1]), [self.words[-1]]
+        return list(self.grams), [self.prefix] if self.prefix else []
+
+    def fts5(self, tier: str) -> str:
+        exact, prefixes = self._terms(tier)
+        return " ".join([f'"{t}"' for t in exact] + [f'"{t}"*' for t in prefixes])
+
+    def tsquery(self, tier: str) -> str:
+        exact, prefixes = self._terms(tier)
+        return " & ".join([f"'{t}'" for t in exact] + [f"'{t}':*" for t in prefixes])
+
+    def score(self, name: Optional[str], address: Optional[str]) -> float:
+        """어절 접두 일치 (이름 2, 주소 1) + 어절 완전 일치 (이름 2, 주소 0.5) — 이름 완전 일치 우선."""
+        name_words, address_words = _words(name), _words(address)
+        total = 0.0
+        for qw in self.words:
+            total += 2.0 * any(w.startswith(qw) for w in name_words) + 2.0 * (qw in name_words)
+            total += 1.0 * any(w.startswith(qw) for w in address_words) + 0.5 * (qw in address_words)
+        return total
+
+
+@dataclass
+class SearchHit:
+    location_id: str
+    name: Optional[str]
+    address: Optional[str]
+    lat: Optional[float]
+    lng: Optional[float]
+    cri: Optional[int]
+    priority_score: Optional[int]
+    score: float  # 높을수록 관련도 높음
+
+
+def _backend(dialect_name: str) -> str:
+    return dialect_name if dialect_name in ("sqlite", "postgresql") else "like"
+
+
+def _session_backend(session: AsyncSession) -> str:
+    return _backend(session.get_bind().dialect.name)
+
+
+def create_search_index(sync_conn) -> None:
+    """검색 색인 테이블 생성 (init_db에서 run_sync로 호출, 이미 있으면 무시)."""
+    backend = _backend(sync_conn.dialect.name)
+    if backend == "sqlite":
+        columns = {row[1] for row in sync_conn.execute(text(f"PRAGMA table_info({SEARCH_TABLE})"))}
+        if columns and "location_id" not in columns:
+            # drainage_latest.rowid로 연결하던 이전 색인 → 삭제 후 init_db가 location_id 기준으로 재구축
+            for name in (SEARCH_TABLE, GRAMS_TABLE):
+                sync_conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        sync_conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {DOC_TABLE} ("
+            "doc_id INTEGER PRIMARY KEY, location_id VARCHAR(64) NOT NULL UNIQUE)"
+        ))
+        for name, column_name in ((SEARCH_TABLE, "words"), (GRAMS_TABLE, "grams")):
+            sync_conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(location_id UNINDEXED, "
+                f"{column_name}, tokenize='unicode61 remove_diacritics 0', prefix='1', detail=column)"
+            ))
+    elif backend == "postgresql":
+        sync_conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            "location_id VARCHAR(64) PRIMARY KEY, words TSVECTOR NOT NULL, grams TSVECTOR NOT NULL)"
+        ))
+        for column_name in ("words", "grams"):
+            sync_conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_{column_name} "
+                f"ON {SEARCH_TABLE} USING GIN ({column_name})"
+            ))
+
+
+async def _write_sqlite(session: AsyncSession, rows: Sequence) -> None:
+    """
+    (location_id, name, address) 행 색인. FTS5는 UPSERT 미지원 → doc_id(FTS rowid) 단위 삭제 후 삽입.
+    doc_id는 location_id별로 drainage_search_doc에서 한 번 발급되어 유지.
+    """
+    if not rows:
+        return
+    lids = [lid for lid, _, _ in rows]
+    await session.execute(
+        text(f"INSERT OR IGNORE INTO {DOC_TABLE}(location_id) VALUES (:lid)"), [{"lid": lid} for lid in lids]
+    )
+    doc_ids = dict(
+        (await session.execute(
+            select(_doc_table.c.location_id, _doc_table.c.doc_id).where(_doc_table.c.location_id.in_(lids))
+        )).all()
+    )
+    params = [
+        dict(zip(("rid", "lid", "words", "grams"), (doc_ids[lid], lid, *index_tokens(name, address))))
+        for lid, name, address in rows
+    ]
+    for name, column_name in ((SEARCH_TABLE, "words"), (GRAMS_TABLE, "grams")):
+        await session.execute(text(f"DELETE FROM {name} WHERE rowid = :rid"), params)
+        await session.execute(
+            text(f"INSERT INTO {name}(rowid, location_id, {column_name}) VALUES (:rid, :lid, :{column_name})"),
+            params,
+        )
+
+
+async def _write_postgres(session: AsyncSession, rows: Sequence) -> None:
+    """(location_id, name, address) 행 색인."""
+    if not rows:
+        return
+    params = []
+    for lid, name, address in rows:
+        words, grams = index_tokens(name, address)
+        params.append({"lid": lid, "words": _ts_lexemes(words), "grams": _ts_lexemes(grams)})
+    await session.execute(
+        text(
+            f"INSERT INTO {SEARCH_TABLE}(location_id, words, grams) "
+            "VALUES (:lid, CAST(:words AS tsvector), CAST(:grams AS tsvector)) "
+            "ON CONFLICT (location_id) DO UPDATE SET words = EXCLUDED.words, grams = EXCLUDED.grams"
+        ),
+        params,
+    )
+
+
+_WRITERS = {"sqlite": _write_sqlite, "postgresql": _write_postgres}
+
+
+async def index_locations(session: AsyncSession, location_ids: Iterable[str]) -> None:
+    """지정 지점의 색인을 drainage_latest 현재 이름·주소로 갱신 (호출자 트랜잭션 안에서)."""
+    ids = list(dict.fromkeys(location_ids))
+    backend = _session_backend(session)
+    if not ids or backend not in _WRITERS:
+        return
+    result = await session.execute(
+        select(DrainageLatest.location_id, DrainageLatest.name, DrainageLatest.address)
+        .where(DrainageLatest.location_id.in_(ids))
+    )
+    await _WRITERS[backend](session, result.all())
+
+
+async def rebuild_search_index_if_empty(session: AsyncSession) -> int:
+    """색인이 비어 있고 drainage_latest에 행이 있으면 전체 재구축. Returns: 색인된 행 수."""
+    backend = _session_backend(session)
+    if backend not in _WRITERS:
+        return 0
+    if await session.scalar(text(f"SELECT 1 FROM {SEARCH_TABLE} LIMIT 1")):
+        return 0
+    key = DrainageLatest.location_id
+    total, last = 0, None
+    while True:
+        stmt = select(key, DrainageLatest.name, DrainageLatest.address).order_by(key).limit(_REBUILD_CHUNK)
+        if last is not None:
+            stmt = stmt.where(key > last)
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            return total
+        await _WRITERS[backend](session, rows)
+        total += len(rows)
+        last = rows[-1][0]
+
+
+_HIT_COLUMNS = (
+    DrainageLatest.location_id,
+    DrainageLatest.name,
+    DrainageLatest.address,
+    DrainageLatest.lat,
+    DrainageLatest.lng,
+    DrainageLatest.last_measured_lat,
+    DrainageLatest.last_measured_lng,
+    DrainageLatest.cri,
+    DrainageLatest.priority_score,
+)
+
+
+def _hit(row, score: float) -> SearchHit:
+    lat, lng = effective_coords(row.lat, row.lng, row.last_measured_lat, row.last_measured_lng)
+    return SearchHit(row.location_id, row.name, row.address, lat, lng, row.cri, row.priority_score, score)
+
+
+def _candidates(backend: str, q: SearchQuery, tier: str):
+    """단계별 색인 일치 후보 (순위 없이 최대 SEARCH_CANDIDATES건 → 일치가 많아도 조기 종료)."""
+    if backend == "sqlite":
+        fts, name = (_grams_table, GRAMS_TABLE) if tier == "infix" else (_search_table, SEARCH_TABLE)
+        matched = (
+            select(fts.c.location_id)
+            .where(text(f"{name} MATCH :match").bindparams(match=q.fts5(tier)))
+            .limit(SEARCH_CANDIDATES)
+        )
+        return select(*_HIT_COLUMNS).where(DrainageLatest.location_id.in_(matched))
+    if backend == "postgresql":
+        vector = _search_table.c.grams if tier == "infix" else _search_table.c.words
+        matched = (
+            select(_search_table.c.location_id)
+            .where(vector.op("@@")(cast(q.tsquery(tier), TSQUERY)))
+            .limit(SEARCH_CANDIDATES)
+        )
+        return select(*_HIT_COLUMNS).where(DrainageLatest.location_id.in_(matched))
+    stmt = select(*_HIT_COLUMNS)
+    for word in q.words:
+        stmt = stmt.where(or_(DrainageLatest.name.contains(word), DrainageLatest.address.contains(word)))
+    return stmt.limit(SEARCH_CANDIDATES)
+
+
+async def _search_ids(session: AsyncSession, query: str, limit: int) -> list[SearchHit]:
+    """location_id 접두 검색 (PK 범위 조회, 입력 원문·대문자 모두 시도)."""
+    hits: dict[str, SearchHit] = {}
+    for prefix in dict.fromkeys((query, query.upper())):
+        result = await session.execute(
+            select(*_HIT_COLUMNS)
+            .where(DrainageLatest.location_id >= prefix, DrainageLatest.location_id < prefix + "\uffff")
+            .order_by(DrainageLatest.location_id)
+            .limit(limit)
+        )
+        for row in result.all():
+            hits.setdefault(row.location_id, _hit(row, ID_MATCH_SCORE))
+    return list(hits.values())[:limit]
+
+
+async def search_drainage(session: AsyncSession, query: str, limit: int = 10) -> list[SearchHit]:
+    """
+    이름·주소 검색 (+ location_id 접두 일치). 관련도 순 최대 limit건.
+    location_id 접두 일치가 먼저, 이어서 exact → prefix → infix 단계 순 (단계 안에서는 점수, CRI 순).
+    """
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    query = query.strip()
+    hits = await _search_ids(session, query, limit) if _ID_PREFIX.fullmatch(query) else []
+    q = SearchQuery.parse(query)
+    if len(hits) >= limit or q.empty:
+        return hits[:limit]
+
+    backend = _session_backend(session)
+    for tier in TIERS if backend != "like" else ("infix",):
+        seen = {h.location_id for h in hits}
+        rows = (await session.execute(_candidates(backend, q, tier))).all()
+        hits += sorted(
+            (_hit(row, q.score(row.name, row.address)) for row in rows if row.location_id not in seen),
+            key=lambda h: (-h.score, -(h.cri if h.cri is not None else -1), h.location_id),
+        )
+        if len(hits) >= limit:
+            break
+    return hits[:limit]
@@ -0,0 +1,191 @@
+"""공간 조회: 격자 셀 인덱스 기반 bbox / 반경 검색.
+
+- drainage_latest에 (geo_cell_y, geo_cell_x) 정수 격자 셀(약 1.1km)을 저장하고 복합 인덱스로 1차 필터
+- 셀 범위로 후보를 좁힌 뒤 실제 좌표(GPS 우선: last_measured → lat/lng)로 정밀 필터
+- 반경 검색은 반경을 감싸는 bbox 후보를 DB에서 근사 거리(등장방형 투영) 순으로 필요한 만큼만 조회 → haversine 거리로 정렬
+SQLite/Postgres 공통으로 동작 (확장 모듈 불필요).
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DrainageLatest
+
+GRID_CELL_DEG = 0.01  # 위도 기준 약 1.1km
+EARTH_RADIUS_M = 6_371_000.0
+MAX_RADIUS_M = 20_000.0
+MAX_NEARBY_LIMIT = 200  # 반경 조회 최대 건수 (GET /drainage limit 상한과 같음)
+NEARBY_FETCH_SLACK = 16  # 반경 조회 1회차에 limit보다 더 가져오는 후보 수 (근사 거리 순위 보정용)
+
+
+def check_point(lat: float, lng: float) -> None:
+    """좌표 범위 검증 (NaN·inf·범위 밖이면 ValueError)."""
+    if not (math.isfinite(lat) and math.isfinite(lng)):
+        raise ValueError("좌표는 유한한 숫자여야 합니다.")
+    if not -90 <= lat <= 90:
+        raise ValueError("위도는 -90~90 범위여야 합니다.")
+    if not -180 <= lng <= 180:
+        raise ValueError("경도는 -180~180 범위여야 합니다.")
+
+
+@dataclass(frozen=True)
+class BBox:
+    min_lng: float
+    min_lat: float
+    max_lng: float
+    max_lat: float
+
+    @classmethod
+    def parse(cls, value: str) -> "BBox":
+        """'minLng,minLat,maxLng,maxLat' 문자열 파싱."""
+        parts = [p.strip() for p in value.split(",")]
+        if len(parts) != 4:
+            raise ValueError("bbox는 minLng,minLat,maxLng,maxLat 형식이어야 합니다.")
+        try:
+            min_lng, min_lat, max_lng, max_lat = (float(p) for p in parts)
+        except ValueError:
+            raise ValueError("bbox는 minLng,minLat,maxLng,maxLat 형식이어야 합니다.")
+        check_point(min_lat, min_lng)
+        check_point(max_lat, max_lng)
+        if min_lng > max_lng or min_lat > max_lat:
+            raise ValueError("bbox 최소값이 최대값보다 큽니다.")
+        return cls(min_lng, min_lat, max_lng, max_lat)
+
+    def contains(self, lat: Optional[float], lng: Optional[float]) -> bool:
+        """좌표가 bbox 안(경계 포함)인지. 좌표가 없으면 False."""
+        if lat is None or lng is None:
+            return False
+        return self.min_lat <= lat <= self.max_lat and self.min_lng <= lng <= self.max_lng
+
+
+def effective_coords(
+    lat: Optional[float],
+    lng: Optional[float],
+    last_measured_lat: Optional[float],
+    last_measured_lng: Optional[float],
+) -> tuple[Optional[float], Optional[float]]:
+    """GPS 우선 정책: 앱 실측 좌표가 있으면 사용 (프론트 effectiveLat/Lng와 동일)."""
+    if last_measured_lat is not None and last_measured_lng is not None:
+        return last_measured_lat, last_measured_lng
+    return lat, lng
+
+
+def grid_cell(lat: Optional[float], lng: Optional[float]) -> tuple[Optional[int], Optional[int]]:
+    """좌표 → (geo_cell_y, geo_cell_x). 좌표가 없으면 (None, None)."""
+    if lat is None or lng is None:
+        return None, None
+    return math.floor(lat / GRID_CELL_DEG), math.floor(lng / GRID_CELL_DEG)
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 좌표 간 대원 거리 (m)."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def radius_bbox(lat: float, lng: float, radius_m: float) -> BBox:
+    """반경 원을 감싸는 bbox (후보 조회용)."""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    dlng = dlat / max(math.cos(math.radians(lat)), 1e-6)
+    return BBox(lng - dlng, lat - dlat, lng + dlng, lat + dlat)
+
+
+def _effective_lat():
+    return func.coalesce(DrainageLatest.last_measured_lat, DrainageLatest.lat)
+
+
+def _effective_lng():
+    return func.coalesce(DrainageLatest.last_measured_lng, DrainageLatest.lng)
+
+
+def bbox_clause(bbox: BBox):
+    """격자 셀 인덱스 범위 + 실제 좌표 정밀 필터 WHERE 절."""
+    min_cy, min_cx = grid_cell(bbox.min_lat, bbox.min_lng)
+    max_cy, max_cx = grid_cell(bbox.max_lat, bbox.max_lng)
+    return and_(
+        DrainageLatest.geo_cell_y.between(min_cy, max_cy),
+        DrainageLatest.geo_cell_x.between(min_cx, max_cx),
+        _effective_lat().between(bbox.min_lat, bbox.max_lat),
+        _effective_lng().between(bbox.min_lng, bbox.max_lng),
+    )
+
+
+async def find_nearby(
+    session: AsyncSession,
+    lat: float,
+    lng: float,
+    radius_m: float,
+    limit: int = 50,
+) -> list[tuple[DrainageLatest, float]]:
+    """
+    반경 radius_m 이내 빗물받이를 가까운 순으로 (row, distance_m) 반환.
+    DB에서 근사 거리(중심 위도 기준 등장방형 투영) 순으로 limit 근처만 조회 → haversine으로 정렬.
+    근사 오차 상한(eps)으로 아직 안 가져온 후보가 더 가까울 수 없음이 확인될 때까지 조회 수를 늘림.
+    """
+    check_point(lat, lng)
+    radius_m = min(radius_m, MAX_RADIUS_M)
+    limit = max(1, min(limit, MAX_NEARBY_LIMIT))
+    box = radius_bbox(lat, lng, radius_m)
+    # 경도 1도 거리는 후보 bbox 안에서 cos(위도)만큼 줄어듦 → 근사 거리가 실제보다 큰 비율의 상한 (+ 구면 곡률 여유)
+    cos0 = max(math.cos(math.radians(lat)), 1e-6)
+    cos_far = math.cos(math.radians(min(max(abs(box.min_lat), abs(box.max_lat)), 90.0)))
+    eps = 1 - cos_far / cos0 + 1e-3
+    m_per_deg = math.radians(1) * EARTH_RADIUS_M
+    d_lat = _effective_lat() - lat
+    d_lng = (_effective_lng() - lng) * cos0
+    approx_sq = d_lat * d_lat + d_lng * d_lng  # 도 단위 제곱 (× m_per_deg² = m²)
+    where = bbox_clause(box)
+    if eps < 1:
+        where = and_(where, approx_sq <= (radius_m / (1 - eps) / m_per_deg) ** 2)
+    fetch = limit + NEARBY_FETCH_SLACK
+    while True:
+        result = await session.execute(
+            select(DrainageLatest, approx_sq).where(where).order_by(approx_sq, DrainageLatest.location_id).limit(fetch)
+        )
+        rows = result.all()
+        hits: list[tuple[DrainageLatest, float]] = []
+        for row, _ in rows:
+            r_lat, r_lng = effective_coords(row.lat, row.lng, row.last_measured_lat, row.last_measured_lng)
+            distance = haversine_m(lat, lng, r_lat, r_lng)
+            if distance <= radius_m:
+                hits.append((row, distance))
+        hits.sort(key=lambda h: h[1])
+        if len(rows) < fetch:
+            return hits[:limit]  # 후보 전부 조회
+        # 안 가져온 후보의 실제 거리 하한: 마지막 행 근사 거리 × (1 - eps)
+        bound = math.sqrt(rows[-1][1]) * m_per_deg * (1 - eps)
+        if sum(1 for _, d in hits if d <= bound) >= limit:
+            return hits[:limit]
+        fetch *= 2
+
+
+async def fill_missing_geo_cells(session: AsyncSession) -> int:
+    """좌표는 있지만 격자 셀이 비어 있는 행(backfill·컬럼 추가 직후) 채움. Returns: 갱신 행 수."""
+    result = await session.execute(
+        select(
+            DrainageLatest.location_id,
+            DrainageLatest.lat,
+            DrainageLatest.lng,
+            DrainageLatest.last_measured_lat,
+            DrainageLatest.last_measured_lng,
+        ).where(DrainageLatest.geo_cell_y.is_(None))
+    )
+    count = 0
+    for location_id, lat, lng, m_lat, m_lng in result.all():
+        cy, cx = grid_cell(*effective_coords(lat, lng, m_lat, m_lng))
+        if cy is None:
+            continue
+        await session.execute(
+            update(DrainageLatest)
+            .where(DrainageLatest.location_id == location_id)
+            .values(geo_cell_y=cy, geo_cell_x=cx)
+        )
+        count += 1
+    return count
@@ -0,0 +1,164 @@
+"""지도 타일 클러스터: 줌아웃 화면용 서버 측 사전 집계.
+
+- Web Mercator 타일(z/x/y) 영역을 TILE_GRID×TILE_GRID 셀로 나눠 셀별 클러스터 집계
+  (개수, 최대 CRI, 평균 flood_probability, 중심 좌표) → 빗물받이 수와 무관하게 응답 크기 일정
+- drainage_latest(location_id별 최신 상태)에서 격자 셀 인덱스로 조회 후 SQL GROUP BY
+- 타일별 메모리 캐시: 수신·ML 갱신 커밋 시 해당 좌표를 포함하는 타일만 무효화
+  (워커별 캐시이므로 다중 워커 환경의 최대 지연은 TTL로 제한)
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import DrainageLatest
+from app.services.drainage_latest import LatestChange, register_change_listener
+from app.services.spatial import BBox, bbox_clause
+
+TILE_GRID = 8  # 타일당 최대 8×8 = 64 클러스터
+MAX_ZOOM = 22
+MAX_CACHED_ZOOM = 16  # 이보다 확대된 타일은 조회 범위가 작아 캐시하지 않음
+MERCATOR_MAX_LAT = 85.05112878
+
+
+def tile_bbox(z: int, x: int, y: int) -> BBox:
+    """슬리피맵 타일 좌표 → 위경도 bbox."""
+    n = 2**z
+    min_lng = x / n * 360.0 - 180.0
+    max_lng = (x + 1) / n * 360.0 - 180.0
+    max_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    min_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return BBox(min_lng, min_lat, max_lng, max_lat)
+
+
+def point_to_tile(lat: float, lng: float, z: int) -> tuple[int, int]:
+    """위경도 → 줌 z에서의 타일 (x, y)."""
+    n = 2**z
+    lat = max(-MERCATOR_MAX_LAT, min(MERCATOR_MAX_LAT, lat))
+    x = int((lng + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+class TileCache:
+    """(z, x, y) → 직렬화 전 타일 dict. LRU + TTL, 좌표 기반 무효화."""
+
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[int, int, int], tuple[float, dict[str, Any]]] = OrderedDict()
+        # 무효화마다 증가: 집계 도중 커밋된 변경이 있으면 그 결과는 캐시하지 않음
+        self.generation = 0
+
+    def get(self, key: tuple[int, int, int]) -> Optional[dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, tile = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return tile
+
+    def put(self, key: tuple[int, int, int], tile: dict[str, Any], generation: int) -> None:
+        if generation != self.generation:
+            return
+        self._entries[key] = (time.monotonic(), tile)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_point(self, lat: float, lng: float) -> None:
+        self.generation += 1
+        for z in range(MAX_CACHED_ZOOM + 1):
+            x, y = point_to_tile(lat, lng, z)
+            self._entries.pop((z, x, y), None)
+
+    def invalidate_changes(self, changes: list[LatestChange]) -> None:
+        for change in changes:
+            for lat, lng in ((change.lat, change.lng), (change.prev_lat, change.prev_lng)):
+                if lat is not None and lng is not None:
+                    self.invalidate_point(lat, lng)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+tile_cache = TileCache()
+register_change_listener(tile_cache.invalidate_changes)
+
+
+async def build_tile(session: AsyncSession, z: int, x: int, y: int) -> dict[str, Any]:
+    """타일 영역 클러스터 집계 (캐시 미사용)."""
+    bbox = tile_bbox(z, x, y)
+    step_lat = (bbox.max_lat - bbox.min_lat) / TILE_GRID
+    step_lng = (bbox.max_lng - bbox.min_lng) / TILE_GRID
+    lat = func.coalesce(DrainageLatest.last_measured_lat, DrainageLatest.lat)
+    lng = func.coalesce(DrainageLatest.last_measured_lng, DrainageLatest.lng)
+    # bbox 내부 좌표는 하한 이상이므로 CAST(정수 절삭) = floor
+    gy = cast((lat - bbox.min_lat) / step_lat, Integer).label("gy")
+    gx = cast((lng - bbox.min_lng) / step_lng, Integer).label("gx")
+    stmt = (
+        select(
+            gy,
+            gx,
+            func.count().label("n"),
+            func.max(DrainageLatest.cri).label("max_cri"),
+            func.sum(DrainageLatest.flood_probability).label("flood_sum"),
+            func.count(DrainageLatest.flood_probability).label("flood_n"),
+            func.sum(lat).label("lat_sum"),
+            func.sum(lng).label("lng_sum"),
+        )
+        .where(bbox_clause(bbox))
+        .group_by(gy, gx)
+    )
+    result = await session.execute(stmt)
+
+    # 상/우측 경계에 정확히 걸친 점(gy == TILE_GRID)은 마지막 셀로 병합
+    cells: dict[tuple[int, int], dict[str, Any]] = {}
+    for row in result.all():
+        key = (min(row.gy, TILE_GRID - 1), min(row.gx, TILE_GRID - 1))
+        cell = cells.setdefault(
+            key, {"n": 0, "max_cri": None, "flood_sum": 0.0, "flood_n": 0, "lat_sum": 0.0, "lng_sum": 0.0}
+        )
+        cell["n"] += row.n
+        if row.max_cri is not None:
+            cell["max_cri"] = row.max_cri if cell["max_cri"] is None else max(cell["max_cri"], row.max_cri)
+        cell["flood_sum"] += row.flood_sum or 0.0
+        cell["flood_n"] += row.flood_n
+        cell["lat_sum"] += row.lat_sum
+        cell["lng_sum"] += row.lng_sum
+
+    clusters = [
+        {
+            "count": c["n"],
+            "max_cri": c["max_cri"],
+            "mean_flood_probability": round(c["flood_sum"] / c["flood_n"], 3) if c["flood_n"] else None,
+            "lat": c["lat_sum"] / c["n"],
+            "lng": c["lng_sum"] / c["n"],
+        }
+        for c in cells.values()
+    ]
+    clusters.sort(key=lambda c: -c["count"])
+    return {"z": z, "x": x, "y": y, "count": sum(c["count"] for c in clusters), "clusters": clusters}
+
+
+async def get_tile(session: AsyncSession, z: int, x: int, y: int) -> dict[str, Any]:
+    """캐시 우선 타일 조회."""
+    key = (z, x, y)
+    if z > MAX_CACHED_ZOOM:
+        return await build_tile(session, z, x, y)
+    cached = tile_cache.get(key)
+    if cached is not None:
+        return cached
+    generation = tile_cache.generation
+    tile = await build_tile(session, z, x, y)
+    tile_cache.put(key, tile, generation)
+    return tile
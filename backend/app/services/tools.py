@@ -21,6 +21,61 @@ TOOLS_DEFINITIONS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "find_nearby_drainage",
+            "description": "특정 좌표(예: 강남역) 또는 특정 빗물받이(location_id) 주변 반경 내 빗물받이를 가까운 순으로 조회합니다. 공간 인덱스를 사용하므로 '○○ 근처 빗물받이' 질문에 사용합니다.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "lat": {"type": "number", "description": "기준점 위도 (WGS84)"},
+                    "lng": {"type": "number", "description": "기준점 경도 (WGS84)"},
+                    "location_id": {
+                        "type": "string",
+                        "description": "기준 빗물받이 ID (lat/lng 대신 사용 가능)",
+                    },
+                    "radius_m": {
+                        "type": "number",
+                        "description": "반경 (m, 기본 500, 최대 20000)",
+                    },
+                    "limit": {"type": "integer", "description": "최대 결과 수 (기본 20, 최대 200)"},
+                },
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_drainage",
+            "description": "이름·주소(예: '역삼동', '반포동 3번길', '강남구 빗물받이 12')로 빗물받이를 검색해 location_id를 찾습니다. 사용자가 ID 대신 주소나 이름으로 지점을 말할 때 먼저 사용합니다.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "검색어 (주소·이름 일부 또는 location_id 앞부분)"},
+                    "limit": {"type": "integer", "description": "최대 결과 수 (기본 10, 최대 50)"},
+                },
+                "required": ["query"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "plan_cleaning_routes",
+            "description": "청소 크루의 방문 동선을 계획합니다. CRI·우선순위가 높은 빗물받이를 근무 시간 안에 최대한 방문하도록 크루별 방문 순서와 도착 예정 시각(분)을 반환합니다. '오늘 청소 동선 짜줘', '크루 3팀 배치' 같은 요청에 사용합니다.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "crew_count": {"type": "integer", "description": "크루 수 (기본 1, 최대 10)"},
+                    "start_lat": {"type": "number", "description": "출발지 위도 (없으면 기본 차고지 또는 후보 중심)"},
+                    "start_lng": {"type": "number", "description": "출발지 경도"},
+                    "min_cri": {"type": "integer", "description": "방문 후보 최소 CRI (기본 50)"},
+                    "shift_minutes": {"type": "number", "description": "크루별 근무 시간 (분, 기본 480)"},
+                },
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
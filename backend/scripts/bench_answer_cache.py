@@ -0,0 +1,142 @@
+"""Chat 응답 캐시 벤치마크 + 유효성 검증 (LLM 없이 app.services.answer_cache만).
+
+임시 SQLite DB에 합성 빗물받이 N곳을 넣고, 질문마다 실제 Intent 라우팅·컨텍스트 조회(get_context_for_query)를 거쳐
+가짜 답변을 캐시에 저장한 뒤
+  (1) 같은 질문 재조회 → 정확 일치 hit, 비슷한 질문 → 유사 일치 hit, 조회 지연
+  (2) 새 스캔 수신 후 재조회 → DB 행이 컨텍스트에 들어간 답변은 모두 miss
+      (인사로 시작하는 위험도 질문, general로 분류돼도 마찬가지), 지점 질문은 해당 지점 스캔 수신 시 miss
+  (3) 컨텍스트에 DB 행이 없던 general 답변만 TTL 동안 유지
+를 확인.
+
+실행 (backend 디렉터리에서):
+    python -m scripts.bench_answer_cache --drains 5000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base
+from app.services.answer_cache import AnswerCache, CachedAnswer, hashed_char_embedding
+from app.services.drainage_latest import upsert_latest
+from app.services.intent_router import route_local
+from app.services.llm_orchestrator import get_context_for_query
+from app.services.scans import record_scans
+from app.services.search import create_search_index
+from scripts.bench_retrieval import DISTRICTS
+
+QUESTIONS = (
+    "안녕, 지금 제일 위험한 빗물받이 어디야?",
+    "CRI가 뭐야? 지금 제일 높은 곳은?",
+    "강남구 CRI 80 이상 빗물받이 목록",
+)
+LOCATION_QUESTION = "AA-000013 상태 알려줘"
+SIMILAR = ("안녕 지금 제일 위험한 빗물받이 어디야", "강남구 CRI 80 이상 빗물받이 목록 보여줘")
+
+
+def _drain(rng: random.Random, i: int) -> dict:
+    gu = rng.choice(list(DISTRICTS))
+    dong = rng.choice(DISTRICTS[gu])
+    return {
+        "location_id": f"AA-{i:06d}",
+        "name": f"{dong} 빗물받이 {i}",
+        "address": f"서울특별시 {gu} {dong} {rng.randint(1, 999)}번길",
+        "lat": 37.45 + rng.random() * 0.2,
+        "lng": 126.85 + rng.random() * 0.3,
+        "volume_L": 100.0,
+        "trash_vol_L": rng.random() * 100,
+        "cri": rng.randint(0, 100),
+        "priority_score": rng.randint(1, 5),
+    }
+
+
+async def _make_db(path: Path, n: int) -> async_sessionmaker[AsyncSession]:
+    rng = random.Random(n)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_index)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    rows = [_drain(rng, i) for i in range(n)]
+    async with sessionmaker() as session:
+        for start in range(0, n, 2000):
+            await upsert_latest(session, await record_scans(session, rows[start:start + 2000]))
+        await session.commit()
+    return sessionmaker
+
+
+async def _answer(cache: AnswerCache, session: AsyncSession, query: str, intent: str | None = None) -> int:
+    """miss → 라우팅·컨텍스트 조회 → 가짜 답변 저장 (chat API와 같은 store 인자). Returns: 컨텍스트 DB 행 수."""
+    lookup = await cache.lookup(session, query)
+    assert lookup.kind == "miss", f"first lookup should miss: {query}"
+    if intent is None:
+        decision = route_local(query)
+        intent = decision.intent if decision else "general"  # 로컬 확신 부족 → LLM 분류 자리: 가장 느슨한 general로 가정
+    _, context_rows = await get_context_for_query(session, query)
+    stored = cache.store(
+        lookup.ticket,
+        CachedAnswer(f"answer to {query}", intent, "bench"),
+        [],
+        context_rows,
+    )
+    assert stored, f"answer not stored: {query}"
+    return context_rows
+
+
+async def main(n: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        sessionmaker = await _make_db(Path(tmp) / "answer_cache.db", n)
+        cache = AnswerCache(max_entries=1000, ttl_seconds=600, similarity_threshold=0.85, embed=hashed_char_embedding)
+        async with sessionmaker() as session:
+            for query in (*QUESTIONS, LOCATION_QUESTION):
+                decision = route_local(query)
+                rows = await _answer(cache, session, query)
+                print(f"  {query:<36} intent={decision.intent if decision else '-':<14} context rows={rows}")
+            # LLM 분류기가 general로 판정한 경우도 같은 결과여야 함 (답변 근거는 컨텍스트의 DB 행)
+            forced = "안녕하세요, 침수 위험 높은 지점 보여줘"
+            await _answer(cache, session, forced, intent="general")
+            # DB 행이 없는 컨텍스트로 답한 general 질문 (TTL만 적용되는 유일한 경우)
+            lookup = await cache.lookup(session, "너 뭐 할 수 있어?")
+            cache.store(lookup.ticket, CachedAnswer("도움말", "general", "bench"), [], 0)
+
+            for query in (*QUESTIONS, forced, LOCATION_QUESTION):
+                assert (await cache.lookup(session, query)).kind == "exact", f"exact hit expected: {query}"
+            for query in SIMILAR:
+                assert (await cache.lookup(session, query)).kind == "semantic", f"semantic hit expected: {query}"
+            print("[check] repeated questions hit (exact), paraphrases hit (semantic)")
+
+            times = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                await cache.lookup(session, QUESTIONS[0])
+                times.append((time.perf_counter() - t0) * 1000)
+            print(f"exact hit lookup (version check incl.): {statistics.median(times):.2f}ms median")
+
+            await upsert_latest(session, await record_scans(session, [_drain(random.Random(0), n)]))
+            await session.commit()
+            for query in (*QUESTIONS, forced):
+                kind = (await cache.lookup(session, query)).kind
+                assert kind == "miss", f"stale answer served after new scan ({kind}): {query}"
+            print("[check] after a new scan every answer built on DB rows misses (incl. greeting-prefixed, general)")
+            assert (await cache.lookup(session, LOCATION_QUESTION)).kind == "exact"
+            await upsert_latest(session, await record_scans(session, [_drain(random.Random(0), 13)]))
+            await session.commit()
+            assert (await cache.lookup(session, LOCATION_QUESTION)).kind == "miss"
+            print("[check] location answer misses only after a scan of that location")
+            assert (await cache.lookup(session, "너 뭐 할 수 있어?")).kind == "exact"
+            print("[check] general answer with no DB rows in context stays cached until TTL")
+        print(cache.metrics())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drains", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.drains, args.repeat))
@@ -0,0 +1,235 @@
+"""조회 API 응답 캐시 벤치마크 + 기존 응답(Pydantic 직렬화)과의 본문 일치 검증.
+
+임시 SQLite DB에 빗물받이 N곳을 넣고 앱을 프로세스 안(ASGI)에서 호출해
+  (1) 목록(cursor 페이지·bbox·near)·단건 응답 본문이 DrainageDataOut 직렬화(FastAPI 기본 JSONResponse)와 같은지 확인
+  (2) 폴링 부하: 클라이언트 C개가 --seconds 동안 목록(limit 200)·상세 1곳 단건을 반복 조회, 수신 writer가 초당 W건 스캔 upsert
+      - cache off: 매 요청 DB 조회 + 직렬화 (기존 동작)
+      - cache 200: 캐시된 바이트 응답 (조건부 헤더 없음)
+      - cache 304: 이전 응답의 ETag로 If-None-Match 재검증 (브라우저·프록시 폴링)
+  초당 처리량, p50/p95 지연, 304 비율, 캐시 적중률을 출력.
+
+실행 (backend 디렉터리에서):
+    python -m scripts.bench_http_cache --drains 20000 --clients 50 --seconds 5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.drainage import NEXT_CURSOR_HEADER
+from app.database import get_db
+from app.main import app
+from app.models import Base, DrainageLatest
+from app.schemas import DrainageDataOut
+from app.services.drainage_latest import update_latest_analytics_many, upsert_latest
+from app.services.http_cache import response_cache, settings
+from app.services.scans import record_scans
+from app.services.search import create_search_index
+from app.services.spatial import find_nearby
+
+INSERT_CHUNK = 5000
+BBOX = "126.95,37.50,127.00,37.55"
+NEAR = (37.55, 126.98)
+
+
+def _scan(rng: random.Random, i: int, created_at: datetime) -> dict:
+    return {
+        "location_id": f"HC-{i:06d}",
+        "name": f"빗물받이 {i}",
+        "address": f"서울특별시 테스트구 {i}번지",
+        "lat": rng.uniform(37.42, 37.70),
+        "lng": rng.uniform(126.76, 127.18),
+        "volume_L": rng.uniform(0, 120),
+        "trash_vol_L": rng.uniform(0, 200),
+        "max_height_mm": rng.uniform(0, 300),
+        "elevation_type": rng.choice(("lowland", "highland")),
+        "created_at": created_at,
+    }
+
+
+async def _make_db(path: Path, n: int) -> async_sessionmaker:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_index)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    rng = random.Random(42)
+    start = datetime.utcnow() - timedelta(days=1)
+    async with sessionmaker() as session:
+        for chunk in range(0, n, INSERT_CHUNK):
+            scans = [_scan(rng, i, start + timedelta(seconds=i)) for i in range(chunk, min(n, chunk + INSERT_CHUNK))]
+            stored = await record_scans(session, scans)
+            await upsert_latest(session, stored)
+            await update_latest_analytics_many(
+                session,
+                [
+                    {
+                        "location_id": s["location_id"],
+                        "scan_id": s["id"],
+                        "cri": rng.randint(0, 100),
+                        "priority_score": rng.randint(1, 3),
+                        "flood_probability": round(rng.random(), 3),
+                        "risk_reason": "벤치마크",
+                        "ml_updated_at": datetime.utcnow(),
+                    }
+                    for s in stored
+                ],
+            )
+        await session.commit()
+    return sessionmaker
+
+
+def _pydantic_body(models: list[DrainageDataOut] | DrainageDataOut | None) -> bytes:
+    """캐시 도입 전 응답 본문: response_model 직렬화 → JSONResponse."""
+    return JSONResponse(jsonable_encoder(models)).body
+
+
+async def _check_bodies(client: httpx.AsyncClient, sessionmaker: async_sessionmaker) -> None:
+    checked = 0
+    async with sessionmaker() as session:
+        r = await client.get("/drainage", params={"limit": 200})  # 기본: 최근 스캔 순
+        stmt = select(DrainageLatest).order_by(DrainageLatest.created_at.desc(), DrainageLatest.location_id.desc())
+        rows = (await session.execute(stmt.limit(200))).scalars().all()
+        assert r.content == _pydantic_body([DrainageDataOut.model_validate(row) for row in rows]), "recent list bytes differ"
+        assert NEXT_CURSOR_HEADER not in r.headers
+        checked += len(rows)
+
+        cursor = None
+        for _ in range(3):  # location_id 순 첫 3페이지 (keyset cursor)
+            params = {"cursor": cursor} if cursor else {"order": "location_id"}
+            r = await client.get("/drainage", params={"limit": 200, **params})
+            stmt = select(DrainageLatest).order_by(DrainageLatest.location_id)
+            if cursor:
+                stmt = stmt.where(DrainageLatest.location_id > rows[-1].location_id)
+            rows = (await session.execute(stmt.limit(200))).scalars().all()
+            expected = _pydantic_body([DrainageDataOut.model_validate(row) for row in rows])
+            assert json.loads(r.content) == json.loads(expected), "list page differs"
+            assert r.content == expected, "list page bytes differ"
+            cursor = r.headers[NEXT_CURSOR_HEADER]
+            checked += len(rows)
+
+        r = await client.get("/drainage", params={"limit": 200, "near": f"{NEAR[0]},{NEAR[1]}", "radius_m": 3000})
+        hits = await find_nearby(session, *NEAR, 3000, 200)
+        expected = _pydantic_body([
+            DrainageDataOut.model_validate(row).model_copy(update={"distance_m": round(d, 1)}) for row, d in hits
+        ])
+        assert r.content == expected, "near bytes differ"
+        checked += len(hits)
+
+        r = await client.get("/drainage", params={"limit": 200, "bbox": BBOX})
+        assert r.status_code == 200 and len(r.json()) > 0, "bbox query returned nothing"
+        checked += len(r.json())
+
+        for row in (await session.execute(select(DrainageLatest).limit(50))).scalars().all():
+            r = await client.get(f"/drainage/{row.location_id}")
+            assert r.content == _pydantic_body(DrainageDataOut.model_validate(row)), f"{row.location_id} differs"
+            checked += 1
+        r = await client.get("/drainage/NOT-FOUND")
+        assert r.content == _pydantic_body(None)
+    print(f"[check] {checked:,} rows: cached bodies == DrainageDataOut JSON bytes (list, cursor pages, near, single)")
+
+
+async def _writer(sessionmaker: async_sessionmaker, n: int, per_second: float, stop: asyncio.Event) -> int:
+    """수신 부하: 기존 지점에 새 스캔 upsert (커밋마다 변경 통지 → 캐시 무효화)."""
+    if per_second <= 0:
+        return 0
+    rng = random.Random(7)
+    written = 0
+    while not stop.is_set():
+        async with sessionmaker() as session:
+            scan = _scan(rng, rng.randrange(n), datetime.utcnow())
+            await upsert_latest(session, await record_scans(session, [scan]))
+            await session.commit()
+        written += 1
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=1 / per_second)
+        except asyncio.TimeoutError:
+            pass
+    return written
+
+
+async def _poller(client: httpx.AsyncClient, ids: list[str], conditional: bool, stop: asyncio.Event,
+                  samples: list[float], statuses: dict[int, int]) -> None:
+    # 지도 클라이언트 패턴: 목록 1회 + 열어 둔 상세 패널 1곳 단건 1회를 반복
+    urls = ("/drainage?limit=200", f"/drainage/{random.choice(ids)}")
+    etags: dict[str, str] = {}
+    while not stop.is_set():
+        for url in urls:
+            headers = {"If-None-Match": etags[url]} if conditional and url in etags else {}
+            t0 = time.perf_counter()
+            r = await client.get(url, headers=headers)
+            samples.append((time.perf_counter() - t0) * 1000)
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+            if r.status_code == 200 and "etag" in r.headers:
+                etags[url] = r.headers["etag"]
+
+
+async def _run(label: str, client, sessionmaker, ids, n, args, enabled: bool, conditional: bool) -> float:
+    settings.http_cache_enabled = enabled
+    response_cache.clear()
+    response_cache.stats.update({k: 0 for k in response_cache.stats})
+    stop = asyncio.Event()
+    samples: list[float] = []
+    statuses: dict[int, int] = {}
+    writer = asyncio.create_task(_writer(sessionmaker, n, args.writes_per_sec, stop))
+    pollers = [
+        asyncio.create_task(_poller(client, ids, conditional, stop, samples, statuses)) for _ in range(args.clients)
+    ]
+    await asyncio.sleep(args.seconds)
+    stop.set()
+    await asyncio.gather(*pollers)
+    written = await writer
+    qps = len(samples) / args.seconds
+    p95 = statistics.quantiles(samples, n=20)[18]
+    metrics = response_cache.metrics()
+    print(
+        f"{label:<10} {qps:>8,.0f} req/s  p50 {statistics.median(samples):>6.1f}ms  p95 {p95:>6.1f}ms  "
+        f"304 {statuses.get(304, 0) / len(samples):>5.1%}  hit rate {metrics['hit_rate']:>5.1%}  writes {written}"
+    )
+    return qps
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        sessionmaker = await _make_db(Path(tmp) / "http_cache.db", args.drains)
+        print(f"[setup] {args.drains:,} drains in {time.perf_counter() - t0:.1f}s")
+
+        async def override_db():
+            async with sessionmaker() as session:
+                yield session
+                await session.commit()
+
+        app.dependency_overrides[get_db] = override_db
+        async with sessionmaker() as session:
+            ids = (await session.execute(select(DrainageLatest.location_id).limit(1000))).scalars().all()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            settings.http_cache_enabled = True
+            await _check_bodies(client, sessionmaker)
+            print(f"[load] {args.clients} clients × (list limit=200 + single), writer {args.writes_per_sec}/s, {args.seconds}s each")
+            base = await _run("cache off", client, sessionmaker, ids, args.drains, args, False, False)
+            hit = await _run("cache 200", client, sessionmaker, ids, args.drains, args, True, False)
+            revalidate = await _run("cache 304", client, sessionmaker, ids, args.drains, args, True, True)
+            print(f"throughput vs cache off: 200 ×{hit / base:.1f}, 304 ×{revalidate / base:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drains", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writes-per-sec", type=float, default=5.0)
+    asyncio.run(main(parser.parse_args()))
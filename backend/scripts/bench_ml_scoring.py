@@ -0,0 +1,138 @@
+"""배치 CRI 스코어링 벤치마크 + 단건 경로와의 결과 일치 검증.
+
+임시 SQLite DB 두 개에 같은 합성 스캔 N건을 넣고
+  (1) 기존 단건 경로: 행마다 trigger_ml_analysis (최신 행 재조회 + UPDATE 1회)
+  (2) 배치 경로: score_unscored (청크 NumPy 벡터화 + executemany)
+의 처리량(rows/sec)을 비교한 뒤, 두 DB의 산출 컬럼이 완전히 같은지 확인.
+
+실행 (backend 디렉터리에서):
+    python -m scripts.bench_ml_scoring --rows 5000
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base, DrainAnalytics, DrainageLatest
+from app.services.drainage_latest import upsert_latest
+from app.services.ml_pipeline import score_unscored, trigger_ml_analysis
+from app.services.ml_scoring import score_batch, score_row
+from app.services.scans import record_scans
+from app.services.search import create_search_index
+
+RESULT_COLUMNS = ("priority_score", "risk_reason", "flood_probability", "cri")
+
+
+def _synthetic_rows(n: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        has_trash = rng.random() < 0.6
+        before = rng.choice([None, 0.0, rng.uniform(0, 40)])
+        trash = max(0.0, rng.uniform(0, 200) - (before or 0)) if has_trash else None
+        rows.append({
+            "location_id": f"BENCH-{i:06d}",  # 지점당 1건: 단건 경로(최신 행 기준)와 배치 경로(행 기준)가 같은 행을 채점
+            "trash_vol_L": trash,
+            "volume_L": rng.choice([None, 0.0, rng.uniform(0, 120)]),
+            "max_height_mm": rng.choice([None, 0.0, rng.uniform(0, 300)]),
+            "elevation_type": rng.choice([None, "lowland", " Lowland ", "highland", ""]),
+        })
+    return rows
+
+
+def _check_pure_equivalence(n: int) -> None:
+    """DB 없이 수식만 비교 (경계값 포함)."""
+    rows = _synthetic_rows(n, seed=7)
+    # 분기 경계: fill_ratio 0.4/0.5/0.7/1.0, CRI 50/80 부근
+    for trash in (0.0, 60.0, 75.0, 105.0, 150.0, 120.0, 119.99, 74.99, 300.0):
+        for elev in ("lowland", None):
+            rows.append({"trash_vol_L": trash, "volume_L": None, "max_height_mm": None, "elevation_type": elev})
+    for volume, height in ((100.0, 200.0), (50.0, 0.0), (0.0, 50.0), (80.0, 100.0), (100.0, 80.0)):
+        rows.append({"trash_vol_L": None, "volume_L": volume, "max_height_mm": height, "elevation_type": None})
+
+    batch = score_batch(
+        [r["trash_vol_L"] for r in rows],
+        [r["volume_L"] for r in rows],
+        [r["max_height_mm"] for r in rows],
+        [r["elevation_type"] for r in rows],
+    )
+    for i, r in enumerate(rows):
+        expected = score_row(r["trash_vol_L"], r["volume_L"], r["max_height_mm"], r["elevation_type"])
+        got = {c: batch[c][i] for c in RESULT_COLUMNS}
+        assert got == expected, f"mismatch at {i}: input={r} expected={expected} got={got}"
+    print(f"[check] pure score_batch == score_row on {len(rows)} inputs")
+
+
+async def _make_db(path: Path, rows: list[dict]) -> async_sessionmaker[AsyncSession]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_index)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessionmaker() as session:
+        await upsert_latest(session, await record_scans(session, rows))
+        await session.commit()
+    return sessionmaker
+
+
+async def _results(sessionmaker: async_sessionmaker[AsyncSession], model, key) -> dict[str, tuple]:
+    async with sessionmaker() as session:
+        result = await session.execute(
+            select(key, *[getattr(model, c) for c in RESULT_COLUMNS])
+        )
+        return {r[0]: tuple(r[1:]) for r in result.all()}
+
+
+async def main(n: int, chunk_size: int) -> None:
+    _check_pure_equivalence(min(n, 50_000))
+    rows = _synthetic_rows(n)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        per_row_db = await _make_db(Path(tmp) / "per_row.db", rows)
+        batch_db = await _make_db(Path(tmp) / "batch.db", rows)
+
+        # (1) 기존 경로: run_periodic_ml_update 루프와 동일 (asyncio.sleep(0.1) 부하 완화는 제외)
+        async with per_row_db() as session:
+            unscored = (
+                await session.execute(
+                    select(DrainageLatest.location_id).where(DrainageLatest.ml_updated_at.is_(None))
+                )
+            ).scalars().all()
+            t0 = time.perf_counter()
+            for location_id in unscored:
+                await trigger_ml_analysis(session, location_id)
+            await session.commit()
+            per_row_sec = time.perf_counter() - t0
+
+        # (2) 배치 경로
+        async with batch_db() as session:
+            t0 = time.perf_counter()
+            scored = await score_unscored(session, chunk_size=chunk_size)
+            await session.commit()
+            batch_sec = time.perf_counter() - t0
+        assert scored == n, f"batch scored {scored} rows, expected {n}"
+
+        for model, key in ((DrainAnalytics, DrainAnalytics.scan_id), (DrainageLatest, DrainageLatest.location_id)):
+            a = await _results(per_row_db, model, key)
+            b = await _results(batch_db, model, key)
+            assert len(a) == n and a == b, f"{model.__tablename__}: per-row and batch results differ"
+        print(f"[check] DB results identical for drain_analytics and drainage_latest ({n} rows)")
+
+    print(f"per-row : {n / per_row_sec:>10,.0f} rows/sec  ({per_row_sec:.2f}s)")
+    print(f"          (기존 루프는 행마다 sleep(0.1) → 최대 10 rows/sec)")
+    print(f"batch   : {n / batch_sec:>10,.0f} rows/sec  ({batch_sec:.2f}s, chunk={chunk_size})")
+    print(f"speedup : {per_row_sec / batch_sec:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--chunk-size", type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.chunk_size))
@@ -0,0 +1,199 @@
+"""강우 예보 재계산 벤치마크 + 단건 수식과의 결과 일치 검증.
+
+임시 SQLite DB에 서울 범위 합성 빗물받이 N곳(ML 산출 완료 상태)을 넣고
+  (1) 격자 최근접 셀 조회(벡터)와 점별 계산, score_batch(rain_mm)와 score_row(rain_mm)가 같은지 확인
+  (2) 1 km 격자 폭우 예보 A 적용 → 도시 전체 재계산 시간 (읽기 / 스코어링 / 쓰기)
+  (3) 폭우 중심이 이동한 예보 B 적용 → 바뀐 지점만 기록되는지
+  (4) 예보 해제 → 강우 없는 기존 점수로 정확히 복귀하는지, 예보별 점수 이력 행 수
+DB 값은 매 단계 score_row(지점 강우량)로 다시 계산한 값과 비교.
+
+실행 (backend 디렉터리에서):
+    python -m scripts.bench_rainfall --drains 100000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base, DrainageLatest, RainfallScore
+from app.services.drainage_latest import upsert_latest
+from app.services.ml_scoring import score_batch, score_row
+from app.services.rainfall import ForecastGrid, applied_forecast_id, apply_forecast, grid_from_points, store_forecast
+from app.services.scans import record_scans
+from app.services.search import create_search_index
+
+LAT_RANGE = (37.42, 37.70)  # 서울 범위
+LNG_RANGE = (126.76, 127.18)
+GRID_DEG = 0.01  # 약 1 km 격자
+INSERT_CHUNK = 5000
+
+
+def _synthetic_drains(n: int, seed: int = 42) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(*LAT_RANGE, n)
+    lng = rng.uniform(*LNG_RANGE, n)
+    trash = np.where(rng.random(n) < 0.8, rng.uniform(0, 200, n), np.nan)
+    volume = rng.uniform(0, 120, n)
+    height = rng.uniform(0, 300, n)
+    lowland = rng.random(n) < 0.3
+    rows = [
+        {
+            "location_id": f"RAIN-{i:06d}",
+            "lat": float(lat[i]),
+            "lng": float(lng[i]),
+            "trash_vol_L": None if np.isnan(trash[i]) else float(trash[i]),
+            "volume_L": float(volume[i]),
+            "max_height_mm": float(height[i]),
+            "elevation_type": "lowland" if lowland[i] else "highland",
+        }
+        for i in range(n)
+    ]
+    scores = score_batch(
+        [r["trash_vol_L"] for r in rows],
+        [r["volume_L"] for r in rows],
+        [r["max_height_mm"] for r in rows],
+        [r["elevation_type"] for r in rows],
+    )
+    now = datetime.utcnow()
+    for i, r in enumerate(rows):
+        r.update({c: scores[c][i] for c in ("priority_score", "risk_reason", "flood_probability", "cri")})
+        r["ml_updated_at"] = now
+    return rows
+
+
+def _storm(center_lat: float, center_lng: float, peak_mm: float) -> ForecastGrid:
+    """서울 전역 1 km 격자, 중심에서 멀어질수록 줄어드는 가우시안 강우 (mm/h), 약한 비는 0."""
+    lat_axis = np.arange(LAT_RANGE[0], LAT_RANGE[1] + GRID_DEG / 2, GRID_DEG)
+    lng_axis = np.arange(LNG_RANGE[0], LNG_RANGE[1] + GRID_DEG / 2, GRID_DEG)
+    lat, lng = (a.ravel() for a in np.meshgrid(lat_axis, lng_axis, indexing="ij"))
+    rain = peak_mm * np.exp(-(((lat - center_lat) / 0.06) ** 2 + ((lng - center_lng) / 0.08) ** 2))
+    return grid_from_points(lat, lng, np.where(rain < 1.0, 0.0, rain))
+
+
+def _check_pure(grid: ForecastGrid, drains: list[dict]) -> None:
+    sample = drains[:20_000]
+    lat = np.array([d["lat"] for d in sample])
+    lng = np.array([d["lng"] for d in sample])
+    rain = grid.rain_at(lat, lng)
+    n_lat, n_lng = grid.values.shape
+    for i in range(0, len(sample), 97):
+        iy = round((lat[i] - grid.lat0) / grid.dlat)
+        ix = round((lng[i] - grid.lng0) / grid.dlng)
+        expected = float(grid.values[iy, ix]) if 0 <= iy < n_lat and 0 <= ix < n_lng else 0.0
+        assert rain[i] == expected, f"grid lookup mismatch at {i}"
+    outside = grid.rain_at(np.array([np.nan, 30.0, LAT_RANGE[0]]), np.array([127.0, 127.0, np.nan]))
+    assert not outside.any(), "points outside the grid must get 0 mm"
+
+    rain_inputs = [*rain.tolist(), 0.0, None, 25.0, 50.0, 100.0, 1e-9]
+    rows = (sample * 2)[:len(rain_inputs)]  # 경계 강우값(0·None·기준값 등)에도 같은 지점 입력 재사용
+    batch = score_batch(
+        [r["trash_vol_L"] for r in rows],
+        [r["volume_L"] for r in rows],
+        [r["max_height_mm"] for r in rows],
+        [r["elevation_type"] for r in rows],
+        rain_mm=rain_inputs,
+    )
+    dry = score_batch(
+        [r["trash_vol_L"] for r in rows],
+        [r["volume_L"] for r in rows],
+        [r["max_height_mm"] for r in rows],
+        [r["elevation_type"] for r in rows],
+    )
+    for i, r in enumerate(rows):
+        expected = score_row(r["trash_vol_L"], r["volume_L"], r["max_height_mm"], r["elevation_type"], rain_inputs[i])
+        got = {c: batch[c][i] for c in expected}
+        assert got == expected, f"mismatch at {i}: rain={rain_inputs[i]} expected={expected} got={got}"
+        if not rain_inputs[i]:
+            assert got == {c: dry[c][i] for c in expected}, "zero rain must equal the rain-free score"
+    print(f"[check] grid lookup and score_batch(rain_mm) == score_row(rain_mm) on {len(rows)} inputs")
+
+
+async def _make_db(path: Path, drains: list[dict]) -> async_sessionmaker[AsyncSession]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_index)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessionmaker() as session:
+        for start in range(0, len(drains), INSERT_CHUNK):
+            await upsert_latest(session, await record_scans(session, drains[start:start + INSERT_CHUNK]))
+        await session.commit()
+    return sessionmaker
+
+
+async def _verify(sessionmaker, grid: ForecastGrid | None, forecast_id: int | None) -> None:
+    """DB의 침수 확률·우선순위·출처가 score_row(지점 강우량)와 같은지."""
+    async with sessionmaker() as session:
+        rows = (
+            await session.execute(
+                select(
+                    DrainageLatest.lat, DrainageLatest.lng, DrainageLatest.trash_vol_L, DrainageLatest.volume_L,
+                    DrainageLatest.max_height_mm, DrainageLatest.elevation_type, DrainageLatest.flood_probability,
+                    DrainageLatest.priority_score, DrainageLatest.forecast_id, DrainageLatest.forecast_rain_mm,
+                )
+            )
+        ).all()
+    lat = np.array([r.lat for r in rows])
+    lng = np.array([r.lng for r in rows])
+    rain = grid.rain_at(lat, lng) if grid is not None else np.zeros(len(rows))
+    for i, r in enumerate(rows):
+        expected = score_row(r.trash_vol_L, r.volume_L, r.max_height_mm, r.elevation_type, float(rain[i]))
+        assert (r.flood_probability, r.priority_score) == (expected["flood_probability"], expected["priority_score"])
+        raining = rain[i] > 0 and forecast_id is not None
+        assert r.forecast_id == (forecast_id if raining else None)
+        assert r.forecast_rain_mm == (round(float(rain[i]), 2) if raining else None)
+    print(f"  [check] {len(rows):,} drains match score_row with their grid-cell rainfall")
+
+
+async def _apply(sessionmaker, label: str, forecast_id: int | None, grid: ForecastGrid | None) -> None:
+    async with sessionmaker() as session:
+        t0 = time.perf_counter()
+        stats = await apply_forecast(session, forecast_id)
+        total = time.perf_counter() - t0
+        history = await session.scalar(select(func.count()).select_from(RainfallScore))
+        high = await session.scalar(select(func.count()).where(DrainageLatest.priority_score == 1))
+        assert await applied_forecast_id(session) == forecast_id, "applied forecast not recorded"
+    print(
+        f"{label}: {total:.2f}s ({stats.drains / total:,.0f} drains/sec) = read {stats.read_ms:,.0f}ms"
+        f" + score {stats.score_ms:,.0f}ms + write {stats.write_ms:,.0f}ms"
+    )
+    print(
+        f"  raining {stats.raining:,} drains, changed {stats.changed:,}, priority 1 now {high:,},"
+        f" history rows {history:,}"
+    )
+    await _verify(sessionmaker, grid, forecast_id)
+
+
+async def main(n: int) -> None:
+    drains = _synthetic_drains(n)
+    storm_a = _storm(37.55, 126.93, 80.0)  # 서부 집중호우
+    storm_b = _storm(37.52, 127.05, 65.0)  # 강남 쪽으로 이동
+    _check_pure(storm_a, drains)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        sessionmaker = await _make_db(Path(tmp) / "rainfall.db", drains)
+        print(f"[setup] {n:,} drains in {time.perf_counter() - t0:.1f}s, grid {storm_a.values.shape[0]}×{storm_a.values.shape[1]} cells")
+
+        now = datetime.utcnow()
+        async with sessionmaker() as session:
+            a = await store_forecast(session, storm_a, now, now, now + timedelta(hours=3), "bench-a")
+            b = await store_forecast(session, storm_b, now, now, now + timedelta(hours=6), "bench-b")
+            await session.commit()
+        await _apply(sessionmaker, "forecast A", a.id, storm_a)
+        await _apply(sessionmaker, "forecast B", b.id, storm_b)
+        await _apply(sessionmaker, "cleared   ", None, None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drains", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.drains))
@@ -0,0 +1,159 @@
+"""Chat 컨텍스트 검색 벤치마크: 기존 "최근 20행 str(dict)" vs 질문 기반 검색(app.services.retrieval).
+
+임시 SQLite DB에 합성 빗물받이 N곳(구·동 주소, 배치 스코어링 완료)을 넣고 대표 질문마다
+  - 프롬프트 토큰 (근사치: retrieval.estimate_tokens, --llm 이면 vLLM usage.prompt_tokens)
+  - 컨텍스트 조회 지연 (중앙값)
+  - 질문에 지정된 location_id가 컨텍스트에 포함됐는지
+를 비교. --llm 을 주면 두 프롬프트로 실제 vLLM 호출 end-to-end 지연도 측정.
+
+실행 (backend 디렉터리에서):
+    python -m scripts.bench_retrieval --drains 20000
+    python -m scripts.bench_retrieval --llm       # VLLM_BASE_URL 필요
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base, DrainageLatest
+from app.services.drainage_latest import upsert_latest
+from app.services.ml_pipeline import score_unscored
+from app.services.retrieval import build_context, estimate_tokens
+from app.services.scans import record_scans
+from app.services.search import create_search_index
+
+DISTRICTS = {
+    "강남구": ("역삼동", "삼성동", "논현동", "대치동"),
+    "서초구": ("서초동", "반포동", "방배동"),
+    "송파구": ("잠실동", "문정동", "가락동"),
+    "마포구": ("합정동", "망원동", "상암동"),
+}
+
+QUERIES = (
+    "AA-000013 상태 알려줘",
+    "AA-000777 위험 사유가 뭐야",
+    "우선순위 1인 빗물받이 목록 보여줘",
+    "침수 확률이 가장 높은 곳 5곳",
+    "CRI 80 이상인 지점 몇 개야",
+    "강남구 빗물받이 위험도 현황",
+    "역삼동 저지대 중 위험한 곳",
+    "쓰레기 가득 찬 곳 top 10",
+    "결함 있는 빗물받이 찾아줘",
+    "전체 현황 요약해줘",
+)
+
+
+async def legacy_context(session: AsyncSession, query: str) -> str:
+    """기존 get_context_for_query: 질문과 무관하게 최근 20행을 str(dict)로."""
+    result = await session.execute(select(DrainageLatest).order_by(DrainageLatest.created_at.desc()).limit(20))
+    lines = []
+    for r in result.scalars().all():
+        d = {
+            "location_id": r.location_id,
+            "volume_L": r.volume_L,
+            "max_height_mm": r.max_height_mm,
+            "priority_score": r.priority_score,
+            "risk_reason": r.risk_reason,
+            "flood_probability": r.flood_probability,
+            "cri": r.cri,
+            "address": r.address,
+        }
+        lines.append(str(d))
+    return "\n".join(lines)
+
+
+async def _make_db(path: Path, n: int, seed: int = 7) -> async_sessionmaker[AsyncSession]:
+    rng = random.Random(seed)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_index)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    rows = []
+    for i in range(n):
+        gu = rng.choice(list(DISTRICTS))
+        dong = rng.choice(DISTRICTS[gu])
+        rows.append({
+            "location_id": f"AA-{i:06d}",
+            "name": f"{dong} 빗물받이 {i % 500}",
+            "address": f"서울특별시 {gu} {dong} {rng.randint(1, 999)}번길 {rng.randint(1, 60)}",
+            "elevation_type": rng.choice(["lowland", "highland", None]),
+            "trash_vol_L": rng.uniform(0, 180),
+            "volume_L": rng.uniform(20, 120),
+            "max_height_mm": rng.uniform(50, 300),
+            "defect_status": rng.choice(["none"] * 9 + ["crack"]),
+        })
+    async with sessionmaker() as session:
+        for start in range(0, n, 2000):
+            await upsert_latest(session, await record_scans(session, rows[start:start + 2000]))
+        await score_unscored(session)
+        await session.commit()
+    return sessionmaker
+
+
+async def _timed(fn, session: AsyncSession, query: str, repeat: int) -> tuple[str, float]:
+    samples = []
+    text = ""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        text = await fn(session, query)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return text, statistics.median(samples)
+
+
+async def _llm_roundtrip(query: str, context: str) -> tuple[int, float]:
+    from app.config import get_settings
+    from app.core.clients import clients
+    from app.services.llm_orchestrator import AGENT_SYSTEM
+
+    t0 = time.perf_counter()
+    resp = await clients.openai.chat.completions.create(
+        model=get_settings().vllm_model,
+        messages=[
+            {"role": "system", "content": AGENT_SYSTEM},
+            {"role": "user", "content": f"[컨텍스트 - DB 조회 결과]\n{context}\n\n[사용자 질문]\n{query}\n"},
+        ],
+        max_tokens=128,
+    )
+    return resp.usage.prompt_tokens if resp.usage else -1, (time.perf_counter() - t0) * 1000
+
+
+async def main(n: int, repeat: int, with_llm: bool, show: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        sessionmaker = await _make_db(Path(tmp) / "bench.db", n)
+        print(f"drains={n}, repeat={repeat}")
+        print(f"{'query':34} {'legacy tok':>10} {'new tok':>8} {'legacy ms':>9} {'new ms':>7}  id_in_ctx")
+        totals = [0, 0]
+        async with sessionmaker() as session:
+            for query in QUERIES:
+                legacy, legacy_ms = await _timed(legacy_context, session, query, repeat)
+                new, new_ms = await _timed(build_context, session, query, repeat)
+                lt, nt = estimate_tokens(legacy), estimate_tokens(new)
+                totals[0] += lt
+                totals[1] += nt
+                target = query.split()[0] if query.startswith("AA-") else None
+                found = f"{target in legacy!s:>5} → {target in new!s:>5}" if target else ""
+                print(f"{query:34} {lt:>10} {nt:>8} {legacy_ms:>9.2f} {new_ms:>7.2f}  {found}")
+                if show:
+                    print(new, end="\n\n")
+                if with_llm:
+                    (lp, lms), (np_, nms) = await _llm_roundtrip(query, legacy), await _llm_roundtrip(query, new)
+                    print(f"{'':34} vLLM prompt_tokens {lp} → {np_}, end-to-end {lms:.0f}ms → {nms:.0f}ms")
+        print(f"total estimated prompt tokens: {totals[0]} → {totals[1]} ({totals[1] / totals[0]:.0%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drains", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--llm", action="store_true", help="vLLM 호출로 prompt_tokens·end-to-end 지연 비교")
+    parser.add_argument("--show", action="store_true", help="새 컨텍스트 출력")
+    args = parser.parse_args()
+    asyncio.run(main(args.drains, args.repeat, args.llm, args.show))
@@ -0,0 +1,135 @@
+"""청소 동선 최적화 벤치마크: 후보 100 / 1k / 5k곳, 단계별 시간·배정률·거리.
+
+각 규모마다 서울 범위의 합성 빗물받이(CRI·priority·쓰레기량 무작위)와 같은 차고지에서 출발하는 크루를 만들어
+  1) KD-tree k-최근접 이웃이 전수 비교 결과와 같은지 검증 (5k는 생략)
+  2) plan_routes 실행 → 준비 / 구성 / 개선 시간, 배정 지점 수, 가중치 배정 비율
+  3) 제약(근무 시간·용량·중복 방문) 검증
+  4) 같은 방문 지점을 기존 프론트 방식(computeOptimalRoute: CRI 최고점 출발 → 최근접 이웃)으로 정렬했을 때와 거리 비교
+
+실행 (backend 디렉터리에서):
+    python -m scripts.bench_routing
+    python -m scripts.bench_routing --sizes 1000 --budget-ms 3000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.routing import (
+    NEIGHBOR_K,
+    Crew,
+    KDTree,
+    RouteCandidate,
+    RouteOptions,
+    haversine_matrix,
+    plan_routes,
+    project,
+)
+
+DEPOT = (37.5665, 126.9780)  # 서울시청
+SHIFT_MINUTES = 480.0
+CAPACITY_L = 2000.0
+
+
+def _synthetic(n: int, seed: int) -> list[RouteCandidate]:
+    rng = np.random.default_rng(seed)
+    lat = 37.45 + rng.random(n) * 0.2
+    lng = 126.85 + rng.random(n) * 0.3
+    cri = rng.integers(0, 101, n)
+    return [
+        RouteCandidate(
+            location_id=f"BR-{i:05d}",
+            lat=float(lat[i]),
+            lng=float(lng[i]),
+            cri=int(cri[i]),
+            priority_score=1 if cri[i] >= 80 else (2 if cri[i] >= 50 else 3),
+            trash_vol_L=float(rng.uniform(0, 150)),
+        )
+        for i in range(n)
+    ]
+
+
+def _check_knn(candidates: list[RouteCandidate]) -> None:
+    lat = np.array([c.lat for c in candidates])
+    lng = np.array([c.lng for c in candidates])
+    points = project(lat, lng)
+    _, got = KDTree(points).knn_all(NEIGHBOR_K)
+    diff = points[:, None, :] - points[None, :, :]
+    brute = np.hypot(diff[..., 0], diff[..., 1])
+    np.fill_diagonal(brute, np.inf)
+    expected = np.sort(brute, axis=1)[:, :NEIGHBOR_K]
+    assert np.allclose(got, expected), "KD-tree k-NN distances differ from brute force"
+    print(f"  [check] KD-tree {NEIGHBOR_K}-NN == brute force ({len(candidates)} points)")
+
+
+def _nearest_neighbor_length(stops: list[RouteCandidate], return_to_start: bool) -> float:
+    """프론트 computeOptimalRoute 순서 (CRI 최고점 → 남은 지점 중 최근접 반복)의 차고지 왕복 거리 (m)."""
+    if not stops:
+        return 0.0
+    lat = np.array([DEPOT[0]] + [s.lat for s in stops])
+    lng = np.array([DEPOT[1]] + [s.lng for s in stops])
+    dist = haversine_matrix(lat, lng, lat, lng)
+    order = [1 + max(range(len(stops)), key=lambda i: stops[i].cri or 0)]
+    remaining = np.ones(len(lat), dtype=bool)
+    remaining[0] = False
+    remaining[order[0]] = False
+    while remaining.any():
+        row = np.where(remaining, dist[order[-1]], np.inf)
+        nxt = int(np.argmin(row))
+        order.append(nxt)
+        remaining[nxt] = False
+    path = [0, *order, 0] if return_to_start else [0, *order]
+    return float(sum(dist[a, b] for a, b in zip(path, path[1:])))
+
+
+def run(n: int, budget_ms: float) -> None:
+    candidates = _synthetic(n, seed=n)
+    crew_count = max(1, n // 250)
+    crews = [
+        Crew(f"crew-{i + 1}", *DEPOT, capacity_L=CAPACITY_L, shift_minutes=SHIFT_MINUTES)
+        for i in range(crew_count)
+    ]
+    options = RouteOptions(time_budget_ms=budget_ms)
+    print(f"[{n} drains, {crew_count} crews, shift={SHIFT_MINUTES:.0f}min, capacity={CAPACITY_L:.0f}L]")
+    if n <= 2000:
+        _check_knn(candidates)
+
+    t0 = time.perf_counter()
+    plan = plan_routes(crews, candidates, options)
+    total_ms = (time.perf_counter() - t0) * 1000
+
+    seen: set[str] = set()
+    for route in plan.routes:
+        ids = {s.candidate.location_id for s in route.stops}
+        assert not ids & seen, "drain visited twice"
+        seen |= ids
+        assert route.duration_min <= SHIFT_MINUTES + 0.1, f"{route.crew.crew_id} exceeds shift"
+        assert route.load_L <= CAPACITY_L + 0.1, f"{route.crew.crew_id} exceeds capacity"
+    assert len(seen) + len(plan.unassigned) == n
+    print("  [check] 제약 충족 (근무 시간·용량·중복 방문 없음)")
+
+    s = plan.stats
+    baseline = sum(_nearest_neighbor_length([st.candidate for st in r.stops], options.return_to_start) for r in plan.routes)
+    print(
+        f"  time      : total {total_ms:,.0f}ms = setup {s['setup_ms']:,.0f} + construct {s['construct_ms']:,.0f}"
+        f" + improve {s['improve_ms']:,.0f} (budget {budget_ms:,.0f}, {s['improvements']:.0f} moves)"
+    )
+    print(
+        f"  assigned  : {s['assigned']:.0f}/{n} drains, CRI weight {s['served_weight_ratio'] * 100:.1f}%,"
+        f" high-risk(CRI≥80) {sum(1 for r in plan.routes for st in r.stops if (st.candidate.cri or 0) >= 80)}"
+        f"/{sum(1 for c in candidates if (c.cri or 0) >= 80)}"
+    )
+    print(
+        f"  distance  : optimized {s['distance_m'] / 1000:,.1f}km (construct {s['constructed_distance_m'] / 1000:,.1f}km)"
+        f" vs CRI-first nearest-neighbor order of the same stops {baseline / 1000:,.1f}km"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,5000", help="후보 수 목록 (쉼표 구분)")
+    parser.add_argument("--budget-ms", type=float, default=2000.0, help="구성 + 개선 전체 시간 예산")
+    args = parser.parse_args()
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        run(size, args.budget_ms)
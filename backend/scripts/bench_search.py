@@ -0,0 +1,89 @@
+"""검색 자동완성 벤치마크: /drainage/search 백엔드(app.services.search) 지연 측정.
+
+임시 SQLite DB에 합성 빗물받이 N곳(구·동 주소)을 upsert_latest로 넣어(검색 색인 동시 갱신)
+검색어를 한 글자씩 입력하는 자동완성 시나리오별 지연(중앙값·최대)과 상위 결과를 출력.
+
+실행 (backend 디렉터리에서):
+    python -m scripts.bench_search --drains 100000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base
+from app.services.drainage_latest import upsert_latest
+from app.services.scans import record_scans
+from app.services.search import create_search_index, search_drainage
+from scripts.bench_retrieval import DISTRICTS
+
+TYPED = (
+    "역삼동 빗물받이 12",
+    "서울특별시 서초구 반포동 3번길",
+    "강남구 대치",
+    "망원동 7",
+    "AA-00123",
+)
+
+
+async def _make_db(path: Path, n: int, seed: int = 7) -> async_sessionmaker[AsyncSession]:
+    rng = random.Random(seed)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_index)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    rows = []
+    for i in range(n):
+        gu = rng.choice(list(DISTRICTS))
+        dong = rng.choice(DISTRICTS[gu])
+        rows.append({
+            "location_id": f"AA-{i:06d}",
+            "name": f"{dong} 빗물받이 {i % 500}",
+            "address": f"서울특별시 {gu} {dong} {rng.randint(1, 999)}번길 {rng.randint(1, 60)}",
+            "cri": rng.randint(0, 100),
+        })
+    t0 = time.perf_counter()
+    async with sessionmaker() as session:
+        for start in range(0, n, 2000):
+            await upsert_latest(session, await record_scans(session, rows[start:start + 2000]))
+        await session.commit()
+    print(f"ingest+index {n} drains: {time.perf_counter() - t0:.1f}s")
+    return sessionmaker
+
+
+async def main(n: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        sessionmaker = await _make_db(Path(tmp) / "bench.db", n)
+        worst = 0.0
+        async with sessionmaker() as session:
+            for text in TYPED:
+                print(f"\n{text!r}")
+                for end in range(1, len(text) + 1):
+                    prefix = text[:end]
+                    if not prefix.strip():
+                        continue
+                    samples = []
+                    for _ in range(repeat):
+                        t0 = time.perf_counter()
+                        hits = await search_drainage(session, prefix, 10)
+                        samples.append((time.perf_counter() - t0) * 1000)
+                    worst = max(worst, max(samples))
+                    top = hits[0] if hits else None
+                    label = f"{top.location_id} {top.name} / {top.address}" if top else "-"
+                    print(f"  {prefix:28} {statistics.median(samples):6.2f}ms (max {max(samples):6.2f})  {label}")
+        print(f"\nworst keystroke latency: {worst:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drains", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.drains, args.repeat))
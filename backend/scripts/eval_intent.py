@@ -0,0 +1,78 @@
+"""로컬 Intent 분류(규칙 → 모델) 정확도·커버리지 평가, 선택적으로 LLM 분류기와 비교.
+
+라벨 평가셋: scripts/intent_eval.jsonl (학습셋 app/data/intent_train.jsonl과 문장 중복 없음)
+
+실행 (backend 디렉터리에서):
+    python -m scripts.eval_intent                  # 로컬 경로만
+    python -m scripts.eval_intent --threshold 0.5  # 임계값 조정
+    python -m scripts.eval_intent --llm            # vLLM 분류기와 비교 (VLLM_BASE_URL 필요)
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from pathlib import Path
+
+from app.config import get_settings
+from app.services.intent_router import get_intent_model, load_examples, route_local
+
+EVAL_PATH = Path(__file__).resolve().parent / "intent_eval.jsonl"
+
+
+async def main(path: Path, threshold: float, with_llm: bool) -> None:
+    texts, labels = load_examples(path)
+    get_intent_model()
+
+    t0 = time.perf_counter()
+    decisions = [route_local(t, threshold) for t in texts]
+    local_ms = (time.perf_counter() - t0) * 1000 / len(texts)
+
+    by_source: Counter = Counter()
+    correct_by_source: Counter = Counter()
+    for decision, label in zip(decisions, labels):
+        source = decision.source if decision else "llm"
+        by_source[source] += 1
+        if decision and decision.intent == label:
+            correct_by_source[source] += 1
+
+    n = len(texts)
+    local_n = by_source["rule"] + by_source["model"]
+    local_correct = correct_by_source["rule"] + correct_by_source["model"]
+    print(f"eval set: {n} ({path.name}), threshold={threshold}")
+    for source in ("rule", "model"):
+        if by_source[source]:
+            print(f"  {source:5}: {by_source[source]:>3} 건, 정확도 {correct_by_source[source] / by_source[source]:.1%}")
+    print(f"  llm  : {by_source['llm']:>3} 건 (로컬 확신 부족 → LLM 분류)")
+    print(f"local coverage {local_n / n:.1%}, local accuracy {local_correct / max(local_n, 1):.1%}, {local_ms:.2f} ms/query")
+
+    for text, label, decision in zip(texts, labels, decisions):
+        if decision and decision.intent != label:
+            print(f"  [오분류] {text!r}: {decision.intent} ({decision.source}, {decision.confidence:.2f}) != {label}")
+
+    if not with_llm:
+        return
+
+    from app.core.clients import clients
+    from app.services.llm_orchestrator import classify_intent
+
+    t0 = time.perf_counter()
+    llm_intents = [await classify_intent(clients, t) for t in texts]
+    llm_ms = (time.perf_counter() - t0) * 1000 / n
+    await clients.aclose()
+    llm_correct = sum(i == label for i, label in zip(llm_intents, labels))
+    hybrid = [d.intent if d else llm for d, llm in zip(decisions, llm_intents)]
+    hybrid_correct = sum(i == label for i, label in zip(hybrid, labels))
+    agree = sum(d.intent == llm for d, llm in zip(decisions, llm_intents) if d)
+    print(f"LLM only ({get_settings().vllm_model}): accuracy {llm_correct / n:.1%}, {llm_ms:.0f} ms/query")
+    print(f"local + LLM fallback: accuracy {hybrid_correct / n:.1%}")
+    print(f"local/LLM agreement on locally routed queries: {agree}/{local_n}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eval-path", type=Path, default=EVAL_PATH)
+    parser.add_argument("--threshold", type=float, default=get_settings().intent_model_threshold)
+    parser.add_argument("--llm", action="store_true", help="vLLM 분류기 정확도·지연과 비교")
+    args = parser.parse_args()
+    asyncio.run(main(args.eval_path, args.threshold, args.llm))
@@ -0,0 +1,119 @@
+"""시군구 경계를 브이월드 데이터 API(LT_C_ADSIGG_INFO)에서 받아 지역 집계용 GeoJSON으로 저장.
+
+프론트 src/lib/vworld-boundaries.ts와 같은 API를 쓰되, 서울만이 아니라 지정한 시도(기본 전국)를 받고
+MultiPolygon 전체(섬 포함)를 단순화 없이 보관 — point-in-polygon 배정 정확도용.
+  1) 시도 코드 접두(sig_cd)별로 페이지를 넘기며 조회 (EPSG:4326)
+  2) sig_cd·sig_kor_nm·full_nm 속성만 남긴 FeatureCollection을 app/data/district_boundaries.geojson에 저장
+  3) --assign: DATABASE_URL 대상 drainage_latest 전체 시군구 재배정 + region_stats 재집계 (경계 교체 후)
+
+실행 (backend 디렉터리에서, VWORLD_API_KEY·VWORLD_DOMAIN 환경 변수 — 브이월드에 등록한 키·도메인):
+    python -m scripts.fetch_district_boundaries
+    python -m scripts.fetch_district_boundaries --sido 11,41 --assign
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import httpx
+
+from app.services.regions import DEFAULT_BOUNDARIES_PATH, SIDO_BY_CODE
+
+VWORLD_DATA_URL = "https://api.vworld.kr/req/data"
+PAGE_SIZE = 1000
+KEEP_PROPERTIES = ("sig_cd", "sig_kor_nm", "full_nm")
+
+
+def fetch_sido(client: httpx.Client, key: str, domain: str, prefix: str) -> list[dict]:
+    features: list[dict] = []
+    page = 1
+    while True:
+        response = client.get(VWORLD_DATA_URL, params={
+            "key": key,
+            "domain": domain,
+            "service": "data",
+            "version": "2.0",
+            "request": "getfeature",
+            "format": "json",
+            "size": PAGE_SIZE,
+            "page": page,
+            "geometry": "true",
+            "attribute": "true",
+            "crs": "EPSG:4326",
+            "data": "LT_C_ADSIGG_INFO",
+            "attrfilter": f"sig_cd:like:{prefix}",
+        })
+        response.raise_for_status()
+        body = response.json().get("response", {})
+        if body.get("status") == "NOT_FOUND":
+            break
+        if body.get("status") != "OK":
+            raise RuntimeError(f"V-World API error ({prefix}): {body.get('error') or body.get('status')}")
+        batch = body["result"]["featureCollection"]["features"]
+        features.extend(batch)
+        if page >= int(body.get("page", {}).get("total", 1)) or not batch:
+            break
+        page += 1
+    return features
+
+
+async def assign_all() -> None:
+    from app.database import async_session, init_db
+    from app.services.regions import assign_districts, rebuild_region_stats
+
+    await init_db()
+    async with async_session() as session:
+        changed = await assign_districts(session, only_missing=False)
+        districts = await rebuild_region_stats(session)
+        await session.commit()
+    print(f"reassigned {changed} drains, region_stats rebuilt for {districts} districts")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sido", default="", help="시도 코드 목록 (쉼표 구분, 예: 11,41). 기본 전국")
+    parser.add_argument("--out", default=str(DEFAULT_BOUNDARIES_PATH), help="저장 경로")
+    parser.add_argument("--assign", action="store_true", help="저장 후 drainage_latest 재배정·region_stats 재집계")
+    args = parser.parse_args()
+
+    key = os.environ.get("VWORLD_API_KEY")
+    domain = os.environ.get("VWORLD_DOMAIN", "http://localhost:3000")
+    if not key:
+        print("VWORLD_API_KEY 환경 변수가 필요합니다.", file=sys.stderr)
+        return 1
+    prefixes = [p.strip() for p in args.sido.split(",") if p.strip()] or sorted(set(SIDO_BY_CODE))
+
+    features = []
+    with httpx.Client(timeout=60.0) as client:
+        for prefix in prefixes:
+            batch = fetch_sido(client, key, domain, prefix)
+            print(f"  {prefix} {SIDO_BY_CODE.get(prefix, '?')}: {len(batch)} districts")
+            features.extend(
+                {
+                    "type": "Feature",
+                    "properties": {k: f.get("properties", {}).get(k) for k in KEEP_PROPERTIES},
+                    "geometry": f["geometry"],
+                }
+                for f in batch
+            )
+    if not features:
+        print("받은 경계가 없습니다.", file=sys.stderr)
+        return 1
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(
+        json.dumps({"type": "FeatureCollection", "features": features}, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    print(f"saved {len(features)} districts → {out} ({out.stat().st_size / 1e6:.1f} MB)")
+    if args.assign:
+        asyncio.run(assign_all())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
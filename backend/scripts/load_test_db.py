@@ -0,0 +1,167 @@
+"""DB 엔진 프로필 부하 테스트: 수신(쓰기)과 목록 조회(읽기)를 동시에 돌려 처리량·지연 비교.
+
+프로필마다 빈 DB를 만들고 --seconds 동안
+  - writer N개: POST /ingestion/drainage와 같은 트랜잭션 (스캔 INSERT → 최신 상태 upsert → ML 작업 등록 → 커밋)
+  - reader M개: GET /drainage 첫 페이지 (drainage_latest, created_at 역순 50건) + 단건 조회
+를 반복하고 초당 처리량, p50/p95 지연, 오류 수(예: database is locked)를 출력.
+
+실행 (backend 디렉터리에서):
+    python -m scripts.load_test_db                                   # 임시 SQLite, none vs sqlite 프로필
+    python -m scripts.load_test_db --url postgresql://u:p@host/loadtest --profiles none,postgres --reset
+PostgreSQL 등 --url로 지정한 DB는 테이블을 지우고 다시 만들므로 전용 테스트 DB만 사용 (--reset 필수).
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.database import create_engine
+from app.models import Base, DrainageLatest
+from app.services.drainage_latest import get_latest, upsert_latest
+from app.services.ml_queue import enqueue_ml_jobs
+from app.services.scans import record_scans
+from app.services.search import create_search_index
+from scripts.bench_retrieval import DISTRICTS
+
+
+@dataclass
+class OpStats:
+    samples_ms: list[float] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def error(self, e: Exception) -> None:
+        key = f"{e.__class__.__name__}: {str(e).splitlines()[0][:60]}"
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+    def summary(self, seconds: float) -> str:
+        errors = sum(self.errors.values())
+        if not self.samples_ms:
+            return f"{'0':>10}/s {'-':>10} {'-':>10}  errors={errors}"
+        p95 = statistics.quantiles(self.samples_ms, n=20)[18] if len(self.samples_ms) > 1 else self.samples_ms[0]
+        return (
+            f"{len(self.samples_ms) / seconds:>10.0f}/s {statistics.median(self.samples_ms):>8.1f}ms "
+            f"{p95:>8.1f}ms  errors={errors}"
+        )
+
+
+def _scan(rng: random.Random, location_id: str) -> dict:
+    gu = rng.choice(list(DISTRICTS))
+    dong = rng.choice(DISTRICTS[gu])
+    return {
+        "location_id": location_id,
+        "name": f"{dong} 빗물받이",
+        "address": f"서울특별시 {gu} {dong} {rng.randint(1, 999)}번길",
+        "lat": 37.45 + rng.random() * 0.2,
+        "lng": 126.9 + rng.random() * 0.25,
+        "volume_L": rng.uniform(20, 120),
+        "max_height_mm": rng.uniform(50, 300),
+        "trash_vol_L": rng.uniform(0, 180),
+    }
+
+
+async def _writer(sessionmaker, ids: list[str], stop: float, stats: OpStats, seed: int) -> None:
+    rng = random.Random(seed)
+    while time.perf_counter() < stop:
+        t0 = time.perf_counter()
+        try:
+            async with sessionmaker() as session:
+                scan = _scan(rng, rng.choice(ids))
+                await upsert_latest(session, await record_scans(session, [scan]))
+                await enqueue_ml_jobs(session, [scan["location_id"]])
+                await session.commit()
+        except Exception as e:
+            stats.error(e)
+            continue
+        stats.samples_ms.append((time.perf_counter() - t0) * 1000)
+
+
+async def _reader(sessionmaker, ids: list[str], stop: float, stats: OpStats, seed: int) -> None:
+    rng = random.Random(seed)
+    list_stmt = (
+        select(DrainageLatest)
+        .order_by(DrainageLatest.created_at.desc(), DrainageLatest.location_id.desc())
+        .limit(50)
+    )
+    while time.perf_counter() < stop:
+        t0 = time.perf_counter()
+        try:
+            async with sessionmaker() as session:
+                (await session.execute(list_stmt)).scalars().all()
+                await get_latest(session, rng.choice(ids))
+        except Exception as e:
+            stats.error(e)
+            continue
+        stats.samples_ms.append((time.perf_counter() - t0) * 1000)
+
+
+async def _reset(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_index)
+
+
+async def run_profile(url: str, profile: str, args: argparse.Namespace) -> None:
+    engine = create_engine(url, profile)
+    await _reset(engine)
+    sessionmaker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    ids = [f"LT-{i:05d}" for i in range(args.drains)]
+
+    # 목록 조회가 빈 테이블을 읽지 않도록 location_id별 1건씩 먼저 수신
+    rng = random.Random(1)
+    async with sessionmaker() as session:
+        for start in range(0, len(ids), 500):
+            rows = [_scan(rng, lid) for lid in ids[start:start + 500]]
+            await upsert_latest(session, await record_scans(session, rows))
+        await session.commit()
+
+    writes, reads = OpStats(), OpStats()
+    stop = time.perf_counter() + args.seconds
+    await asyncio.gather(
+        *(_writer(sessionmaker, ids, stop, writes, seed) for seed in range(args.writers)),
+        *(_reader(sessionmaker, ids, stop, reads, 1000 + seed) for seed in range(args.readers)),
+    )
+    await engine.dispose()
+
+    print(f"[{profile}] {engine.url.render_as_string(hide_password=True)}")
+    print(f"  {f'ingest ({args.writers} writers)':<20} {writes.summary(args.seconds)}")
+    print(f"  {f'list ({args.readers} readers)':<20} {reads.summary(args.seconds)}")
+    for key, count in sorted({**writes.errors, **reads.errors}.items()):
+        print(f"    {count:>6} × {key}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    print(f"writers={args.writers}, readers={args.readers}, seconds={args.seconds}, drains={args.drains}")
+    print(f"  {'':20} {'throughput':>12} {'p50':>10} {'p95':>10}")
+    if args.url:
+        for profile in profiles:
+            await run_profile(args.url, profile, args)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in profiles:
+            await run_profile(f"sqlite+aiosqlite:///{Path(tmp) / f'load_{profile}.db'}", profile, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="대상 DB URL (미지정 시 프로필마다 임시 SQLite 파일)")
+    parser.add_argument("--profiles", default="none,sqlite", help="비교할 db_profile 목록 (쉼표 구분)")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--drains", type=int, default=2000)
+    parser.add_argument("--reset", action="store_true", help="--url DB의 테이블을 지우고 다시 생성 (필수 확인)")
+    args = parser.parse_args()
+    if args.url and not args.reset:
+        sys.exit("--url로 지정한 DB는 테이블을 지우고 다시 만듭니다. 전용 테스트 DB라면 --reset을 함께 지정하세요.")
+    asyncio.run(main(args))
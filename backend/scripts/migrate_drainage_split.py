@@ -0,0 +1,91 @@
+"""drainage_data(통합 테이블) → drain_master / drain_scan / drain_analytics 분리 이관·검증.
+
+앱 시작(init_db) 시에도 자동 이관되지만, 큰 DB는 배포 전에 이 스크립트로 미리 실행하고 결과를 확인.
+  1) 새 테이블 생성 후 이관 (이미 drain_scan에 데이터가 있으면 건너뜀)
+  2) 검증: 원본의 스캔·location_id·산출값이 있는 스캔이 모두 새 테이블에 있는지
+  3) --drop-legacy: 검증 통과 시 drainage_data 삭제 (같은 트랜잭션)
+이후 drainage_latest가 비어 있으면 init_db가 새 테이블에서 다시 채움.
+
+실행 (backend 디렉터리에서, DATABASE_URL 대상):
+    python -m scripts.migrate_drainage_split
+    python -m scripts.migrate_drainage_split --drop-legacy
+"""
+
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy import column, false, func, or_, select, table
+
+from app.database import async_session, engine
+from app.models import Base, DrainAnalytics, DrainMaster, DrainScan
+from app.services.legacy_migration import (
+    LEGACY_TABLE,
+    drop_legacy_table,
+    legacy_columns,
+    migrate_legacy_drainage_data,
+)
+from app.services.scans import ANALYTICS_FIELDS
+
+
+async def main(drop_legacy: bool) -> int:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_session() as session:
+        columns = await legacy_columns(session)
+        if not columns:
+            print(f"{LEGACY_TABLE} 테이블이 없습니다 (이미 분리된 스키마).")
+            return 0
+        result = await migrate_legacy_drainage_data(session)
+        print(f"이관: {result}" if result else "이관할 행 없음 (drain_scan에 이미 데이터가 있거나 원본이 비어 있음)")
+
+        legacy = table(LEGACY_TABLE, *(column(name) for name in columns))
+        analytics_cols = [name for name in ANALYTICS_FIELDS if name in legacy.c]
+        scored = or_(*[legacy.c[name].is_not(None) for name in analytics_cols]) if analytics_cols else false()
+        # 이관 후 새로 수신·분석된 행은 제외하고 원본 행이 모두 옮겨졌는지만 확인
+        checks = {
+            "scans": (
+                await session.scalar(select(func.count()).select_from(legacy)),
+                await session.scalar(
+                    select(func.count()).select_from(legacy.join(DrainScan, DrainScan.id == legacy.c.id))
+                ),
+            ),
+            "locations": (
+                await session.scalar(select(func.count(legacy.c.location_id.distinct()))),
+                await session.scalar(
+                    select(func.count(legacy.c.location_id.distinct()))
+                    .select_from(legacy.join(DrainMaster, DrainMaster.location_id == legacy.c.location_id))
+                ),
+            ),
+            "scored scans": (
+                await session.scalar(select(func.count()).select_from(legacy).where(scored)),
+                await session.scalar(
+                    select(func.count())
+                    .select_from(legacy.join(DrainAnalytics, DrainAnalytics.scan_id == legacy.c.id))
+                    .where(scored)
+                ),
+            ),
+        }
+        ok = True
+        for name, (before, after) in checks.items():
+            status = "ok" if before == after else "MISMATCH"
+            ok &= before == after
+            print(f"  {name:13} {LEGACY_TABLE}={before:>10,}  migrated={after:>10,}  {status}")
+
+        if not ok:
+            await session.rollback()
+            print("검증 실패 — 변경 사항을 롤백했습니다.")
+            return 1
+        if drop_legacy:
+            await drop_legacy_table(session)
+            print(f"{LEGACY_TABLE} 삭제")
+        await session.commit()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drop-legacy", action="store_true", help=f"검증 통과 시 {LEGACY_TABLE} 삭제")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.drop_legacy)))